@@ -0,0 +1,82 @@
+"""add session directory
+
+Revision ID: a4f7c2e9b316
+Revises: e6c4a1b9d852
+Create Date: 2026-10-17 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'a4f7c2e9b316'
+down_revision = 'e6c4a1b9d852'
+branch_labels = None
+depends_on = None
+
+
+_TRIGGER_SQL = """
+    CREATE TRIGGER IF NOT EXISTS trg_messages_session_stats AFTER INSERT ON messages
+    BEGIN
+        INSERT INTO session_stats (
+            session_id, message_count, user_count, system_count,
+            first_timestamp, last_timestamp, word_count_sum, character_count_sum, last_id{last_message_columns}
+        )
+        VALUES (
+            NEW.session_id, 1, NEW.sender = 'user', NEW.sender = 'system',
+            NEW.timestamp, NEW.timestamp, coalesce(NEW.word_count, 0), coalesce(NEW.character_count, 0), NEW.id{last_message_values}
+        )
+        ON CONFLICT(session_id) DO UPDATE SET
+            message_count = message_count + 1,
+            user_count = user_count + excluded.user_count,
+            system_count = system_count + excluded.system_count,
+            first_timestamp = min(first_timestamp, excluded.first_timestamp),
+            last_timestamp = max(last_timestamp, excluded.last_timestamp),
+            word_count_sum = word_count_sum + excluded.word_count_sum,
+            character_count_sum = character_count_sum + excluded.character_count_sum,
+            last_id = max(last_id, excluded.last_id){last_message_update};
+    END
+"""
+
+# Mismo valor que SESSION_PREVIEW_LENGTH en src/Infrastructure/database/models.py
+_PREVIEW_LENGTH = 120
+
+_LATEST_MESSAGE_SQL = """
+    (SELECT {column} FROM messages
+     WHERE messages.session_id = session_stats.session_id
+     ORDER BY messages.timestamp DESC, messages.id DESC LIMIT 1)
+"""
+
+
+def upgrade():
+    op.add_column('session_stats', sa.Column('last_sender', sa.String(), nullable=True))
+    op.add_column('session_stats', sa.Column('last_message_preview', sa.String(), nullable=True))
+    op.execute(f"""
+        UPDATE session_stats SET
+            last_sender = {_LATEST_MESSAGE_SQL.format(column="sender")},
+            last_message_preview = {_LATEST_MESSAGE_SQL.format(column=f"substr(content, 1, {_PREVIEW_LENGTH})")}
+    """)
+    op.create_index('ix_session_stats_last_timestamp_session_id', 'session_stats', ['last_timestamp', 'session_id'])
+
+    # Mismo trigger que SESSION_STATS_TRIGGER_SQL en src/Infrastructure/database/models.py
+    op.execute("DROP TRIGGER IF EXISTS trg_messages_session_stats")
+    op.execute(_TRIGGER_SQL.format(
+        last_message_columns=",\n            last_sender, last_message_preview",
+        last_message_values=f",\n            NEW.sender, substr(NEW.content, 1, {_PREVIEW_LENGTH})",
+        last_message_update=(
+            ",\n            last_sender = CASE WHEN excluded.last_timestamp >= last_timestamp"
+            " THEN excluded.last_sender ELSE last_sender END"
+            ",\n            last_message_preview = CASE WHEN excluded.last_timestamp >= last_timestamp"
+            " THEN excluded.last_message_preview ELSE last_message_preview END"
+        ),
+    ))
+
+
+def downgrade():
+    # El trigger se recrea después: la copia de la tabla que hace batch_alter_table no puede renombrarla
+    # mientras haya un trigger que la referencie
+    op.execute("DROP TRIGGER IF EXISTS trg_messages_session_stats")
+    op.drop_index('ix_session_stats_last_timestamp_session_id', table_name='session_stats')
+    with op.batch_alter_table('session_stats') as batch_op:
+        batch_op.drop_column('last_message_preview')
+        batch_op.drop_column('last_sender')
+    op.execute(_TRIGGER_SQL.format(last_message_columns="", last_message_values="", last_message_update=""))
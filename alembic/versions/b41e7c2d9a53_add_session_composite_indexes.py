@@ -0,0 +1,27 @@
+"""add session composite indexes
+
+Revision ID: b41e7c2d9a53
+Revises: f9fc9c8c91ad
+Create Date: 2026-10-16 10:00:00.000000
+"""
+
+from alembic import op
+
+revision = 'b41e7c2d9a53'
+down_revision = 'f9fc9c8c91ad'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Índices con la forma de las consultas por sesión: igualdad (session_id[, sender]) + orden (timestamp, id).
+    # ix_messages_session_id queda cubierto por el prefijo de ix_messages_session_timestamp_id.
+    op.create_index('ix_messages_session_timestamp_id', 'messages', ['session_id', 'timestamp', 'id'], unique=False)
+    op.create_index('ix_messages_session_sender_timestamp_id', 'messages', ['session_id', 'sender', 'timestamp', 'id'], unique=False)
+    op.drop_index('ix_messages_session_id', table_name='messages')
+
+
+def downgrade():
+    op.create_index('ix_messages_session_id', 'messages', ['session_id'], unique=False)
+    op.drop_index('ix_messages_session_sender_timestamp_id', table_name='messages')
+    op.drop_index('ix_messages_session_timestamp_id', table_name='messages')
@@ -0,0 +1,70 @@
+"""add session stats
+
+Revision ID: c7d2e8f41a06
+Revises: b41e7c2d9a53
+Create Date: 2026-10-16 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'c7d2e8f41a06'
+down_revision = 'b41e7c2d9a53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('session_stats',
+    sa.Column('session_id', sa.String(), nullable=False),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.Column('user_count', sa.Integer(), nullable=False),
+    sa.Column('system_count', sa.Integer(), nullable=False),
+    sa.Column('first_timestamp', sa.DateTime(), nullable=True),
+    sa.Column('last_timestamp', sa.DateTime(), nullable=True),
+    sa.Column('word_count_sum', sa.Integer(), nullable=False),
+    sa.Column('character_count_sum', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('session_id')
+    )
+
+    # Backfill con los mensajes existentes, antes de crear el trigger
+    op.execute("""
+        INSERT INTO session_stats (
+            session_id, message_count, user_count, system_count,
+            first_timestamp, last_timestamp, word_count_sum, character_count_sum
+        )
+        SELECT
+            session_id, count(*), count(CASE WHEN sender = 'user' THEN 1 END),
+            count(CASE WHEN sender = 'system' THEN 1 END), min(timestamp), max(timestamp),
+            coalesce(sum(word_count), 0), coalesce(sum(character_count), 0)
+        FROM messages
+        GROUP BY session_id
+    """)
+
+    # Mismo trigger que SESSION_STATS_TRIGGER_SQL en src/Infrastructure/database/models.py
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_messages_session_stats AFTER INSERT ON messages
+        BEGIN
+            INSERT INTO session_stats (
+                session_id, message_count, user_count, system_count,
+                first_timestamp, last_timestamp, word_count_sum, character_count_sum
+            )
+            VALUES (
+                NEW.session_id, 1, NEW.sender = 'user', NEW.sender = 'system',
+                NEW.timestamp, NEW.timestamp, coalesce(NEW.word_count, 0), coalesce(NEW.character_count, 0)
+            )
+            ON CONFLICT(session_id) DO UPDATE SET
+                message_count = message_count + 1,
+                user_count = user_count + excluded.user_count,
+                system_count = system_count + excluded.system_count,
+                first_timestamp = min(first_timestamp, excluded.first_timestamp),
+                last_timestamp = max(last_timestamp, excluded.last_timestamp),
+                word_count_sum = word_count_sum + excluded.word_count_sum,
+                character_count_sum = character_count_sum + excluded.character_count_sum;
+        END
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_messages_session_stats")
+    op.drop_table('session_stats')
@@ -0,0 +1,63 @@
+"""add session stats last id
+
+Revision ID: d3a9f5b27e14
+Revises: c7d2e8f41a06
+Create Date: 2026-10-16 14:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd3a9f5b27e14'
+down_revision = 'c7d2e8f41a06'
+branch_labels = None
+depends_on = None
+
+
+_TRIGGER_SQL = """
+    CREATE TRIGGER IF NOT EXISTS trg_messages_session_stats AFTER INSERT ON messages
+    BEGIN
+        INSERT INTO session_stats (
+            session_id, message_count, user_count, system_count,
+            first_timestamp, last_timestamp, word_count_sum, character_count_sum{last_id_column}
+        )
+        VALUES (
+            NEW.session_id, 1, NEW.sender = 'user', NEW.sender = 'system',
+            NEW.timestamp, NEW.timestamp, coalesce(NEW.word_count, 0), coalesce(NEW.character_count, 0){last_id_value}
+        )
+        ON CONFLICT(session_id) DO UPDATE SET
+            message_count = message_count + 1,
+            user_count = user_count + excluded.user_count,
+            system_count = system_count + excluded.system_count,
+            first_timestamp = min(first_timestamp, excluded.first_timestamp),
+            last_timestamp = max(last_timestamp, excluded.last_timestamp),
+            word_count_sum = word_count_sum + excluded.word_count_sum,
+            character_count_sum = character_count_sum + excluded.character_count_sum{last_id_update};
+    END
+"""
+
+
+def upgrade():
+    op.add_column('session_stats', sa.Column('last_id', sa.Integer(), nullable=False, server_default='0'))
+    op.execute("""
+        UPDATE session_stats
+        SET last_id = (SELECT max(id) FROM messages WHERE messages.session_id = session_stats.session_id)
+        WHERE EXISTS (SELECT 1 FROM messages WHERE messages.session_id = session_stats.session_id)
+    """)
+
+    # Mismo trigger que SESSION_STATS_TRIGGER_SQL en src/Infrastructure/database/models.py
+    op.execute("DROP TRIGGER IF EXISTS trg_messages_session_stats")
+    op.execute(_TRIGGER_SQL.format(
+        last_id_column=", last_id",
+        last_id_value=", NEW.id",
+        last_id_update=",\n            last_id = max(last_id, excluded.last_id)",
+    ))
+
+
+def downgrade():
+    # El trigger se recrea después: la copia de la tabla que hace batch_alter_table no puede renombrarla
+    # mientras haya un trigger que la referencie
+    op.execute("DROP TRIGGER IF EXISTS trg_messages_session_stats")
+    with op.batch_alter_table('session_stats') as batch_op:
+        batch_op.drop_column('last_id')
+    op.execute(_TRIGGER_SQL.format(last_id_column="", last_id_value="", last_id_update=""))
@@ -0,0 +1,71 @@
+"""add messages fts
+
+Revision ID: e6c4a1b9d852
+Revises: d3a9f5b27e14
+Create Date: 2026-10-17 10:00:00.000000
+"""
+
+from alembic import op
+
+revision = 'e6c4a1b9d852'
+down_revision = 'd3a9f5b27e14'
+branch_labels = None
+depends_on = None
+
+
+# Mismas sentencias que MESSAGES_FTS_DDL en src/Infrastructure/database/models.py
+_SOURCE_VIEW_SQL = """
+    CREATE VIEW IF NOT EXISTS messages_fts_source AS
+    SELECT id, content, 's' || hex(session_id) AS session_key FROM messages
+"""
+
+_FTS_TABLE_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+        content, session_key,
+        content='messages_fts_source', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+"""
+
+_TRIGGERS_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_messages_fts_insert AFTER INSERT ON messages
+    BEGIN
+        INSERT INTO messages_fts (rowid, content, session_key)
+        VALUES (NEW.id, NEW.content, 's' || hex(NEW.session_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_messages_fts_delete AFTER DELETE ON messages
+    BEGIN
+        INSERT INTO messages_fts (messages_fts, rowid, content, session_key)
+        VALUES ('delete', OLD.id, OLD.content, 's' || hex(OLD.session_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_messages_fts_update AFTER UPDATE OF content, session_id ON messages
+    BEGIN
+        INSERT INTO messages_fts (messages_fts, rowid, content, session_key)
+        VALUES ('delete', OLD.id, OLD.content, 's' || hex(OLD.session_id));
+        INSERT INTO messages_fts (rowid, content, session_key)
+        VALUES (NEW.id, NEW.content, 's' || hex(NEW.session_id));
+    END
+    """,
+]
+
+
+def upgrade():
+    op.execute(_SOURCE_VIEW_SQL)
+    op.execute(_FTS_TABLE_SQL)
+    # Indexa los mensajes existentes de una vez, antes de crear los triggers
+    op.execute("INSERT INTO messages_fts (messages_fts) VALUES ('rebuild')")
+    for trigger_sql in _TRIGGERS_SQL:
+        op.execute(trigger_sql)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_messages_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS trg_messages_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS trg_messages_fts_insert")
+    op.execute("DROP TABLE IF EXISTS messages_fts")
+    op.execute("DROP VIEW IF EXISTS messages_fts_source")
@@ -0,0 +1,197 @@
+#Importante: Este archivo implementa la conexión WebSocket de chat de una sesión.
+#El cliente envía un mensaje por trama y recibe por el mismo socket la confirmación (ack) de cada trama
+#y los mensajes que guardan los demás participantes de la sesión.
+#
+#Tareas por conexión:
+#   lectura  -> cola de entrada (acotada) -> escritura por lotes -> acks  -> cola de salida (acotada) -> envío
+#   hub de eventos (mensajes de otros, los propios se ignoran)            -> cola de salida
+#Las tramas se encadenan sin esperar su ack: mientras se guarda un lote se acumulan las siguientes,
+#que forman el próximo. Si la escritura se atrasa, la cola de entrada se llena y se deja de leer del
+#socket (el control de flujo de TCP frena al cliente) en lugar de acumular memoria.
+import asyncio
+from typing import List, Optional, Set, Union
+
+import orjson
+from fastapi import WebSocket, status
+from pydantic import ValidationError
+
+from src.API.v1.responses import message_payload
+from src.API.v1.schemas.message_schema import MessageCreateSchema
+from src.Application.dtos.message_dto import BatchItemResultDTO, CreateMessageDTO
+from src.Application.interfaces.message_event_hub_interface import MessageSubscriptionInterface, SubscriberEvictedError
+from src.Application.use_cases.ingest_messages_stream_use_case import IngestMessagesStreamUseCase, StreamEntry
+from src.Application.use_cases.stream_message_events_use_case import StreamMessageEventsUseCase
+
+# Marca en la cola de salida para cerrar el socket (consumidor lento)
+_CLOSE = object()
+
+
+def parse_frame(seq: int, data: Union[str, bytes, None], session_id: str, max_frame_bytes: int) -> StreamEntry:
+    """
+    Interpreta una trama JSON como un mensaje de la sesión de la conexión. `session_id` puede omitirse.
+    Retorna (seq, DTO, None) o (seq, None, error).
+    """
+    if data is None:
+        return seq, None, "La trama está vacía"
+    if len(data) > max_frame_bytes:
+        return seq, None, f"La trama supera {max_frame_bytes} bytes"
+
+    try:
+        payload = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return seq, None, "La trama no es un JSON válido"
+    if not isinstance(payload, dict):
+        return seq, None, "La trama debe ser un objeto JSON"
+
+    payload.setdefault("session_id", session_id)
+    if payload["session_id"] != session_id:
+        return seq, None, "session_id no coincide con la sesión de la conexión"
+
+    try:
+        message = MessageCreateSchema.model_validate(payload)
+    except ValidationError as e:
+        error = "; ".join(
+            f"{'.'.join(str(part) for part in err['loc']) or 'frame'}: {err['msg']}" for err in e.errors()
+        )
+        return seq, None, error
+
+    return seq, CreateMessageDTO(
+        message_id=message.message_id,
+        session_id=message.session_id,
+        content=message.content,
+        timestamp=message.timestamp,
+        sender=message.sender,
+    ), None
+
+
+def _ack_frame(result: BatchItemResultDTO) -> str:
+    return orjson.dumps({
+        "type": "ack",
+        "seq": result.index,
+        "message_id": result.message_id,
+        "status": result.status,
+        "error": result.error,
+    }).decode("utf-8")
+
+
+async def serve_chat_socket(
+    websocket: WebSocket,
+    session_id: str,
+    ingest: IngestMessagesStreamUseCase,
+    events: StreamMessageEventsUseCase,
+    subscription: MessageSubscriptionInterface,
+    batch_size: int,
+    max_pending_frames: int,
+    max_frame_bytes: int,
+    after_id: Optional[int] = None,
+) -> None:
+    """
+    Atiende un WebSocket ya aceptado hasta que el cliente se desconecta.
+    Entrega los mensajes de los demás con id mayor que `after_id` (el último guardado al suscribirse).
+    Las tramas recibidas antes de la desconexión se guardan aunque ya no se puedan confirmar.
+    """
+    inbound: "asyncio.Queue[Optional[StreamEntry]]" = asyncio.Queue(maxsize=max_pending_frames)
+    outbound: asyncio.Queue = asyncio.Queue(maxsize=max_pending_frames)
+    # message_id que guarda esta conexión. Se registran antes de guardar: los eventos pueden leer de la BD
+    # un mensaje propio recién confirmado, y el cliente ya lo tiene con su ack
+    own_ids: Set[str] = set()
+
+    async def read_frames() -> None:
+        seq = 0
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                await inbound.put(None)
+                return
+            seq += 1
+            # Con la cola llena esta espera detiene la lectura del socket (backpressure)
+            await inbound.put(parse_frame(seq, message.get("text") or message.get("bytes"), session_id, max_frame_bytes))
+
+    async def write_batches() -> None:
+        while True:
+            entry = await inbound.get()
+            if entry is None:
+                return
+
+            # Lote con lo que ya está en cola, sin esperar a que se llene
+            entries: List[StreamEntry] = [entry]
+            finished = False
+            while len(entries) < batch_size and not inbound.empty():
+                entry = inbound.get_nowait()
+                if entry is None:
+                    finished = True
+                    break
+                entries.append(entry)
+
+            # El cliente confirma sus propios mensajes con el ack: el hub no los encola en su suscripción,
+            # así un lote mayor que la cola del hub (o una cola de salida llena) no desconecta al que escribe
+            batch_ids = [dto.message_id for _, dto, _ in entries if dto is not None]
+            own_ids.update(batch_ids)
+            subscription.ignore(batch_ids)
+            try:
+                results = await ingest.ingest_batch(entries)
+            except ValueError as e:
+                # Falló la transacción completa: ninguna trama del lote quedó guardada
+                results = [
+                    BatchItemResultDTO(index=seq, message_id=dto.message_id if dto else None, status="error", error=error or str(e))
+                    for seq, dto, error in entries
+                ]
+            # Los guardados ya se publicaron (dentro de ingest_batch); los demás no deben quedar ignorados
+            failed_ids = [result.message_id for result in results if result.status != "created" and result.message_id]
+            own_ids.difference_update(failed_ids)
+            subscription.unignore(failed_ids)
+
+            for result in results:
+                await outbound.put(_ack_frame(result))
+            if finished:
+                return
+
+    async def deliver_events() -> None:
+        try:
+            async for batch in events.events(subscription, after_id):
+                for event in batch:
+                    if event.message.message_id in own_ids:
+                        own_ids.discard(event.message.message_id)
+                        continue
+                    await outbound.put(orjson.dumps(
+                        {"type": "message", "id": event.event_id, "data": message_payload(event.message)},
+                        option=orjson.OPT_UTC_Z,
+                    ).decode("utf-8"))
+        except SubscriberEvictedError:
+            await outbound.put(_CLOSE)
+
+    async def send_frames() -> None:
+        connected = True
+        while True:
+            frame = await outbound.get()
+            # Con el socket cerrado se siguen vaciando la cola para no bloquear la escritura pendiente
+            if not connected:
+                continue
+            try:
+                if frame is _CLOSE:
+                    # El cliente no consume los mensajes de la sesión al ritmo en que llegan
+                    connected = False
+                    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                else:
+                    await websocket.send_text(frame)
+            except Exception:
+                # El cliente ya se fue; la lectura recibirá la desconexión
+                connected = False
+
+    reading = asyncio.ensure_future(read_frames())
+    writing = asyncio.ensure_future(write_batches())
+    tasks = (reading, writing, asyncio.ensure_future(deliver_events()), asyncio.ensure_future(send_frames()))
+    try:
+        await asyncio.wait((reading, writing), return_when=asyncio.FIRST_COMPLETED)
+        if reading.done() and not reading.cancelled() and reading.exception() is None:
+            # El cliente se desconectó: se guardan las tramas que ya estaban en cola
+            await writing
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        subscription.close()
+
+    # Un error inesperado al guardar cierra la conexión (1011) y queda en el log del servidor
+    if writing.done() and not writing.cancelled() and writing.exception() is not None:
+        raise writing.exception()
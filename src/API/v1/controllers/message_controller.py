@@ -1,25 +1,82 @@
-from fastapi import APIRouter, Depends, status, Query, HTTPException
+from datetime import datetime
+from functools import partial
+from fastapi import APIRouter, Depends, status, Query, Header, HTTPException, Request, Response, WebSocket
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.background import BackgroundTask
 from typing import Optional
 
 from src.API.v1.schemas.message_schema import (
     MessageCreateSchema,
     MessageResponseSchema,
     PaginatedMessagesSchema,
+    MessagesSinceSchema,
+    MessageSearchResultsSchema,
+    SessionsQuerySchema,
+    SessionsMessagesSchema,
+    MessageBatchCreateSchema,
+    BatchCreateResultSchema,
 )
 
 from src.API.v1.schemas.response_schema import SuccessResponse
+from src.API.v1.responses import (
+    FastJSONResponse,
+    batch_result_payload,
+    message_payload,
+    messages_since_payload,
+    pagination_payload,
+    search_results_payload,
+    sessions_messages_payload,
+    success_response,
+)
+from src.API.v1.export import EXPORT_MEDIA_TYPES, encode_export
+from src.API.v1.chat_socket import serve_chat_socket
+from src.API.v1.sse import SSE_HEADERS, SSE_MEDIA_TYPE, encode_message_events
+from src.API.v1.ndjson import NDJSON_MEDIA_TYPE, NDJSONStreamingResponse, iter_ndjson_lines, ndjson_dumps
 
 from src.Application.dtos.message_dto import CreateMessageDTO
-from src.Application.dtos.pagination_dto import GetMessagesFilterDTO
+from src.Application.dtos.pagination_dto import (
+    ExportMessagesFilterDTO,
+    GetMessagesFilterDTO,
+    GetSessionsMessagesFilterDTO,
+    SearchMessagesFilterDTO,
+)
 from src.Application.use_cases.create_message_use_case import CreateMessageUseCase
+from src.Application.use_cases.create_messages_batch_use_case import CreateMessagesBatchUseCase
+from src.Application.use_cases.export_messages_use_case import ExportMessagesUseCase
+from src.Application.use_cases.get_messages_since_use_case import GetMessagesSinceUseCase
 from src.Application.use_cases.get_messages_use_case import GetMessagesUseCase
+from src.Application.use_cases.get_sessions_messages_use_case import GetSessionsMessagesUseCase
+from src.Application.use_cases.ingest_messages_stream_use_case import IngestMessagesStreamUseCase
+from src.Application.use_cases.search_messages_use_case import SearchMessagesUseCase
+from src.Application.use_cases.stream_message_events_use_case import StreamMessageEventsUseCase
+from src.Application.interfaces.message_event_hub_interface import (
+    MessageSubscriptionInterface,
+    SubscriberEvictedError,
+    SubscriberLimitError,
+)
 
-from src.Infrastructure.database.dependencies import get_db
+from src.Infrastructure.config.settings import settings
+from src.Infrastructure.database.dependencies import (
+    get_db,
+    get_message_hub,
+    get_message_id_filter,
+    get_message_page_cache,
+    get_session_factory,
+    get_sqlite_writer,
+    get_write_coalescer,
+)
+from src.Infrastructure.cache.message_id_bloom_filter import MessageIdBloomFilter
+from src.Infrastructure.cache.message_page_cache import MessagePageCache
+from src.Infrastructure.database.sqlite_writer import SQLiteWriter
+from src.Infrastructure.events.message_hub import MessageHub
 from src.Infrastructure.repositories.message_repository_impl import MessageRepositoryImpl
+from src.Infrastructure.repositories.write_coalescer import WriteCoalescer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.Domain.services.content_filter import ContentFilterService
 from src.Domain.services.message_processor import MessageProcessor
+from src.Domain.services.message_search_ranker import MessageSearchRanker
 from src.Infrastructure.database.models import MessageModel
 
 router = APIRouter(prefix="/messages", tags=["Messages"])
@@ -27,33 +84,81 @@ router = APIRouter(prefix="/messages", tags=["Messages"])
 # Dependencias de casos de uso. Inyección de dependencias manual.
 async def get_create_message_use_case(
     db: AsyncSession = Depends(get_db),
+    write_coalescer: Optional[WriteCoalescer] = Depends(get_write_coalescer),
+    message_id_filter: Optional[MessageIdBloomFilter] = Depends(get_message_id_filter),
+    writer: Optional[SQLiteWriter] = Depends(get_sqlite_writer),
+    page_cache: Optional[MessagePageCache] = Depends(get_message_page_cache),
+    event_hub: MessageHub = Depends(get_message_hub),
 ) -> CreateMessageUseCase:
-    repository = MessageRepositoryImpl(db)
+    repository = MessageRepositoryImpl(db, write_coalescer=write_coalescer, writer=writer)
     processor = MessageProcessor()
 
     return CreateMessageUseCase(
         repository=repository,
         content_filter=ContentFilterService(),
         message_processor=processor,
+        message_id_filter=message_id_filter,
+        page_cache=page_cache,
+        event_hub=event_hub,
+    )
+
+
+async def get_create_messages_batch_use_case(
+    db: AsyncSession = Depends(get_db),
+    message_id_filter: Optional[MessageIdBloomFilter] = Depends(get_message_id_filter),
+    writer: Optional[SQLiteWriter] = Depends(get_sqlite_writer),
+    page_cache: Optional[MessagePageCache] = Depends(get_message_page_cache),
+    event_hub: MessageHub = Depends(get_message_hub),
+) -> CreateMessagesBatchUseCase:
+    repository = MessageRepositoryImpl(db, writer=writer)
+
+    return CreateMessagesBatchUseCase(
+        repository=repository,
+        content_filter=ContentFilterService(),
+        message_processor=MessageProcessor(),
+        message_id_filter=message_id_filter,
+        page_cache=page_cache,
+        event_hub=event_hub,
     )
 
 
 async def get_get_messages_use_case(
     db: AsyncSession = Depends(get_db),
+    page_cache: Optional[MessagePageCache] = Depends(get_message_page_cache),
 ) -> GetMessagesUseCase:
     repository = MessageRepositoryImpl(db)
-    return GetMessagesUseCase(repository=repository)
+    return GetMessagesUseCase(repository=repository, page_cache=page_cache)
+
+
+async def get_get_sessions_messages_use_case(db: AsyncSession = Depends(get_db)) -> GetSessionsMessagesUseCase:
+    return GetSessionsMessagesUseCase(
+        repository=MessageRepositoryImpl(db),
+        max_sessions=settings.SESSIONS_QUERY_MAX_SESSIONS,
+    )
+
+
+async def get_search_messages_use_case(db: AsyncSession = Depends(get_db)) -> SearchMessagesUseCase:
+    return SearchMessagesUseCase(
+        repository=MessageRepositoryImpl(db),
+        ranker=MessageSearchRanker(),
+        max_candidates=settings.SEARCH_MAX_CANDIDATES,
+    )
 
 
 @router.post(
     "",
-    response_model=SuccessResponse,
+    response_model=SuccessResponse[MessageResponseSchema],
+    response_class=FastJSONResponse,
     status_code=status.HTTP_201_CREATED,
 )
 
 #función para crear un mensaje con payload y caso de uso
 async def create_message(
     payload: MessageCreateSchema,
+    idempotent: bool = Query(
+        default=False,
+        description="Si el message_id ya existe con los mismos datos, retorna el mensaje almacenado (200) en lugar de un error",
+    ),
     use_case: CreateMessageUseCase = Depends(get_create_message_use_case),
 ):
     try:
@@ -65,11 +170,19 @@ async def create_message(
             sender=payload.sender,
         )
 
-        result = await use_case.execute(dto)
+        if idempotent:
+            result, created = await use_case.execute_idempotent(dto)
+            if not created:
+                # Reintento de un mensaje ya guardado: no es una nueva creación
+                return success_response(
+                    message_payload(result),
+                    status_code=status.HTTP_200_OK,
+                    headers={"X-Idempotent-Replay": "true"},
+                )
+        else:
+            result = await use_case.execute(dto)
 
-        return SuccessResponse(
-            data=MessageResponseSchema(**result.__dict__)
-        )
+        return success_response(message_payload(result), status_code=status.HTTP_201_CREATED)
     except ValueError as e:
         # Validación de errores
         raise HTTPException(
@@ -86,9 +199,407 @@ async def create_message(
         )
 
 
+@router.post(
+    "/batch",
+    response_model=SuccessResponse[BatchCreateResultSchema],
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#función para crear varios mensajes en una sola transacción, con resultado por mensaje
+async def create_messages_batch(
+    payload: MessageBatchCreateSchema,
+    use_case: CreateMessagesBatchUseCase = Depends(get_create_messages_batch_use_case),
+):
+    if len(payload.messages) > settings.BATCH_MAX_MESSAGES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El lote no puede superar {settings.BATCH_MAX_MESSAGES} mensajes"
+        )
+
+    try:
+        dtos = [
+            CreateMessageDTO(
+                message_id=item.message_id,
+                session_id=item.session_id,
+                content=item.content,
+                timestamp=item.timestamp,
+                sender=item.sender,
+            )
+            for item in payload.messages
+        ]
+
+        result = await use_case.execute(dtos)
+
+        return success_response(batch_result_payload(result))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred"
+        )
+
+
+@router.post(
+    "/sessions/query",
+    response_model=SuccessResponse[SessionsMessagesSchema],
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#función para obtener los últimos mensajes y el total de varias sesiones en una sola petición
+#(por ejemplo, un panel que muestra muchas conversaciones): dos consultas en total, no dos por sesión
+async def query_sessions_messages(
+    payload: SessionsQuerySchema,
+    use_case: GetSessionsMessagesUseCase = Depends(get_get_sessions_messages_use_case),
+):
+    try:
+        result = await use_case.execute(
+            GetSessionsMessagesFilterDTO(session_ids=payload.session_ids, limit=payload.limit)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return success_response(sessions_messages_payload(result))
+
+
+@router.post(
+    "/stream",
+    response_class=NDJSONStreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#función para ingerir un NDJSON (un mensaje por línea) leyendo el cuerpo de forma incremental.
+#Responde con una línea NDJSON por cada línea recibida y una línea final de resumen.
+async def stream_messages(
+    request: Request,
+    session_factory=Depends(get_session_factory),
+    message_id_filter: Optional[MessageIdBloomFilter] = Depends(get_message_id_filter),
+    writer: Optional[SQLiteWriter] = Depends(get_sqlite_writer),
+    page_cache: Optional[MessagePageCache] = Depends(get_message_page_cache),
+    event_hub: MessageHub = Depends(get_message_hub),
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type != NDJSON_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type debe ser {NDJSON_MEDIA_TYPE}"
+        )
+
+    return NDJSONStreamingResponse(_ingest_ndjson(request, session_factory, message_id_filter, writer, page_cache, event_hub))
+
+
+def _parse_ndjson_line(line_number: int, line: Optional[bytes]):
+    if line is None:
+        return line_number, None, f"La línea supera {settings.STREAM_INGEST_MAX_LINE_BYTES} bytes"
+
+    try:
+        payload = MessageCreateSchema.model_validate_json(line)
+    except ValidationError as e:
+        error = "; ".join(
+            f"{'.'.join(str(part) for part in err['loc']) or 'line'}: {err['msg']}" for err in e.errors()
+        )
+        return line_number, None, error
+
+    return line_number, CreateMessageDTO(
+        message_id=payload.message_id,
+        session_id=payload.session_id,
+        content=payload.content,
+        timestamp=payload.timestamp,
+        sender=payload.sender,
+    ), None
+
+
+async def _ingest_ndjson(request: Request, session_factory, message_id_filter=None, writer=None, page_cache=None, event_hub=None):
+    async def entries():
+        async for line_number, line in iter_ndjson_lines(request.stream(), settings.STREAM_INGEST_MAX_LINE_BYTES):
+            yield _parse_ndjson_line(line_number, line)
+
+    created = failed = 0
+    async with session_factory() as session:
+        use_case = IngestMessagesStreamUseCase(
+            batch_use_case=CreateMessagesBatchUseCase(
+                repository=MessageRepositoryImpl(session, writer=writer),
+                content_filter=ContentFilterService(),
+                message_processor=MessageProcessor(),
+                message_id_filter=message_id_filter,
+                page_cache=page_cache,
+                event_hub=event_hub,
+            ),
+            batch_size=settings.STREAM_INGEST_BATCH_SIZE,
+        )
+
+        async for result in use_case.execute(entries()):
+            if result.status == "created":
+                created += 1
+            else:
+                failed += 1
+            yield ndjson_dumps({
+                "line": result.index,
+                "message_id": result.message_id,
+                "status": result.status,
+                "error": result.error,
+            })
+
+    yield ndjson_dumps({"summary": {"created": created, "failed": failed}})
+
+
+# Debe registrarse antes de /{session_id} para que "export" no se tome como un id de sesión
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#función para exportar mensajes en streaming (NDJSON o CSV) con filtros opcionales de sesión y rango de fechas.
+#La memoria usada es constante: las filas se leen de la BD en bloques y se envían a medida que llegan.
+async def export_messages(
+    export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson o csv"),
+    session_id: Optional[str] = Query(default=None, description="Filtro opcional por sesión"),
+    start: Optional[datetime] = Query(default=None, alias="from", description="Incluir mensajes con timestamp >= from"),
+    end: Optional[datetime] = Query(default=None, alias="to", description="Incluir mensajes con timestamp < to"),
+    session_factory=Depends(get_session_factory),
+):
+    filters = ExportMessagesFilterDTO(session_id=session_id, start=start, end=end)
+    try:
+        ExportMessagesUseCase.validate(filters)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return StreamingResponse(
+        _export_messages(session_factory, filters, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="messages.{export_format}"'},
+    )
+
+
+async def _export_messages(session_factory, filters: ExportMessagesFilterDTO, export_format: str):
+    async with session_factory() as session:
+        use_case = ExportMessagesUseCase(repository=MessageRepositoryImpl(session))
+        async for chunk in encode_export(use_case.execute(filters), export_format):
+            yield chunk
+
+
+# Debe registrarse antes de /{session_id} para que "search" no se tome como un id de sesión
+@router.get(
+    "/search",
+    response_model=SuccessResponse[MessageSearchResultsSchema],
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#función de búsqueda de texto completo en el contenido de los mensajes (índice FTS5), ordenada por relevancia.
+#Todas las palabras deben aparecer; sin distinguir mayúsculas ni tildes, y con * al final para buscar por prefijo.
+async def search_messages(
+    q: str = Query(..., min_length=1, max_length=500, description="Palabras a buscar, por ejemplo: factura pend*"),
+    session_id: Optional[str] = Query(default=None, description="Filtro opcional por sesión"),
+    limit: int = Query(default=20, ge=1, le=100, description="Límite de resultados por página"),
+    after: Optional[str] = Query(default=None, description="Cursor (next_cursor) para pedir los resultados siguientes"),
+    use_case: SearchMessagesUseCase = Depends(get_search_messages_use_case),
+):
+    try:
+        result = await use_case.execute(SearchMessagesFilterDTO(query=q, session_id=session_id, limit=limit, after=after))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return success_response(search_results_payload(result))
+
+
+@router.get(
+    "/{session_id}/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#función para seguir en vivo los mensajes nuevos de una sesión con Server-Sent Events.
+#Cada evento lleva como id el id del mensaje; al reconectar con Last-Event-ID se reenvía desde la BD lo perdido.
+async def stream_session_events(
+    session_id: str,
+    last_event_id: Optional[str] = Header(default=None, description="Id del último evento recibido (lo envía EventSource al reconectar)"),
+    last_event_id_query: Optional[str] = Query(default=None, alias="last_event_id", description="Alternativa a la cabecera Last-Event-ID"),
+    session_factory=Depends(get_session_factory),
+    event_hub: MessageHub = Depends(get_message_hub),
+):
+    use_case = StreamMessageEventsUseCase(
+        hub=event_hub,
+        load_messages_after=partial(_load_messages_after, session_factory),
+        load_last_message_id=partial(_load_last_message_id, session_factory),
+        heartbeat_seconds=settings.MESSAGE_EVENTS_HEARTBEAT_SECONDS,
+    )
+    try:
+        last_id = use_case.parse_last_event_id(last_event_id if last_event_id is not None else last_event_id_query)
+        subscription = use_case.subscribe(session_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except SubscriberLimitError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+    try:
+        # Después de suscribirse: lo que se guarde desde ahora llega por el hub
+        after_id = await use_case.start_position(session_id, last_id)
+    except BaseException:
+        subscription.close()
+        raise
+
+    # La tarea de fondo cierra la suscripción aunque el cliente se vaya antes de empezar el flujo
+    return StreamingResponse(
+        _session_events(use_case, subscription, after_id),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS,
+        background=BackgroundTask(subscription.close),
+    )
+
+
+@router.websocket("/{session_id}/ws")
+
+#WebSocket de chat de una sesión: el cliente envía un mensaje por trama (sin esperar respuesta) y recibe
+#un ack por trama y los mensajes de los demás participantes. Las tramas se guardan en lotes con CreateMessagesBatchUseCase.
+async def chat_socket(
+    websocket: WebSocket,
+    session_id: str,
+    session_factory=Depends(get_session_factory),
+    message_id_filter: Optional[MessageIdBloomFilter] = Depends(get_message_id_filter),
+    writer: Optional[SQLiteWriter] = Depends(get_sqlite_writer),
+    page_cache: Optional[MessagePageCache] = Depends(get_message_page_cache),
+    event_hub: MessageHub = Depends(get_message_hub),
+):
+    events = StreamMessageEventsUseCase(
+        hub=event_hub,
+        load_messages_after=partial(_load_messages_after, session_factory),
+        load_last_message_id=partial(_load_last_message_id, session_factory),
+        heartbeat_seconds=settings.MESSAGE_EVENTS_HEARTBEAT_SECONDS,
+    )
+    try:
+        subscription = events.subscribe(session_id)
+    except ValueError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    except SubscriberLimitError:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    try:
+        # Posición leída después de suscribirse: lo que se guarde desde ahora llega por el hub
+        after_id = await events.start_position(session_id, None)
+        await websocket.accept()
+        # La sesión de BD no retiene una conexión mientras el socket está inactivo: cada lote confirma
+        async with session_factory() as session:
+            ingest = IngestMessagesStreamUseCase(
+                batch_use_case=CreateMessagesBatchUseCase(
+                    repository=MessageRepositoryImpl(session, writer=writer),
+                    content_filter=ContentFilterService(),
+                    message_processor=MessageProcessor(),
+                    message_id_filter=message_id_filter,
+                    page_cache=page_cache,
+                    event_hub=event_hub,
+                ),
+                batch_size=settings.WEBSOCKET_BATCH_SIZE,
+            )
+            await serve_chat_socket(
+                websocket,
+                session_id,
+                ingest=ingest,
+                events=events,
+                subscription=subscription,
+                batch_size=settings.WEBSOCKET_BATCH_SIZE,
+                max_pending_frames=settings.WEBSOCKET_MAX_PENDING_FRAMES,
+                max_frame_bytes=settings.WEBSOCKET_MAX_FRAME_BYTES,
+                after_id=after_id,
+            )
+    finally:
+        subscription.close()
+
+
+async def _load_messages_after(session_factory, session_id: str, after_id: int, limit: int):
+    # Una sesión de BD por bloque: un suscriptor en espera no retiene conexiones del pool
+    async with session_factory() as session:
+        return await MessageRepositoryImpl(session).get_by_session_after_id(session_id, after_id, limit)
+
+
+async def _load_last_message_id(session_factory, session_id: str) -> int:
+    async with session_factory() as session:
+        return await MessageRepositoryImpl(session).get_last_message_id(session_id)
+
+
+async def _session_events(use_case: StreamMessageEventsUseCase, subscription: MessageSubscriptionInterface, after_id: int):
+    try:
+        async for events in use_case.events(subscription, after_id):
+            yield encode_message_events(events)
+    except SubscriberEvictedError:
+        # Consumidor lento: se cierra el flujo y el cliente reconecta con Last-Event-ID
+        yield b": evicted\n\n"
+
+
+@router.get(
+    "/{session_id}/since",
+    response_model=SuccessResponse[MessagesSinceSchema],
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#función de long-poll para clientes que no pueden mantener SSE ni WebSocket: retorna los mensajes guardados
+#después del cursor y, si no hay ninguno, espera hasta `wait` a que llegue uno sin volver a consultar la BD.
+async def get_messages_since(
+    session_id: str,
+    cursor: Optional[str] = Query(default=None, description="next_cursor de la respuesta anterior; sin cursor se retorna la posición actual"),
+    wait: Optional[str] = Query(default=None, description="Espera máxima si no hay mensajes nuevos, por ejemplo 30s o 500ms"),
+    limit: int = Query(default=100, ge=1, le=100, description="Máximo de mensajes por respuesta"),
+    session_factory=Depends(get_session_factory),
+    event_hub: MessageHub = Depends(get_message_hub),
+):
+    use_case = GetMessagesSinceUseCase(
+        hub=event_hub,
+        load_messages_after=partial(_load_messages_after, session_factory),
+        load_last_message_id=partial(_load_last_message_id, session_factory),
+        max_wait_seconds=settings.LONG_POLL_MAX_WAIT_SECONDS,
+        max_staleness_seconds=settings.LONG_POLL_MAX_STALENESS_SECONDS,
+    )
+    try:
+        result = await use_case.execute(
+            session_id,
+            cursor=use_case.parse_cursor(cursor),
+            wait_seconds=use_case.parse_wait(wait),
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except SubscriberLimitError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+    return success_response(messages_since_payload(result))
+
+
 @router.get(
     "/{session_id}",
-    response_model=SuccessResponse,
+    response_model=SuccessResponse[PaginatedMessagesSchema],
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
 )
 
@@ -98,38 +609,42 @@ async def get_messages(
     limit: int = Query(default=20, ge=1, le=100, description="Límite de mensajes por página"),
     offset: int = Query(default=0, ge=0, description="Desplazamiento para paginación"),
     sender: Optional[str] = Query(default=None, description="Filtro opcional por remitente"),
+    after: Optional[str] = Query(default=None, description="Cursor (next_cursor) para pedir los mensajes siguientes"),
+    before: Optional[str] = Query(default=None, description="Cursor (prev_cursor) para pedir los mensajes anteriores"),
+    include_total: bool = Query(default=True, description="Si es false no se cuenta el total (total = null)"),
+    start: Optional[datetime] = Query(default=None, alias="from", description="Incluir mensajes con timestamp >= from"),
+    end: Optional[datetime] = Query(default=None, alias="to", description="Incluir mensajes con timestamp < to"),
+    if_none_match: Optional[str] = Header(default=None, description="ETag de una respuesta anterior; si no cambió se responde 304"),
     use_case: GetMessagesUseCase = Depends(get_get_messages_use_case),
 ):
-    #Obtener mensajes con paginación y filtro opcional por remitente
+    #Obtener mensajes con paginación (offset o cursor) y filtro opcional por remitente
     try:
         filters = GetMessagesFilterDTO(
             session_id=session_id,
             limit=limit,
             offset=offset,
             sender=sender,
+            after=after,
+            before=before,
+            include_total=include_total,
+            start=start,
+            end=end,
         )
+        # Una petición inválida es un 400 aunque el cliente envíe un ETag vigente
+        use_case.validate(filters)
 
-        result = await use_case.execute(filters)
-        
-        # Convertir DTOs a schemas
-        paginated_response = PaginatedMessagesSchema(
-            items=[
-                MessageResponseSchema(
-                    message_id=msg.message_id,
-                    session_id=msg.session_id,
-                    content=msg.content,
-                    timestamp=msg.timestamp,
-                    sender=msg.sender,
-                    metadata=msg.metadata,
-                )
-                for msg in result.items
-            ],
-            limit=result.limit,
-            offset=result.offset,
-            total=result.total,
-        )
+        # La versión de la sesión se lee de session_stats: si el cliente ya tiene esta versión
+        # se responde 304 sin consultar los mensajes ni serializar la página
+        version = await use_case.session_version(session_id)
+        etag = use_case.etag(version)
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        # La misma versión elige la página en caché: nunca se sirve una página vieja con un ETag nuevo
+        result = await use_case.execute(filters, version=version)
 
-        return SuccessResponse(data=paginated_response)
+        # Los DTOs ya vienen validados del caso de uso: se serializan directamente, sin schemas intermedios
+        return success_response(pagination_payload(result), headers={"ETag": etag})
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -141,30 +656,44 @@ async def get_messages(
             detail=str(e)
         )
 
-# Endpoint de debug para ver todos los mensajes en la BD.
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match usa comparación débil: se ignora el prefijo W/
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+# Endpoint de debug para ver los mensajes de la BD, por páginas acotadas en orden de id.
 @router.get(
     "/debug/all",
     response_model=SuccessResponse,
     status_code=status.HTTP_200_OK,
 )
 async def debug_all_messages(
+    limit: int = Query(default=100, ge=1, le=1000, description="Máximo de mensajes por página"),
+    after_id: int = Query(default=0, ge=0, description="next_after_id de la página anterior"),
     db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(MessageModel)
-    result = await db.execute(stmt)
-    all_messages = result.scalars().all()
+    # Búsqueda por clave primaria: cada página cuesta O(limit) sin importar el tamaño de la tabla
+    stmt = (
+        select(MessageModel.id, MessageModel.message_id, MessageModel.session_id, MessageModel.content, MessageModel.sender)
+        .where(MessageModel.id > after_id)
+        .order_by(MessageModel.id)
+        .limit(limit)
+    )
+    rows = (await db.execute(stmt)).all()
 
     return SuccessResponse(
         data={
-            "total_count": len(all_messages),
+            "count": len(rows),
+            "next_after_id": rows[-1].id if len(rows) == limit else None,
             "messages": [
                 {
-                    "message_id": msg.message_id,
-                    "session_id": msg.session_id,
-                    "content": msg.content,
-                    "sender": msg.sender,
+                    "message_id": row.message_id,
+                    "session_id": row.session_id,
+                    "content": row.content,
+                    "sender": row.sender,
                 }
-                for msg in all_messages
+                for row in rows
             ]
         }
     )
@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from src.API.v1.schemas.response_schema import SuccessResponse
+from src.Infrastructure.cache.message_id_bloom_filter import MessageIdBloomFilter
+from src.Infrastructure.cache.message_page_cache import MessagePageCache
+from src.Infrastructure.database.dependencies import (
+    get_message_hub,
+    get_message_id_filter,
+    get_message_page_cache,
+    get_sqlite_writer,
+    get_write_coalescer,
+)
+from src.Infrastructure.database.sqlite_writer import SQLiteWriter
+from src.Infrastructure.events.message_hub import MessageHub
+from src.Infrastructure.repositories.write_coalescer import WriteCoalescer
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get(
+    "/write-coalescer",
+    response_model=SuccessResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#Métricas del coalescedor de escrituras: lotes confirmados y distribución de tamaños
+async def write_coalescer_metrics(
+    write_coalescer: Optional[WriteCoalescer] = Depends(get_write_coalescer),
+):
+    if write_coalescer is None:
+        return SuccessResponse(data={"enabled": False})
+
+    return SuccessResponse(data={"enabled": True, **write_coalescer.snapshot()})
+
+
+@router.get(
+    "/message-id-filter",
+    response_model=SuccessResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#Estadísticas del filtro de Bloom de message_id: ocupación y tasa estimada de falsos positivos
+async def message_id_filter_stats(
+    message_id_filter: Optional[MessageIdBloomFilter] = Depends(get_message_id_filter),
+):
+    if message_id_filter is None:
+        return SuccessResponse(data={"enabled": False})
+
+    return SuccessResponse(data={"enabled": True, **message_id_filter.stats()})
+
+
+@router.get(
+    "/sqlite-writer",
+    response_model=SuccessResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#Estado del escritor único de SQLite: operaciones en cola, completadas y fallidas
+async def sqlite_writer_metrics(
+    writer: Optional[SQLiteWriter] = Depends(get_sqlite_writer),
+):
+    if writer is None:
+        return SuccessResponse(data={"enabled": False})
+
+    return SuccessResponse(data={"enabled": True, **writer.snapshot()})
+
+
+@router.get(
+    "/message-page-cache",
+    response_model=SuccessResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#Estadísticas de la caché de páginas de mensajes: aciertos, fallos, desalojos e invalidaciones
+async def message_page_cache_stats(
+    page_cache: Optional[MessagePageCache] = Depends(get_message_page_cache),
+):
+    if page_cache is None:
+        return SuccessResponse(data={"enabled": False})
+
+    return SuccessResponse(data={"enabled": True, **page_cache.stats()})
+
+
+@router.get(
+    "/message-events",
+    response_model=SuccessResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#Estado del hub de eventos SSE: suscriptores, mensajes publicados/entregados y desconexiones de consumidores lentos
+async def message_events_stats(
+    event_hub: MessageHub = Depends(get_message_hub),
+):
+    return SuccessResponse(data=event_hub.stats())
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, status, Query, HTTPException
+from typing import Optional
+
+from src.API.v1.schemas.session_schema import SessionsPageSchema
+from src.API.v1.schemas.response_schema import SuccessResponse
+from src.API.v1.responses import FastJSONResponse, sessions_page_payload, success_response
+
+from src.Application.dtos.pagination_dto import ListSessionsFilterDTO
+from src.Application.use_cases.list_sessions_use_case import ListSessionsUseCase
+
+from src.Infrastructure.database.dependencies import get_db
+from src.Infrastructure.repositories.session_repository_impl import SessionRepositoryImpl
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter(prefix="/sessions", tags=["Sessions"])
+
+# Dependencias de casos de uso. Inyección de dependencias manual.
+async def get_list_sessions_use_case(db: AsyncSession = Depends(get_db)) -> ListSessionsUseCase:
+    return ListSessionsUseCase(repository=SessionRepositoryImpl(db))
+
+
+@router.get(
+    "",
+    response_model=SuccessResponse[SessionsPageSchema],
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+
+#función para listar las sesiones de la más a la menos reciente (pantalla de conversaciones recientes).
+#Lee el resumen que se mantiene al guardar cada mensaje, así que no recorre la tabla de mensajes.
+async def list_sessions(
+    limit: int = Query(default=20, ge=1, le=100, description="Límite de sesiones por página"),
+    after: Optional[str] = Query(default=None, description="Cursor (next_cursor) para pedir las sesiones siguientes"),
+    use_case: ListSessionsUseCase = Depends(get_list_sessions_use_case),
+):
+    try:
+        result = await use_case.execute(ListSessionsFilterDTO(limit=limit, after=after))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return success_response(sessions_page_payload(result))
@@ -0,0 +1,98 @@
+#Importante: Este archivo convierte un flujo de mensajes en bytes NDJSON o CSV para exportarlos en streaming.
+#Lo usan tanto el endpoint GET /messages/export como la herramienta de línea de comandos.
+import csv
+import io
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from src.API.v1.ndjson import NDJSON_MEDIA_TYPE, ndjson_dumps
+from src.Application.dtos.message_dto import MessageDTO
+
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": NDJSON_MEDIA_TYPE,
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Columnas del CSV: los metadatos se aplanan en columnas propias
+CSV_COLUMNS = [
+    "message_id", "session_id", "content", "timestamp", "sender",
+    "word_count", "character_count", "processed_at",
+]
+
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def export_record(message: MessageDTO) -> dict:
+    """
+    Representación de un mensaje exportado; misma forma que MessageResponseSchema.
+    """
+    metadata = None
+    if message.metadata:
+        metadata = {**message.metadata, "processed_at": _isoformat(message.metadata.get("processed_at"))}
+
+    return {
+        "message_id": message.message_id,
+        "session_id": message.session_id,
+        "content": message.content,
+        "timestamp": _isoformat(message.timestamp),
+        "sender": message.sender,
+        "metadata": metadata,
+    }
+
+
+async def encode_export(
+    messages: AsyncIterable[MessageDTO],
+    export_format: str,
+    rows_per_chunk: int = 500,
+) -> AsyncIterator[bytes]:
+    """
+    Codifica los mensajes en bloques de hasta rows_per_chunk filas.
+    En CSV la cabecera se envía de inmediato, antes de leer el primer mensaje.
+    """
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Formato de exportación no soportado: '{export_format}'")
+
+    if export_format == "ndjson":
+        chunk = bytearray()
+        rows = 0
+        async for message in messages:
+            chunk += ndjson_dumps(export_record(message))
+            rows += 1
+            if rows >= rows_per_chunk:
+                yield bytes(chunk)
+                chunk.clear()
+                rows = 0
+        if chunk:
+            yield bytes(chunk)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+
+    rows = 0
+    async for message in messages:
+        metadata = message.metadata or {}
+        writer.writerow([
+            message.message_id,
+            message.session_id,
+            message.content,
+            _isoformat(message.timestamp),
+            message.sender,
+            metadata.get("word_count"),
+            metadata.get("character_count"),
+            _isoformat(metadata.get("processed_at")),
+        ])
+        rows += 1
+        if rows >= rows_per_chunk:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if rows:
+        yield buffer.getvalue().encode("utf-8")
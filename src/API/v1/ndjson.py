@@ -0,0 +1,75 @@
+#Importante: Este archivo contiene utilidades para leer y escribir NDJSON (un objeto JSON por línea) en streaming.
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Optional, Tuple
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+#Respuesta NDJSON cuyo generador puede seguir leyendo el cuerpo de la petición mientras responde.
+#StreamingResponse escucha `receive` en paralelo para detectar desconexiones, lo que consumiría
+#los fragmentos del cuerpo que el propio generador necesita leer.
+class NDJSONStreamingResponse(StreamingResponse):
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
+
+
+def ndjson_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterable[bytes],
+    max_line_bytes: int,
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Divide un flujo de bytes en líneas sin cargarlo completo en memoria.
+    Retorna (número de línea, contenido); el contenido es None si la línea supera max_line_bytes.
+    Las líneas vacías se omiten pero cuentan para la numeración.
+    """
+    buffer = bytearray()
+    line_number = 0
+    oversized = False
+
+    async for chunk in chunks:
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline == -1:
+                if not oversized:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        # Se descarta el resto de la línea hasta el siguiente salto
+                        oversized = True
+                        buffer.clear()
+                break
+
+            line_number += 1
+            if oversized:
+                oversized = False
+                yield line_number, None
+            else:
+                buffer += chunk[start:newline]
+                line = bytes(buffer).strip()
+                buffer.clear()
+                if len(line) > max_line_bytes:
+                    yield line_number, None
+                elif line:
+                    yield line_number, line
+            start = newline + 1
+
+    # Última línea sin salto final
+    if oversized:
+        yield line_number + 1, None
+    else:
+        line = bytes(buffer).strip()
+        if line:
+            yield line_number + 1, line
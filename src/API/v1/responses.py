@@ -0,0 +1,132 @@
+#Importante: Este archivo contiene la ruta rápida de respuestas JSON de los endpoints de mensajes.
+#Los DTOs de los casos de uso se convierten directamente en dicts y se serializan con orjson, sin construir
+#un schema de pydantic por mensaje ni volver a validarlo contra el response_model (FastAPI no valida
+#las respuestas que el endpoint ya devuelve como Response). Los schemas siguen documentando la forma en OpenAPI.
+from typing import Any, Mapping, Optional, Union
+
+import orjson
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+
+from src.Application.dtos.message_dto import (
+    BatchCreateResultDTO,
+    MessageDTO,
+    MessageResponseDTO,
+    MessagesSinceDTO,
+    SearchResultsDTO,
+    SessionsMessagesDTO,
+)
+from src.Application.dtos.pagination_dto import PaginationDTO
+from src.Application.dtos.session_dto import SessionsPageDTO
+
+
+#ORJSONResponse que escribe las fechas UTC con sufijo Z, igual que pydantic, para no cambiar el JSON
+class FastJSONResponse(ORJSONResponse):
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def message_payload(message: Union[MessageDTO, MessageResponseDTO]) -> dict:
+    # Misma forma que MessageResponseSchema; orjson serializa las fechas en ISO 8601
+    return {
+        "message_id": message.message_id,
+        "session_id": message.session_id,
+        "content": message.content,
+        "timestamp": message.timestamp,
+        "sender": message.sender,
+        "metadata": message.metadata,
+    }
+
+
+def pagination_payload(page: PaginationDTO[MessageDTO]) -> dict:
+    # Misma forma que PaginatedMessagesSchema
+    return {
+        "items": [message_payload(message) for message in page.items],
+        "limit": page.limit,
+        "offset": page.offset,
+        "total": page.total,
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+    }
+
+
+def messages_since_payload(result: MessagesSinceDTO) -> dict:
+    # Misma forma que MessagesSinceSchema
+    return {
+        "items": [message_payload(message) for message in result.items],
+        "next_cursor": str(result.next_cursor),
+    }
+
+
+def sessions_messages_payload(result: SessionsMessagesDTO) -> dict:
+    # Misma forma que SessionsMessagesSchema
+    return {
+        "sessions": [
+            {
+                "session_id": session.session_id,
+                "items": [message_payload(message) for message in session.items],
+                "total": session.total,
+            }
+            for session in result.sessions
+        ],
+    }
+
+
+def search_results_payload(results: SearchResultsDTO) -> dict:
+    # Misma forma que MessageSearchResultsSchema
+    return {
+        "items": [
+            {"message": message_payload(hit.message), "score": hit.score, "snippet": hit.snippet}
+            for hit in results.items
+        ],
+        "limit": results.limit,
+        "next_cursor": results.next_cursor,
+        "truncated": results.truncated,
+    }
+
+
+def sessions_page_payload(page: SessionsPageDTO) -> dict:
+    # Misma forma que SessionsPageSchema
+    return {
+        "items": [
+            {
+                "session_id": session.session_id,
+                "message_count": session.message_count,
+                "first_message_at": session.first_message_at,
+                "last_message_at": session.last_message_at,
+                "last_sender": session.last_sender,
+                "last_message_preview": session.last_message_preview,
+            }
+            for session in page.items
+        ],
+        "limit": page.limit,
+        "next_cursor": page.next_cursor,
+    }
+
+
+def batch_result_payload(result: BatchCreateResultDTO) -> dict:
+    # Misma forma que BatchCreateResultSchema
+    return {
+        "items": [
+            {
+                "index": item.index,
+                "message_id": item.message_id,
+                "status": item.status,
+                "data": message_payload(item.data) if item.data is not None else None,
+                "error": item.error,
+            }
+            for item in result.items
+        ],
+        "created": result.created,
+        "failed": result.failed,
+    }
+
+
+def success_response(
+    data: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Mapping[str, str]] = None,
+) -> FastJSONResponse:
+    # Misma forma que SuccessResponse
+    return FastJSONResponse({"status": "success", "data": data}, status_code=status_code, headers=headers)
@@ -25,4 +25,58 @@ class PaginatedMessagesSchema(BaseModel):
     items: List[MessageResponseSchema] = Field(..., description="Lista de mensajes")
     limit: int = Field(..., description="Límite de mensajes por página")
     offset: int = Field(..., description="Desplazamiento en la paginación")
+    total: Optional[int] = Field(..., description="Número total de mensajes en la sesión (null con include_total=false)")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor para la página siguiente (usar en after)")
+    prev_cursor: Optional[str] = Field(default=None, description="Cursor para la página anterior (usar en before)")
+
+
+
+class MessagesSinceSchema(BaseModel):
+    items: List[MessageResponseSchema] = Field(..., description="Mensajes guardados después del cursor, en orden de inserción")
+    next_cursor: str = Field(..., description="Cursor para la siguiente petición (usar en cursor)")
+
+
+class SessionsQuerySchema(BaseModel):
+    session_ids: List[str] = Field(..., min_length=1, example=["session-abc", "session-xyz"], description="Sesiones a consultar")
+    limit: int = Field(default=20, ge=1, le=100, description="Últimos mensajes a retornar por sesión")
+
+
+class SessionMessagesSchema(BaseModel):
+    session_id: str = Field(..., description="ID de la sesión")
+    items: List[MessageResponseSchema] = Field(..., description="Últimos mensajes de la sesión, del más antiguo al más reciente")
     total: int = Field(..., description="Número total de mensajes en la sesión")
+
+
+class SessionsMessagesSchema(BaseModel):
+    sessions: List[SessionMessagesSchema] = Field(..., description="Una entrada por sesión, en el orden pedido")
+
+
+class MessageSearchHitSchema(BaseModel):
+    message: MessageResponseSchema = Field(..., description="Mensaje encontrado")
+    score: float = Field(..., description="Relevancia (mayor es más relevante)")
+    snippet: str = Field(..., description="Fragmento del contenido en HTML, con las coincidencias entre <mark>")
+
+
+class MessageSearchResultsSchema(BaseModel):
+    items: List[MessageSearchHitSchema] = Field(..., description="Resultados ordenados por relevancia")
+    limit: int = Field(..., description="Límite de resultados por página")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor para la página siguiente (usar en after)")
+    truncated: bool = Field(default=False, description="Hay coincidencias más antiguas que no se puntuaron")
+
+
+class MessageBatchCreateSchema(BaseModel):
+    messages: List[MessageCreateSchema] = Field(..., min_length=1, description="Mensajes a crear en una sola transacción")
+
+
+class BatchItemResultSchema(BaseModel):
+    index: int = Field(..., description="Posición del mensaje dentro del lote")
+    message_id: Optional[str] = None
+    status: str = Field(..., description="'created' o 'error'")
+    data: Optional[MessageResponseSchema] = None
+    error: Optional[str] = None
+
+
+class BatchCreateResultSchema(BaseModel):
+    items: List[BatchItemResultSchema] = Field(..., description="Resultado de cada mensaje del lote")
+    created: int = Field(..., description="Número de mensajes creados")
+    failed: int = Field(..., description="Número de mensajes con error")
@@ -1,10 +1,14 @@
 from pydantic import BaseModel
-from typing import Any
+from typing import Generic, TypeVar
 
 
-class SuccessResponse(BaseModel):
+T = TypeVar("T")
+
+
+#SuccessResponse[Schema] documenta en OpenAPI el tipo exacto de `data`; sin parámetro acepta cualquier valor
+class SuccessResponse(BaseModel, Generic[T]):
     status: str = "success"
-    data: Any
+    data: T
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,18 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+#Schemas del directorio de sesiones: cada sesión con sus contadores y la vista previa de su último mensaje
+class SessionSummarySchema(BaseModel):
+    session_id: str = Field(..., description="ID de la sesión")
+    message_count: int = Field(..., description="Número de mensajes de la sesión")
+    first_message_at: datetime = Field(..., description="Timestamp del primer mensaje")
+    last_message_at: datetime = Field(..., description="Timestamp del último mensaje (última actividad)")
+    last_sender: Optional[str] = Field(default=None, description="Remitente del último mensaje")
+    last_message_preview: Optional[str] = Field(default=None, description="Comienzo del contenido del último mensaje")
+
+
+class SessionsPageSchema(BaseModel):
+    items: List[SessionSummarySchema] = Field(..., description="Sesiones de la más a la menos reciente")
+    limit: int = Field(..., description="Límite de sesiones por página")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor para la página siguiente (usar en after)")
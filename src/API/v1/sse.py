@@ -0,0 +1,42 @@
+#Importante: Este archivo contiene utilidades para escribir Server-Sent Events (text/event-stream).
+from typing import List, Optional
+
+import orjson
+
+from src.API.v1.responses import message_payload
+from src.Application.dtos.message_dto import MessageEventDTO
+
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Cabeceras para que ni la caché ni un proxy (nginx) retengan los eventos
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+# Comentario SSE: el cliente lo ignora, pero mantiene viva la conexión y detecta clientes caídos
+SSE_HEARTBEAT = b": ping\n\n"
+
+
+def sse_event(data: bytes, event: Optional[str] = None, event_id: Optional[int] = None) -> bytes:
+    # `data` debe ser una sola línea (el JSON de orjson nunca contiene saltos de línea sin escapar)
+    lines = []
+    if event_id is not None:
+        lines.append(b"id: %d\n" % event_id)
+    if event is not None:
+        lines.append(b"event: " + event.encode("utf-8") + b"\n")
+    lines.append(b"data: " + data + b"\n\n")
+    return b"".join(lines)
+
+
+def encode_message_events(events: List[MessageEventDTO]) -> bytes:
+    """
+    Codifica un lote de eventos `message` en un solo fragmento; un lote vacío es un heartbeat.
+    """
+    if not events:
+        return SSE_HEARTBEAT
+    return b"".join(
+        sse_event(orjson.dumps(message_payload(event.message), option=orjson.OPT_UTC_Z), "message", event.event_id)
+        for event in events
+    )
@@ -2,7 +2,7 @@
 #Importar las librerías necesarias
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 #Dataclass para definir los DTOs relacionados con mensajes
 
@@ -33,4 +33,61 @@ class MessageDTO:
     content: str
     timestamp: datetime
     sender: str
-    metadata: Optional[Dict]
\ No newline at end of file
+    metadata: Optional[Dict]
+
+#MessageEventDTO representa un mensaje entregado en el flujo de eventos de una sesión.
+#event_id es el id con el que el cliente reanuda el flujo (Last-Event-ID)
+@dataclass
+class MessageEventDTO:
+    event_id: Optional[int]
+    message: MessageDTO
+
+@dataclass
+class MessagesSinceDTO:
+    items: List[MessageDTO]
+    next_cursor: int
+
+
+@dataclass
+class MessageSearchHitDTO:
+    message: MessageDTO
+    score: float
+    snippet: str
+
+
+@dataclass
+class SearchResultsDTO:
+    items: List[MessageSearchHitDTO]
+    limit: int
+    next_cursor: Optional[str] = None
+    truncated: bool = False
+
+
+#SessionMessagesDTO agrupa los últimos mensajes de una sesión y su total, para la consulta de varias sesiones
+@dataclass
+class SessionMessagesDTO:
+    session_id: str
+    items: List[MessageDTO]
+    total: int
+
+
+@dataclass
+class SessionsMessagesDTO:
+    sessions: List[SessionMessagesDTO]
+
+
+#BatchItemResultDTO representa el resultado de un mensaje dentro de una carga por lotes
+@dataclass
+class BatchItemResultDTO:
+    index: int
+    message_id: Optional[str]
+    status: str  # "created" o "error"
+    data: Optional[MessageResponseDTO] = None
+    error: Optional[str] = None
+
+#BatchCreateResultDTO agrupa los resultados de una carga por lotes
+@dataclass
+class BatchCreateResultDTO:
+    items: List[BatchItemResultDTO]
+    created: int
+    failed: int
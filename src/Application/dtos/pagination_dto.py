@@ -1,5 +1,9 @@
 #Importante: Este archivo define los DTOs (Data Transfer Objects) utilizados para la paginación y filtros de mensajes.
 #Importar las librerías necesarias
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
 from typing import List, TypeVar, Generic, Optional
 from pydantic import BaseModel, Field
 
@@ -11,7 +15,9 @@ class PaginationDTO(BaseModel, Generic[T]):
     items: List[T]
     limit: int = Field(..., description="Número máximo de elementos por página")
     offset: int = Field(..., description="Número de elementos a saltar")
-    total: int = Field(..., description="Número total de elementos")
+    total: Optional[int] = Field(..., description="Número total de elementos (None si no se pidió contarlos)")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor para pedir la página siguiente (after)")
+    prev_cursor: Optional[str] = Field(default=None, description="Cursor para pedir la página anterior (before)")
 
     class Config:
         arbitrary_types_allowed = True
@@ -22,3 +28,117 @@ class GetMessagesFilterDTO(BaseModel):
     limit: int = Field(default=20, ge=1, le=100, description="Límite de mensajes por página")
     offset: int = Field(default=0, ge=0, description="Desplazamiento para paginación")
     sender: Optional[str] = Field(default=None, description="Filtro opcional por remitente")
+    after: Optional[str] = Field(default=None, description="Cursor: mensajes posteriores a esta posición")
+    before: Optional[str] = Field(default=None, description="Cursor: mensajes anteriores a esta posición")
+    include_total: bool = Field(default=True, description="Si es False no se cuenta el total (scroll infinito)")
+    start: Optional[datetime] = Field(default=None, description="Incluir mensajes con timestamp >= start")
+    end: Optional[datetime] = Field(default=None, description="Incluir mensajes con timestamp < end")
+
+
+#MessagePageKey identifica una página de GET /messages/{session_id} en la caché de páginas.
+#Se construye con los parámetros ya normalizados (límite por defecto y máximo aplicados).
+@dataclass(frozen=True)
+class MessagePageKey:
+    session_id: str
+    sender: Optional[str]
+    limit: int
+    offset: int
+    after: Optional[str]
+    before: Optional[str]
+    include_total: bool
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+
+#MessageCursor es la posición de un mensaje en el orden (timestamp, id) de una sesión.
+#Se envía al cliente como un token opaco en base64.
+@dataclass(frozen=True)
+class MessageCursor:
+    timestamp: datetime
+    id: int
+
+    def encode(self) -> str:
+        raw = json.dumps([self.timestamp.isoformat(), self.id], separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "MessageCursor":
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            timestamp, message_pk = json.loads(raw)
+            return cls(timestamp=datetime.fromisoformat(timestamp), id=int(message_pk))
+        except (ValueError, TypeError) as e:
+            raise ValueError("cursor inválido") from e
+
+
+#ExportMessagesFilterDTO define los filtros opcionales de una exportación: sesión y rango [start, end)
+class ExportMessagesFilterDTO(BaseModel):
+    session_id: Optional[str] = Field(default=None, description="Filtro opcional por sesión")
+    start: Optional[datetime] = Field(default=None, description="Incluir mensajes con timestamp >= start")
+    end: Optional[datetime] = Field(default=None, description="Incluir mensajes con timestamp < end")
+
+
+#SearchMessagesFilterDTO define una búsqueda de texto completo, opcionalmente dentro de una sesión
+class SearchMessagesFilterDTO(BaseModel):
+    query: str = Field(..., description="Palabras a buscar (todas deben aparecer); con * al final busca por prefijo")
+    session_id: Optional[str] = Field(default=None, description="Filtro opcional por sesión")
+    limit: int = Field(default=20, ge=1, le=100, description="Límite de resultados por página")
+    after: Optional[str] = Field(default=None, description="Cursor: resultados posteriores a esta posición")
+
+
+#GetSessionsMessagesFilterDTO define una consulta de los últimos mensajes de varias sesiones a la vez
+class GetSessionsMessagesFilterDTO(BaseModel):
+    session_ids: List[str] = Field(..., min_length=1, description="Sesiones a consultar, en el orden de la respuesta")
+    limit: int = Field(default=20, ge=1, le=100, description="Últimos mensajes a retornar por sesión")
+
+
+#SearchCursor es la posición de un resultado en el orden (puntuación descendente, id descendente).
+#max_id fija las coincidencias de la primera página: las que lleguen después no mueven la paginación.
+#Se envía al cliente como un token opaco en base64.
+@dataclass(frozen=True)
+class SearchCursor:
+    score: float
+    id: int
+    max_id: int
+
+    def encode(self) -> str:
+        raw = json.dumps([self.score, self.id, self.max_id], separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "SearchCursor":
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            score, message_pk, max_id = json.loads(raw)
+            return cls(score=float(score), id=int(message_pk), max_id=int(max_id))
+        except (ValueError, TypeError) as e:
+            raise ValueError("cursor inválido") from e
+
+
+#ListSessionsFilterDTO define una página del directorio de sesiones, de la más a la menos reciente
+class ListSessionsFilterDTO(BaseModel):
+    limit: int = Field(default=20, ge=1, le=100, description="Límite de sesiones por página")
+    after: Optional[str] = Field(default=None, description="Cursor: sesiones con actividad anterior a esta posición")
+
+
+#SessionCursor es la posición de una sesión en el orden (last_timestamp descendente, session_id descendente).
+#Se envía al cliente como un token opaco en base64.
+@dataclass(frozen=True)
+class SessionCursor:
+    last_timestamp: datetime
+    session_id: str
+
+    def encode(self) -> str:
+        raw = json.dumps([self.last_timestamp.isoformat(), self.session_id], separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "SessionCursor":
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            last_timestamp, session_id = json.loads(raw)
+            if not isinstance(session_id, str):
+                raise ValueError("session_id inválido")
+            return cls(last_timestamp=datetime.fromisoformat(last_timestamp), session_id=session_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError("cursor inválido") from e
@@ -0,0 +1,21 @@
+#Importante: Este archivo define los DTOs (Data Transfer Objects) del directorio de sesiones.
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+#SessionSummaryDTO representa una sesión en el listado: sus contadores y su último mensaje
+@dataclass
+class SessionSummaryDTO:
+    session_id: str
+    message_count: int
+    first_message_at: datetime
+    last_message_at: datetime
+    last_sender: Optional[str]
+    last_message_preview: Optional[str]
+
+#SessionsPageDTO es una página del directorio de sesiones, de la más a la menos reciente
+@dataclass
+class SessionsPageDTO:
+    items: List[SessionSummaryDTO]
+    limit: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,84 @@
+#Importante: Este archivo define la interfaz del hub de eventos de mensajes (pub/sub en el proceso).
+#Importar las librerías necesarias
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+
+from src.Domain.entities.message_entity import MessageEntity
+
+#Error lanzado a un suscriptor que no consumió sus eventos a tiempo y fue desconectado.
+#Los mensajes pendientes se descartan; el cliente puede reanudar desde el último id recibido.
+class SubscriberEvictedError(Exception):
+    pass
+
+
+#Error lanzado al suscribirse cuando el hub ya tiene el máximo de suscriptores
+class SubscriberLimitError(Exception):
+    pass
+
+
+#Suscripción a los mensajes nuevos de una sesión
+class MessageSubscriptionInterface(ABC):
+    session_id: str
+
+    @abstractmethod
+    async def next_batch(self, timeout: float) -> List[MessageEntity]:
+        """
+        Espera hasta `timeout` segundos y retorna los mensajes publicados desde la llamada anterior,
+        o una lista vacía si no llegó ninguno. Lanza SubscriberEvictedError si el suscriptor fue desconectado.
+        """
+        pass
+
+    @abstractmethod
+    def ignore(self, message_ids: Iterable[str]) -> None:
+        """
+        No encola los mensajes con estos message_id, que guarda el propio suscriptor: solo lo despiertan,
+        con el último de ellos, para que avance su posición. Cada message_id se descarta al publicarse una vez.
+        """
+        pass
+
+    @abstractmethod
+    def unignore(self, message_ids: Iterable[str]) -> None:
+        """
+        Deja de ignorar los message_id que finalmente no se guardaron.
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Cancela la suscripción. Puede llamarse más de una vez.
+        """
+        pass
+
+
+#Interfaz de un hub que reparte los mensajes guardados a los suscriptores de su sesión
+class MessageEventHubInterface(ABC):
+    @abstractmethod
+    def publish(self, message: MessageEntity) -> None:
+        """
+        Entrega el mensaje recién guardado a los suscriptores de su sesión sin bloquear a quien publica.
+        """
+        pass
+
+    @abstractmethod
+    def subscribe(self, session_id: str) -> MessageSubscriptionInterface:
+        """
+        Crea una suscripción a los mensajes que se publiquen desde ahora en la sesión.
+        Lanza SubscriberLimitError si no se admiten más suscriptores.
+        """
+        pass
+
+    @abstractmethod
+    def remember_last_id(self, session_id: str, last_id: int) -> None:
+        """
+        Registra que la sesión no tiene mensajes con id mayor que `last_id` (comprobado ahora en la BD).
+        """
+        pass
+
+    @abstractmethod
+    def last_known_id(self, session_id: str, max_age_seconds: float) -> Optional[int]:
+        """
+        Último id de la sesión según lo publicado o registrado hace menos de `max_age_seconds`, o None.
+        Los mensajes guardados por otros procesos no pasan por el hub: la antigüedad acota cuánto pueden tardar en verse.
+        """
+        pass
@@ -0,0 +1,20 @@
+#Importante: Este archivo define la interfaz para filtros probabilísticos de message_id ya vistos.
+#Importar las librerías necesarias
+from abc import ABC, abstractmethod
+
+#Interfaz de un filtro de pertenencia aproximada (p. ej. Bloom): puede dar falsos positivos, nunca falsos negativos
+class MessageIdFilterInterface(ABC):
+    @abstractmethod
+    def might_contain(self, message_id: str) -> bool:
+        """
+        Retorna False solo si el message_id con seguridad no se ha guardado.
+        True significa "quizá": hay que confirmarlo contra la base de datos.
+        """
+        pass
+
+    @abstractmethod
+    def add(self, message_id: str) -> None:
+        """
+        Registra un message_id recién guardado.
+        """
+        pass
@@ -0,0 +1,38 @@
+#Importante: Este archivo define la interfaz de la caché de páginas de mensajes por sesión.
+#Importar las librerías necesarias
+from abc import ABC, abstractmethod
+from typing import Hashable, Optional
+
+from src.Application.dtos.message_dto import MessageDTO
+from src.Application.dtos.pagination_dto import MessagePageKey, PaginationDTO
+
+#Interfaz de una caché de lectura de páginas que se invalida por sesión cuando se escribe en ella
+class MessagePageCacheInterface(ABC):
+    @abstractmethod
+    def get(self, key: MessagePageKey, version: Hashable) -> Optional[PaginationDTO[MessageDTO]]:
+        """
+        Retorna la página guardada o None si no está, ya no es válida o se leyó en otra versión de la sesión.
+        """
+        pass
+
+    @abstractmethod
+    def token(self, session_id: str) -> Hashable:
+        """
+        Marca el inicio de una lectura de la BD; se entrega luego a put().
+        """
+        pass
+
+    @abstractmethod
+    def put(self, key: MessagePageKey, page: PaginationDTO[MessageDTO], token: Hashable, version: Hashable) -> None:
+        """
+        Guarda la página con la versión de la sesión leída antes de consultarla, salvo que la sesión
+        se haya invalidado después de obtener el token (la lectura pudo ver datos anteriores a esa escritura).
+        """
+        pass
+
+    @abstractmethod
+    def invalidate_session(self, session_id: str) -> None:
+        """
+        Descarta todas las páginas de la sesión tras escribir en ella.
+        """
+        pass
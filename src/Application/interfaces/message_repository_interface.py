@@ -1,8 +1,17 @@
 #Importante: Este archivo define la interfaz para el repositorio de mensajes.
 #Importar las librerías necesarias
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.search_term import SearchTerm
+from src.Application.dtos.pagination_dto import MessageCursor
+
+#Error lanzado cuando se intenta guardar un message_id que ya existe.
+#Hereda de ValueError para que las capas superiores lo sigan traduciendo a un 400.
+class DuplicateMessageError(ValueError):
+    pass
+
 
 #Clase que define la interfaz del repositorio de mensajes - Define el contrato para la persistencia de mensajes
 class MessageRepositoryInterface(ABC):
@@ -10,6 +19,30 @@ class MessageRepositoryInterface(ABC):
     async def save(self, message: MessageEntity) -> MessageEntity:
         """
         Guarda un mensaje y retorna el mensaje persistido.
+        Lanza DuplicateMessageError si el message_id ya existe.
+        """
+        pass
+
+    @abstractmethod
+    async def save_many(self, messages: List[MessageEntity]) -> List[Optional[MessageEntity]]:
+        """
+        Guarda varios mensajes en una sola transacción.
+        Retorna, en el mismo orden, el mensaje persistido o None si su message_id ya existía.
+        """
+        pass
+
+    @abstractmethod
+    async def save_or_get(self, message: MessageEntity) -> Tuple[MessageEntity, bool]:
+        """
+        Guarda el mensaje si su message_id no existe; si ya existe retorna el almacenado sin error.
+        El booleano indica si el mensaje se creó en esta llamada.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_message_id(self, message_id: str) -> Optional[MessageEntity]:
+        """
+        Obtiene un mensaje por su message_id, o None si no existe.
         """
         pass
 
@@ -19,10 +52,36 @@ class MessageRepositoryInterface(ABC):
         session_id: str,
         limit: int,
         offset: int,
-        sender: Optional[str] = None
+        sender: Optional[str] = None,
+        after: Optional[MessageCursor] = None,
+        before: Optional[MessageCursor] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
     ) -> List[MessageEntity]:
         """
-        Obtiene mensajes por sesión con paginación y filtro opcional por remitente.
+        Obtiene mensajes por sesión en orden (timestamp, id) con filtro opcional por remitente
+        y por rango de fechas [start, end).
+        Con `after`/`before` se usa paginación por cursor (se ignora offset): retorna los `limit`
+        mensajes inmediatamente posteriores/anteriores a esa posición, siempre en orden ascendente.
+        """
+        pass
+
+    @abstractmethod
+    async def get_page_by_session(
+        self,
+        session_id: str,
+        limit: int,
+        offset: int,
+        sender: Optional[str] = None,
+        after: Optional[MessageCursor] = None,
+        before: Optional[MessageCursor] = None,
+        include_total: bool = True,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[List[MessageEntity], Optional[int]]:
+        """
+        Igual que get_by_session, pero retorna también el total de mensajes con los mismos filtros
+        en la misma consulta. Con include_total=False no se cuenta y el total es None.
         """
         pass
 
@@ -30,9 +89,77 @@ class MessageRepositoryInterface(ABC):
     async def count_by_session(
         self,
         session_id: str,
-        sender: Optional[str] = None
+        sender: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
     ) -> int:
         """
-        Cuenta el total de mensajes en una sesión, opcionalmente filtrados por remitente.
+        Cuenta el total de mensajes en una sesión, opcionalmente filtrados por remitente y por rango [start, end).
+        """
+        pass
+
+    @abstractmethod
+    async def get_latest_by_sessions(self, session_ids: List[str], limit: int) -> Dict[str, List[MessageEntity]]:
+        """
+        Retorna, en una sola consulta, los últimos `limit` mensajes de cada sesión en orden (timestamp, id) ascendente.
+        Las sesiones sin mensajes no aparecen en el resultado.
+        """
+        pass
+
+    @abstractmethod
+    async def count_by_sessions(self, session_ids: List[str]) -> Dict[str, int]:
+        """
+        Retorna, en una sola consulta, el número de mensajes de cada sesión (0 si no tiene mensajes).
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_session_after_id(self, session_id: str, after_id: int, limit: int) -> List[MessageEntity]:
+        """
+        Obtiene hasta `limit` mensajes de la sesión guardados después del mensaje con id `after_id`,
+        en orden de inserción (id). Sirve para reanudar un flujo de eventos.
+        """
+        pass
+
+    @abstractmethod
+    async def search_recent_matches(
+        self,
+        terms: List[SearchTerm],
+        session_id: Optional[str],
+        limit: int,
+        max_id: Optional[int] = None,
+    ) -> List[MessageEntity]:
+        """
+        Obtiene hasta `limit` mensajes que contienen todos los términos (índice de texto completo),
+        los más recientes primero (id descendente). Con max_id solo considera los de id <= max_id.
+        """
+        pass
+
+    @abstractmethod
+    async def get_last_message_id(self, session_id: str) -> int:
+        """
+        Retorna el id del último mensaje guardado en la sesión, o 0 si no tiene mensajes.
+        """
+        pass
+
+    @abstractmethod
+    async def get_session_version(self, session_id: str) -> str:
+        """
+        Retorna un identificador que cambia cada vez que se guarda un mensaje en la sesión.
+        """
+        pass
+
+    @abstractmethod
+    def iter_messages(
+        self,
+        session_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[MessageEntity]:
+        """
+        Recorre los mensajes (opcionalmente de una sesión y un rango [start, end)) en orden de inserción,
+        o por (timestamp, id) dentro de una sesión, leyendo de la base de datos en bloques de chunk_size
+        sin cargar todo en memoria.
         """
         pass
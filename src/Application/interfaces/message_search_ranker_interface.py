@@ -0,0 +1,31 @@
+#Importante: Este archivo define la interfaz del servicio que ordena y resume los resultados de búsqueda.
+from abc import ABC, abstractmethod
+from typing import List
+
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.search_term import SearchTerm
+
+
+#Interfaz para convertir la consulta en términos, puntuar los mensajes encontrados y generar fragmentos
+class MessageSearchRankerInterface(ABC):
+
+    @abstractmethod
+    def parse_query(self, query: str) -> List[SearchTerm]:
+        """
+        Convierte el texto buscado en términos. Lanza ValueError si no hay ninguno o hay demasiados.
+        """
+        pass
+
+    @abstractmethod
+    def score(self, messages: List[MessageEntity], terms: List[SearchTerm]) -> List[float]:
+        """
+        Puntúa cada mensaje (mayor es más relevante), en el mismo orden recibido.
+        """
+        pass
+
+    @abstractmethod
+    def snippet(self, content: str, terms: List[SearchTerm]) -> str:
+        """
+        Fragmento del contenido alrededor de la primera coincidencia, en HTML con las coincidencias entre <mark>.
+        """
+        pass
@@ -0,0 +1,15 @@
+#Importante: Este archivo define la interfaz para el repositorio del directorio de sesiones.
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from src.Domain.entities.session_summary_entity import SessionSummaryEntity
+from src.Application.dtos.pagination_dto import SessionCursor
+
+#Clase que define la interfaz del repositorio de sesiones - Define el contrato para leer los resúmenes de sesión
+class SessionRepositoryInterface(ABC):
+    @abstractmethod
+    async def list_recent(self, limit: int, after: Optional[SessionCursor] = None) -> List[SessionSummaryEntity]:
+        """
+        Retorna hasta `limit` sesiones ordenadas por última actividad (last_timestamp, session_id) descendente,
+        empezando después de `after` si se indica.
+        """
+        pass
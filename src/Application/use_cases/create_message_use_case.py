@@ -1,11 +1,15 @@
 #Importante: Este archivo implementa el caso de uso para crear un mensaje.
+from typing import Optional, Tuple
 
 from src.Domain.entities.message_entity import MessageEntity
 from src.Domain.value_objects.sender_type import SenderType
 from src.Application.dtos.message_dto import CreateMessageDTO, MessageResponseDTO
-from src.Application.interfaces.message_repository_interface import MessageRepositoryInterface
+from src.Application.interfaces.message_repository_interface import MessageRepositoryInterface, DuplicateMessageError
 from src.Application.interfaces.content_filter_interface import ContentFilterInterface
 from src.Application.interfaces.message_processor_interface import MessageProcessorInterface
+from src.Application.interfaces.message_id_filter_interface import MessageIdFilterInterface
+from src.Application.interfaces.message_page_cache_interface import MessagePageCacheInterface
+from src.Application.interfaces.message_event_hub_interface import MessageEventHubInterface
 
 #Clase que implementa el caso de uso para crear un mensaje. 
 #Orquesta las reglas del dominio y la persistencia.
@@ -16,15 +20,69 @@ class CreateMessageUseCase:
         repository: MessageRepositoryInterface,
         content_filter: ContentFilterInterface,
         message_processor: MessageProcessorInterface,
+        message_id_filter: Optional[MessageIdFilterInterface] = None,
+        page_cache: Optional[MessagePageCacheInterface] = None,
+        event_hub: Optional[MessageEventHubInterface] = None,
     ):
         self.repository = repository
         self.content_filter = content_filter
         self.message_processor = message_processor
+        self.message_id_filter = message_id_filter
+        self.page_cache = page_cache
+        self.event_hub = event_hub
 
     async def execute(self, dto: CreateMessageDTO) -> MessageResponseDTO:
         """
         Ejecuta el flujo de creación del mensaje.
         """
+        processed_message = self.build_message(dto)
+
+        # Si el filtro dice "quizá ya existe", se confirma con una lectura por índice
+        # en lugar de dejar que el INSERT falle y obligue a un rollback
+        if self.message_id_filter is not None and self.message_id_filter.might_contain(processed_message.message_id):
+            if await self.repository.get_by_message_id(processed_message.message_id) is not None:
+                raise DuplicateMessageError(f"El mensaje con id {processed_message.message_id} ya existe")
+
+        saved_message = await self.repository.save(processed_message)
+        self.remember_saved(saved_message)
+        # Convertir entidad guardada a DTO de respuesta
+        return self.to_response_dto(saved_message)
+
+    async def execute_idempotent(self, dto: CreateMessageDTO) -> Tuple[MessageResponseDTO, bool]:
+        """
+        Crea el mensaje o, si su message_id ya existe con los mismos datos, retorna el almacenado.
+        El booleano indica si el mensaje se creó (False = reintento repetido).
+        """
+        processed_message = self.build_message(dto)
+
+        if self.message_id_filter is None:
+            saved_message, created = await self.repository.save_or_get(processed_message)
+        elif self.message_id_filter.might_contain(processed_message.message_id):
+            # Posible reintento: una sola lectura por índice resuelve el caso habitual
+            stored_message = await self.repository.get_by_message_id(processed_message.message_id)
+            if stored_message is not None:
+                saved_message, created = stored_message, False
+            else:
+                saved_message, created = await self.repository.save_or_get(processed_message)
+        else:
+            # Con seguridad es nuevo: INSERT simple, con el upsert como respaldo por si
+            # otro proceso lo guardó sin que este filtro lo supiera
+            try:
+                saved_message, created = await self.repository.save(processed_message), True
+            except DuplicateMessageError:
+                saved_message, created = await self.repository.save_or_get(processed_message)
+
+        if created:
+            self.remember_saved(saved_message)
+        if not created and not self._is_same_message(saved_message, processed_message):
+            raise ValueError(f"El mensaje con id {dto.message_id} ya existe con un contenido diferente")
+
+        return self.to_response_dto(saved_message), created
+
+    def build_message(self, dto: CreateMessageDTO) -> MessageEntity:
+        """
+        Valida, filtra y procesa el DTO, retornando la entidad lista para persistir.
+        """
         if not dto.message_id or not dto.message_id.strip():
             raise ValueError("message_id no puede estar vacío")
         
@@ -53,15 +111,37 @@ class CreateMessageUseCase:
             sender=sender
         )
         # Procesar el mensaje (lógica de negocio adicional)
-        processed_message = self.message_processor.process(message)
+        return self.message_processor.process(message)
 
-        saved_message = await self.repository.save(processed_message)
-        # Convertir entidad guardada a DTO de respuesta
+    def remember_saved(self, message: MessageEntity) -> None:
+        """
+        Registra en el filtro de message_id un mensaje recién guardado,
+        invalida las páginas en caché de su sesión y lo publica a sus suscriptores.
+        """
+        if self.message_id_filter is not None:
+            self.message_id_filter.add(message.message_id)
+        if self.page_cache is not None:
+            self.page_cache.invalidate_session(message.session_id)
+        if self.event_hub is not None:
+            self.event_hub.publish(message)
+
+    @staticmethod
+    def _is_same_message(stored: MessageEntity, incoming: MessageEntity) -> bool:
+        # La BD guarda las fechas sin zona horaria, así que se comparan sin ella
+        return (
+            stored.session_id == incoming.session_id
+            and stored.sender == incoming.sender
+            and stored.content == incoming.content
+            and stored.timestamp.replace(tzinfo=None) == incoming.timestamp.replace(tzinfo=None)
+        )
+
+    @staticmethod
+    def to_response_dto(message: MessageEntity) -> MessageResponseDTO:
         return MessageResponseDTO(
-            message_id=saved_message.message_id,
-            session_id=saved_message.session_id,
-            content=saved_message.content,
-            timestamp=saved_message.timestamp,
-            sender=saved_message.sender.value,
-            metadata=saved_message.metadata.to_dict() if saved_message.metadata else None
+            message_id=message.message_id,
+            session_id=message.session_id,
+            content=message.content,
+            timestamp=message.timestamp,
+            sender=message.sender.value,
+            metadata=message.metadata.to_dict() if message.metadata else None
         )
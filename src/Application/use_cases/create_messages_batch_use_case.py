@@ -0,0 +1,83 @@
+#Importante: Este archivo implementa el caso de uso para crear mensajes por lotes.
+from typing import List, Optional, Tuple
+
+from src.Domain.entities.message_entity import MessageEntity
+from src.Application.dtos.message_dto import CreateMessageDTO, BatchItemResultDTO, BatchCreateResultDTO
+from src.Application.interfaces.message_repository_interface import MessageRepositoryInterface
+from src.Application.interfaces.content_filter_interface import ContentFilterInterface
+from src.Application.interfaces.message_processor_interface import MessageProcessorInterface
+from src.Application.interfaces.message_id_filter_interface import MessageIdFilterInterface
+from src.Application.interfaces.message_page_cache_interface import MessagePageCacheInterface
+from src.Application.interfaces.message_event_hub_interface import MessageEventHubInterface
+from src.Application.use_cases.create_message_use_case import CreateMessageUseCase
+
+#Clase que implementa el caso de uso para crear varios mensajes a la vez.
+#Aplica las mismas reglas que CreateMessageUseCase, pero persiste todo en una sola transacción
+#y reporta el resultado de cada mensaje por separado.
+class CreateMessagesBatchUseCase:
+
+    def __init__(
+        self,
+        repository: MessageRepositoryInterface,
+        content_filter: ContentFilterInterface,
+        message_processor: MessageProcessorInterface,
+        message_id_filter: Optional[MessageIdFilterInterface] = None,
+        page_cache: Optional[MessagePageCacheInterface] = None,
+        event_hub: Optional[MessageEventHubInterface] = None,
+    ):
+        self.repository = repository
+        self.create_message = CreateMessageUseCase(
+            repository=repository,
+            content_filter=content_filter,
+            message_processor=message_processor,
+            message_id_filter=message_id_filter,
+            page_cache=page_cache,
+            event_hub=event_hub,
+        )
+
+    async def execute(self, dtos: List[CreateMessageDTO]) -> BatchCreateResultDTO:
+        """
+        Ejecuta el flujo de creación por lotes.
+        Un mensaje inválido o duplicado no impide guardar el resto del lote.
+        """
+        results: List[Optional[BatchItemResultDTO]] = [None] * len(dtos)
+        pending: List[Tuple[int, MessageEntity]] = []
+
+        # Validar, filtrar y procesar cada mensaje de forma independiente
+        for index, dto in enumerate(dtos):
+            try:
+                pending.append((index, self.create_message.build_message(dto)))
+            except ValueError as e:
+                results[index] = BatchItemResultDTO(
+                    index=index,
+                    message_id=dto.message_id,
+                    status="error",
+                    error=str(e),
+                )
+
+        if pending:
+            saved_messages = await self.repository.save_many([message for _, message in pending])
+
+            for (index, message), saved_message in zip(pending, saved_messages):
+                if saved_message is None:
+                    results[index] = BatchItemResultDTO(
+                        index=index,
+                        message_id=message.message_id,
+                        status="error",
+                        error=f"El mensaje con id {message.message_id} ya existe",
+                    )
+                else:
+                    self.create_message.remember_saved(saved_message)
+                    results[index] = BatchItemResultDTO(
+                        index=index,
+                        message_id=saved_message.message_id,
+                        status="created",
+                        data=self.create_message.to_response_dto(saved_message),
+                    )
+
+        created = sum(1 for item in results if item.status == "created")
+        return BatchCreateResultDTO(
+            items=results,
+            created=created,
+            failed=len(results) - created,
+        )
@@ -0,0 +1,46 @@
+#Importante: Este archivo implementa el caso de uso para exportar mensajes en streaming.
+from typing import AsyncIterator
+
+from src.Application.interfaces.message_repository_interface import MessageRepositoryInterface
+from src.Application.dtos.message_dto import MessageDTO
+from src.Application.dtos.pagination_dto import ExportMessagesFilterDTO
+
+#Caso de uso para exportar mensajes sin cargarlos todos en memoria
+class ExportMessagesUseCase:
+
+    def __init__(self, repository: MessageRepositoryInterface, chunk_size: int = 1000):
+        self.repository = repository
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def validate(filters: ExportMessagesFilterDTO) -> None:
+        """
+        Valida los filtros antes de empezar a responder.
+        """
+        if filters.session_id is not None and not filters.session_id.strip():
+            raise ValueError("session_id no puede estar vacío")
+
+        if filters.start is not None and filters.end is not None:
+            if filters.start.replace(tzinfo=None) >= filters.end.replace(tzinfo=None):
+                raise ValueError("from debe ser anterior a to")
+
+    async def execute(self, filters: ExportMessagesFilterDTO) -> AsyncIterator[MessageDTO]:
+        """
+        Retorna los mensajes que cumplen los filtros, uno a uno, en orden de inserción.
+        """
+        self.validate(filters)
+
+        async for msg in self.repository.iter_messages(
+            session_id=filters.session_id,
+            start=filters.start,
+            end=filters.end,
+            chunk_size=self.chunk_size,
+        ):
+            yield MessageDTO(
+                message_id=msg.message_id,
+                session_id=msg.session_id,
+                content=msg.content,
+                timestamp=msg.timestamp,
+                sender=msg.sender.value,
+                metadata=msg.metadata.__dict__ if msg.metadata else None,
+            )
@@ -0,0 +1,142 @@
+#Importante: Este archivo implementa el caso de uso del long-poll de mensajes nuevos de una sesión.
+import asyncio
+import re
+from typing import List, Optional
+
+from src.Domain.entities.message_entity import MessageEntity
+from src.Application.dtos.message_dto import MessageDTO, MessagesSinceDTO
+from src.Application.interfaces.message_event_hub_interface import MessageEventHubInterface, SubscriberEvictedError
+from src.Application.use_cases.stream_message_events_use_case import LoadLastMessageId, LoadMessagesAfter
+
+_WAIT_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)(ms|s)?$")
+
+
+#Caso de uso que retorna los mensajes guardados después de un cursor (el id del último mensaje visto).
+#Si no hay ninguno, espera en el hub hasta que llegue uno o se acabe el tiempo, sin consultar la BD mientras espera.
+#El hub recuerda el último id de cada sesión, así que un cliente al día no genera consultas mientras espera.
+class GetMessagesSinceUseCase:
+
+    def __init__(
+        self,
+        hub: MessageEventHubInterface,
+        load_messages_after: LoadMessagesAfter,
+        load_last_message_id: LoadLastMessageId,
+        max_wait_seconds: float = 60.0,
+        max_staleness_seconds: float = 60.0,
+    ):
+        if max_wait_seconds <= 0:
+            raise ValueError("max_wait_seconds debe ser positivo")
+        if max_staleness_seconds < 0:
+            raise ValueError("max_staleness_seconds no puede ser negativo")
+
+        self.hub = hub
+        self.load_messages_after = load_messages_after
+        self.load_last_message_id = load_last_message_id
+        self.max_wait_seconds = max_wait_seconds
+        self.max_staleness_seconds = max_staleness_seconds
+
+    @staticmethod
+    def parse_cursor(cursor: Optional[str]) -> Optional[int]:
+        """
+        Valida el cursor recibido: el next_cursor (entero no negativo) de una respuesta anterior.
+        """
+        if cursor is None or not cursor.strip():
+            return None
+        try:
+            value = int(cursor)
+        except ValueError:
+            raise ValueError("cursor inválido")
+        if value < 0:
+            raise ValueError("cursor inválido")
+        return value
+
+    def parse_wait(self, wait: Optional[str]) -> float:
+        """
+        Convierte la espera ("30s", "500ms" o segundos sin unidad) a segundos, acotada a max_wait_seconds.
+        """
+        if wait is None or not wait.strip():
+            return 0.0
+        match = _WAIT_PATTERN.match(wait.strip())
+        if match is None:
+            raise ValueError("wait inválido: use segundos, por ejemplo 30s o 500ms")
+        seconds = float(match.group(1))
+        if match.group(2) == "ms":
+            seconds /= 1000
+        return min(seconds, self.max_wait_seconds)
+
+    async def execute(
+        self,
+        session_id: str,
+        cursor: Optional[int],
+        wait_seconds: float = 0.0,
+        limit: int = 100,
+    ) -> MessagesSinceDTO:
+        """
+        Sin cursor retorna solo la posición actual de la sesión, para empezar a sondear desde ahí.
+        Lanza SubscriberLimitError si hay que esperar y el hub no admite más suscriptores.
+        """
+        if not session_id or not session_id.strip():
+            raise ValueError("session_id no puede estar vacío")
+        if limit < 1:
+            raise ValueError("limit debe ser al menos 1")
+
+        if cursor is None:
+            return MessagesSinceDTO(items=[], next_cursor=await self._current_position(session_id))
+
+        # Suscribirse antes de leer la BD: lo que se guarde entre la consulta y la espera llega por el hub
+        subscription = self.hub.subscribe(session_id)
+        try:
+            known_id = self.hub.last_known_id(session_id, self.max_staleness_seconds)
+            if known_id is None or known_id > cursor:
+                messages = await self.load_messages_after(session_id, cursor, limit)
+                if messages:
+                    if len(messages) < limit:
+                        self.hub.remember_last_id(session_id, messages[-1].id)
+                    return self._result(messages, cursor)
+                # El cursor viene del cliente y los ids son globales: solo se recuerda el último id confirmado por la BD
+                self.hub.remember_last_id(session_id, await self.load_last_message_id(session_id))
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + wait_seconds
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return MessagesSinceDTO(items=[], next_cursor=cursor)
+                try:
+                    batch = await subscription.next_batch(remaining)
+                except SubscriberEvictedError:
+                    # Llegaron más mensajes de los que caben en la cola: se leen de la BD
+                    return self._result(await self.load_messages_after(session_id, cursor, limit), cursor)
+                # El hub solo avisa: puede publicar desordenado (el id 6 antes que el 5), así que lo nuevo se lee
+                # de la BD en orden de id. SQLite asigna los ids con el bloqueo de escritura: cuando se publica
+                # un id, todos los menores ya están confirmados
+                if any(message.id is not None and message.id > cursor for message in batch):
+                    messages = await self.load_messages_after(session_id, cursor, limit)
+                    if messages:
+                        return self._result(messages, cursor)
+        finally:
+            subscription.close()
+
+    async def _current_position(self, session_id: str) -> int:
+        last_id = self.hub.last_known_id(session_id, self.max_staleness_seconds)
+        if last_id is None:
+            last_id = await self.load_last_message_id(session_id)
+            self.hub.remember_last_id(session_id, last_id)
+        return last_id
+
+    @staticmethod
+    def _result(messages: List[MessageEntity], cursor: int) -> MessagesSinceDTO:
+        return MessagesSinceDTO(
+            items=[
+                MessageDTO(
+                    message_id=message.message_id,
+                    session_id=message.session_id,
+                    content=message.content,
+                    timestamp=message.timestamp,
+                    sender=message.sender.value,
+                    metadata=message.metadata.to_dict() if message.metadata else None,
+                )
+                for message in messages
+            ],
+            next_cursor=messages[-1].id if messages else cursor,
+        )
@@ -1,24 +1,73 @@
 #Importante: Este archivo implementa el caso de uso para obtener mensajes con paginación y filtrado.
+from datetime import datetime
+from typing import Optional
+
+from src.Domain.entities.message_entity import MessageEntity
 from src.Application.interfaces.message_repository_interface import MessageRepositoryInterface
+from src.Application.interfaces.message_page_cache_interface import MessagePageCacheInterface
 from src.Application.dtos.message_dto import MessageDTO
-from src.Application.dtos.pagination_dto import GetMessagesFilterDTO, PaginationDTO
+from src.Application.dtos.pagination_dto import GetMessagesFilterDTO, MessageCursor, MessagePageKey, PaginationDTO
 
 #Caso de uso para obtener mensajes de una sesión con paginación y filtrado
 class GetMessagesUseCase:
 
-    def __init__(self, repository: MessageRepositoryInterface):
+    def __init__(
+        self,
+        repository: MessageRepositoryInterface,
+        page_cache: Optional[MessagePageCacheInterface] = None,
+    ):
         self.repository = repository
+        self.page_cache = page_cache
 
-    async def execute(self, filters: GetMessagesFilterDTO) -> PaginationDTO[MessageDTO]:
+    async def execute(self, filters: GetMessagesFilterDTO, version: Optional[str] = None) -> PaginationDTO[MessageDTO]:
         """
         Ejecuta el caso de uso de obtención de mensajes.
 
         Args:
             filters: DTO con los parámetros de búsqueda y paginación
+            version: versión de la sesión (get_session_version) ya leída por el llamador; con caché,
+                si falta se lee aquí
 
         Returns:
             DTO de paginación con los mensajes encontrados
         """
+        after, before, start, end, limit, offset = self._parse_filters(filters)
+
+        if self.page_cache is None:
+            return await self._load_page(filters, limit, offset, after, before, start, end)
+
+        # Caché de lectura: el token se toma antes de consultar, así una escritura concurrente
+        # en la sesión impide guardar una página que pudo leerse antes de ella.
+        # La versión de session_stats detecta además las escrituras de otros procesos.
+        if version is None:
+            version = await self.repository.get_session_version(filters.session_id)
+        key = MessagePageKey(
+            session_id=filters.session_id,
+            sender=filters.sender,
+            limit=limit,
+            offset=offset,
+            after=filters.after,
+            before=filters.before,
+            include_total=filters.include_total,
+            start=start,
+            end=end,
+        )
+        page = self.page_cache.get(key, version)
+        if page is None:
+            token = self.page_cache.token(filters.session_id)
+            page = await self._load_page(filters, limit, offset, after, before, start, end)
+            self.page_cache.put(key, page, token, version)
+        return page
+
+    def validate(self, filters: GetMessagesFilterDTO) -> None:
+        """
+        Valida los filtros (incluidos los cursores y el rango) sin consultar el repositorio.
+        Lanza ValueError si no son válidos; execute() aplica la misma validación.
+        """
+        self._parse_filters(filters)
+
+    @staticmethod
+    def _parse_filters(filters: GetMessagesFilterDTO):
         if not filters.session_id or not filters.session_id.strip():
             raise ValueError("session_id no puede estar vacío")
         
@@ -27,6 +76,20 @@ class GetMessagesUseCase:
         
         if filters.offset is not None and filters.offset < 0:
             raise ValueError("offset debe ser no negativo")
+
+        # Paginación por cursor: cada página cuesta O(limit) sin importar cuán profunda sea
+        after = MessageCursor.decode(filters.after) if filters.after else None
+        before = MessageCursor.decode(filters.before) if filters.before else None
+        if after is not None and before is not None:
+            raise ValueError("after y before no pueden usarse a la vez")
+        if (after is not None or before is not None) and filters.offset:
+            raise ValueError("offset no puede combinarse con after o before")
+
+        # Rango [start, end): las fechas se guardan sin zona horaria, igual que los timestamps
+        start = filters.start.replace(tzinfo=None) if filters.start else None
+        end = filters.end.replace(tzinfo=None) if filters.end else None
+        if start is not None and end is not None and start >= end:
+            raise ValueError("from debe ser anterior a to")
         
         # Aplicar valor por defecto de límite si es 0
         limit = filters.limit if filters.limit and filters.limit > 0 else 10
@@ -34,33 +97,63 @@ class GetMessagesUseCase:
         # Asegurar que el límite no exceda 100
         limit = min(limit, 100)
 
-        # Si se pide filtrar por `sender` y la sesión ya existe pero el sender
-        # no tiene mensajes en esa sesión, consideramos esto una validación
-        # y devolvemos un error claro en lugar de una lista vacía.
-        if filters.sender:
-            session_total = await self.repository.count_by_session(session_id=filters.session_id)
-            if session_total > 0:
-                sender_total = await self.repository.count_by_session(
-                    session_id=filters.session_id, sender=filters.sender
-                )
-                if sender_total == 0:
-                    raise ValueError(
-                        f"sender '{filters.sender}' no pertenece a la sesión '{filters.session_id}'"
-                    )
+        offset = filters.offset or 0
 
-        messages = await self.repository.get_by_session(
-            session_id=filters.session_id,
-            limit=limit,
-            offset=filters.offset or 0,
-            sender=filters.sender,
-        )
+        return after, before, start, end, limit, offset
 
-        # Obtener el total de mensajes (con los mismos filtros)
-        total = await self.repository.count_by_session(
+    async def _load_page(
+        self,
+        filters: GetMessagesFilterDTO,
+        limit: int,
+        offset: int,
+        after: Optional[MessageCursor],
+        before: Optional[MessageCursor],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> PaginationDTO[MessageDTO]:
+        keyset = after is not None or before is not None
+        # Sin total (o con cursor) se pide un mensaje extra para saber si hay más allá de esta página
+        probe_extra = keyset or not filters.include_total
+
+        # Página y total en una sola consulta
+        messages, total = await self.repository.get_page_by_session(
             session_id=filters.session_id,
+            limit=limit + 1 if probe_extra else limit,
+            offset=offset,
             sender=filters.sender,
+            after=after,
+            before=before,
+            include_total=filters.include_total,
+            start=start,
+            end=end,
         )
 
+        # Si se pide filtrar por `sender` y la sesión ya existe pero el sender
+        # no tiene mensajes en esa sesión, consideramos esto una validación
+        # y devolvemos un error claro en lugar de una lista vacía.
+        # Solo hace falta comprobarlo cuando la página viene vacía. Con rango, el total es solo el del rango.
+        if filters.sender and not messages:
+            ranged = start is not None or end is not None
+            sender_total = total if total is not None and not ranged else await self.repository.count_by_session(
+                session_id=filters.session_id, sender=filters.sender
+            )
+            if sender_total == 0 and await self.repository.count_by_session(session_id=filters.session_id) > 0:
+                raise ValueError(
+                    f"sender '{filters.sender}' no pertenece a la sesión '{filters.session_id}'"
+                )
+
+        if before is not None:
+            has_prev = len(messages) > limit
+            messages = messages[-limit:] if has_prev else messages
+            has_next = True
+        else:
+            if probe_extra:
+                has_next = len(messages) > limit
+                messages = messages[:limit]
+            else:
+                has_next = offset + len(messages) < total
+            has_prev = after is not None or offset > 0
+
         # Convertir entidades a DTOs
         message_dtos = [
             MessageDTO(
@@ -76,6 +169,28 @@ class GetMessagesUseCase:
         return PaginationDTO(
             items=message_dtos,
             limit=limit,
-            offset=filters.offset or 0,
+            offset=offset,
             total=total,
+            next_cursor=self._cursor(messages[-1]) if has_next and messages else None,
+            prev_cursor=self._cursor(messages[0]) if has_prev and messages else None,
         )
+
+    async def session_version(self, session_id: str) -> str:
+        """
+        Versión actual de la sesión en session_stats. Debe leerse antes de execute() y entregársele,
+        así una escritura intermedia solo puede dejar una versión más vieja que los datos servidos.
+        """
+        return await self.repository.get_session_version(session_id)
+
+    @staticmethod
+    def etag(version: str) -> str:
+        """
+        ETag fuerte de las páginas de la sesión: la misma URL y la misma versión producen la misma respuesta.
+        """
+        return f'"{version}"'
+
+    @staticmethod
+    def _cursor(message: MessageEntity) -> Optional[str]:
+        if message.id is None:
+            return None
+        return MessageCursor(timestamp=message.timestamp, id=message.id).encode()
@@ -0,0 +1,53 @@
+#Importante: Este archivo implementa el caso de uso para obtener los últimos mensajes de varias sesiones a la vez.
+from src.Application.dtos.message_dto import MessageDTO, SessionMessagesDTO, SessionsMessagesDTO
+from src.Application.dtos.pagination_dto import GetSessionsMessagesFilterDTO
+from src.Application.interfaces.message_repository_interface import MessageRepositoryInterface
+
+
+#Caso de uso para pantallas que muestran muchas conversaciones: en lugar de un GET (y sus conteos) por sesión,
+#los mensajes de todas salen de una consulta y los totales de otra, sin importar cuántas sesiones se pidan
+class GetSessionsMessagesUseCase:
+
+    def __init__(self, repository: MessageRepositoryInterface, max_sessions: int = 100):
+        if max_sessions < 1:
+            raise ValueError("max_sessions debe ser al menos 1")
+
+        self.repository = repository
+        self.max_sessions = max_sessions
+
+    async def execute(self, filters: GetSessionsMessagesFilterDTO) -> SessionsMessagesDTO:
+        """
+        Retorna los últimos `limit` mensajes y el total de cada sesión, en el orden en que se pidieron.
+        Lanza ValueError si alguna sesión está vacía o se piden demasiadas.
+        """
+        if any(not session_id or not session_id.strip() for session_id in filters.session_ids):
+            raise ValueError("session_id no puede estar vacío")
+
+        # Una sesión repetida se retorna una sola vez, en su primera posición
+        session_ids = list(dict.fromkeys(filters.session_ids))
+        if len(session_ids) > self.max_sessions:
+            raise ValueError(f"No se pueden consultar más de {self.max_sessions} sesiones a la vez")
+
+        messages = await self.repository.get_latest_by_sessions(session_ids, filters.limit)
+        totals = await self.repository.count_by_sessions(session_ids)
+
+        return SessionsMessagesDTO(
+            sessions=[
+                SessionMessagesDTO(
+                    session_id=session_id,
+                    items=[
+                        MessageDTO(
+                            message_id=msg.message_id,
+                            session_id=msg.session_id,
+                            content=msg.content,
+                            timestamp=msg.timestamp,
+                            sender=msg.sender.value,
+                            metadata=msg.metadata.__dict__ if msg.metadata else None,
+                        )
+                        for msg in messages.get(session_id, [])
+                    ],
+                    total=totals.get(session_id, 0),
+                )
+                for session_id in session_ids
+            ]
+        )
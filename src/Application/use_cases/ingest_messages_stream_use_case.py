@@ -0,0 +1,66 @@
+#Importante: Este archivo implementa el caso de uso para ingerir un flujo (potencialmente enorme) de mensajes.
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+from src.Application.dtos.message_dto import CreateMessageDTO, BatchItemResultDTO
+from src.Application.use_cases.create_messages_batch_use_case import CreateMessagesBatchUseCase
+
+
+# Entrada del flujo: (número de línea, DTO si se pudo interpretar, error de interpretación)
+StreamEntry = Tuple[int, Optional[CreateMessageDTO], Optional[str]]
+
+
+#Caso de uso que consume las entradas de forma incremental y las persiste en lotes acotados,
+#de modo que la memoria usada no depende del tamaño total del flujo.
+class IngestMessagesStreamUseCase:
+
+    def __init__(self, batch_use_case: CreateMessagesBatchUseCase, batch_size: int = 500):
+        if batch_size < 1:
+            raise ValueError("batch_size debe ser al menos 1")
+
+        self.batch_use_case = batch_use_case
+        self.batch_size = batch_size
+
+    async def execute(self, entries: AsyncIterable[StreamEntry]) -> AsyncIterator[BatchItemResultDTO]:
+        """
+        Retorna un resultado por entrada (index = número de línea), en el mismo orden de llegada.
+        """
+        pending: List[StreamEntry] = []
+        async for entry in entries:
+            pending.append(entry)
+            if len(pending) >= self.batch_size:
+                for result in await self.ingest_batch(pending):
+                    yield result
+                pending = []
+
+        if pending:
+            for result in await self.ingest_batch(pending):
+                yield result
+
+    async def ingest_batch(self, entries: List[StreamEntry]) -> List[BatchItemResultDTO]:
+        """
+        Persiste las entradas válidas en una sola escritura y retorna un resultado por entrada, en orden.
+        Sirve también para flujos que deciden ellos mismos cuándo cortar un lote (WebSocket).
+        """
+        valid = [(line, dto) for line, dto, _ in entries if dto is not None]
+
+        saved_by_line = {}
+        if valid:
+            batch_result = await self.batch_use_case.execute([dto for _, dto in valid])
+            for (line, _), item in zip(valid, batch_result.items):
+                saved_by_line[line] = item
+
+        results = []
+        for line, dto, error in entries:
+            if dto is None:
+                results.append(BatchItemResultDTO(index=line, message_id=None, status="error", error=error))
+                continue
+
+            item = saved_by_line[line]
+            # El flujo solo reporta el estado; no reenvía el mensaje completo
+            results.append(BatchItemResultDTO(
+                index=line,
+                message_id=item.message_id,
+                status=item.status,
+                error=item.error,
+            ))
+        return results
@@ -0,0 +1,41 @@
+#Importante: Este archivo implementa el caso de uso para listar las sesiones por última actividad.
+from src.Application.dtos.pagination_dto import ListSessionsFilterDTO, SessionCursor
+from src.Application.dtos.session_dto import SessionSummaryDTO, SessionsPageDTO
+from src.Application.interfaces.session_repository_interface import SessionRepositoryInterface
+
+#Caso de uso para la pantalla de conversaciones recientes: páginas del directorio de sesiones con paginación por cursor
+class ListSessionsUseCase:
+
+    def __init__(self, repository: SessionRepositoryInterface):
+        self.repository = repository
+
+    async def execute(self, filters: ListSessionsFilterDTO) -> SessionsPageDTO:
+        """
+        Retorna una página de sesiones, de la más a la menos reciente.
+        Lanza ValueError si el cursor no es válido.
+        """
+        after = SessionCursor.decode(filters.after) if filters.after else None
+
+        # Se pide una sesión extra para saber si hay página siguiente sin contar las sesiones
+        sessions = await self.repository.list_recent(limit=filters.limit + 1, after=after)
+        page = sessions[:filters.limit]
+        next_cursor = None
+        if len(sessions) > filters.limit:
+            last = page[-1]
+            next_cursor = SessionCursor(last_timestamp=last.last_timestamp, session_id=last.session_id).encode()
+
+        return SessionsPageDTO(
+            items=[
+                SessionSummaryDTO(
+                    session_id=session.session_id,
+                    message_count=session.message_count,
+                    first_message_at=session.first_timestamp,
+                    last_message_at=session.last_timestamp,
+                    last_sender=session.last_sender.value if session.last_sender else None,
+                    last_message_preview=session.last_message_preview,
+                )
+                for session in page
+            ],
+            limit=filters.limit,
+            next_cursor=next_cursor,
+        )
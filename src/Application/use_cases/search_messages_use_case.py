@@ -0,0 +1,79 @@
+#Importante: Este archivo implementa el caso de uso de búsqueda de texto completo en los mensajes.
+from src.Application.dtos.message_dto import MessageDTO, MessageSearchHitDTO, SearchResultsDTO
+from src.Application.dtos.pagination_dto import SearchCursor, SearchMessagesFilterDTO
+from src.Application.interfaces.message_repository_interface import MessageRepositoryInterface
+from src.Application.interfaces.message_search_ranker_interface import MessageSearchRankerInterface
+
+
+#Caso de uso que busca mensajes por contenido, ordenados por relevancia y con paginación por cursor.
+#Se puntúan las max_candidates coincidencias más recientes: el costo queda acotado aunque un término
+#aparezca en millones de mensajes (dentro de una sesión normalmente son todas las coincidencias).
+#Si hay más, la respuesta lo indica con truncated en lugar de omitirlas sin avisar.
+class SearchMessagesUseCase:
+
+    def __init__(
+        self,
+        repository: MessageRepositoryInterface,
+        ranker: MessageSearchRankerInterface,
+        max_candidates: int = 1000,
+    ):
+        if max_candidates < 1:
+            raise ValueError("max_candidates debe ser al menos 1")
+
+        self.repository = repository
+        self.ranker = ranker
+        self.max_candidates = max_candidates
+
+    async def execute(self, filters: SearchMessagesFilterDTO) -> SearchResultsDTO:
+        """
+        Retorna una página de resultados con su puntuación y un fragmento del contenido.
+        Lanza ValueError si la consulta, la sesión o el cursor no son válidos.
+        """
+        if filters.session_id is not None and not filters.session_id.strip():
+            raise ValueError("session_id no puede estar vacío")
+        terms = self.ranker.parse_query(filters.query)
+        after = SearchCursor.decode(filters.after) if filters.after else None
+
+        # Las páginas siguientes puntúan las mismas coincidencias que la primera (id <= max_id del cursor):
+        # un mensaje nuevo no mueve la ventana ni el largo promedio, así que el cursor no salta ni repite
+        max_id = after.max_id if after is not None else None
+        candidates = await self.repository.search_recent_matches(
+            terms, filters.session_id, self.max_candidates + 1, max_id=max_id
+        )
+        truncated = len(candidates) > self.max_candidates
+        candidates = candidates[:self.max_candidates]
+        if max_id is None and candidates:
+            max_id = candidates[0].id
+        scores = self.ranker.score(candidates, terms)
+
+        # Orden total: puntuación descendente y, a igual puntuación, el mensaje más reciente primero
+        ranked = sorted(zip(scores, candidates), key=lambda hit: (-hit[0], -hit[1].id))
+        if after is not None:
+            ranked = [hit for hit in ranked if (-hit[0], -hit[1].id) > (-after.score, -after.id)]
+
+        page = ranked[:filters.limit]
+        next_cursor = None
+        if len(ranked) > filters.limit:
+            last_score, last_message = page[-1]
+            next_cursor = SearchCursor(score=last_score, id=last_message.id, max_id=max_id).encode()
+
+        return SearchResultsDTO(
+            items=[
+                MessageSearchHitDTO(
+                    message=MessageDTO(
+                        message_id=message.message_id,
+                        session_id=message.session_id,
+                        content=message.content,
+                        timestamp=message.timestamp,
+                        sender=message.sender.value,
+                        metadata=message.metadata.__dict__ if message.metadata else None,
+                    ),
+                    score=round(score, 6),
+                    snippet=self.ranker.snippet(message.content, terms),
+                )
+                for score, message in page
+            ],
+            limit=filters.limit,
+            next_cursor=next_cursor,
+            truncated=truncated,
+        )
@@ -0,0 +1,127 @@
+#Importante: Este archivo implementa el caso de uso del flujo de eventos (mensajes nuevos) de una sesión.
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from src.Domain.entities.message_entity import MessageEntity
+from src.Application.dtos.message_dto import MessageDTO, MessageEventDTO
+from src.Application.interfaces.message_event_hub_interface import MessageEventHubInterface, MessageSubscriptionInterface
+
+# Carga hasta `limit` mensajes de la sesión posteriores a un id (en orden de id), con su propia sesión de BD
+LoadMessagesAfter = Callable[[str, int, int], Awaitable[List[MessageEntity]]]
+
+# Retorna el id del último mensaje de la sesión (0 si no tiene), con su propia sesión de BD
+LoadLastMessageId = Callable[[str], Awaitable[int]]
+
+
+#Caso de uso que entrega los mensajes nuevos de una sesión a medida que se guardan, siempre en orden de id.
+#El hub solo avisa que hay algo nuevo: los mensajes se leen de la BD desde el último id entregado.
+#El hub puede publicar desordenado (el 6 antes que el 5), pero SQLite asigna los ids con el bloqueo de escritura:
+#cuando se publica un id, todos los menores ya están confirmados. Así el id de cada evento sirve para reanudar.
+class StreamMessageEventsUseCase:
+
+    def __init__(
+        self,
+        hub: MessageEventHubInterface,
+        load_messages_after: LoadMessagesAfter,
+        load_last_message_id: LoadLastMessageId,
+        heartbeat_seconds: float = 15.0,
+        replay_batch_size: int = 100,
+    ):
+        if heartbeat_seconds <= 0:
+            raise ValueError("heartbeat_seconds debe ser positivo")
+        if replay_batch_size < 1:
+            raise ValueError("replay_batch_size debe ser al menos 1")
+
+        self.hub = hub
+        self.load_messages_after = load_messages_after
+        self.load_last_message_id = load_last_message_id
+        self.heartbeat_seconds = heartbeat_seconds
+        self.replay_batch_size = replay_batch_size
+
+    @staticmethod
+    def parse_last_event_id(last_event_id: Optional[str]) -> Optional[int]:
+        """
+        Valida el Last-Event-ID recibido: debe ser el id (entero no negativo) de un evento anterior.
+        """
+        if last_event_id is None or not last_event_id.strip():
+            return None
+        try:
+            event_id = int(last_event_id)
+        except ValueError:
+            raise ValueError("Last-Event-ID inválido")
+        if event_id < 0:
+            raise ValueError("Last-Event-ID inválido")
+        return event_id
+
+    def subscribe(self, session_id: str) -> MessageSubscriptionInterface:
+        """
+        Se suscribe a la sesión antes de leer la BD: lo que se guarde durante la reanudación llega por el hub.
+        Lanza SubscriberLimitError si el hub no admite más suscriptores.
+        """
+        if not session_id or not session_id.strip():
+            raise ValueError("session_id no puede estar vacío")
+        return self.hub.subscribe(session_id)
+
+    async def start_position(self, session_id: str, last_event_id: Optional[int]) -> int:
+        """
+        Id desde el que empieza el flujo: el Last-Event-ID recibido o, sin él, el último mensaje guardado.
+        Debe obtenerse después de subscribe(): lo que se guarde desde entonces llega por el hub.
+        """
+        if last_event_id is not None:
+            return last_event_id
+        return await self.load_last_message_id(session_id)
+
+    async def events(
+        self,
+        subscription: MessageSubscriptionInterface,
+        after_id: Optional[int] = None,
+    ) -> AsyncIterator[List[MessageEventDTO]]:
+        """
+        Genera lotes de eventos con los mensajes posteriores a `after_id` (ver start_position; sin él se lee ahora),
+        en orden de id: primero los que ya están en la BD y luego los nuevos, leídos de la BD cada vez que avisa el hub.
+        Un lote vacío indica que no hubo mensajes durante heartbeat_seconds (sirve para mantener viva la conexión). Propaga SubscriberEvictedError.
+        """
+        try:
+            session_id = subscription.session_id
+            last_id = after_id if after_id is not None else await self.start_position(session_id, None)
+            async for messages in self._load_after(session_id, last_id):
+                last_id = messages[-1].id
+                yield [self._to_event(message) for message in messages]
+
+            while True:
+                batch = await subscription.next_batch(self.heartbeat_seconds)
+                if not batch:
+                    yield []
+                    continue
+                if not any(message.id is not None and message.id > last_id for message in batch):
+                    # Ya se entregaron al leer la BD
+                    continue
+                async for messages in self._load_after(session_id, last_id):
+                    last_id = messages[-1].id
+                    yield [self._to_event(message) for message in messages]
+        finally:
+            subscription.close()
+
+    async def _load_after(self, session_id: str, after_id: int) -> AsyncIterator[List[MessageEntity]]:
+        # Por bloques de replay_batch_size, para no cargar en memoria todo lo pendiente
+        while True:
+            messages = await self.load_messages_after(session_id, after_id, self.replay_batch_size)
+            if not messages:
+                return
+            after_id = messages[-1].id
+            yield messages
+            if len(messages) < self.replay_batch_size:
+                return
+
+    @staticmethod
+    def _to_event(message: MessageEntity) -> MessageEventDTO:
+        return MessageEventDTO(
+            event_id=message.id,
+            message=MessageDTO(
+                message_id=message.message_id,
+                session_id=message.session_id,
+                content=message.content,
+                timestamp=message.timestamp,
+                sender=message.sender.value,
+                metadata=message.metadata.to_dict() if message.metadata else None,
+            ),
+        )
@@ -1,5 +1,5 @@
 #Definición de la entidad de dominio para mensajes, es decir, la representación central del mensaje en el sistema.
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 from ..value_objects.sender_type import SenderType
@@ -14,6 +14,8 @@ class MessageEntity:
     timestamp: datetime
     sender: SenderType
     metadata: Optional[MessageMetadata] = None
+    # Identificador asignado por la persistencia (None hasta que se lee de la BD); no participa en la igualdad
+    id: Optional[int] = field(default=None, compare=False)
     
     def __post_init__(self):
         #validaciones básicas del mensaje
@@ -37,7 +39,8 @@ class MessageEntity:
             content=self.content,
             timestamp=self.timestamp,
             sender=self.sender,
-            metadata=metadata
+            metadata=metadata,
+            id=self.id,
         )
     
     @property
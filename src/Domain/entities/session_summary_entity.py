@@ -0,0 +1,19 @@
+#Definición de la entidad de dominio para el resumen de una sesión: sus contadores y su último mensaje.
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from ..value_objects.sender_type import SenderType
+
+#Dataclass que representa una sesión en el directorio de sesiones (se mantiene al guardar cada mensaje)
+@dataclass(frozen=True)
+class SessionSummaryEntity:
+    session_id: str
+    message_count: int
+    first_timestamp: datetime
+    last_timestamp: datetime
+    last_sender: Optional[SenderType] = None
+    last_message_preview: Optional[str] = None
+
+    def __post_init__(self):
+        if not self.session_id:
+            raise ValueError("session_id no puede estar vacío")
@@ -0,0 +1,87 @@
+#Importante: Este archivo define el servicio de dominio que puntúa y resume los resultados de búsqueda.
+import html
+import re
+import unicodedata
+from collections import Counter
+from typing import List
+
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.search_term import SearchTerm
+from src.Application.interfaces.message_search_ranker_interface import MessageSearchRankerInterface
+
+# Palabras como las separa el tokenizador unicode61 de SQLite: letras y dígitos
+_TOKEN = re.compile(r"[^\W_]+")
+_QUERY_TERM = re.compile(r"([^\W_]+)(\*?)")
+_COMBINING_MARKS = re.compile("[\u0300-\u036f]")
+
+
+def normalize(text: str) -> str:
+    # Igual que remove_diacritics del tokenizador: sin tildes y sin distinguir mayúsculas
+    if text.isascii():
+        return text.lower()
+    return _COMBINING_MARKS.sub("", unicodedata.normalize("NFKD", text)).casefold()
+
+
+#Servicio de dominio que puntúa con BM25 (frecuencia del término normalizada por el largo del mensaje).
+#Se omite el IDF: todos los candidatos contienen todos los términos, y calcularlo en SQLite obliga
+#a recorrer la lista completa de cada término en el índice, lo que crece con el tamaño de la tabla.
+class MessageSearchRanker(MessageSearchRankerInterface):
+    K1 = 1.2
+    B = 0.75
+    MAX_TERMS = 16
+    MIN_PREFIX_LENGTH = 2
+    SNIPPET_TOKENS = 16
+    SNIPPET_TOKENS_BEFORE = 4
+
+    def parse_query(self, query: str) -> List[SearchTerm]:
+        terms = list(dict.fromkeys(
+            SearchTerm(text=text, prefix=bool(star)) for text, star in _QUERY_TERM.findall(normalize(query))
+        ))
+        if not terms:
+            raise ValueError("q debe contener al menos una palabra")
+        if len(terms) > self.MAX_TERMS:
+            raise ValueError(f"q admite como máximo {self.MAX_TERMS} palabras")
+        if any(term.prefix and len(term.text) < self.MIN_PREFIX_LENGTH for term in terms):
+            raise ValueError(f"los prefijos (*) deben tener al menos {self.MIN_PREFIX_LENGTH} caracteres")
+        return terms
+
+    def score(self, messages: List[MessageEntity], terms: List[SearchTerm]) -> List[float]:
+        documents = [Counter(_TOKEN.findall(normalize(message.content))) for message in messages]
+        lengths = [sum(document.values()) for document in documents]
+        average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        if not average_length:
+            return [0.0] * len(messages)
+
+        scores = []
+        for document, length in zip(documents, lengths):
+            norm = self.K1 * (1 - self.B + self.B * length / average_length)
+            score = 0.0
+            for term in terms:
+                if term.prefix:
+                    frequency = sum(count for token, count in document.items() if term.matches(token))
+                else:
+                    frequency = document.get(term.text, 0)
+                score += frequency * (self.K1 + 1) / (frequency + norm)
+            scores.append(score)
+        return scores
+
+    def snippet(self, content: str, terms: List[SearchTerm]) -> str:
+        tokens = list(_TOKEN.finditer(content))
+        if not tokens:
+            return html.escape(content)
+
+        matched = [any(term.matches(normalize(token.group())) for term in terms) for token in tokens]
+        first = matched.index(True) if True in matched else 0
+        start = max(0, first - self.SNIPPET_TOKENS_BEFORE)
+        end = min(len(tokens), start + self.SNIPPET_TOKENS)
+
+        parts = ["…"] if start > 0 else [html.escape(content[:tokens[0].start()])]
+        position = tokens[start].start()
+        for index in range(start, end):
+            token = tokens[index]
+            parts.append(html.escape(content[position:token.start()]))
+            text = html.escape(token.group())
+            parts.append(f"<mark>{text}</mark>" if matched[index] else text)
+            position = token.end()
+        parts.append("…" if end < len(tokens) else html.escape(content[position:]))
+        return "".join(parts)
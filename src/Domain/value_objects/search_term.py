@@ -0,0 +1,13 @@
+#Contiene la definición de un objeto de valor para un término de búsqueda de texto completo
+from dataclasses import dataclass
+
+#Término normalizado (minúsculas, sin tildes); con prefix=True coincide con las palabras que empiezan por él
+@dataclass(frozen=True)
+class SearchTerm:
+
+    text: str
+    prefix: bool = False
+
+    #indica si una palabra (ya normalizada) coincide con el término
+    def matches(self, token: str) -> bool:
+        return token.startswith(self.text) if self.prefix else token == self.text
@@ -0,0 +1,81 @@
+#Importante: Este archivo implementa un filtro de Bloom en memoria para los message_id guardados.
+#Permite descartar sin ir a la BD los message_id que con seguridad son nuevos (la gran mayoría).
+import hashlib
+import math
+from typing import Iterable
+
+from src.Application.interfaces.message_id_filter_interface import MessageIdFilterInterface
+
+
+#Filtro de Bloom dimensionado a partir de un presupuesto de memoria y una tasa de falsos positivos objetivo.
+#Mientras no se haya cargado desde la BD (ready=False) responde siempre "quizá", para no dar falsos negativos.
+class MessageIdBloomFilter(MessageIdFilterInterface):
+
+    def __init__(self, false_positive_rate: float = 0.01, max_memory_bytes: int = 16 * 1024 * 1024):
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate debe estar entre 0 y 1")
+        if max_memory_bytes < 1:
+            raise ValueError("max_memory_bytes debe ser positivo")
+
+        self.false_positive_rate = false_positive_rate
+        self.bit_count = max_memory_bytes * 8
+        self.hash_count = max(1, round(-math.log2(false_positive_rate)))
+        # Número de elementos que caben manteniendo la tasa objetivo
+        self.capacity = int(self.bit_count * math.log(2) ** 2 / -math.log(false_positive_rate))
+
+        self._bits = bytearray(max_memory_bytes)
+        self.set_bits = 0
+        self.items = 0
+        self.ready = False
+
+        self.checks = 0
+        self.definite_misses = 0
+
+    def might_contain(self, message_id: str) -> bool:
+        self.checks += 1
+        if not self.ready:
+            return True
+
+        for position in self._positions(message_id):
+            if not self._bits[position >> 3] & (1 << (position & 7)):
+                self.definite_misses += 1
+                return False
+        return True
+
+    def add(self, message_id: str) -> None:
+        self.items += 1
+        for position in self._positions(message_id):
+            index, mask = position >> 3, 1 << (position & 7)
+            if not self._bits[index] & mask:
+                self._bits[index] |= mask
+                self.set_bits += 1
+
+    def load(self, message_ids: Iterable[str]) -> None:
+        for message_id in message_ids:
+            self.add(message_id)
+
+    def mark_ready(self) -> None:
+        self.ready = True
+
+    def stats(self) -> dict:
+        fill_ratio = self.set_bits / self.bit_count
+        return {
+            "ready": self.ready,
+            "memory_bytes": len(self._bits),
+            "bits": self.bit_count,
+            "hash_functions": self.hash_count,
+            "capacity": self.capacity,
+            "items": self.items,
+            "fill_ratio": round(fill_ratio, 6),
+            "target_false_positive_rate": self.false_positive_rate,
+            "estimated_false_positive_rate": round(fill_ratio ** self.hash_count, 6),
+            "checks": self.checks,
+            "definite_misses": self.definite_misses,
+        }
+
+    def _positions(self, message_id: str):
+        # Doble hashing (Kirsch-Mitzenmacher): k posiciones a partir de un solo digest
+        digest = hashlib.blake2b(message_id.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bit_count for i in range(self.hash_count)]
@@ -0,0 +1,158 @@
+#Importante: Este archivo implementa una caché LRU en memoria de páginas de mensajes por sesión.
+#Evita repetir las consultas de GET /messages/{session_id} cuando los clientes sondean las mismas páginas.
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+from src.Application.dtos.message_dto import MessageDTO
+from src.Application.dtos.pagination_dto import MessagePageKey, PaginationDTO
+from src.Application.interfaces.message_page_cache_interface import MessagePageCacheInterface
+
+# Costo fijo aproximado de un MessageDTO (objeto, campos, fecha y metadatos) sin contar el texto
+_MESSAGE_OVERHEAD_BYTES = 600
+_PAGE_OVERHEAD_BYTES = 400
+
+
+@dataclass
+class _Entry:
+    page: PaginationDTO[MessageDTO]
+    size: int
+    expires_at: float
+    version: Hashable
+
+
+def _estimate_page_size(page: PaginationDTO[MessageDTO]) -> int:
+    return _PAGE_OVERHEAD_BYTES + sum(
+        _MESSAGE_OVERHEAD_BYTES + sys.getsizeof(item.content) + sys.getsizeof(item.message_id)
+        for item in page.items
+    )
+
+
+#Caché LRU acotada por número de entradas y por memoria estimada, con TTL por entrada.
+#Las escrituras de este proceso invalidan la sesión al instante. Cada entrada guarda además la versión
+#de la sesión (session_stats) con la que se leyó, así una escritura de otro proceso (otra réplica,
+#el importador) deja de servirse en cuanto cambia la versión, sin esperar al TTL.
+class MessagePageCache(MessagePageCacheInterface):
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries debe ser al menos 1")
+        if max_memory_bytes < 1:
+            raise ValueError("max_memory_bytes debe ser positivo")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds debe ser positivo")
+
+        self.max_entries = max_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+
+        self._entries: "OrderedDict[MessagePageKey, _Entry]" = OrderedDict()
+        self._keys_by_session: Dict[str, Set[MessagePageKey]] = {}
+        self.memory_bytes = 0
+
+        # Generación por sesión: cada invalidación la incrementa y descarta las lecturas en curso.
+        # Para acotar el diccionario se vacía al crecer demasiado, cambiando de época.
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale = 0
+        self.invalidations = 0
+        self.rejected_puts = 0
+
+    def get(self, key: MessagePageKey, version: Hashable) -> Optional[PaginationDTO[MessageDTO]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.version != version:
+            self._remove(key)
+            self.stale += 1
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.page
+
+    def token(self, session_id: str) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(session_id, 0)
+
+    def put(self, key: MessagePageKey, page: PaginationDTO[MessageDTO], token: Hashable, version: Hashable) -> None:
+        if token != self.token(key.session_id):
+            self.rejected_puts += 1
+            return
+
+        size = _estimate_page_size(page)
+        if size > self.max_memory_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(
+            page=page, size=size, expires_at=self._clock() + self.ttl_seconds, version=version
+        )
+        self._keys_by_session.setdefault(key.session_id, set()).add(key)
+        self.memory_bytes += size
+
+        while len(self._entries) > self.max_entries or self.memory_bytes > self.max_memory_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate_session(self, session_id: str) -> None:
+        for key in self._keys_by_session.pop(session_id, ()):
+            entry = self._entries.pop(key)
+            self.memory_bytes -= entry.size
+        self.invalidations += 1
+
+        if session_id not in self._generations and len(self._generations) >= self.max_entries:
+            self._generations.clear()
+            self._epoch += 1
+        self._generations[session_id] = self._generations.get(session_id, 0) + 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "memory_bytes": self.memory_bytes,
+            "max_memory_bytes": self.max_memory_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 6) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "stale": self.stale,
+            "invalidations": self.invalidations,
+            "rejected_puts": self.rejected_puts,
+        }
+
+    def _remove(self, key: MessagePageKey) -> None:
+        entry = self._entries.pop(key)
+        self.memory_bytes -= entry.size
+        keys = self._keys_by_session.get(key.session_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_session[key.session_id]
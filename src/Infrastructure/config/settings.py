@@ -15,10 +15,69 @@ class Settings:
     # Database
     DATABASE_URL: str | None = None
 
+    # Perfil de ajuste de SQLite (durable / balanced / throughput) y sobrescrituras opcionales por PRAGMA
+    SQLITE_PROFILE: str = "balanced"
+    SQLITE_JOURNAL_MODE: str | None = None
+    SQLITE_SYNCHRONOUS: str | None = None
+    SQLITE_MMAP_SIZE: int | None = None
+    SQLITE_CACHE_SIZE: int | None = None
+    SQLITE_TEMP_STORE: str | None = None
+    SQLITE_BUSY_TIMEOUT_MS: int | None = None
+    SQLITE_FOREIGN_KEYS: str | None = None
+
+    # Escritor único de SQLite: una conexión para escrituras y un pool de conexiones de solo lectura
+    SQLITE_SINGLE_WRITER: bool = False
+    SQLITE_READ_POOL_SIZE: int = 4
+    SQLITE_WRITER_QUEUE_SIZE: int = 10000
+
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
 
+    # Ingesta por lotes
+    BATCH_MAX_MESSAGES: int = 10000
+
+    # Ingesta NDJSON en streaming
+    STREAM_INGEST_BATCH_SIZE: int = 500
+    STREAM_INGEST_MAX_LINE_BYTES: int = 1048576
+
+    # Filtro de Bloom de message_id (pre-chequeo de duplicados)
+    MESSAGE_ID_FILTER_ENABLED: bool = False
+    MESSAGE_ID_FILTER_FALSE_POSITIVE_RATE: float = 0.01
+    MESSAGE_ID_FILTER_MAX_MEMORY_BYTES: int = 16777216
+
+    # Caché de páginas de GET /messages/{session_id} (LRU en memoria, invalidada al escribir)
+    MESSAGE_PAGE_CACHE_ENABLED: bool = False
+    MESSAGE_PAGE_CACHE_MAX_ENTRIES: int = 10000
+    MESSAGE_PAGE_CACHE_MAX_MEMORY_BYTES: int = 67108864
+    MESSAGE_PAGE_CACHE_TTL_SECONDS: float = 5.0
+
+    # Eventos SSE de mensajes nuevos (hub pub/sub en memoria)
+    MESSAGE_EVENTS_MAX_SUBSCRIBERS: int = 10000
+    MESSAGE_EVENTS_QUEUE_SIZE: int = 256
+    MESSAGE_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # WebSocket de chat: tramas por escritura, tramas en cola antes de dejar de leer y tamaño máximo
+    WEBSOCKET_BATCH_SIZE: int = 200
+    WEBSOCKET_MAX_PENDING_FRAMES: int = 1000
+    WEBSOCKET_MAX_FRAME_BYTES: int = 1048576
+
+    # Búsqueda de texto completo: coincidencias más recientes que se puntúan por consulta
+    SEARCH_MAX_CANDIDATES: int = 1000
+
+    # Consulta de varias sesiones a la vez (POST /messages/sessions/query): sesiones por petición
+    SESSIONS_QUERY_MAX_SESSIONS: int = 100
+
+    # Long-poll de mensajes nuevos: espera máxima por petición y antigüedad máxima del último id
+    # recordado por el hub antes de volver a comprobarlo en la BD (escrituras de otros procesos)
+    LONG_POLL_MAX_WAIT_SECONDS: float = 60.0
+    LONG_POLL_MAX_STALENESS_SECONDS: float = 60.0
+
+    # Coalescedor de escrituras (group commit)
+    WRITE_COALESCER_ENABLED: bool = False
+    WRITE_COALESCER_MAX_LATENCY_MS: float = 2.0
+    WRITE_COALESCER_MAX_BATCH_SIZE: int = 256
+
     def __post_init__(self):
         self.APP_NAME = os.getenv("APP_NAME", self.APP_NAME)
         self.APP_VERSION = os.getenv("APP_VERSION", self.APP_VERSION)
@@ -26,6 +85,40 @@ class Settings:
         self.ENVIRONMENT = os.getenv("ENVIRONMENT", self.ENVIRONMENT)
         self.HOST = os.getenv("HOST", self.HOST)
         self.PORT = int(os.getenv("PORT", str(self.PORT)))
+        self.SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", self.SQLITE_PROFILE).lower()
+        self.SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", self.SQLITE_JOURNAL_MODE)
+        self.SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", self.SQLITE_SYNCHRONOUS)
+        self.SQLITE_MMAP_SIZE = _optional_int(os.getenv("SQLITE_MMAP_SIZE"), self.SQLITE_MMAP_SIZE)
+        self.SQLITE_CACHE_SIZE = _optional_int(os.getenv("SQLITE_CACHE_SIZE"), self.SQLITE_CACHE_SIZE)
+        self.SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", self.SQLITE_TEMP_STORE)
+        self.SQLITE_BUSY_TIMEOUT_MS = _optional_int(os.getenv("SQLITE_BUSY_TIMEOUT_MS"), self.SQLITE_BUSY_TIMEOUT_MS)
+        self.SQLITE_FOREIGN_KEYS = os.getenv("SQLITE_FOREIGN_KEYS", self.SQLITE_FOREIGN_KEYS)
+        self.SQLITE_SINGLE_WRITER = os.getenv("SQLITE_SINGLE_WRITER", str(self.SQLITE_SINGLE_WRITER)).lower() == "true"
+        self.SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", str(self.SQLITE_READ_POOL_SIZE)))
+        self.SQLITE_WRITER_QUEUE_SIZE = int(os.getenv("SQLITE_WRITER_QUEUE_SIZE", str(self.SQLITE_WRITER_QUEUE_SIZE)))
+        self.BATCH_MAX_MESSAGES = int(os.getenv("BATCH_MAX_MESSAGES", str(self.BATCH_MAX_MESSAGES)))
+        self.STREAM_INGEST_BATCH_SIZE = int(os.getenv("STREAM_INGEST_BATCH_SIZE", str(self.STREAM_INGEST_BATCH_SIZE)))
+        self.STREAM_INGEST_MAX_LINE_BYTES = int(os.getenv("STREAM_INGEST_MAX_LINE_BYTES", str(self.STREAM_INGEST_MAX_LINE_BYTES)))
+        self.MESSAGE_ID_FILTER_ENABLED = os.getenv("MESSAGE_ID_FILTER_ENABLED", str(self.MESSAGE_ID_FILTER_ENABLED)).lower() == "true"
+        self.MESSAGE_ID_FILTER_FALSE_POSITIVE_RATE = float(os.getenv("MESSAGE_ID_FILTER_FALSE_POSITIVE_RATE", str(self.MESSAGE_ID_FILTER_FALSE_POSITIVE_RATE)))
+        self.MESSAGE_ID_FILTER_MAX_MEMORY_BYTES = int(os.getenv("MESSAGE_ID_FILTER_MAX_MEMORY_BYTES", str(self.MESSAGE_ID_FILTER_MAX_MEMORY_BYTES)))
+        self.MESSAGE_PAGE_CACHE_ENABLED = os.getenv("MESSAGE_PAGE_CACHE_ENABLED", str(self.MESSAGE_PAGE_CACHE_ENABLED)).lower() == "true"
+        self.MESSAGE_PAGE_CACHE_MAX_ENTRIES = int(os.getenv("MESSAGE_PAGE_CACHE_MAX_ENTRIES", str(self.MESSAGE_PAGE_CACHE_MAX_ENTRIES)))
+        self.MESSAGE_PAGE_CACHE_MAX_MEMORY_BYTES = int(os.getenv("MESSAGE_PAGE_CACHE_MAX_MEMORY_BYTES", str(self.MESSAGE_PAGE_CACHE_MAX_MEMORY_BYTES)))
+        self.MESSAGE_PAGE_CACHE_TTL_SECONDS = float(os.getenv("MESSAGE_PAGE_CACHE_TTL_SECONDS", str(self.MESSAGE_PAGE_CACHE_TTL_SECONDS)))
+        self.MESSAGE_EVENTS_MAX_SUBSCRIBERS = int(os.getenv("MESSAGE_EVENTS_MAX_SUBSCRIBERS", str(self.MESSAGE_EVENTS_MAX_SUBSCRIBERS)))
+        self.MESSAGE_EVENTS_QUEUE_SIZE = int(os.getenv("MESSAGE_EVENTS_QUEUE_SIZE", str(self.MESSAGE_EVENTS_QUEUE_SIZE)))
+        self.MESSAGE_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("MESSAGE_EVENTS_HEARTBEAT_SECONDS", str(self.MESSAGE_EVENTS_HEARTBEAT_SECONDS)))
+        self.WEBSOCKET_BATCH_SIZE = int(os.getenv("WEBSOCKET_BATCH_SIZE", str(self.WEBSOCKET_BATCH_SIZE)))
+        self.WEBSOCKET_MAX_PENDING_FRAMES = int(os.getenv("WEBSOCKET_MAX_PENDING_FRAMES", str(self.WEBSOCKET_MAX_PENDING_FRAMES)))
+        self.WEBSOCKET_MAX_FRAME_BYTES = int(os.getenv("WEBSOCKET_MAX_FRAME_BYTES", str(self.WEBSOCKET_MAX_FRAME_BYTES)))
+        self.SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", str(self.SEARCH_MAX_CANDIDATES)))
+        self.SESSIONS_QUERY_MAX_SESSIONS = int(os.getenv("SESSIONS_QUERY_MAX_SESSIONS", str(self.SESSIONS_QUERY_MAX_SESSIONS)))
+        self.LONG_POLL_MAX_WAIT_SECONDS = float(os.getenv("LONG_POLL_MAX_WAIT_SECONDS", str(self.LONG_POLL_MAX_WAIT_SECONDS)))
+        self.LONG_POLL_MAX_STALENESS_SECONDS = float(os.getenv("LONG_POLL_MAX_STALENESS_SECONDS", str(self.LONG_POLL_MAX_STALENESS_SECONDS)))
+        self.WRITE_COALESCER_ENABLED = os.getenv("WRITE_COALESCER_ENABLED", str(self.WRITE_COALESCER_ENABLED)).lower() == "true"
+        self.WRITE_COALESCER_MAX_LATENCY_MS = float(os.getenv("WRITE_COALESCER_MAX_LATENCY_MS", str(self.WRITE_COALESCER_MAX_LATENCY_MS)))
+        self.WRITE_COALESCER_MAX_BATCH_SIZE = int(os.getenv("WRITE_COALESCER_MAX_BATCH_SIZE", str(self.WRITE_COALESCER_MAX_BATCH_SIZE)))
 
         # DATABASE_URL según entorno
         if os.getenv("DATABASE_URL"):
@@ -38,6 +131,22 @@ class Settings:
                 Path("data").mkdir(exist_ok=True)
                 self.DATABASE_URL = "sqlite:///./data/chat_messages.db"
 
+    # Sobrescrituras de PRAGMA definidas por entorno (None = usar el valor del perfil)
+    def sqlite_pragma_overrides(self) -> dict:
+        return {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "mmap_size": self.SQLITE_MMAP_SIZE,
+            "cache_size": self.SQLITE_CACHE_SIZE,
+            "temp_store": self.SQLITE_TEMP_STORE,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT_MS,
+            "foreign_keys": self.SQLITE_FOREIGN_KEYS,
+        }
+
+
+def _optional_int(value: str | None, default: int | None) -> int | None:
+    return int(value) if value not in (None, "") else default
+
 
 # Singleton
 settings = Settings()
@@ -1,9 +1,11 @@
 #Importante: Este archivo gestiona la conexión a la base de datos utilizando SQLAlchemy.
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.Infrastructure.config.settings import settings
 from src.Infrastructure.database.models import Base
+from src.Infrastructure.database.sqlite_tuning import install_sqlite_pragmas, resolve_sqlite_pragmas
 
 
 # Convertir DATABASE_URL a formato async si es sqlite
@@ -17,17 +19,41 @@ else:
 # Crea el engine asíncrono de la base de datos
 engine: AsyncEngine = create_async_engine(async_database_url, echo=False, future=True)
 
+# PRAGMAs del perfil de SQLite activo, aplicados a cada conexión nueva del pool
+sqlite_pragmas = resolve_sqlite_pragmas(settings.SQLITE_PROFILE, settings.sqlite_pragma_overrides())
+install_sqlite_pragmas(engine, sqlite_pragmas)
+
+# Escritor único: todas las escrituras usan una sola conexión de larga duración y las
+# sesiones normales pasan a un pool de conexiones de solo lectura (query_only).
+# aiosqlite usa NullPool por defecto; aquí se necesita un pool real para conservar las conexiones.
+write_engine: AsyncEngine = engine
+WriterSessionLocal = None
+if settings.SQLITE_SINGLE_WRITER:
+    write_engine = create_async_engine(
+        async_database_url, echo=False, future=True,
+        poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0,
+    )
+    install_sqlite_pragmas(write_engine, sqlite_pragmas)
+
+    engine = create_async_engine(
+        async_database_url, echo=False, future=True,
+        poolclass=AsyncAdaptedQueuePool, pool_size=settings.SQLITE_READ_POOL_SIZE, max_overflow=0,
+    )
+    install_sqlite_pragmas(engine, {**sqlite_pragmas, "query_only": "ON"})
+
+    WriterSessionLocal = sessionmaker(write_engine, class_=AsyncSession, expire_on_commit=False)
+
 
 # Factory de sesiones asíncronas
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 async def create_tables():
-    async with engine.begin() as conn:
+    async with write_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
 async def drop_tables():
-    async with engine.begin() as conn:
+    async with write_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
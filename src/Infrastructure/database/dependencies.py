@@ -1,7 +1,152 @@
 # Dependencia para la gestión de la sesión de la base de datos (async)
-from src.Infrastructure.database.session import SessionLocal
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from src.Domain.entities.message_entity import MessageEntity
+from src.Infrastructure.cache.message_id_bloom_filter import MessageIdBloomFilter
+from src.Infrastructure.cache.message_page_cache import MessagePageCache
+from src.Infrastructure.config.settings import settings
+from src.Infrastructure.events.message_hub import MessageHub
+from src.Infrastructure.database.models import MessageModel
+from src.Infrastructure.database.session import SessionLocal, WriterSessionLocal
+from src.Infrastructure.database.sqlite_writer import SQLiteWriter
+from src.Infrastructure.repositories.message_repository_impl import MessageRepositoryImpl
+from src.Infrastructure.repositories.write_coalescer import WriteCoalescer
 
 
 async def get_db():
     async with SessionLocal() as session:
         yield session
+
+
+# Factory de sesiones para respuestas en streaming: FastAPI cierra las dependencias con
+# yield antes de enviar el cuerpo, así que el generador abre su propia sesión.
+def get_session_factory():
+    return SessionLocal
+
+
+# Escritor único de SQLite compartido por todo el proceso (None si está deshabilitado)
+_sqlite_writer: Optional[SQLiteWriter] = None
+
+
+def get_sqlite_writer() -> Optional[SQLiteWriter]:
+    global _sqlite_writer
+    if WriterSessionLocal is None:
+        return None
+
+    if _sqlite_writer is None:
+        _sqlite_writer = SQLiteWriter(
+            session_factory=WriterSessionLocal,
+            max_queue_size=settings.SQLITE_WRITER_QUEUE_SIZE,
+        )
+    return _sqlite_writer
+
+
+async def close_sqlite_writer() -> None:
+    global _sqlite_writer
+    if _sqlite_writer is not None:
+        await _sqlite_writer.close()
+        _sqlite_writer = None
+
+
+# Coalescedor de escrituras compartido por todo el proceso (None si está deshabilitado)
+_write_coalescer: Optional[WriteCoalescer] = None
+
+
+async def _save_many_in_new_session(messages: List[MessageEntity]) -> List[Optional[MessageEntity]]:
+    async with SessionLocal() as session:
+        return await MessageRepositoryImpl(session, writer=get_sqlite_writer()).save_many(messages)
+
+
+def get_write_coalescer() -> Optional[WriteCoalescer]:
+    global _write_coalescer
+    if not settings.WRITE_COALESCER_ENABLED:
+        return None
+
+    if _write_coalescer is None:
+        _write_coalescer = WriteCoalescer(
+            save_many=_save_many_in_new_session,
+            max_batch_size=settings.WRITE_COALESCER_MAX_BATCH_SIZE,
+            max_latency_ms=settings.WRITE_COALESCER_MAX_LATENCY_MS,
+        )
+    return _write_coalescer
+
+
+async def close_write_coalescer() -> None:
+    global _write_coalescer
+    if _write_coalescer is not None:
+        await _write_coalescer.close()
+        _write_coalescer = None
+
+
+# Filtro de Bloom de message_id compartido por todo el proceso (None si está deshabilitado)
+_message_id_filter: Optional[MessageIdBloomFilter] = None
+
+
+def get_message_id_filter() -> Optional[MessageIdBloomFilter]:
+    global _message_id_filter
+    if not settings.MESSAGE_ID_FILTER_ENABLED:
+        return None
+
+    if _message_id_filter is None:
+        _message_id_filter = MessageIdBloomFilter(
+            false_positive_rate=settings.MESSAGE_ID_FILTER_FALSE_POSITIVE_RATE,
+            max_memory_bytes=settings.MESSAGE_ID_FILTER_MAX_MEMORY_BYTES,
+        )
+    return _message_id_filter
+
+
+# Caché de páginas de mensajes compartida por todo el proceso (None si está deshabilitada)
+_message_page_cache: Optional[MessagePageCache] = None
+
+
+def get_message_page_cache() -> Optional[MessagePageCache]:
+    global _message_page_cache
+    if not settings.MESSAGE_PAGE_CACHE_ENABLED:
+        return None
+
+    if _message_page_cache is None:
+        _message_page_cache = MessagePageCache(
+            max_entries=settings.MESSAGE_PAGE_CACHE_MAX_ENTRIES,
+            max_memory_bytes=settings.MESSAGE_PAGE_CACHE_MAX_MEMORY_BYTES,
+            ttl_seconds=settings.MESSAGE_PAGE_CACHE_TTL_SECONDS,
+        )
+    return _message_page_cache
+
+
+# Hub de eventos de mensajes compartido por todo el proceso (siempre activo: sin suscriptores no cuesta nada)
+_message_hub: Optional[MessageHub] = None
+
+
+def get_message_hub() -> MessageHub:
+    global _message_hub
+    if _message_hub is None:
+        _message_hub = MessageHub(
+            max_queue_size=settings.MESSAGE_EVENTS_QUEUE_SIZE,
+            max_subscribers=settings.MESSAGE_EVENTS_MAX_SUBSCRIBERS,
+        )
+    return _message_hub
+
+
+async def rebuild_message_id_filter(session_factory=SessionLocal, chunk_size: int = 10000) -> None:
+    """
+    Carga en el filtro todos los message_id existentes recorriendo el índice ix_messages_message_id.
+    Si la carga falla, el filtro queda sin marcar como listo y sigue respondiendo "quizá".
+    """
+    message_id_filter = get_message_id_filter()
+    if message_id_filter is None:
+        return
+
+    try:
+        async with session_factory() as session:
+            stmt = select(MessageModel.message_id).execution_options(yield_per=chunk_size)
+            result = await session.stream_scalars(stmt)
+            async for partition in result.partitions():
+                message_id_filter.load(partition)
+    except OperationalError as e:
+        print(f"No se pudo cargar el filtro de message_id: {e}")
+        return
+
+    message_id_filter.mark_ready()
@@ -1,5 +1,5 @@
 #Importante: Este archivo define el modelo de base de datos para mensajes utilizando SQLAlchemy.
-from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy import DDL, Column, String, DateTime, Integer, Index, event
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -8,11 +8,18 @@ Base = declarative_base()
 class MessageModel(Base):
     
     __tablename__ = "messages"
+
+    # Índices con la forma de las consultas de MessageRepositoryImpl.get_by_session/count_by_session:
+    # igualdad por sesión (y remitente) seguida del orden (timestamp, id), sin ordenar en memoria.
+    __table_args__ = (
+        Index("ix_messages_session_timestamp_id", "session_id", "timestamp", "id"),
+        Index("ix_messages_session_sender_timestamp_id", "session_id", "sender", "timestamp", "id"),
+    )
     
     # Campos básicos del mensaje (según instrucciones en el documento)
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     message_id = Column(String, unique=True, nullable=False, index=True)
-    session_id = Column(String, nullable=False, index=True)
+    session_id = Column(String, nullable=False)
     content = Column(String, nullable=False)
     timestamp = Column(DateTime, nullable=False)
     sender = Column(String, nullable=False)  # "user" o "system"
@@ -23,4 +30,138 @@ class MessageModel(Base):
     processed_at = Column(DateTime, nullable=True)
     
     def __repr__(self):
-        return f"<Message(message_id={self.message_id}, session_id={self.session_id})>"
\ No newline at end of file
+        return f"<Message(message_id={self.message_id}, session_id={self.session_id})>"
+
+
+# Caracteres del contenido del último mensaje que se guardan como vista previa de la sesión
+SESSION_PREVIEW_LENGTH = 120
+
+
+#Contadores por sesión que se mantienen al escribir, para no contar filas de messages en cada lectura.
+#También es el directorio de sesiones: cada fila resume la sesión y su último mensaje.
+class SessionStatsModel(Base):
+
+    __tablename__ = "session_stats"
+
+    # Listado de sesiones por última actividad (GET /sessions): recorrido del índice hacia atrás,
+    # con session_id como desempate para la paginación por cursor
+    __table_args__ = (
+        Index("ix_session_stats_last_timestamp_session_id", "last_timestamp", "session_id"),
+    )
+
+    session_id = Column(String, primary_key=True)
+    message_count = Column(Integer, nullable=False, default=0)
+    user_count = Column(Integer, nullable=False, default=0)
+    system_count = Column(Integer, nullable=False, default=0)
+    first_timestamp = Column(DateTime, nullable=True)
+    last_timestamp = Column(DateTime, nullable=True)
+    word_count_sum = Column(Integer, nullable=False, default=0)
+    character_count_sum = Column(Integer, nullable=False, default=0)
+    # Mayor messages.id de la sesión; junto con message_count forma su versión (ETag)
+    last_id = Column(Integer, nullable=False, default=0, server_default="0")
+    # Remitente y vista previa del último mensaje en orden (timestamp, id)
+    last_sender = Column(String, nullable=True)
+    last_message_preview = Column(String, nullable=True)
+
+    def __repr__(self):
+        return f"<SessionStats(session_id={self.session_id}, message_count={self.message_count})>"
+
+
+# El trigger actualiza session_stats dentro de la misma sentencia INSERT, así que todas las rutas de
+# escritura (repositorio, coalescedor, escritor único, importador) mantienen los contadores en su transacción.
+# Los INSERT ignorados por ON CONFLICT DO NOTHING no lo disparan.
+# En el SET, last_timestamp es el valor anterior a la actualización; a igual timestamp el mensaje nuevo
+# tiene el mayor id, así que también pasa a ser el último.
+SESSION_STATS_TRIGGER = "trg_messages_session_stats"
+SESSION_STATS_TRIGGER_SQL = f"""
+CREATE TRIGGER IF NOT EXISTS {SESSION_STATS_TRIGGER} AFTER INSERT ON messages
+BEGIN
+    INSERT INTO session_stats (
+        session_id, message_count, user_count, system_count,
+        first_timestamp, last_timestamp, word_count_sum, character_count_sum, last_id,
+        last_sender, last_message_preview
+    )
+    VALUES (
+        NEW.session_id, 1, NEW.sender = 'user', NEW.sender = 'system',
+        NEW.timestamp, NEW.timestamp, coalesce(NEW.word_count, 0), coalesce(NEW.character_count, 0), NEW.id,
+        NEW.sender, substr(NEW.content, 1, {SESSION_PREVIEW_LENGTH})
+    )
+    ON CONFLICT(session_id) DO UPDATE SET
+        message_count = message_count + 1,
+        user_count = user_count + excluded.user_count,
+        system_count = system_count + excluded.system_count,
+        first_timestamp = min(first_timestamp, excluded.first_timestamp),
+        last_timestamp = max(last_timestamp, excluded.last_timestamp),
+        word_count_sum = word_count_sum + excluded.word_count_sum,
+        character_count_sum = character_count_sum + excluded.character_count_sum,
+        last_id = max(last_id, excluded.last_id),
+        last_sender = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last_sender ELSE last_sender END,
+        last_message_preview = CASE
+            WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last_message_preview
+            ELSE last_message_preview
+        END;
+END
+"""
+
+# Se crea después de ambas tablas (create_all); al eliminar messages SQLite elimina también el trigger
+event.listen(Base.metadata, "after_create", DDL(SESSION_STATS_TRIGGER_SQL))
+
+
+# Búsqueda de texto completo: tabla FTS5 de contenido externo sobre messages (el texto no se duplica).
+# Además del contenido indexa la sesión como un único token (session_key), para que la búsqueda dentro
+# de una sesión intersecte listas del índice en lugar de filtrar todas las coincidencias globales.
+# La vista da a FTS5 la misma session_key que escriben los triggers, así que 'rebuild' reconstruye lo mismo.
+# prefix='2 3' guarda índices de prefijos cortos: "fa*" no tiene que mezclar las listas de miles de palabras.
+MESSAGES_FTS_TABLE = "messages_fts"
+MESSAGES_FTS_SOURCE_VIEW = "messages_fts_source"
+MESSAGES_FTS_INSERT_TRIGGER = "trg_messages_fts_insert"
+MESSAGES_FTS_INSERT_TRIGGER_SQL = f"""
+CREATE TRIGGER IF NOT EXISTS {MESSAGES_FTS_INSERT_TRIGGER} AFTER INSERT ON messages
+BEGIN
+    INSERT INTO {MESSAGES_FTS_TABLE} (rowid, content, session_key)
+    VALUES (NEW.id, NEW.content, 's' || hex(NEW.session_id));
+END
+"""
+MESSAGES_FTS_DDL = [
+    f"""
+CREATE VIEW IF NOT EXISTS {MESSAGES_FTS_SOURCE_VIEW} AS
+SELECT id, content, 's' || hex(session_id) AS session_key FROM messages
+""",
+    f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {MESSAGES_FTS_TABLE} USING fts5(
+    content, session_key,
+    content='{MESSAGES_FTS_SOURCE_VIEW}', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+)
+""",
+    MESSAGES_FTS_INSERT_TRIGGER_SQL,
+    f"""
+CREATE TRIGGER IF NOT EXISTS trg_messages_fts_delete AFTER DELETE ON messages
+BEGIN
+    INSERT INTO {MESSAGES_FTS_TABLE} ({MESSAGES_FTS_TABLE}, rowid, content, session_key)
+    VALUES ('delete', OLD.id, OLD.content, 's' || hex(OLD.session_id));
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS trg_messages_fts_update AFTER UPDATE OF content, session_id ON messages
+BEGIN
+    INSERT INTO {MESSAGES_FTS_TABLE} ({MESSAGES_FTS_TABLE}, rowid, content, session_key)
+    VALUES ('delete', OLD.id, OLD.content, 's' || hex(OLD.session_id));
+    INSERT INTO {MESSAGES_FTS_TABLE} (rowid, content, session_key)
+    VALUES (NEW.id, NEW.content, 's' || hex(NEW.session_id));
+END
+""",
+]
+# Reindexa todo desde messages (tras una carga masiva sin el trigger de inserción)
+MESSAGES_FTS_REBUILD_SQL = f"INSERT INTO {MESSAGES_FTS_TABLE} ({MESSAGES_FTS_TABLE}) VALUES ('rebuild')"
+
+
+def session_search_key(session_id: str) -> str:
+    # Mismo valor que 's' || hex(session_id) en SQLite (hex de los bytes UTF-8; el tokenizador ignora mayúsculas)
+    return "s" + session_id.encode("utf-8").hex()
+
+
+for _statement in MESSAGES_FTS_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement))
+event.listen(Base.metadata, "before_drop", DDL(f"DROP TABLE IF EXISTS {MESSAGES_FTS_TABLE}"))
+event.listen(Base.metadata, "before_drop", DDL(f"DROP VIEW IF EXISTS {MESSAGES_FTS_SOURCE_VIEW}"))
@@ -1,6 +1,6 @@
 #Importante: Este archivo maneja la creación y gestión de sesiones de base de datos usando SQLAlchemy.
-from src.Infrastructure.database.connection import AsyncSessionLocal
+from src.Infrastructure.database.connection import AsyncSessionLocal, WriterSessionLocal
 
-# Exportar el factory de sesiones asíncronas
+# Exportar el factory de sesiones asíncronas (de solo lectura si el escritor único está activo)
 SessionLocal = AsyncSessionLocal
 
@@ -0,0 +1,94 @@
+#Importante: Este archivo define los perfiles de ajuste de SQLite (PRAGMAs) y los aplica a cada conexión del pool.
+from typing import Dict, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+# Perfiles predefinidos. WAL permite que los lectores no bloqueen al escritor en todos ellos;
+# lo que cambia es cuánto se sacrifica de durabilidad (synchronous) a cambio de velocidad.
+SQLITE_PROFILES: Dict[str, Dict[str, Union[str, int]]] = {
+    # Cada commit hace fsync del WAL: no se pierde nada ni ante un corte de energía
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -8000,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    # fsync solo en los checkpoints: un corte de energía puede perder los últimos commits, nunca corromper
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    # Sin fsync: máximo rendimiento, un fallo del sistema operativo puede perder o corromper datos
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 1073741824,
+        "cache_size": -256000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+        "foreign_keys": "ON",
+    },
+}
+
+# Valores permitidos por PRAGMA (los PRAGMA no admiten parámetros enlazados, así que se validan aquí)
+_ALLOWED_VALUES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+    "foreign_keys": {"ON", "OFF"},
+}
+_INTEGER_PRAGMAS = {"mmap_size", "cache_size", "busy_timeout"}
+
+
+def resolve_sqlite_pragmas(profile: str, overrides: Dict[str, Union[str, int, None]] = None) -> Dict[str, Union[str, int]]:
+    """
+    Retorna los PRAGMAs del perfil indicado con las sobrescrituras aplicadas.
+    Lanza ValueError si el perfil o algún valor no es válido.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Perfil de SQLite desconocido '{profile}'. Opciones: {', '.join(SQLITE_PROFILES)}")
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name, value in (overrides or {}).items():
+        if value is None:
+            continue
+        if name in _INTEGER_PRAGMAS:
+            pragmas[name] = int(value)
+        elif name in _ALLOWED_VALUES:
+            value = str(value).upper()
+            if value not in _ALLOWED_VALUES[name]:
+                raise ValueError(f"Valor inválido para PRAGMA {name}: '{value}'")
+            pragmas[name] = value
+        else:
+            raise ValueError(f"PRAGMA no soportado: '{name}'")
+    return pragmas
+
+
+def install_sqlite_pragmas(engine: Union[Engine, AsyncEngine], pragmas: Dict[str, Union[str, int]]) -> None:
+    """
+    Registra un evento 'connect' que aplica los PRAGMAs a cada nueva conexión del pool.
+    No hace nada si el engine no es de SQLite.
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
@@ -0,0 +1,95 @@
+#Importante: Este archivo implementa el escritor único de SQLite: una sola tarea y una sola conexión
+#ejecutan todas las escrituras en orden, de modo que nunca compiten por el bloqueo de la base de datos.
+import asyncio
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+T = TypeVar("T")
+
+# Operación de escritura: recibe la sesión del escritor y retorna su resultado
+WriteOperation = Callable[[AsyncSession], Awaitable[T]]
+
+# Marca interna para detener la tarea de escritura
+_STOP = object()
+
+
+#Cola de escrituras atendida por una única tarea. Con una cola acotada, los llamadores esperan
+#(contrapresión) cuando el escritor va por detrás, en lugar de acumular trabajo sin límite.
+class SQLiteWriter:
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], max_queue_size: int = 10000):
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size debe ser al menos 1")
+
+        self._session_factory = session_factory
+        self.max_queue_size = max_queue_size
+
+        # La cola y la tarea se crean al primer uso, dentro del event loop que atiende las peticiones
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self, operation: WriteOperation) -> Any:
+        """
+        Encola la operación y espera su resultado (o su excepción).
+        """
+        self._ensure_worker()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def snapshot(self) -> dict:
+        return {
+            "max_queue_size": self.max_queue_size,
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    async def close(self) -> None:
+        """
+        Detiene la tarea de escritura después de ejecutar las operaciones pendientes.
+        """
+        if self._worker is None or self._worker.done():
+            return
+
+        await self._queue.put(_STOP)
+        await self._worker
+        self._worker = None
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            operation, future = item
+            if future.done():
+                continue
+
+            try:
+                async with self._session_factory() as session:
+                    result = await operation(session)
+            except Exception as e:
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.completed += 1
+                if not future.done():
+                    future.set_result(result)
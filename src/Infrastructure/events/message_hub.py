@@ -0,0 +1,184 @@
+#Importante: Este archivo implementa el hub de eventos de mensajes: pub/sub en memoria por sesión.
+#Los casos de uso de creación publican cada mensaje guardado y los flujos SSE lo reciben sin consultar la BD.
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.Application.interfaces.message_event_hub_interface import (
+    MessageEventHubInterface,
+    MessageSubscriptionInterface,
+    SubscriberEvictedError,
+    SubscriberLimitError,
+)
+from src.Domain.entities.message_entity import MessageEntity
+
+
+#Suscripción con cola acotada. Un suscriptor inactivo solo ocupa esta instancia (sin tareas ni timers propios):
+#la espera es un asyncio.Event que publish() activa.
+class MessageSubscription(MessageSubscriptionInterface):
+
+    def __init__(self, hub: "MessageHub", session_id: str):
+        self.session_id = session_id
+        self._hub = hub
+        self._pending: Deque[MessageEntity] = deque()
+        self._ready = asyncio.Event()
+        # message_id que guarda el propio suscriptor: publish() no los encola, solo recuerda el último
+        # para despertarlo (así su posición avanza) sin ocupar la cola
+        self._ignored: Set[str] = set()
+        self._last_ignored: Optional[MessageEntity] = None
+        self.evicted = False
+        self.closed = False
+
+    async def next_batch(self, timeout: float) -> List[MessageEntity]:
+        if not self._pending and self._last_ignored is None and not self.evicted:
+            try:
+                async with asyncio.timeout(timeout):
+                    await self._ready.wait()
+            except TimeoutError:
+                return []
+
+        if self.evicted:
+            raise SubscriberEvictedError(f"Suscriptor de la sesión {self.session_id} desconectado por no consumir sus eventos")
+
+        batch = list(self._pending)
+        if self._last_ignored is not None:
+            batch.append(self._last_ignored)
+            self._last_ignored = None
+        self._pending.clear()
+        self._ready.clear()
+        return batch
+
+    def ignore(self, message_ids: Iterable[str]) -> None:
+        self._ignored.update(message_ids)
+
+    def unignore(self, message_ids: Iterable[str]) -> None:
+        self._ignored.difference_update(message_ids)
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._hub._unsubscribe(self)
+
+    def __enter__(self) -> "MessageSubscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+#Hub con colas acotadas por suscriptor. Publicar nunca espera: si la cola de un suscriptor está llena
+#(consumidor lento) se le desconecta y se descarta lo pendiente, en lugar de acumular memoria sin límite.
+#También recuerda el último id conocido de cada sesión, para que el long-poll no consulte la BD si no hay nada nuevo.
+#Solo ve los mensajes guardados por este proceso.
+class MessageHub(MessageEventHubInterface):
+
+    def __init__(
+        self,
+        max_queue_size: int = 256,
+        max_subscribers: int = 10000,
+        max_tracked_sessions: int = 100000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size debe ser al menos 1")
+        if max_subscribers < 1:
+            raise ValueError("max_subscribers debe ser al menos 1")
+        if max_tracked_sessions < 1:
+            raise ValueError("max_tracked_sessions debe ser al menos 1")
+
+        self.max_queue_size = max_queue_size
+        self.max_subscribers = max_subscribers
+        self.max_tracked_sessions = max_tracked_sessions
+        self._clock = clock
+        self._subscribers: Dict[str, Set[MessageSubscription]] = {}
+        self.subscriber_count = 0
+
+        # session_id -> (último id conocido, cuándo se confirmó). Se vacía al crecer demasiado.
+        self._positions: Dict[str, Tuple[int, float]] = {}
+        self.position_hits = 0
+        self.position_misses = 0
+
+        self.published = 0
+        self.delivered = 0
+        self.evictions = 0
+        self.rejected_subscriptions = 0
+
+    def subscribe(self, session_id: str) -> MessageSubscription:
+        if self.subscriber_count >= self.max_subscribers:
+            self.rejected_subscriptions += 1
+            raise SubscriberLimitError(f"Se alcanzó el máximo de {self.max_subscribers} suscriptores")
+
+        subscription = MessageSubscription(self, session_id)
+        self._subscribers.setdefault(session_id, set()).add(subscription)
+        self.subscriber_count += 1
+        return subscription
+
+    def publish(self, message: MessageEntity) -> None:
+        self.published += 1
+        if message.id is not None:
+            self.remember_last_id(message.session_id, message.id)
+        subscribers = self._subscribers.get(message.session_id)
+        if not subscribers:
+            return
+
+        for subscription in list(subscribers):
+            if message.message_id in subscription._ignored:
+                subscription._ignored.discard(message.message_id)
+                subscription._last_ignored = message
+                subscription._ready.set()
+                continue
+            if len(subscription._pending) >= self.max_queue_size:
+                self._evict(subscription)
+                continue
+            subscription._pending.append(message)
+            subscription._ready.set()
+            self.delivered += 1
+
+    def remember_last_id(self, session_id: str, last_id: int) -> None:
+        position = self._positions.get(session_id)
+        if position is None and len(self._positions) >= self.max_tracked_sessions:
+            self._positions.clear()
+        if position is not None:
+            last_id = max(last_id, position[0])
+        self._positions[session_id] = (last_id, self._clock())
+
+    def last_known_id(self, session_id: str, max_age_seconds: float) -> Optional[int]:
+        position = self._positions.get(session_id)
+        if position is None or self._clock() - position[1] > max_age_seconds:
+            self.position_misses += 1
+            return None
+        self.position_hits += 1
+        return position[0]
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscriber_count,
+            "sessions": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "max_queue_size": self.max_queue_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "evictions": self.evictions,
+            "rejected_subscriptions": self.rejected_subscriptions,
+            "tracked_sessions": len(self._positions),
+            "position_hits": self.position_hits,
+            "position_misses": self.position_misses,
+        }
+
+    def _evict(self, subscription: MessageSubscription) -> None:
+        subscription.evicted = True
+        subscription._pending.clear()
+        # Despierta al consumidor para que vea la desconexión
+        subscription._ready.set()
+        self._unsubscribe(subscription)
+        self.evictions += 1
+
+    def _unsubscribe(self, subscription: MessageSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.session_id)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        self.subscriber_count -= 1
+        if not subscribers:
+            del self._subscribers[subscription.session_id]
@@ -1,46 +1,166 @@
 #Importante: Este archivo contiene la implementación concreta del repositorio de mensajes usando SQLAlchemy.
-from typing import List, Optional
+import json
+from dataclasses import replace
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import column, select, func, insert, literal, literal_column, table, tuple_, true
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.elements import UnaryExpression
+from sqlalchemy.sql.operators import custom_op
 
-from src.Application.interfaces.message_repository_interface import MessageRepositoryInterface
+from src.Application.interfaces.message_repository_interface import MessageRepositoryInterface, DuplicateMessageError
+from src.Application.dtos.pagination_dto import MessageCursor
 from src.Domain.entities.message_entity import MessageEntity
 from src.Domain.value_objects.sender_type import SenderType
 from src.Domain.value_objects.message_metadata import MessageMetadata
+from src.Domain.value_objects.search_term import SearchTerm
 
-from src.Infrastructure.database.models import MessageModel
+from src.Infrastructure.database.models import MESSAGES_FTS_TABLE, MessageModel, SessionStatsModel, session_search_key
+from src.Infrastructure.database.sqlite_writer import SQLiteWriter
+from src.Infrastructure.repositories.write_coalescer import WriteCoalescer
+
+
+# Columnas que se leen para construir un MessageEntity, en el orden que espera _rows_to_entities.
+# Los listados seleccionan solo estas columnas (Core): sin instancias ORM ni identity map.
+_messages = MessageModel.__table__
+_ENTITY_COLUMNS = (
+    _messages.c.id,
+    _messages.c.message_id,
+    _messages.c.session_id,
+    _messages.c.content,
+    _messages.c.timestamp,
+    _messages.c.sender,
+    _messages.c.word_count,
+    _messages.c.character_count,
+    _messages.c.processed_at,
+)
+_SENDERS = {sender.value: sender for sender in SenderType}
+
+# "+session_id" impide que SQLite use los índices de session_id: la reanudación de eventos recorre
+# la clave primaria desde el último id visto, así cuesta lo escrito desde entonces y no el tamaño de la sesión
+_UNINDEXED_SESSION_ID = UnaryExpression(_messages.c.session_id, operator=custom_op("+"), type_=_messages.c.session_id.type)
+
+# Tabla FTS5 de contenido externo: su rowid es messages.id
+_messages_fts = table(MESSAGES_FTS_TABLE, column("rowid"))
+_MESSAGES_FTS_MATCH = literal_column(MESSAGES_FTS_TABLE).op("MATCH")
+
+# Columna de session_stats con el conteo de cada remitente
+_SENDER_COUNT_COLUMNS = {
+    SenderType.USER.value: SessionStatsModel.user_count,
+    SenderType.SYSTEM.value: SessionStatsModel.system_count,
+}
 
 
 class MessageRepositoryImpl(MessageRepositoryInterface):
 
-    def __init__(self, db_session: AsyncSession):
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        write_coalescer: Optional[WriteCoalescer] = None,
+        writer: Optional[SQLiteWriter] = None,
+    ):
         self.db_session = db_session
+        self.write_coalescer = write_coalescer
+        # Con escritor único, db_session solo se usa para lecturas y las escrituras
+        # se ejecutan en la conexión del escritor con un repositorio propio.
+        self.writer = writer
 
     async def save(self, message: MessageEntity) -> MessageEntity:
-        model = MessageModel(
-            message_id=message.message_id,
-            session_id=message.session_id,
-            content=message.content,
-            timestamp=message.timestamp,
-            sender=message.sender.value,
-            word_count=message.metadata.word_count if message.metadata else None,
-            character_count=message.metadata.character_count if message.metadata else None,
-            processed_at=message.metadata.processed_at if message.metadata else None,
-        )
+        # Con el coalescedor activo, el mensaje se confirma junto con los de otras peticiones concurrentes
+        if self.write_coalescer is not None:
+            return await self.write_coalescer.submit(message)
+
+        if self.writer is not None:
+            return await self.writer.run(lambda session: MessageRepositoryImpl(session).save(message))
 
-        self.db_session.add(model)
+        # INSERT directo sin refresh posterior: la BD solo genera el id (RETURNING), el resto
+        # de la entidad se construye a partir de lo que se envió.
         try:
+            result = await self.db_session.execute(
+                insert(MessageModel).values(**self._to_row(message)).returning(MessageModel.id)
+            )
+            message_pk = result.scalar_one()
             await self.db_session.commit()
-            await self.db_session.refresh(model)
         except IntegrityError as e:
             # Map DB integrity issues (e.g. unique constraint on message_id)
             await self.db_session.rollback()
             # Raise a ValueError so upper layers (use-case/controller) can return 400
-            raise ValueError(f"El mensaje con id {message.message_id} ya existe o hay un error de integridad en la base de datos") from e
+            raise DuplicateMessageError(f"El mensaje con id {message.message_id} ya existe o hay un error de integridad en la base de datos") from e
+
+        return self._as_stored(message, message_pk)
+
+    async def save_many(self, messages: List[MessageEntity]) -> List[Optional[MessageEntity]]:
+        if not messages:
+            return []
+
+        if self.writer is not None:
+            return await self.writer.run(lambda session: MessageRepositoryImpl(session).save_many(messages))
+
+        # Un solo INSERT multi-fila; los message_id repetidos (en BD o dentro del lote)
+        # se omiten con ON CONFLICT DO NOTHING en lugar de abortar la transacción.
+        rows = []
+        seen_ids = set()
+        for message in messages:
+            if message.message_id not in seen_ids:
+                seen_ids.add(message.message_id)
+                rows.append(self._to_row(message))
+
+        stmt = (
+            sqlite_insert(MessageModel)
+            .on_conflict_do_nothing(index_elements=[MessageModel.message_id])
+            .returning(MessageModel.message_id, MessageModel.id)
+        )
+        try:
+            result = await self.db_session.execute(stmt, rows)
+            inserted_ids = dict(result.all())
+            await self.db_session.commit()
+        except IntegrityError as e:
+            await self.db_session.rollback()
+            raise ValueError("Error de integridad al guardar el lote de mensajes en la base de datos") from e
+
+        # Solo la primera aparición de cada message_id insertado cuenta como guardada
+        saved: List[Optional[MessageEntity]] = []
+        for message in messages:
+            if message.message_id in inserted_ids:
+                saved.append(self._as_stored(message, inserted_ids.pop(message.message_id)))
+            else:
+                saved.append(None)
+        return saved
+
+    async def save_or_get(self, message: MessageEntity) -> Tuple[MessageEntity, bool]:
+        if self.writer is not None:
+            return await self.writer.run(lambda session: MessageRepositoryImpl(session).save_or_get(message))
+
+        # Un reintento no provoca IntegrityError ni rollback: el INSERT no hace nada
+        # y se lee la fila existente por el índice único de message_id.
+        stmt = (
+            sqlite_insert(MessageModel)
+            .values(**self._to_row(message))
+            .on_conflict_do_nothing(index_elements=[MessageModel.message_id])
+            .returning(MessageModel.id)
+        )
+        result = await self.db_session.execute(stmt)
+        message_pk = result.scalar_one_or_none()
+        if message_pk is not None:
+            await self.db_session.commit()
+            return self._as_stored(message, message_pk), True
 
-        return self._to_entity(model)
+        existing = await self.db_session.execute(
+            select(MessageModel).where(MessageModel.message_id == message.message_id)
+        )
+        model = existing.scalar_one()
+        await self.db_session.commit()
+        return self._to_entity(model), False
+
+    async def get_by_message_id(self, message_id: str) -> Optional[MessageEntity]:
+        result = await self.db_session.execute(
+            select(MessageModel).where(MessageModel.message_id == message_id)
+        )
+        model = result.scalar_one_or_none()
+        return self._to_entity(model) if model is not None else None
 
     async def get_by_session(
         self,
@@ -48,28 +168,302 @@ class MessageRepositoryImpl(MessageRepositoryInterface):
         limit: int,
         offset: int,
         sender: Optional[str] = None,
+        after: Optional[MessageCursor] = None,
+        before: Optional[MessageCursor] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
     ) -> List[MessageEntity]:
-        stmt = select(MessageModel).where(MessageModel.session_id == session_id)
+        stmt = self._session_page_stmt(session_id, limit, offset, sender, after, before, start, end)
 
-        if sender:
-            stmt = stmt.where(MessageModel.sender == sender)
+        result = await self.db_session.execute(stmt)
+        rows = result.all()
+        if before is not None:
+            rows.reverse()
+
+        return self._rows_to_entities(rows)
+
+    async def get_page_by_session(
+        self,
+        session_id: str,
+        limit: int,
+        offset: int,
+        sender: Optional[str] = None,
+        after: Optional[MessageCursor] = None,
+        before: Optional[MessageCursor] = None,
+        include_total: bool = True,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[List[MessageEntity], Optional[int]]:
+        if not include_total:
+            return await self.get_by_session(session_id, limit, offset, sender, after, before, start, end), None
 
-        stmt = stmt.order_by(MessageModel.timestamp.asc()).offset(offset).limit(limit)
+        # Una sola consulta: la CTE del total (una fila, leída de session_stats o contada en el rango)
+        # se une por LEFT JOIN a la CTE de la página, así que el total llega aunque la página esté vacía.
+        total_cte = select(self._session_count_expr(session_id, sender, start, end).label("total")).cte("total")
+        page_cte = self._session_page_stmt(session_id, limit, offset, sender, after, before, start, end).cte("page")
 
+        stmt = select(total_cte.c.total, *page_cte.c).select_from(total_cte).outerjoin(page_cte, true())
         result = await self.db_session.execute(stmt)
-        rows = result.scalars().all()
+        rows = result.all()
+
+        total = rows[0].total if rows else 0
+        # Sin mensajes en la página, el LEFT JOIN deja una única fila con las columnas de la página en NULL
+        page = [row[1:] for row in rows if row[1] is not None]
+        # El orden de las filas de un JOIN no está garantizado: se ordena la página (como mucho `limit` filas)
+        page.sort(key=lambda row: (row[4], row[0]))
 
-        return [self._to_entity(m) for m in rows]
+        return self._rows_to_entities(page), int(total)
 
-    async def count_by_session(self, session_id: str, sender: Optional[str] = None) -> int:
-        stmt = select(func.count()).select_from(MessageModel).where(MessageModel.session_id == session_id)
+    def _session_filter(
+        self,
+        stmt,
+        session_id: str,
+        sender: Optional[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ):
+        stmt = stmt.where(MessageModel.session_id == session_id)
         if sender:
             stmt = stmt.where(MessageModel.sender == sender)
+        # El rango acota el recorrido del índice (session_id[, sender], timestamp, id): se salta a `start`
+        # y se detiene en `end`, así que el costo depende de los mensajes del rango y no de la sesión
+        if start is not None:
+            stmt = stmt.where(MessageModel.timestamp >= start)
+        if end is not None:
+            stmt = stmt.where(MessageModel.timestamp < end)
+        return stmt
 
-        result = await self.db_session.execute(stmt)
+    def _session_page_stmt(
+        self,
+        session_id: str,
+        limit: int,
+        offset: int,
+        sender: Optional[str],
+        after: Optional[MessageCursor],
+        before: Optional[MessageCursor],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ):
+        stmt = self._session_filter(select(*_ENTITY_COLUMNS), session_id, sender, start, end)
+
+        # Orden total (timestamp, id): el id desempata mensajes con el mismo timestamp
+        position = tuple_(MessageModel.timestamp, MessageModel.id)
+        if before is not None:
+            # Se recorre hacia atrás desde el cursor; quien llama restaura el orden ascendente
+            return (
+                stmt.where(position < (before.timestamp, before.id))
+                .order_by(MessageModel.timestamp.desc(), MessageModel.id.desc())
+                .limit(limit)
+            )
+
+        if after is not None:
+            # Seek: el índice salta directamente a la posición del cursor, sin OFFSET
+            stmt = stmt.where(position > (after.timestamp, after.id))
+        else:
+            stmt = stmt.offset(offset)
+        return stmt.order_by(MessageModel.timestamp.asc(), MessageModel.id.asc()).limit(limit)
+
+    async def count_by_session(
+        self,
+        session_id: str,
+        sender: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> int:
+        # Sin rango: búsqueda por clave primaria en session_stats, no depende del largo de la sesión
+        result = await self.db_session.execute(select(self._session_count_expr(session_id, sender, start, end)))
         count = result.scalar_one()
         return int(count)
 
+    async def get_latest_by_sessions(self, session_ids: List[str], limit: int) -> Dict[str, List[MessageEntity]]:
+        # Las sesiones llegan como un solo parámetro JSON y json_each las recorre; por cada una, la subconsulta
+        # correlacionada lee los `limit` últimos ids del índice (session_id, timestamp, id) y se detiene.
+        # Con ROW_NUMBER() OVER (PARTITION BY session_id ...) SQLite numeraría todas las filas de cada sesión.
+        requested = func.json_each(json.dumps(session_ids)).table_valued("value").alias("requested")
+        latest = (
+            select(_messages.c.id)
+            .where(_messages.c.session_id == requested.c.value)
+            .order_by(_messages.c.timestamp.desc(), _messages.c.id.desc())
+            .limit(limit)
+            .correlate(requested)
+        )
+        stmt = select(*_ENTITY_COLUMNS).select_from(requested).join(_messages, _messages.c.id.in_(latest))
+        result = await self.db_session.execute(stmt)
+
+        messages: Dict[str, List[MessageEntity]] = {}
+        for message in self._rows_to_entities(result.all()):
+            messages.setdefault(message.session_id, []).append(message)
+        for session_messages in messages.values():
+            session_messages.sort(key=lambda message: (message.timestamp, message.id))
+        return messages
+
+    async def count_by_sessions(self, session_ids: List[str]) -> Dict[str, int]:
+        # session_stats ya tiene una fila agregada por sesión: no hace falta agrupar messages
+        result = await self.db_session.execute(
+            select(SessionStatsModel.session_id, SessionStatsModel.message_count)
+            .where(SessionStatsModel.session_id.in_(session_ids))
+        )
+        counts = dict.fromkeys(session_ids, 0)
+        counts.update({session_id: int(count) for session_id, count in result.all()})
+        return counts
+
+    async def get_by_session_after_id(self, session_id: str, after_id: int, limit: int) -> List[MessageEntity]:
+        stmt = (
+            select(*_ENTITY_COLUMNS)
+            .where(_messages.c.id > after_id, _UNINDEXED_SESSION_ID == session_id)
+            .order_by(_messages.c.id)
+            .limit(limit)
+        )
+        result = await self.db_session.execute(stmt)
+        return self._rows_to_entities(result.all())
+
+    async def search_recent_matches(
+        self,
+        terms: List[SearchTerm],
+        session_id: Optional[str],
+        limit: int,
+        max_id: Optional[int] = None,
+    ) -> List[MessageEntity]:
+        # Recorrer el índice por rowid descendente se detiene tras `limit` coincidencias:
+        # el costo no depende de cuántos mensajes contengan los términos
+        stmt = (
+            select(*_ENTITY_COLUMNS)
+            .select_from(_messages_fts)
+            .join(_messages, _messages.c.id == _messages_fts.c.rowid)
+            .where(_MESSAGES_FTS_MATCH(self._fts_query(terms, session_id)))
+            .order_by(_messages_fts.c.rowid.desc())
+            .limit(limit)
+        )
+        if max_id is not None:
+            # FTS5 aplica el límite de rowid al recorrer el índice: empieza directamente en max_id
+            stmt = stmt.where(_messages_fts.c.rowid <= max_id)
+        result = await self.db_session.execute(stmt)
+        return self._rows_to_entities(result.all())
+
+    @staticmethod
+    def _fts_query(terms: List[SearchTerm], session_id: Optional[str]) -> str:
+        # Cada término entre comillas: las palabras de la consulta no se interpretan como operadores de FTS5
+        phrases = " ".join('"' + term.text.replace('"', '""') + '"' + ("*" if term.prefix else "") for term in terms)
+        query = f"content : ({phrases})"
+        if session_id is not None:
+            # La sesión es un token del índice: FTS5 intersecta su lista con la de los términos
+            query = f"session_key : {session_search_key(session_id)} AND {query}"
+        return query
+
+    async def get_last_message_id(self, session_id: str) -> int:
+        result = await self.db_session.execute(
+            select(SessionStatsModel.last_id).where(SessionStatsModel.session_id == session_id)
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def get_session_version(self, session_id: str) -> str:
+        # (message_count, last_id) de session_stats: solo aumentan al insertar y no se lee messages
+        result = await self.db_session.execute(
+            select(SessionStatsModel.message_count, SessionStatsModel.last_id)
+            .where(SessionStatsModel.session_id == session_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return "0-0"
+        return f"{row.message_count}-{row.last_id}"
+
+    def _session_count_expr(
+        self,
+        session_id: str,
+        sender: Optional[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ):
+        if start is not None or end is not None:
+            # session_stats no tiene conteos por rango: se cuentan las entradas del índice dentro del rango
+            count = self._session_filter(select(func.count()).select_from(_messages), session_id, sender, start, end)
+            return count.scalar_subquery()
+
+        column = _SENDER_COUNT_COLUMNS.get(sender) if sender else SessionStatsModel.message_count
+        if column is None:
+            return literal(0)
+        # Sesión sin fila en session_stats: todavía no tiene mensajes
+        count = select(column).where(SessionStatsModel.session_id == session_id).scalar_subquery()
+        return func.coalesce(count, 0)
+
+    async def iter_messages(
+        self,
+        session_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[MessageEntity]:
+        stmt = select(*_ENTITY_COLUMNS)
+        if session_id:
+            stmt = stmt.where(MessageModel.session_id == session_id)
+        if start is not None:
+            stmt = stmt.where(MessageModel.timestamp >= start)
+        if end is not None:
+            stmt = stmt.where(MessageModel.timestamp < end)
+
+        # Con sesión se recorre ix_messages_session_timestamp_id en su orden: ordenar por id obligaría
+        # a SQLite a ordenar toda la sesión (TEMP B-TREE) antes de entregar la primera fila
+        if session_id:
+            stmt = stmt.order_by(MessageModel.timestamp, MessageModel.id)
+        else:
+            stmt = stmt.order_by(MessageModel.id)
+
+        # Cursor del lado del servidor: solo hay chunk_size filas en memoria a la vez
+        stmt = stmt.execution_options(yield_per=chunk_size)
+        result = await self.db_session.stream(stmt)
+        async for partition in result.partitions():
+            for entity in self._rows_to_entities(partition):
+                yield entity
+
+    @staticmethod
+    def _to_row(message: MessageEntity) -> dict:
+        return {
+            "message_id": message.message_id,
+            "session_id": message.session_id,
+            "content": message.content,
+            "timestamp": message.timestamp,
+            "sender": message.sender.value,
+            "word_count": message.metadata.word_count if message.metadata else None,
+            "character_count": message.metadata.character_count if message.metadata else None,
+            "processed_at": message.metadata.processed_at if message.metadata else None,
+        }
+
+    def _as_stored(self, message: MessageEntity, message_pk: int) -> MessageEntity:
+        # Equivale a releer la fila: SQLite guarda los DateTime sin zona horaria
+        timestamp = message.timestamp.replace(tzinfo=None) if message.timestamp.tzinfo else message.timestamp
+        metadata = message.metadata
+        if metadata is not None and metadata.processed_at is not None and metadata.processed_at.tzinfo:
+            metadata = MessageMetadata(
+                word_count=metadata.word_count,
+                character_count=metadata.character_count,
+                processed_at=metadata.processed_at.replace(tzinfo=None),
+            )
+
+        return replace(message, timestamp=timestamp, metadata=metadata, id=message_pk)
+
+    @staticmethod
+    def _rows_to_entities(rows) -> List[MessageEntity]:
+        # Una sola pasada sobre tuplas con las columnas de _ENTITY_COLUMNS
+        entities = []
+        for pk, message_id, session_id, content, timestamp, sender, word_count, character_count, processed_at in rows:
+            metadata = None
+            if word_count is not None:
+                metadata = MessageMetadata(
+                    word_count=word_count,
+                    character_count=character_count,
+                    processed_at=processed_at,
+                )
+            entities.append(MessageEntity(
+                message_id=message_id,
+                session_id=session_id,
+                content=content,
+                timestamp=timestamp,
+                sender=_SENDERS[sender],
+                metadata=metadata,
+                id=pk,
+            ))
+        return entities
+
     def _to_entity(self, model: MessageModel) -> MessageEntity:
         metadata = None
         if model.word_count is not None:
@@ -86,4 +480,5 @@ class MessageRepositoryImpl(MessageRepositoryInterface):
             timestamp=model.timestamp,
             sender=SenderType(model.sender),
             metadata=metadata,
+            id=model.id,
         )
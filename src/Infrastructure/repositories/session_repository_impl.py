@@ -0,0 +1,56 @@
+#Importante: Este archivo contiene la implementación del repositorio del directorio de sesiones usando SQLAlchemy.
+from typing import List, Optional
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.Application.interfaces.session_repository_interface import SessionRepositoryInterface
+from src.Application.dtos.pagination_dto import SessionCursor
+from src.Domain.entities.session_summary_entity import SessionSummaryEntity
+from src.Domain.value_objects.sender_type import SenderType
+
+from src.Infrastructure.database.models import SessionStatsModel
+
+
+# Columnas que se leen para construir un SessionSummaryEntity, en el orden que espera _rows_to_entities
+_SUMMARY_COLUMNS = (
+    SessionStatsModel.session_id,
+    SessionStatsModel.message_count,
+    SessionStatsModel.first_timestamp,
+    SessionStatsModel.last_timestamp,
+    SessionStatsModel.last_sender,
+    SessionStatsModel.last_message_preview,
+)
+_SENDERS = {sender.value: sender for sender in SenderType}
+
+
+class SessionRepositoryImpl(SessionRepositoryInterface):
+
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def list_recent(self, limit: int, after: Optional[SessionCursor] = None) -> List[SessionSummaryEntity]:
+        # session_stats ya resume cada sesión (el trigger de messages la mantiene): la página es un recorrido
+        # hacia atrás del índice (last_timestamp, session_id) que salta al cursor, sin leer messages
+        stmt = select(*_SUMMARY_COLUMNS)
+        if after is not None:
+            position = tuple_(SessionStatsModel.last_timestamp, SessionStatsModel.session_id)
+            stmt = stmt.where(position < (after.last_timestamp, after.session_id))
+        stmt = stmt.order_by(SessionStatsModel.last_timestamp.desc(), SessionStatsModel.session_id.desc()).limit(limit)
+
+        result = await self.db_session.execute(stmt)
+        return self._rows_to_entities(result.all())
+
+    @staticmethod
+    def _rows_to_entities(rows) -> List[SessionSummaryEntity]:
+        return [
+            SessionSummaryEntity(
+                session_id=session_id,
+                message_count=message_count,
+                first_timestamp=first_timestamp,
+                last_timestamp=last_timestamp,
+                last_sender=_SENDERS.get(last_sender),
+                last_message_preview=last_message_preview,
+            )
+            for session_id, message_count, first_timestamp, last_timestamp, last_sender, last_message_preview in rows
+        ]
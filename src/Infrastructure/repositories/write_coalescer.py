@@ -0,0 +1,174 @@
+#Importante: Este archivo implementa un coalescedor de escrituras (group commit) para la creación de mensajes.
+#Agrupa los mensajes que llegan de forma concurrente y los confirma en una sola transacción,
+#de modo que N peticiones simultáneas pagan un solo bloqueo de escritura y un solo fsync en SQLite.
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.Domain.entities.message_entity import MessageEntity
+from src.Application.interfaces.message_repository_interface import DuplicateMessageError
+
+
+# Función que persiste un lote y retorna, por posición, el mensaje guardado o None si ya existía
+SaveManyFn = Callable[[List[MessageEntity]], Awaitable[List[Optional[MessageEntity]]]]
+
+# Marca interna para detener la tarea de escritura
+_STOP = object()
+
+
+#Métricas acumuladas del coalescedor (tamaños de lote agrupados en potencias de 2)
+class WriteCoalescerMetrics:
+
+    def __init__(self):
+        self.batches = 0
+        self.messages = 0
+        self.failed_batches = 0
+        self.max_batch_size = 0
+        self.batch_size_histogram: Dict[str, int] = {}
+
+    def record_batch(self, size: int, failed: bool = False) -> None:
+        self.batches += 1
+        self.messages += size
+        self.max_batch_size = max(self.max_batch_size, size)
+        if failed:
+            self.failed_batches += 1
+
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+        key = f"<={bucket}"
+        self.batch_size_histogram[key] = self.batch_size_histogram.get(key, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "batches": self.batches,
+            "messages": self.messages,
+            "failed_batches": self.failed_batches,
+            "average_batch_size": round(self.messages / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "batch_size_histogram": dict(
+                sorted(self.batch_size_histogram.items(), key=lambda item: int(item[0][2:]))
+            ),
+        }
+
+
+#Clase que agrupa inserciones pendientes durante unos milisegundos (o hasta N filas)
+#y las confirma juntas, resolviendo el future de cada llamador con su propio resultado.
+class WriteCoalescer:
+
+    def __init__(self, save_many: SaveManyFn, max_batch_size: int = 256, max_latency_ms: float = 2.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size debe ser al menos 1")
+        if max_latency_ms < 0:
+            raise ValueError("max_latency_ms no puede ser negativo")
+
+        self._save_many = save_many
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.metrics = WriteCoalescerMetrics()
+
+        # La cola y la tarea se crean al primer uso, dentro del event loop que atiende las peticiones
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, message: MessageEntity) -> MessageEntity:
+        """
+        Encola el mensaje y espera a que su lote se confirme.
+        Lanza DuplicateMessageError si el message_id ya existe, igual que MessageRepositoryImpl.save.
+        """
+        self._ensure_worker()
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((message, future))
+        # La tarea de escritura ya sostiene el primer mensaje del lote en curso
+        if self._queue.qsize() >= self.max_batch_size - 1:
+            self._batch_full.set()
+
+        return await future
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def snapshot(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_latency_ms": self.max_latency * 1000,
+            "pending": self.pending,
+            **self.metrics.to_dict(),
+        }
+
+    async def close(self) -> None:
+        """
+        Detiene la tarea de escritura después de confirmar los mensajes pendientes.
+        """
+        if self._worker is None or self._worker.done():
+            return
+
+        self._queue.put_nowait(_STOP)
+        self._batch_full.set()
+        await self._worker
+        self._worker = None
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+                self._batch_full = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+
+            # Esperar a que se llene el lote o a que venza la latencia máxima
+            if self._queue.qsize() + 1 < self.max_batch_size and self.max_latency > 0:
+                self._batch_full.clear()
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), timeout=self.max_latency)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = [first] + self._drain(self.max_batch_size - 1)
+            stop = _STOP in batch
+            await self._flush([item for item in batch if item is not _STOP])
+            if stop:
+                break
+
+        # Confirmar lo que se haya encolado mientras se cerraba
+        while not self._queue.empty():
+            await self._flush([item for item in self._drain(self.max_batch_size) if item is not _STOP])
+
+    def _drain(self, limit: int) -> list:
+        items = []
+        while len(items) < limit and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        return items
+
+    async def _flush(self, batch: List[Tuple[MessageEntity, asyncio.Future]]) -> None:
+        if not batch:
+            return
+
+        messages = [message for message, _ in batch]
+        try:
+            saved_messages = await self._save_many(messages)
+        except Exception as e:
+            # Un fallo de la transacción afecta a todo el lote
+            self.metrics.record_batch(len(batch), failed=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.metrics.record_batch(len(batch))
+        for (message, future), saved_message in zip(batch, saved_messages):
+            if future.done():
+                continue
+            if saved_message is None:
+                future.set_exception(DuplicateMessageError(
+                    f"El mensaje con id {message.message_id} ya existe o hay un error de integridad en la base de datos"
+                ))
+            else:
+                future.set_result(saved_message)
@@ -2,9 +2,16 @@
 from fastapi import FastAPI
 
 from src.Infrastructure.config.settings import settings
-from src.Infrastructure.database.connection import create_tables
+from src.Infrastructure.database.connection import create_tables, sqlite_pragmas
+from src.Infrastructure.database.dependencies import (
+    close_sqlite_writer,
+    close_write_coalescer,
+    rebuild_message_id_filter,
+)
 
 from src.API.v1.controllers.message_controller import router
+from src.API.v1.controllers.metrics_controller import router as metrics_router
+from src.API.v1.controllers.session_controller import router as sessions_router
 from src.API.exceptions.handlers import register_exception_handlers
 
 app = FastAPI(
@@ -18,6 +25,7 @@ app = FastAPI(
 @app.on_event("startup")
 async def startup_event():
     create_tables()
+    await rebuild_message_id_filter()
 
     base_url = f"http://{settings.HOST}:{settings.PORT}"
 
@@ -30,9 +38,18 @@ async def startup_event():
     print("=" * 60)
 
 
+# Evento de cierre: confirmar las escrituras que sigan agrupadas en memoria o en la cola del escritor
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_write_coalescer()
+    await close_sqlite_writer()
+
+
 
 # Registrar routers
 app.include_router(router, prefix="/api/v1")
+app.include_router(metrics_router, prefix="/api/v1")
+app.include_router(sessions_router, prefix="/api/v1")
 
 # Registrar handlers de errores
 register_exception_handlers(app)
@@ -55,4 +72,9 @@ async def health_check():
         "app_name": settings.APP_NAME,
         "version": settings.APP_VERSION,
         "environment": settings.ENVIRONMENT,
+        "database": {
+            "sqlite_profile": settings.SQLITE_PROFILE,
+            "sqlite_pragmas": sqlite_pragmas,
+            "single_writer": settings.SQLITE_SINGLE_WRITER,
+        },
     }
@@ -0,0 +1 @@
+#Importante: Este paquete contiene herramientas de línea de comandos que trabajan directamente sobre la base de datos.
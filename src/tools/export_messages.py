@@ -0,0 +1,101 @@
+#Importante: Este archivo implementa la exportación de mensajes a NDJSON o CSV desde la línea de comandos.
+#Recorre la tabla con un cursor del lado del servidor, así que la memoria usada no depende del tamaño de la BD. Uso:
+#   python -m src.tools.export_messages [--format ndjson|csv] [--session-id ID] [--from FECHA] [--to FECHA] [--output archivo]
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.API.v1.export import EXPORT_MEDIA_TYPES, encode_export
+from src.Application.dtos.message_dto import MessageDTO
+from src.Application.dtos.pagination_dto import ExportMessagesFilterDTO
+from src.Application.use_cases.export_messages_use_case import ExportMessagesUseCase
+from src.Infrastructure.config.settings import settings
+from src.Infrastructure.database.sqlite_tuning import install_sqlite_pragmas, resolve_sqlite_pragmas
+from src.Infrastructure.repositories.message_repository_impl import MessageRepositoryImpl
+
+
+async def export_messages(
+    database_url: str,
+    filters: ExportMessagesFilterDTO,
+    export_format: str,
+    output: BinaryIO,
+    chunk_size: int = 1000,
+) -> int:
+    """
+    Escribe los mensajes que cumplen los filtros en `output` y retorna cuántos se exportaron.
+    """
+    ExportMessagesUseCase.validate(filters)
+
+    engine = create_async_engine(_async_database_url(database_url))
+    install_sqlite_pragmas(engine, resolve_sqlite_pragmas(settings.SQLITE_PROFILE, settings.sqlite_pragma_overrides()))
+    SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    exported = 0
+
+    async def counted(messages: AsyncIterator[MessageDTO]) -> AsyncIterator[MessageDTO]:
+        nonlocal exported
+        async for message in messages:
+            exported += 1
+            yield message
+
+    try:
+        async with SessionLocal() as session:
+            use_case = ExportMessagesUseCase(repository=MessageRepositoryImpl(session), chunk_size=chunk_size)
+            async for chunk in encode_export(counted(use_case.execute(filters)), export_format):
+                output.write(chunk)
+        output.flush()
+    finally:
+        await engine.dispose()
+
+    return exported
+
+
+def _async_database_url(database_url: str) -> str:
+    if database_url.startswith("sqlite:") and not database_url.startswith("sqlite+"):
+        return database_url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    return database_url
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.export_messages",
+        description="Exporta mensajes de la base de datos a NDJSON o CSV.",
+    )
+    parser.add_argument("--format", choices=sorted(EXPORT_MEDIA_TYPES), default="ndjson", help="Formato de salida")
+    parser.add_argument("--session-id", help="Exportar solo los mensajes de esta sesión")
+    parser.add_argument("--from", dest="start", type=datetime.fromisoformat, help="Incluir mensajes con timestamp >= FECHA (ISO 8601)")
+    parser.add_argument("--to", dest="end", type=datetime.fromisoformat, help="Incluir mensajes con timestamp < FECHA (ISO 8601)")
+    parser.add_argument("--output", type=Path, help="Archivo de salida (por defecto stdout)")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="URL de la base de datos (por defecto DATABASE_URL)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Filas leídas de la BD por bloque")
+    args = parser.parse_args(argv)
+
+    filters = ExportMessagesFilterDTO(session_id=args.session_id, start=args.start, end=args.end)
+    try:
+        ExportMessagesUseCase.validate(filters)
+    except ValueError as e:
+        parser.error(str(e))
+
+    started = time.monotonic()
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        exported = asyncio.run(export_messages(args.database_url, filters, args.format, output, args.chunk_size))
+    finally:
+        if args.output:
+            output.close()
+
+    elapsed = time.monotonic() - started
+    rate = exported / elapsed if elapsed > 0 else 0.0
+    sys.stderr.write(f"[resumen] exportados={exported} tiempo={elapsed:.1f}s filas/s={rate:,.0f}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
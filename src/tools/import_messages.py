@@ -0,0 +1,316 @@
+#Importante: Este archivo implementa la importación masiva de mensajes (JSONL o CSV) directamente en la tabla messages.
+#Aplica las mismas reglas que la API (ContentFilterService y MessageProcessor) pero escribe en transacciones grandes,
+#sin pasar por HTTP. Uso:
+#   python -m src.tools.import_messages archivo.jsonl [--batch-size 50000] [--drop-indexes] [--checkpoint archivo.json]
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import DDL, create_engine
+from sqlalchemy.engine import Engine
+
+from src.API.v1.schemas.message_schema import MessageCreateSchema
+from src.Application.dtos.message_dto import CreateMessageDTO
+from src.Application.use_cases.create_message_use_case import CreateMessageUseCase
+from src.Domain.services.content_filter import ContentFilterService
+from src.Domain.services.message_processor import MessageProcessor
+from src.Infrastructure.config.settings import settings
+from src.Infrastructure.database.models import (
+    MESSAGES_FTS_INSERT_TRIGGER,
+    MESSAGES_FTS_INSERT_TRIGGER_SQL,
+    MESSAGES_FTS_REBUILD_SQL,
+    MessageModel,
+    SESSION_STATS_TRIGGER,
+    SESSION_STATS_TRIGGER_SQL,
+)
+from src.Infrastructure.database.sqlite_tuning import install_sqlite_pragmas, resolve_sqlite_pragmas
+from src.Infrastructure.repositories.message_repository_impl import MessageRepositoryImpl
+from src.tools.rebuild_session_stats import rebuild_session_stats
+
+
+# Registro leído del archivo: (número de registro, payload validado o None, error)
+Record = Tuple[int, Optional[MessageCreateSchema], Optional[str]]
+
+# INSERT precompilado para executemany directo sobre sqlite3: procesar cada parámetro con
+# SQLAlchemy cuesta más que el propio INSERT. Los message_id repetidos se omiten.
+_COLUMNS = (
+    "message_id", "session_id", "content", "timestamp", "sender",
+    "word_count", "character_count", "processed_at",
+)
+_INSERT_SQL = (
+    f"INSERT INTO {MessageModel.__tablename__} ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+    f"ON CONFLICT(message_id) DO NOTHING"
+)
+
+
+#Contadores de la importación; también es el contenido del archivo de checkpoint
+@dataclass
+class ImportStats:
+    records: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+
+
+def iter_records(path: Path, file_format: str, skip: int = 0) -> Iterator[Record]:
+    """
+    Lee el archivo en streaming y valida cada registro con el mismo schema que la API.
+    Los primeros `skip` registros (ya importados según el checkpoint) se saltan sin validarlos.
+    """
+    if file_format == "jsonl":
+        with open(path, "rb") as f:
+            for number, line in enumerate(f, start=1):
+                if number <= skip:
+                    continue
+                line = line.strip()
+                if not line:
+                    continue
+                yield _validate(number, lambda: MessageCreateSchema.model_validate_json(line))
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                if number <= skip:
+                    continue
+                yield _validate(number, lambda: MessageCreateSchema.model_validate(row))
+
+
+def _validate(number: int, parse) -> Record:
+    try:
+        return number, parse(), None
+    except ValidationError as e:
+        error = "; ".join(
+            f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}" for err in e.errors()
+        )
+        return number, None, error
+
+
+def import_messages(
+    engine: Engine,
+    path: Path,
+    file_format: str,
+    batch_size: int = 50000,
+    drop_indexes: bool = False,
+    checkpoint_path: Optional[Path] = None,
+    errors_file: Optional[TextIO] = None,
+    progress_every: float = 5.0,
+    progress_file: Optional[TextIO] = None,
+) -> ImportStats:
+    """
+    Importa el archivo en transacciones de `batch_size` filas con un INSERT ... ON CONFLICT DO NOTHING,
+    así que repetir una importación no duplica mensajes. Tras cada transacción se guarda el checkpoint.
+    """
+    progress_file = progress_file or sys.stderr
+    stats = _load_checkpoint(checkpoint_path)
+    # Solo se usa build_message, que no toca el repositorio
+    builder = CreateMessageUseCase(
+        repository=None,
+        content_filter=ContentFilterService(),
+        message_processor=MessageProcessor(),
+    )
+
+    # Índices secundarios: se eliminan durante la carga y se reconstruyen al final.
+    # El índice único de message_id se conserva porque lo necesita ON CONFLICT.
+    # El trigger de session_stats también se suspende y los contadores se recalculan al final.
+    # Igual con el de búsqueda: reconstruir el índice FTS de una vez es más rápido que fila a fila.
+    # Si una importación anterior se interrumpió sin restaurarlos, se restauran antes de empezar:
+    # sin los triggers, las escrituras de la API dejarían de actualizar session_stats y la búsqueda.
+    if _triggers_missing(engine):
+        _restore_indexes(engine)
+    if drop_indexes:
+        with engine.begin() as conn:
+            for index in _secondary_indexes():
+                index.drop(conn, checkfirst=True)
+            conn.execute(DDL(f"DROP TRIGGER IF EXISTS {SESSION_STATS_TRIGGER}"))
+            conn.execute(DDL(f"DROP TRIGGER IF EXISTS {MESSAGES_FTS_INSERT_TRIGGER}"))
+
+    started = time.monotonic()
+    last_report = started
+    imported_before = stats.records
+    rows: List[tuple] = []
+
+    def flush(last_record: int) -> None:
+        if rows:
+            with engine.begin() as conn:
+                result = conn.exec_driver_sql(_INSERT_SQL, rows)
+            stats.inserted += result.rowcount
+            stats.duplicates += len(rows) - result.rowcount
+            rows.clear()
+        stats.records = last_record
+        _save_checkpoint(checkpoint_path, stats)
+
+    try:
+        last_record = stats.records
+        for number, payload, error in iter_records(path, file_format, skip=stats.records):
+            last_record = number
+            if payload is not None:
+                try:
+                    message = builder.build_message(CreateMessageDTO(
+                        message_id=payload.message_id,
+                        session_id=payload.session_id,
+                        content=payload.content,
+                        timestamp=payload.timestamp,
+                        sender=payload.sender,
+                    ))
+                    rows.append(_to_params(MessageRepositoryImpl._to_row(message)))
+                except ValueError as e:
+                    error = str(e)
+
+            if error is not None:
+                stats.failed += 1
+                if errors_file is not None:
+                    errors_file.write(json.dumps({"record": number, "error": error}, ensure_ascii=False) + "\n")
+
+            if len(rows) >= batch_size:
+                flush(number)
+
+            now = time.monotonic()
+            if progress_every and now - last_report >= progress_every:
+                last_report = now
+                _report(progress_file, stats, last_record - imported_before, now - started, prefix="progreso")
+
+        flush(last_record)
+    finally:
+        # También si la carga falla: lo ya confirmado queda con índices, contadores y búsqueda al día
+        if drop_indexes:
+            _restore_indexes(engine)
+
+    _report(progress_file, stats, stats.records - imported_before, time.monotonic() - started, prefix="resumen")
+    return stats
+
+
+def _secondary_indexes():
+    return [index for index in MessageModel.__table__.indexes if not index.unique]
+
+
+def _triggers_missing(engine: Engine) -> bool:
+    with engine.connect() as conn:
+        names = {name for (name,) in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    return not {SESSION_STATS_TRIGGER, MESSAGES_FTS_INSERT_TRIGGER} <= names
+
+
+def _restore_indexes(engine: Engine) -> None:
+    # Idempotente: recrea lo que falte y recalcula session_stats y el índice FTS desde messages
+    with engine.begin() as conn:
+        for index in _secondary_indexes():
+            index.create(conn, checkfirst=True)
+        rebuild_session_stats(conn)
+        conn.execute(DDL(SESSION_STATS_TRIGGER_SQL))
+        conn.exec_driver_sql(MESSAGES_FTS_REBUILD_SQL)
+        conn.execute(DDL(MESSAGES_FTS_INSERT_TRIGGER_SQL))
+
+
+def _to_params(row: dict) -> tuple:
+    return tuple(
+        _sqlite_datetime(value) if isinstance(value, datetime) else value
+        for value in (row[column] for column in _COLUMNS)
+    )
+
+
+def _sqlite_datetime(value: datetime) -> str:
+    # Mismo formato de texto con el que SQLAlchemy guarda DateTime en SQLite (sin zona horaria)
+    return value.replace(tzinfo=None).isoformat(" ", "microseconds")
+
+
+def _report(out: TextIO, stats: ImportStats, processed: int, elapsed: float, prefix: str) -> None:
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    out.write(
+        f"[{prefix}] registros={stats.records} insertados={stats.inserted} "
+        f"duplicados={stats.duplicates} fallidos={stats.failed} "
+        f"tiempo={elapsed:.1f}s filas/s={rate:,.0f}\n"
+    )
+    out.flush()
+
+
+def _load_checkpoint(path: Optional[Path]) -> ImportStats:
+    if path is None or not path.exists():
+        return ImportStats()
+    with open(path, encoding="utf-8") as f:
+        return ImportStats(**json.load(f))
+
+
+def _save_checkpoint(path: Optional[Path], stats: ImportStats) -> None:
+    if path is None:
+        return
+    # Escritura atómica: un corte a mitad no deja un checkpoint corrupto
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(asdict(stats), f)
+    os.replace(tmp_path, path)
+
+
+def _sync_database_url(database_url: str) -> str:
+    # El importador es síncrono: usa el driver sqlite3 estándar
+    return database_url.replace("sqlite+aiosqlite:", "sqlite:", 1)
+
+
+def _detect_format(path: Path) -> Optional[str]:
+    suffix = path.suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".csv":
+        return "csv"
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.import_messages",
+        description="Importa mensajes desde un archivo JSONL o CSV directamente en la base de datos.",
+    )
+    parser.add_argument("path", type=Path, help="Archivo .jsonl/.ndjson o .csv")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Formato del archivo (por defecto según la extensión)")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="URL de la base de datos (por defecto DATABASE_URL)")
+    parser.add_argument("--sqlite-profile", default=settings.SQLITE_PROFILE, help="Perfil de SQLite durante la carga (durable, balanced, throughput)")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Filas por transacción")
+    parser.add_argument("--drop-indexes", action="store_true", help="Eliminar los índices secundarios (y el trigger de session_stats) durante la carga y reconstruirlos al final")
+    parser.add_argument("--checkpoint", type=Path, help="Archivo de checkpoint para reanudar (por defecto <archivo>.checkpoint.json)")
+    parser.add_argument("--no-checkpoint", action="store_true", help="No leer ni guardar checkpoint")
+    parser.add_argument("--errors", type=Path, help="Archivo NDJSON donde registrar los registros rechazados")
+    parser.add_argument("--progress-every", type=float, default=5.0, help="Segundos entre reportes de progreso")
+    args = parser.parse_args(argv)
+
+    file_format = args.format or _detect_format(args.path)
+    if file_format is None:
+        parser.error("No se pudo deducir el formato por la extensión; use --format")
+    if not args.path.exists():
+        parser.error(f"No existe el archivo {args.path}")
+    if args.batch_size < 1:
+        parser.error("--batch-size debe ser al menos 1")
+
+    checkpoint_path = None
+    if not args.no_checkpoint:
+        checkpoint_path = args.checkpoint or args.path.with_name(args.path.name + ".checkpoint.json")
+
+    engine = create_engine(_sync_database_url(args.database_url))
+    install_sqlite_pragmas(engine, resolve_sqlite_pragmas(args.sqlite_profile, settings.sqlite_pragma_overrides()))
+
+    errors_file = open(args.errors, "a", encoding="utf-8") if args.errors else None
+    try:
+        import_messages(
+            engine,
+            args.path,
+            file_format,
+            batch_size=args.batch_size,
+            drop_indexes=args.drop_indexes,
+            checkpoint_path=checkpoint_path,
+            errors_file=errors_file,
+            progress_every=args.progress_every,
+        )
+    finally:
+        if errors_file is not None:
+            errors_file.close()
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
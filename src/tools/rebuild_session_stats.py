@@ -0,0 +1,123 @@
+#Importante: Este archivo reconstruye la tabla session_stats a partir de la tabla messages.
+#El trigger de messages la mantiene al escribir; esto sirve para el backfill de una BD existente o para
+#corregir los contadores tras modificar messages a mano. Uso:
+#   python -m src.tools.rebuild_session_stats [--session-id ID ...] [--database-url URL]
+import argparse
+import sys
+import time
+from typing import Iterable, List, Optional
+
+from sqlalchemy import case, create_engine, delete, func, insert, select, update
+from sqlalchemy.engine import Connection
+
+from src.Domain.value_objects.sender_type import SenderType
+from src.Infrastructure.config.settings import settings
+from src.Infrastructure.database.models import SESSION_PREVIEW_LENGTH, MessageModel, SessionStatsModel
+from src.Infrastructure.database.sqlite_tuning import install_sqlite_pragmas, resolve_sqlite_pragmas
+
+# Sesiones por sentencia: cada una es un parámetro del IN y SQLite limita su número
+_SESSIONS_PER_STATEMENT = 500
+
+
+def _sender_count(sender: SenderType):
+    return func.count(case((MessageModel.sender == sender.value, 1)))
+
+
+def _aggregate_select():
+    return select(
+        MessageModel.session_id,
+        func.count(),
+        _sender_count(SenderType.USER),
+        _sender_count(SenderType.SYSTEM),
+        func.min(MessageModel.timestamp),
+        func.max(MessageModel.timestamp),
+        func.coalesce(func.sum(MessageModel.word_count), 0),
+        func.coalesce(func.sum(MessageModel.character_count), 0),
+        func.max(MessageModel.id),
+    ).group_by(MessageModel.session_id)
+
+
+_STATS_COLUMNS = [
+    SessionStatsModel.session_id,
+    SessionStatsModel.message_count,
+    SessionStatsModel.user_count,
+    SessionStatsModel.system_count,
+    SessionStatsModel.first_timestamp,
+    SessionStatsModel.last_timestamp,
+    SessionStatsModel.word_count_sum,
+    SessionStatsModel.character_count_sum,
+    SessionStatsModel.last_id,
+]
+
+
+def _latest_message_column(column):
+    # Columna del último mensaje (timestamp, id) de cada sesión: una búsqueda en el índice por sesión
+    return (
+        select(column)
+        .where(MessageModel.session_id == SessionStatsModel.session_id)
+        .order_by(MessageModel.timestamp.desc(), MessageModel.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+_LATEST_MESSAGE_VALUES = {
+    "last_sender": _latest_message_column(MessageModel.sender),
+    "last_message_preview": _latest_message_column(func.substr(MessageModel.content, 1, SESSION_PREVIEW_LENGTH)),
+}
+
+
+def rebuild_session_stats(conn: Connection, session_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Recalcula los contadores de las sesiones indicadas (o de todas) dentro de la transacción de `conn`.
+    Retorna cuántas sesiones quedaron con contadores.
+    """
+    if session_ids is None:
+        conn.execute(delete(SessionStatsModel))
+        result = conn.execute(insert(SessionStatsModel).from_select(_STATS_COLUMNS, _aggregate_select()))
+        conn.execute(update(SessionStatsModel).values(_LATEST_MESSAGE_VALUES))
+        return result.rowcount
+
+    session_ids = list(dict.fromkeys(session_ids))
+    rebuilt = 0
+    for start in range(0, len(session_ids), _SESSIONS_PER_STATEMENT):
+        chunk = session_ids[start:start + _SESSIONS_PER_STATEMENT]
+        # Las sesiones sin mensajes se quedan sin fila, igual que si nunca hubieran existido
+        conn.execute(delete(SessionStatsModel).where(SessionStatsModel.session_id.in_(chunk)))
+        aggregate = _aggregate_select().where(MessageModel.session_id.in_(chunk))
+        result = conn.execute(insert(SessionStatsModel).from_select(_STATS_COLUMNS, aggregate))
+        conn.execute(update(SessionStatsModel).where(SessionStatsModel.session_id.in_(chunk)).values(_LATEST_MESSAGE_VALUES))
+        rebuilt += result.rowcount
+    return rebuilt
+
+
+def _sync_database_url(database_url: str) -> str:
+    return database_url.replace("sqlite+aiosqlite:", "sqlite:", 1)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.rebuild_session_stats",
+        description="Reconstruye los contadores por sesión (session_stats) a partir de la tabla messages.",
+    )
+    parser.add_argument("--session-id", action="append", dest="session_ids", help="Reconstruir solo esta sesión (repetible)")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="URL de la base de datos (por defecto DATABASE_URL)")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(_sync_database_url(args.database_url))
+    install_sqlite_pragmas(engine, resolve_sqlite_pragmas(settings.SQLITE_PROFILE, settings.sqlite_pragma_overrides()))
+
+    started = time.monotonic()
+    try:
+        # Una sola transacción: los lectores ven los contadores anteriores o los nuevos, nunca a medias
+        with engine.begin() as conn:
+            rebuilt = rebuild_session_stats(conn, args.session_ids)
+    finally:
+        engine.dispose()
+
+    sys.stderr.write(f"[resumen] sesiones={rebuilt} tiempo={time.monotonic() - started:.1f}s\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from httpx import AsyncClient
 from src.Infrastructure.database.models import Base
-from src.Infrastructure.database.dependencies import get_db
+from src.Infrastructure.database.dependencies import get_db, get_session_factory, get_sqlite_writer
 from src.main import app
 
 # Fixture para crear una base de datos SQLite asíncrona temporal para cada función de prueba
@@ -66,6 +66,8 @@ async def client_with_db(tmp_path):
 
     app.dependency_overrides.clear()
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: AsyncSessionLocal
+    app.dependency_overrides[get_sqlite_writer] = lambda: None
 
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
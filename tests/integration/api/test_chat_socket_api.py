@@ -0,0 +1,144 @@
+# Test de integración del WebSocket de chat con una BD SQLite real
+import asyncio
+import json
+import pytest
+from sqlalchemy import event
+
+from src.main import app
+from src.Infrastructure.database.dependencies import get_message_hub, get_session_factory
+from src.Infrastructure.events.message_hub import MessageHub
+
+pytestmark = pytest.mark.asyncio
+
+
+def _message(i, session_id=None):
+    message = {
+        "message_id": f"msg-{i:03d}",
+        "content": f"Message {i}",
+        "timestamp": f"2026-01-30T10:00:{i % 60:02d}",
+        "sender": "user",
+    }
+    if session_id is not None:
+        message["session_id"] = session_id
+    return message
+
+
+#Cliente WebSocket mínimo sobre el protocolo ASGI (httpx no soporta WebSocket)
+class ChatSocket:
+
+    def __init__(self, path):
+        self.path = path
+        self._incoming = asyncio.Queue()
+        self._sent = asyncio.Queue()
+
+    async def __aenter__(self):
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "ws",
+            "path": self.path, "raw_path": self.path.encode(), "query_string": b"", "root_path": "",
+            "headers": [(b"host", b"test")], "client": ("test", 1), "server": ("test", 80), "subprotocols": [],
+        }
+        await self._incoming.put({"type": "websocket.connect"})
+        self._task = asyncio.ensure_future(app(scope, self._incoming.get, self._sent.put))
+        self.handshake = await asyncio.wait_for(self._sent.get(), 5)
+        return self
+
+    async def send(self, frame):
+        text = frame if isinstance(frame, str) else json.dumps(frame)
+        await self._incoming.put({"type": "websocket.receive", "text": text})
+
+    async def receive(self):
+        message = await asyncio.wait_for(self._sent.get(), 5)
+        return json.loads(message["text"]) if message["type"] == "websocket.send" else message
+
+    async def __aexit__(self, *exc_info):
+        await self._incoming.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self._task, 5)
+
+
+@pytest.fixture
+def hub():
+    hub = MessageHub()
+    app.dependency_overrides[get_message_hub] = lambda: hub
+    return hub
+
+
+#Cada trama recibe su ack en orden; las inválidas no impiden guardar las demás
+async def test_frames_are_acknowledged_in_order(client_with_db, hub):
+    async with ChatSocket("/api/v1/messages/session-abc/ws") as socket:
+        assert socket.handshake["type"] == "websocket.accept"
+        await socket.send(_message(1))
+        await socket.send("{no es json")
+        await socket.send(_message(2, session_id="other-session"))
+        await socket.send({**_message(3), "sender": "robot"})
+        await socket.send(_message(1))
+        await socket.send(_message(4, session_id="session-abc"))
+
+        acks = [await socket.receive() for _ in range(6)]
+
+    assert [(ack["type"], ack["seq"], ack["status"]) for ack in acks] == [
+        ("ack", 1, "created"), ("ack", 2, "error"), ("ack", 3, "error"),
+        ("ack", 4, "error"), ("ack", 5, "error"), ("ack", 6, "created"),
+    ]
+    assert "session_id" in acks[2]["error"]
+    assert "ya existe" in acks[4]["error"]
+
+    response = await client_with_db.get("/api/v1/messages/session-abc")
+    assert [item["message_id"] for item in response.json()["data"]["items"]] == ["msg-001", "msg-004"]
+    assert hub.stats()["subscribers"] == 0
+
+
+#Las tramas encadenadas sin esperar el ack se guardan en lotes, no con un INSERT por trama
+async def test_pipelined_frames_are_batched_into_few_writes(client_with_db, hub):
+    engine = app.dependency_overrides[get_session_factory]().kw["bind"]
+    inserts = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: inserts.append(statement) if statement.startswith("INSERT INTO messages") else None,
+    )
+
+    async with ChatSocket("/api/v1/messages/session-abc/ws") as socket:
+        for i in range(50):
+            await socket.send(_message(i))
+        acks = [await socket.receive() for _ in range(50)]
+
+    assert all(ack["status"] == "created" for ack in acks)
+    assert [ack["seq"] for ack in acks] == list(range(1, 51))
+    assert 1 <= len(inserts) < 10
+
+
+#Un participante recibe los mensajes de los demás (socket o HTTP) pero no los suyos, que ya confirmó con el ack
+async def test_messages_of_other_participants_are_delivered(client_with_db, hub):
+    async with ChatSocket("/api/v1/messages/session-abc/ws") as alice, ChatSocket("/api/v1/messages/session-abc/ws") as bob:
+        await alice.send(_message(1))
+        assert (await alice.receive())["type"] == "ack"
+        delivered = await bob.receive()
+
+        await client_with_db.post("/api/v1/messages", json={**_message(2), "session_id": "session-abc"})
+        from_http = [await alice.receive(), await bob.receive()]
+
+    assert delivered["type"] == "message"
+    assert (delivered["id"], delivered["data"]["message_id"]) == (1, "msg-001")
+    assert [(frame["type"], frame["data"]["message_id"]) for frame in from_http] == [("message", "msg-002")] * 2
+
+
+#Los mensajes propios no pasan por la cola del hub: un lote mayor que ella no desconecta al que escribe
+async def test_batch_larger_than_hub_queue_keeps_the_writer_connected(client_with_db):
+    hub = MessageHub(max_queue_size=4)
+    app.dependency_overrides[get_message_hub] = lambda: hub
+
+    async with ChatSocket("/api/v1/messages/session-abc/ws") as socket:
+        for i in range(40):
+            await socket.send(_message(i))
+        frames = [await socket.receive() for _ in range(40)]
+
+    assert [(frame["type"], frame["status"]) for frame in frames] == [("ack", "created")] * 40
+    assert (hub.stats()["evictions"], hub.stats()["delivered"]) == (0, 0)
+
+
+async def test_subscriber_limit_rejects_the_connection(client_with_db):
+    hub = MessageHub(max_subscribers=1)
+    hub.subscribe("session-abc")
+    app.dependency_overrides[get_message_hub] = lambda: hub
+
+    async with ChatSocket("/api/v1/messages/session-abc/ws") as socket:
+        assert socket.handshake == {"type": "websocket.close", "code": 1013, "reason": ""}
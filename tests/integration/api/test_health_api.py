@@ -0,0 +1,15 @@
+# Test para el endpoint de salud
+import pytest
+
+from src.Infrastructure.config.settings import settings
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_health_reports_active_sqlite_profile(client_with_db):
+    response = await client_with_db.get("/health")
+
+    assert response.status_code == 200
+    database = response.json()["database"]
+    assert database["sqlite_profile"] == settings.SQLITE_PROFILE
+    assert database["sqlite_pragmas"]["journal_mode"] == "WAL"
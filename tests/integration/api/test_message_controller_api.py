@@ -1,6 +1,15 @@
 # Test para el endpoint de mensajes de la API
+import csv
+import io
+import json
 import pytest
 from datetime import datetime
+from sqlalchemy import event
+
+from src.main import app
+from src.Infrastructure.cache.message_page_cache import MessagePageCache
+from src.Infrastructure.database.dependencies import get_message_page_cache, get_session_factory
+from src.Infrastructure.database.models import MessageModel
 
 # ensure pytest-asyncio applies to module async tests
 pytestmark = pytest.mark.asyncio
@@ -291,3 +300,453 @@ class TestMessageControllerGetEndpoint:
         assert "character_count" in item["metadata"]
         assert item["metadata"]["word_count"] == 2
         assert item["metadata"]["character_count"] == 12
+
+
+@pytest.mark.asyncio
+class TestMessageControllerCursorPagination:
+
+    async def test_get_messages_walks_pages_with_next_cursor(self, client_with_db):
+        client = client_with_db
+        payload = {
+            "messages": [
+                {
+                    "message_id": f"msg-{i:03d}",
+                    "session_id": "session-abc",
+                    "content": f"Message {i}",
+                    "timestamp": "2026-01-30T10:00:00",
+                    "sender": "user",
+                }
+                for i in range(7)
+            ]
+        }
+        await client.post("/api/v1/messages/batch", json=payload)
+
+        seen = []
+        response = await client.get("/api/v1/messages/session-abc", params={"limit": 3})
+        while True:
+            data = response.json()["data"]
+            seen.extend(item["message_id"] for item in data["items"])
+            if data["next_cursor"] is None:
+                break
+            response = await client.get(
+                "/api/v1/messages/session-abc", params={"limit": 3, "after": data["next_cursor"]}
+            )
+
+        assert seen == [f"msg-{i:03d}" for i in range(7)]
+
+        response = await client.get(
+            "/api/v1/messages/session-abc", params={"limit": 3, "before": data["prev_cursor"]}
+        )
+        assert [item["message_id"] for item in response.json()["data"]["items"]] == ["msg-003", "msg-004", "msg-005"]
+
+    async def test_get_messages_with_invalid_cursor_returns_400(self, client_with_db):
+        response = await client_with_db.get("/api/v1/messages/session-abc", params={"after": "???"})
+
+        assert response.status_code == 400
+
+    async def test_get_messages_without_total(self, client_with_db):
+        client = client_with_db
+        for i in range(3):
+            await client.post("/api/v1/messages", json={
+                "message_id": f"msg-{i:03d}",
+                "session_id": "session-abc",
+                "content": f"Message {i}",
+                "timestamp": f"2026-01-30T10:00:0{i}",
+                "sender": "user",
+            })
+
+        response = await client.get("/api/v1/messages/session-abc", params={"limit": 2, "include_total": "false"})
+
+        data = response.json()["data"]
+        assert data["total"] is None
+        assert len(data["items"]) == 2
+        assert data["next_cursor"] is not None
+
+    async def test_get_messages_filters_by_time_range(self, client_with_db):
+        client = client_with_db
+        for i in range(6):
+            await client.post("/api/v1/messages", json={
+                "message_id": f"msg-{i:03d}",
+                "session_id": "session-abc",
+                "content": f"Message {i}",
+                "timestamp": f"2026-01-30T10:0{i}:00",
+                "sender": "user",
+            })
+
+        response = await client.get(
+            "/api/v1/messages/session-abc",
+            params={"from": "2026-01-30T10:01:00", "to": "2026-01-30T10:04:00", "limit": 2},
+        )
+        data = response.json()["data"]
+        rest = await client.get(
+            "/api/v1/messages/session-abc",
+            params={"from": "2026-01-30T10:01:00", "to": "2026-01-30T10:04:00", "after": data["next_cursor"]},
+        )
+
+        assert response.status_code == 200
+        assert data["total"] == 3
+        assert [item["message_id"] for item in data["items"]] == ["msg-001", "msg-002"]
+        assert [item["message_id"] for item in rest.json()["data"]["items"]] == ["msg-003"]
+
+    async def test_get_messages_with_inverted_range_returns_400(self, client_with_db):
+        response = await client_with_db.get(
+            "/api/v1/messages/session-abc", params={"from": "2026-01-31T00:00:00", "to": "2026-01-30T00:00:00"}
+        )
+
+        assert response.status_code == 400
+
+    #La respuesta rápida (orjson) mantiene la forma del JSON y OpenAPI documenta el tipo de data
+    async def test_get_messages_keeps_json_shape_and_typed_openapi(self, client_with_db):
+        client = client_with_db
+        await client.post("/api/v1/messages", json={
+            "message_id": "msg-utc",
+            "session_id": "session-abc",
+            "content": "Hola",
+            "timestamp": "2026-01-30T10:00:00Z",
+            "sender": "user",
+        })
+
+        response = await client.get("/api/v1/messages/session-abc")
+        openapi = (await client.get("/openapi.json")).json()
+
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["ETag"]
+        assert set(response.json()["data"]["items"][0]) == {
+            "message_id", "session_id", "content", "timestamp", "sender", "metadata",
+        }
+        schema = openapi["paths"]["/api/v1/messages/{session_id}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["$ref"].endswith("SuccessResponse_PaginatedMessagesSchema_")
+
+
+@pytest.mark.asyncio
+class TestMessageControllerConditionalGet:
+
+    @staticmethod
+    def _message(message_id, session_id="session-abc"):
+        return {
+            "message_id": message_id,
+            "session_id": session_id,
+            "content": "Hello world",
+            "timestamp": "2026-01-30T10:00:00",
+            "sender": "user",
+        }
+
+    async def test_matching_etag_returns_304_without_reading_messages(self, client_with_db):
+        client = client_with_db
+        await client.post("/api/v1/messages", json=self._message("msg-001"))
+        first = await client.get("/api/v1/messages/session-abc")
+        etag = first.headers["etag"]
+
+        engine = app.dependency_overrides[get_session_factory]().kw["bind"]
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        response = await client.get("/api/v1/messages/session-abc", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert len(statements) == 1
+        assert "session_stats" in statements[0] and "messages" not in statements[0]
+
+    #Los filtros se validan antes del ETag: una petición inválida es 400 aunque el ETag coincida
+    async def test_invalid_query_with_matching_etag_returns_400(self, client_with_db):
+        client = client_with_db
+        await client.post("/api/v1/messages", json=self._message("msg-001"))
+        etag = (await client.get("/api/v1/messages/session-abc")).headers["etag"]
+
+        for params in ({"after": "???"}, {"from": "2026-01-31T00:00:00", "to": "2026-01-30T00:00:00"}):
+            response = await client.get("/api/v1/messages/session-abc", params=params, headers={"If-None-Match": etag})
+            assert response.status_code == 400
+
+    async def test_write_to_session_changes_etag(self, client_with_db):
+        client = client_with_db
+        await client.post("/api/v1/messages", json=self._message("msg-001"))
+        etag = (await client.get("/api/v1/messages/session-abc")).headers["etag"]
+
+        await client.post("/api/v1/messages", json=self._message("msg-other", session_id="other-session"))
+        unchanged = await client.get("/api/v1/messages/session-abc", headers={"If-None-Match": f'W/{etag}, "x"'})
+        await client.post("/api/v1/messages", json=self._message("msg-002"))
+        changed = await client.get("/api/v1/messages/session-abc", headers={"If-None-Match": etag})
+
+        assert unchanged.status_code == 304
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert len(changed.json()["data"]["items"]) == 2
+
+    #Si otro proceso escribe en la sesión, la página en caché no se sirve con el ETag de la nueva versión
+    async def test_write_from_another_process_under_warm_cache_returns_fresh_page(self, client_with_db):
+        client = client_with_db
+        app.dependency_overrides[get_message_page_cache] = lambda: MessagePageCache()
+        await client.post("/api/v1/messages", json=self._message("msg-001"))
+        first = await client.get("/api/v1/messages/session-abc")
+
+        async with app.dependency_overrides[get_session_factory]()() as session:
+            session.add(MessageModel(
+                message_id="msg-002", session_id="session-abc", content="Hello again",
+                timestamp=datetime(2026, 1, 30, 10, 0, 1), sender="user",
+            ))
+            await session.commit()
+        second = await client.get("/api/v1/messages/session-abc")
+        replay = await client.get("/api/v1/messages/session-abc", headers={"If-None-Match": second.headers["etag"]})
+
+        assert second.headers["etag"] != first.headers["etag"]
+        assert [item["message_id"] for item in second.json()["data"]["items"]] == ["msg-001", "msg-002"]
+        assert replay.status_code == 304
+
+
+@pytest.mark.asyncio
+class TestMessageControllerBatchEndpoint:
+
+    async def test_post_batch_creates_all_messages(self, client_with_db):
+        client = client_with_db
+        payload = {
+            "messages": [
+                {
+                    "message_id": f"msg-{i:03d}",
+                    "session_id": "session-abc",
+                    "content": f"Message {i}",
+                    "timestamp": datetime.now().isoformat(),
+                    "sender": "user",
+                }
+                for i in range(5)
+            ]
+        }
+
+        response = await client.post("/api/v1/messages/batch", json=payload)
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["created"] == 5
+        assert data["failed"] == 0
+
+        response = await client.get("/api/v1/messages/session-abc")
+        assert response.json()["data"]["total"] == 5
+
+    async def test_post_batch_reports_duplicates_without_aborting(self, client_with_db):
+        client = client_with_db
+        existing = {
+            "message_id": "msg-001",
+            "session_id": "session-abc",
+            "content": "Hello world",
+            "timestamp": datetime.now().isoformat(),
+            "sender": "user",
+        }
+        await client.post("/api/v1/messages", json=existing)
+
+        payload = {
+            "messages": [
+                existing,
+                {**existing, "message_id": "msg-002"},
+                {**existing, "message_id": "msg-003", "content": "This is spam"},
+                {**existing, "message_id": "msg-002"},
+            ]
+        }
+
+        response = await client.post("/api/v1/messages/batch", json=payload)
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert [item["status"] for item in data["items"]] == ["error", "created", "error", "error"]
+        assert data["created"] == 1
+        assert data["failed"] == 3
+
+        response = await client.get("/api/v1/messages/session-abc")
+        assert response.json()["data"]["total"] == 2
+
+    async def test_post_batch_with_empty_list_returns_422(self, client_with_db):
+        client = client_with_db
+
+        response = await client.post("/api/v1/messages/batch", json={"messages": []})
+
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+class TestMessageControllerStreamEndpoint:
+
+    async def test_post_stream_ingests_ndjson_and_reports_each_line(self, client_with_db):
+        import json
+
+        client = client_with_db
+        lines = [
+            json.dumps({
+                "message_id": f"msg-{i:03d}",
+                "session_id": "session-abc",
+                "content": f"Message {i}",
+                "timestamp": datetime.now().isoformat(),
+                "sender": "user",
+            })
+            for i in range(3)
+        ]
+        lines.append("not json")
+        lines.append(lines[0])
+        body = ("\n".join(lines) + "\n").encode()
+
+        async def chunks():
+            # Fragmentos pequeños para que las líneas lleguen partidas
+            for start in range(0, len(body), 17):
+                yield body[start:start + 17]
+
+        response = await client.post(
+            "/api/v1/messages/stream",
+            content=chunks(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [(r["line"], r["status"]) for r in results[:-1]] == [
+            (1, "created"), (2, "created"), (3, "created"), (4, "error"), (5, "error")
+        ]
+        assert results[-1] == {"summary": {"created": 3, "failed": 2}}
+
+        response = await client.get("/api/v1/messages/session-abc")
+        assert response.json()["data"]["total"] == 3
+
+    async def test_post_stream_with_wrong_content_type_returns_415(self, client_with_db):
+        client = client_with_db
+
+        response = await client.post("/api/v1/messages/stream", json=[{"message_id": "msg-001"}])
+
+        assert response.status_code == 415
+
+
+@pytest.mark.asyncio
+class TestMessageControllerIdempotentPost:
+
+    async def test_idempotent_retry_returns_200_with_replay_header(self, client_with_db):
+        client = client_with_db
+        payload = {
+            "message_id": "msg-001",
+            "session_id": "session-abc",
+            "content": "Hello world",
+            "timestamp": "2026-01-30T14:30:00",
+            "sender": "user",
+        }
+
+        first = await client.post("/api/v1/messages?idempotent=true", json=payload)
+        retry = await client.post("/api/v1/messages?idempotent=true", json=payload)
+
+        assert first.status_code == 201
+        assert "X-Idempotent-Replay" not in first.headers
+        assert retry.status_code == 200
+        assert retry.headers["X-Idempotent-Replay"] == "true"
+        assert retry.json()["data"] == first.json()["data"]
+
+        response = await client.get("/api/v1/messages/session-abc")
+        assert response.json()["data"]["total"] == 1
+
+    async def test_idempotent_post_with_different_content_returns_400(self, client_with_db):
+        client = client_with_db
+        payload = {
+            "message_id": "msg-001",
+            "session_id": "session-abc",
+            "content": "Hello world",
+            "timestamp": "2026-01-30T14:30:00",
+            "sender": "user",
+        }
+        await client.post("/api/v1/messages?idempotent=true", json=payload)
+
+        response = await client.post(
+            "/api/v1/messages?idempotent=true", json={**payload, "content": "Other content"}
+        )
+
+        assert response.status_code == 400
+
+    async def test_duplicate_without_idempotent_flag_still_returns_400(self, client_with_db):
+        client = client_with_db
+        payload = {
+            "message_id": "msg-001",
+            "session_id": "session-abc",
+            "content": "Hello world",
+            "timestamp": "2026-01-30T14:30:00",
+            "sender": "user",
+        }
+        await client.post("/api/v1/messages", json=payload)
+
+        response = await client.post("/api/v1/messages", json=payload)
+
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+class TestMessageControllerExportEndpoint:
+
+    async def _seed(self, client):
+        payload = {
+            "messages": [
+                {
+                    "message_id": f"msg-{i:03d}",
+                    "session_id": "session-abc" if i % 2 == 0 else "session-xyz",
+                    "content": f"Message {i}",
+                    "timestamp": f"2026-01-30T10:0{i}:00",
+                    "sender": "user",
+                }
+                for i in range(6)
+            ]
+        }
+        await client.post("/api/v1/messages/batch", json=payload)
+
+    async def test_export_streams_all_messages_as_ndjson(self, client_with_db):
+        client = client_with_db
+        await self._seed(client)
+
+        response = await client.get("/api/v1/messages/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["message_id"] for line in lines] == [f"msg-{i:03d}" for i in range(6)]
+        assert lines[0]["timestamp"] == "2026-01-30T10:00:00"
+        assert lines[0]["metadata"]["word_count"] == 2
+
+    async def test_export_filters_by_session_and_time_range(self, client_with_db):
+        client = client_with_db
+        await self._seed(client)
+
+        response = await client.get(
+            "/api/v1/messages/export",
+            params={"session_id": "session-abc", "from": "2026-01-30T10:01:00", "to": "2026-01-30T10:04:00"},
+        )
+
+        assert [json.loads(line)["message_id"] for line in response.text.splitlines()] == ["msg-002"]
+
+    async def test_export_as_csv_includes_header(self, client_with_db):
+        client = client_with_db
+        await self._seed(client)
+
+        response = await client.get("/api/v1/messages/export", params={"format": "csv", "session_id": "session-xyz"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["message_id"] for row in rows] == ["msg-001", "msg-003", "msg-005"]
+        assert rows[0]["word_count"] == "2"
+
+    async def test_export_with_inverted_range_returns_400(self, client_with_db):
+        response = await client_with_db.get(
+            "/api/v1/messages/export", params={"from": "2026-01-31T00:00:00", "to": "2026-01-30T00:00:00"}
+        )
+
+        assert response.status_code == 400
+
+    async def test_export_with_unknown_format_returns_422(self, client_with_db):
+        response = await client_with_db.get("/api/v1/messages/export", params={"format": "xml"})
+
+        assert response.status_code == 422
+
+    #El endpoint de debug ya no carga toda la tabla: pagina por id con un límite acotado
+    async def test_debug_all_messages_is_paginated_by_id(self, client_with_db):
+        client = client_with_db
+        await self._seed(client)
+
+        first = (await client.get("/api/v1/messages/debug/all", params={"limit": 4})).json()["data"]
+        second = (await client.get(
+            "/api/v1/messages/debug/all", params={"limit": 4, "after_id": first["next_after_id"]}
+        )).json()["data"]
+        too_large = await client.get("/api/v1/messages/debug/all", params={"limit": 100000})
+
+        assert [m["message_id"] for m in first["messages"] + second["messages"]] == [f"msg-{i:03d}" for i in range(6)]
+        assert (first["count"], second["count"], second["next_after_id"]) == (4, 2, None)
+        assert too_large.status_code == 422
@@ -0,0 +1,124 @@
+# Test de integración del flujo SSE de mensajes nuevos con una BD SQLite real
+import asyncio
+import json
+import pytest
+
+from src.main import app
+from src.Infrastructure.database.dependencies import get_message_hub
+from src.Infrastructure.events.message_hub import MessageHub
+
+pytestmark = pytest.mark.asyncio
+
+
+def _message(i, session_id="session-abc"):
+    return {
+        "message_id": f"msg-{session_id}-{i:03d}",
+        "session_id": session_id,
+        "content": f"Message {i}",
+        "timestamp": f"2026-01-30T10:00:{i:02d}",
+        "sender": "user",
+    }
+
+
+def _parse_events(chunk: bytes):
+    events = []
+    for block in chunk.decode("utf-8").split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+#Cliente SSE mínimo: httpx acumula todo el cuerpo de la respuesta ASGI antes de retornarla,
+#así que se llama a la aplicación directamente y se lee cada fragmento a medida que se envía
+class EventStream:
+
+    def __init__(self, path, headers=()):
+        self.path = path
+        self.headers = [(b"host", b"test"), *[(k.encode(), v.encode()) for k, v in headers]]
+        self._sent = asyncio.Queue()
+        self._disconnected = asyncio.Event()
+
+    async def _receive(self):
+        await self._disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def __aenter__(self):
+        path, _, query = self.path.partition("?")
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+            "root_path": "", "headers": self.headers, "client": ("test", 1), "server": ("test", 80),
+        }
+        self._task = asyncio.ensure_future(app(scope, self._receive, self._sent.put))
+        self.start = await asyncio.wait_for(self._sent.get(), 5)
+        return self
+
+    async def read(self) -> bytes:
+        message = await asyncio.wait_for(self._sent.get(), 5)
+        return message["body"]
+
+    async def __aexit__(self, *exc_info):
+        self._disconnected.set()
+        await asyncio.wait_for(self._task, 5)
+
+
+@pytest.fixture
+def hub():
+    hub = MessageHub()
+    app.dependency_overrides[get_message_hub] = lambda: hub
+    return hub
+
+
+#Un mensaje creado por POST llega como evento `message` con el id de la fila como id del evento
+async def test_created_message_is_pushed_to_subscribers(client_with_db, hub):
+    async with EventStream("/api/v1/messages/session-abc/events") as stream:
+        assert stream.start["status"] == 200
+        assert (b"content-type", b"text/event-stream; charset=utf-8") in stream.start["headers"]
+
+        await client_with_db.post("/api/v1/messages", json=_message(0))
+        await client_with_db.post("/api/v1/messages", json=_message(0, session_id="other-session"))
+        await client_with_db.post("/api/v1/messages/batch", json={"messages": [_message(1), _message(2)]})
+
+        events = []
+        while len(events) < 3:
+            events += _parse_events(await stream.read())
+
+    assert [(event_id, name, data["message_id"]) for event_id, name, data in events] == [
+        (1, "message", "msg-session-abc-000"),
+        (3, "message", "msg-session-abc-001"),
+        (4, "message", "msg-session-abc-002"),
+    ]
+    assert events[0][2]["metadata"]["word_count"] == 2
+    # Al desconectarse el cliente se libera la suscripción
+    assert hub.stats()["subscribers"] == 0
+
+
+#Al reconectar con Last-Event-ID se reenvían desde la BD los mensajes posteriores
+async def test_last_event_id_replays_missed_messages(client_with_db, hub):
+    for i in range(4):
+        await client_with_db.post("/api/v1/messages", json=_message(i))
+
+    async with EventStream("/api/v1/messages/session-abc/events", headers=[("last-event-id", "2")]) as stream:
+        replayed = _parse_events(await stream.read())
+        await client_with_db.post("/api/v1/messages", json=_message(4))
+        live = _parse_events(await stream.read())
+
+    assert [event_id for event_id, _, _ in replayed] == [3, 4]
+    assert [event_id for event_id, _, _ in live] == [5]
+
+
+async def test_invalid_last_event_id_returns_400(client_with_db, hub):
+    response = await client_with_db.get("/api/v1/messages/session-abc/events", params={"last_event_id": "abc"})
+
+    assert response.status_code == 400
+
+
+async def test_subscriber_limit_returns_503(client_with_db):
+    hub = MessageHub(max_subscribers=1)
+    hub.subscribe("session-abc")
+    app.dependency_overrides[get_message_hub] = lambda: hub
+
+    response = await client_with_db.get("/api/v1/messages/session-abc/events")
+
+    assert response.status_code == 503
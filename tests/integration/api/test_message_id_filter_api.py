@@ -0,0 +1,70 @@
+# Test de integración del filtro de Bloom de message_id con una BD SQLite real
+import pytest
+from datetime import datetime
+
+from src.main import app
+from src.Infrastructure.cache.message_id_bloom_filter import MessageIdBloomFilter
+from src.Infrastructure.config.settings import settings
+from src.Infrastructure.database.dependencies import get_message_id_filter, rebuild_message_id_filter
+from src.Infrastructure.database import dependencies
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_rebuild_loads_existing_ids_from_database(client_with_db, monkeypatch):
+    client = client_with_db
+    await client.post("/api/v1/messages/batch", json={"messages": [
+        {
+            "message_id": f"msg-{i:03d}",
+            "session_id": "session-abc",
+            "content": f"Message {i}",
+            "timestamp": datetime.now().isoformat(),
+            "sender": "user",
+        }
+        for i in range(5)
+    ]})
+
+    monkeypatch.setattr(settings, "MESSAGE_ID_FILTER_ENABLED", True)
+    monkeypatch.setattr(dependencies, "_message_id_filter", None)
+
+    # Se reconstruye desde la misma BD temporal que usa el cliente
+    session_factory = app.dependency_overrides[dependencies.get_session_factory]()
+    await rebuild_message_id_filter(session_factory)
+    bloom = get_message_id_filter()
+
+    assert bloom.ready is True
+    assert bloom.items == 5
+    assert all(bloom.might_contain(f"msg-{i:03d}") for i in range(5))
+
+
+async def test_duplicate_post_with_filter_enabled_returns_400(client_with_db):
+    client = client_with_db
+    bloom = MessageIdBloomFilter(false_positive_rate=0.01, max_memory_bytes=1024)
+    bloom.mark_ready()
+    app.dependency_overrides[get_message_id_filter] = lambda: bloom
+    payload = {
+        "message_id": "msg-001",
+        "session_id": "session-abc",
+        "content": "Hello world",
+        "timestamp": datetime.now().isoformat(),
+        "sender": "user",
+    }
+
+    first = await client.post("/api/v1/messages", json=payload)
+    duplicate = await client.post("/api/v1/messages", json=payload)
+    stats = await client.get("/api/v1/metrics/message-id-filter")
+
+    assert first.status_code == 201
+    assert duplicate.status_code == 400
+    data = stats.json()["data"]
+    assert data["enabled"] is True
+    assert data["items"] == 1
+    assert data["checks"] == 2
+    assert data["definite_misses"] == 1
+    assert data["fill_ratio"] > 0
+
+
+async def test_message_id_filter_stats_when_disabled(client_with_db):
+    response = await client_with_db.get("/api/v1/metrics/message-id-filter")
+
+    assert response.json()["data"] == {"enabled": False}
@@ -0,0 +1,58 @@
+# Test de integración de la caché de páginas de mensajes con una BD SQLite real
+import pytest
+
+from src.main import app
+from src.Infrastructure.cache.message_page_cache import MessagePageCache
+from src.Infrastructure.database.dependencies import get_message_page_cache
+
+pytestmark = pytest.mark.asyncio
+
+
+def _message(i, session_id="session-abc"):
+    return {
+        "message_id": f"msg-{session_id}-{i:03d}",
+        "session_id": session_id,
+        "content": f"Message {i}",
+        "timestamp": f"2026-01-30T10:00:{i:02d}",
+        "sender": "user",
+    }
+
+
+#Cada forma de escribir en la sesión invalida sus páginas; las demás sesiones siguen en caché
+async def test_writes_invalidate_cached_pages_of_their_session(client_with_db):
+    client = client_with_db
+    page_cache = MessagePageCache()
+    app.dependency_overrides[get_message_page_cache] = lambda: page_cache
+    await client.post("/api/v1/messages", json=_message(0))
+    await client.post("/api/v1/messages", json=_message(0, session_id="other-session"))
+
+    async def total(session_id="session-abc"):
+        response = await client.get(f"/api/v1/messages/{session_id}")
+        return response.json()["data"]["total"]
+
+    assert await total() == 1
+    assert await total("other-session") == 1
+    assert await total() == 1
+
+    await client.post("/api/v1/messages/batch", json={"messages": [_message(1), _message(2)]})
+    assert await total() == 3
+
+    await client.post(
+        "/api/v1/messages/stream",
+        content=b'{"message_id": "msg-stream", "session_id": "session-abc", "content": "Hola", '
+                b'"timestamp": "2026-01-30T10:00:30", "sender": "system"}\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert await total() == 4
+    assert await total("other-session") == 1
+
+    stats = (await client.get("/api/v1/metrics/message-page-cache")).json()["data"]
+    assert stats["enabled"] is True
+    assert (stats["hits"], stats["misses"]) == (2, 4)
+    assert stats["invalidations"] == 5
+
+
+async def test_message_page_cache_stats_when_disabled(client_with_db):
+    response = await client_with_db.get("/api/v1/metrics/message-page-cache")
+
+    assert response.json()["data"] == {"enabled": False}
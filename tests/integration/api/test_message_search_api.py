@@ -0,0 +1,106 @@
+# Test de integración de la búsqueda de texto completo con una BD SQLite real (FTS5)
+import pytest
+
+from src.Infrastructure.config.settings import settings
+
+pytestmark = pytest.mark.asyncio
+
+
+def _message(i, content, session_id="session-abc"):
+    return {
+        "message_id": f"msg-{session_id}-{i:03d}",
+        "session_id": session_id,
+        "content": content,
+        "timestamp": f"2026-01-30T10:00:{i:02d}",
+        "sender": "user",
+    }
+
+
+async def _post_all(client, messages):
+    response = await client.post("/api/v1/messages/batch", json={"messages": messages})
+    assert response.json()["data"]["failed"] == 0
+
+
+#Busca sin distinguir tildes ni mayúsculas, ordena por relevancia y marca las coincidencias
+async def test_search_ranks_matches_with_snippets(client_with_db):
+    await _post_all(client_with_db, [
+        _message(1, "La canción de ayer"),
+        _message(2, "Canción, canción y más CANCION"),
+        _message(3, "Nada que ver"),
+        _message(4, "otra cancion", session_id="session-xyz"),
+    ])
+
+    response = await client_with_db.get("/api/v1/messages/search", params={"q": "cancion"})
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [hit["message"]["message_id"] for hit in data["items"]] == [
+        "msg-session-abc-002", "msg-session-xyz-004", "msg-session-abc-001",
+    ]
+    assert data["items"][0]["snippet"] == "<mark>Canción</mark>, <mark>canción</mark> y más <mark>CANCION</mark>"
+    assert data["items"][0]["score"] > data["items"][2]["score"]
+    assert data["next_cursor"] is None
+    assert data["truncated"] is False
+
+
+#El filtro por sesión, los prefijos y la paginación con cursor recorren todos los resultados una sola vez
+async def test_search_in_session_with_prefix_and_cursor(client_with_db):
+    await _post_all(client_with_db, [_message(i, f"pago pendiente número {i}") for i in range(7)])
+    await _post_all(client_with_db, [_message(9, "pago pendiente", session_id="session-xyz")])
+
+    seen, after = [], None
+    while True:
+        params = {"q": "pend* pago", "session_id": "session-abc", "limit": 3}
+        if after:
+            params["after"] = after
+        data = (await client_with_db.get("/api/v1/messages/search", params=params)).json()["data"]
+        seen.extend(hit["message"]["message_id"] for hit in data["items"])
+        after = data["next_cursor"]
+        if after is None:
+            break
+
+    assert sorted(seen) == [f"msg-session-abc-{i:03d}" for i in range(7)]
+
+
+async def _search_all(client, params, between_pages=None):
+    seen, after, data = [], None, None
+    while True:
+        page_params = dict(params, after=after) if after else params
+        data = (await client.get("/api/v1/messages/search", params=page_params)).json()["data"]
+        seen.extend(hit["message"]["message_id"] for hit in data["items"])
+        after = data["next_cursor"]
+        if after is None:
+            return seen, data
+        if between_pages is not None:
+            await between_pages()
+
+
+#Con más coincidencias que SEARCH_MAX_CANDIDATES se pagina por las más recientes y la respuesta lo avisa
+async def test_search_past_max_candidates_reports_truncated(client_with_db, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_MAX_CANDIDATES", 5)
+    await _post_all(client_with_db, [_message(i, "pago " + "extra " * (i % 3)) for i in range(12)])
+
+    seen, last_page = await _search_all(client_with_db, {"q": "pago", "limit": 2})
+
+    assert sorted(seen) == [f"msg-session-abc-{i:03d}" for i in range(7, 12)]
+    assert last_page["truncated"] is True
+
+
+#Los mensajes guardados entre dos páginas no se cuelan ni hacen saltar o repetir resultados
+async def test_search_cursor_is_stable_when_messages_arrive_between_pages(client_with_db):
+    await _post_all(client_with_db, [_message(i, "pago " + "extra " * (i % 4)) for i in range(10)])
+    arrivals = iter(range(20, 30))
+
+    async def insert_match():
+        i = next(arrivals)
+        await _post_all(client_with_db, [_message(i, "pago pago " + "extra " * (i % 5))])
+
+    seen, _ = await _search_all(client_with_db, {"q": "pago", "limit": 3}, between_pages=insert_match)
+
+    assert sorted(seen) == [f"msg-session-abc-{i:03d}" for i in range(10)]
+
+
+async def test_search_rejects_queries_without_words(client_with_db):
+    response = await client_with_db.get("/api/v1/messages/search", params={"q": '"*"'})
+
+    assert response.status_code == 400
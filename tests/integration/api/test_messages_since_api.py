@@ -0,0 +1,90 @@
+# Test de integración del long-poll de mensajes nuevos con una BD SQLite real
+import asyncio
+import pytest
+from sqlalchemy import event
+
+from src.main import app
+from src.Infrastructure.database.dependencies import get_message_hub, get_session_factory
+from src.Infrastructure.events.message_hub import MessageHub
+
+pytestmark = pytest.mark.asyncio
+
+
+def _message(i, session_id="session-abc"):
+    return {
+        "message_id": f"msg-{session_id}-{i:03d}",
+        "session_id": session_id,
+        "content": f"Message {i}",
+        "timestamp": f"2026-01-30T10:00:{i:02d}",
+        "sender": "user",
+    }
+
+
+@pytest.fixture
+def hub():
+    hub = MessageHub()
+    app.dependency_overrides[get_message_hub] = lambda: hub
+    return hub
+
+
+def _statements():
+    engine = app.dependency_overrides[get_session_factory]().kw["bind"]
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+async def _since(client, query):
+    response = await client.get(f"/api/v1/messages/session-abc/since?{query}")
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+#Sin cursor retorna la posición actual; con cursor retorna enseguida lo guardado después
+async def test_returns_messages_after_cursor_immediately(client_with_db, hub):
+    await client_with_db.post("/api/v1/messages", json=_message(0))
+    start = await _since(client_with_db, "")
+    for i in range(1, 4):
+        await client_with_db.post("/api/v1/messages", json=_message(i))
+
+    data = await _since(client_with_db, f"cursor={start['next_cursor']}&wait=30s&limit=2")
+
+    assert start["items"] == []
+    assert [item["message_id"] for item in data["items"]] == ["msg-session-abc-001", "msg-session-abc-002"]
+    rest = await _since(client_with_db, f"cursor={data['next_cursor']}")
+    assert [item["message_id"] for item in rest["items"]] == ["msg-session-abc-003"]
+
+
+#Una petición en espera se despierta con el mensaje creado por POST
+async def test_parked_request_is_woken_by_new_message(client_with_db, hub):
+    start = await _since(client_with_db, "")
+
+    poll = asyncio.ensure_future(_since(client_with_db, f"cursor={start['next_cursor']}&wait=5s"))
+    while hub.stats()["subscribers"] == 0:
+        await asyncio.sleep(0.01)
+    await client_with_db.post("/api/v1/messages", json=_message(1, session_id="other-session"))
+    await client_with_db.post("/api/v1/messages", json=_message(2))
+    data = await asyncio.wait_for(poll, 5)
+
+    assert [item["message_id"] for item in data["items"]] == ["msg-session-abc-002"]
+    assert int(data["next_cursor"]) > int(start["next_cursor"])
+    assert hub.stats()["subscribers"] == 0
+
+
+#Un cliente al día que vuelve a sondear tras agotar la espera no genera consultas a la BD
+async def test_idle_polls_do_not_query_database(client_with_db, hub):
+    await client_with_db.post("/api/v1/messages", json=_message(0))
+    cursor = (await _since(client_with_db, ""))["next_cursor"]
+
+    statements = _statements()
+    for _ in range(3):
+        data = await _since(client_with_db, f"cursor={cursor}&wait=50ms")
+        assert (data["items"], data["next_cursor"]) == ([], cursor)
+
+    assert statements == []
+
+
+async def test_invalid_cursor_or_wait_returns_400(client_with_db, hub):
+    for query in ("cursor=abc", "cursor=1&wait=forever"):
+        response = await client_with_db.get(f"/api/v1/messages/session-abc/since?{query}")
+        assert response.status_code == 400
@@ -0,0 +1,50 @@
+# Test de integración del directorio de sesiones con una BD SQLite real
+import pytest
+from sqlalchemy import event
+
+from src.main import app
+from src.Infrastructure.database.dependencies import get_session_factory
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _post(client, message_id, session_id, minute, sender="user", content=None):
+    response = await client.post("/api/v1/messages", json={
+        "message_id": message_id,
+        "session_id": session_id,
+        "content": content or f"Mensaje {message_id}",
+        "timestamp": f"2026-01-30T10:{minute:02d}:00",
+        "sender": sender,
+    })
+    assert response.status_code == 201
+
+
+#Las sesiones se listan por última actividad, con el resumen de su último mensaje
+async def test_lists_sessions_by_last_activity(client_with_db):
+    await _post(client_with_db, "msg-1", "session-a", 1)
+    await _post(client_with_db, "msg-2", "session-b", 2)
+    await _post(client_with_db, "msg-3", "session-c", 3)
+    await _post(client_with_db, "msg-4", "session-a", 4, sender="system", content="Respuesta " + "larga " * 40)
+
+    engine = app.dependency_overrides[get_session_factory]().kw["bind"]
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    response = await client_with_db.get("/api/v1/sessions", params={"limit": 2})
+    data = response.json()["data"]
+    rest = (await client_with_db.get("/api/v1/sessions", params={"limit": 2, "after": data["next_cursor"]})).json()["data"]
+
+    assert response.status_code == 200
+    assert [s["session_id"] for s in data["items"]] == ["session-a", "session-c"]
+    first = data["items"][0]
+    assert (first["message_count"], first["last_sender"]) == (2, "system")
+    assert (first["first_message_at"], first["last_message_at"]) == ("2026-01-30T10:01:00", "2026-01-30T10:04:00")
+    assert first["last_message_preview"].startswith("Respuesta larga") and len(first["last_message_preview"]) == 120
+    assert [s["session_id"] for s in rest["items"]] == ["session-b"]
+    assert rest["next_cursor"] is None
+    assert all("messages" not in statement for statement in statements)
+
+
+async def test_invalid_cursor_returns_400(client_with_db):
+    response = await client_with_db.get("/api/v1/sessions", params={"after": "???"})
+
+    assert response.status_code == 400
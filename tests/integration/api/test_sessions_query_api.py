@@ -0,0 +1,65 @@
+# Test de integración de la consulta de varias sesiones con una BD SQLite real
+import pytest
+from sqlalchemy import event
+
+from src.main import app
+from src.Infrastructure.database.dependencies import get_session_factory
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _seed(client, sessions):
+    payload = {
+        "messages": [
+            {
+                "message_id": f"msg-{session_id}-{i:03d}",
+                "session_id": session_id,
+                "content": f"Message {i}",
+                "timestamp": f"2026-01-30T10:00:{i:02d}",
+                "sender": "user" if i % 2 else "system",
+            }
+            for session_id, count in sessions.items()
+            for i in range(count)
+        ]
+    }
+    response = await client.post("/api/v1/messages/batch", json=payload)
+    assert response.json()["data"]["failed"] == 0
+
+
+def _statements():
+    engine = app.dependency_overrides[get_session_factory]().kw["bind"]
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+#Retorna los últimos mensajes y el total de cada sesión, en el orden pedido, con dos consultas en total
+async def test_returns_latest_messages_of_each_session(client_with_db):
+    await _seed(client_with_db, {"session-a": 5, "session-b": 2, "session-c": 1})
+
+    statements = _statements()
+    response = await client_with_db.post(
+        "/api/v1/messages/sessions/query",
+        json={"session_ids": ["session-b", "session-missing", "session-a"], "limit": 3},
+    )
+
+    assert response.status_code == 200
+    sessions = response.json()["data"]["sessions"]
+    assert [(s["session_id"], s["total"]) for s in sessions] == [("session-b", 2), ("session-missing", 0), ("session-a", 5)]
+    assert [m["message_id"] for m in sessions[0]["items"]] == ["msg-session-b-000", "msg-session-b-001"]
+    assert sessions[1]["items"] == []
+    assert [m["message_id"] for m in sessions[2]["items"]] == ["msg-session-a-002", "msg-session-a-003", "msg-session-a-004"]
+    assert sessions[2]["items"][0]["metadata"]["word_count"] == 2
+    assert len(statements) == 2
+
+
+async def test_invalid_requests_are_rejected(client_with_db):
+    empty = await client_with_db.post("/api/v1/messages/sessions/query", json={"session_ids": []})
+    blank = await client_with_db.post("/api/v1/messages/sessions/query", json={"session_ids": [""]})
+    too_many = await client_with_db.post(
+        "/api/v1/messages/sessions/query", json={"session_ids": [f"session-{i}" for i in range(101)]}
+    )
+
+    assert empty.status_code == 422
+    assert blank.status_code == 400
+    assert too_many.status_code == 400
@@ -0,0 +1,68 @@
+# Test de integración del coalescedor de escrituras con la API y una BD SQLite real
+import asyncio
+import pytest
+from datetime import datetime
+from httpx import AsyncClient
+
+from src.main import app
+from src.Infrastructure.database.dependencies import get_db, get_write_coalescer
+from src.Infrastructure.repositories.message_repository_impl import MessageRepositoryImpl
+from src.Infrastructure.repositories.write_coalescer import WriteCoalescer
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_concurrent_posts_are_group_committed(test_db):
+    SessionLocal = test_db
+
+    async def save_many(messages):
+        async with SessionLocal() as session:
+            return await MessageRepositoryImpl(session).save_many(messages)
+
+    coalescer = WriteCoalescer(save_many, max_batch_size=64, max_latency_ms=20)
+
+    async def override_get_db():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides.clear()
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_write_coalescer] = lambda: coalescer
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            payloads = [
+                {
+                    "message_id": f"msg-{i:03d}",
+                    "session_id": "session-abc",
+                    "content": f"Message {i}",
+                    "timestamp": datetime.now().isoformat(),
+                    "sender": "user",
+                }
+                for i in range(20)
+            ]
+            # El último repite un message_id: solo esa petición debe fallar
+            payloads.append(dict(payloads[0]))
+
+            responses = await asyncio.gather(*(client.post("/api/v1/messages", json=p) for p in payloads))
+
+            assert sorted(r.status_code for r in responses) == [201] * 20 + [400]
+
+            response = await client.get("/api/v1/messages/session-abc?limit=100")
+            assert response.json()["data"]["total"] == 20
+
+            response = await client.get("/api/v1/metrics/write-coalescer")
+            metrics = response.json()["data"]
+            assert metrics["enabled"] is True
+            assert metrics["messages"] == 21
+            assert metrics["batches"] < 21
+    finally:
+        await coalescer.close()
+        app.dependency_overrides.clear()
+
+
+async def test_write_coalescer_metrics_when_disabled(client_with_db):
+    response = await client_with_db.get("/api/v1/metrics/write-coalescer")
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {"enabled": False}
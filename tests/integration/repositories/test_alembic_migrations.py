@@ -0,0 +1,134 @@
+# Test de las migraciones de Alembic contra una BD SQLite temporal
+import sqlite3
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+from src.Infrastructure.config.settings import settings
+from src.Infrastructure.database.models import MessageModel
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+def _alembic_config():
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    return config
+
+
+def _indexes(db_path):
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'messages' AND sql IS NOT NULL"
+        ).fetchall()
+    return {name for (name,) in rows}
+
+
+#La última migración debe dejar exactamente los índices declarados en el modelo, y poder revertirse
+def test_upgrade_head_matches_model_indexes(tmp_path, monkeypatch):
+    db_path = tmp_path / "migrated.db"
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{db_path}")
+    config = _alembic_config()
+
+    command.upgrade(config, "head")
+
+    assert _indexes(db_path) == {index.name for index in MessageModel.__table__.indexes}
+
+    command.downgrade(config, "f9fc9c8c91ad")
+
+    assert "ix_messages_session_id" in _indexes(db_path)
+    assert "ix_messages_session_timestamp_id" not in _indexes(db_path)
+
+
+#La migración de session_stats rellena los contadores de los mensajes existentes e instala el trigger
+def test_session_stats_migration_backfills_existing_messages(tmp_path, monkeypatch):
+    db_path = tmp_path / "migrated.db"
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{db_path}")
+    config = _alembic_config()
+    command.upgrade(config, "b41e7c2d9a53")
+
+    insert_sql = (
+        "INSERT INTO messages (message_id, session_id, content, timestamp, sender, word_count, character_count) "
+        "VALUES (?, 'session-abc', 'Hola', ?, ?, 1, 4)"
+    )
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(insert_sql, ("msg-1", "2026-01-30 10:00:00.000000", "user"))
+        conn.execute(insert_sql, ("msg-2", "2026-01-30 10:05:00.000000", "system"))
+
+    command.upgrade(config, "head")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(insert_sql, ("msg-3", "2026-01-30 09:00:00.000000", "user"))
+        stats = conn.execute(
+            "SELECT message_count, user_count, system_count, first_timestamp, last_timestamp, word_count_sum, last_id "
+            "FROM session_stats WHERE session_id = 'session-abc'"
+        ).fetchone()
+
+    assert stats == (3, 2, 1, "2026-01-30 09:00:00.000000", "2026-01-30 10:05:00.000000", 3, 3)
+
+    command.downgrade(config, "b41e7c2d9a53")
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name LIKE '%session_stats%'").fetchall() == []
+
+
+#La migración de búsqueda indexa los mensajes existentes y los triggers mantienen el índice al escribir
+def test_messages_fts_migration_indexes_existing_messages(tmp_path, monkeypatch):
+    db_path = tmp_path / "migrated.db"
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{db_path}")
+    config = _alembic_config()
+    command.upgrade(config, "d3a9f5b27e14")
+
+    insert_sql = (
+        "INSERT INTO messages (message_id, session_id, content, timestamp, sender) "
+        "VALUES (?, 'session-abc', ?, '2026-01-30 10:00:00.000000', 'user')"
+    )
+    search_sql = "SELECT rowid FROM messages_fts WHERE messages_fts MATCH 'canción' ORDER BY rowid"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(insert_sql, ("msg-1", "Una canción antigua"))
+
+    command.upgrade(config, "head")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(insert_sql, ("msg-2", "Otra cancion nueva"))
+        conn.execute(insert_sql, ("msg-3", "Sin coincidencias"))
+        conn.execute("UPDATE messages SET content = 'Ya no' WHERE message_id = 'msg-1'")
+        assert conn.execute(search_sql).fetchall() == [(2,)]
+        conn.execute("INSERT INTO messages_fts (messages_fts) VALUES ('integrity-check')")
+
+    command.downgrade(config, "d3a9f5b27e14")
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name LIKE '%messages_fts%'").fetchall() == []
+
+
+#La migración del directorio de sesiones rellena el último mensaje de cada sesión y el trigger lo mantiene
+def test_session_directory_migration_backfills_last_message(tmp_path, monkeypatch):
+    db_path = tmp_path / "migrated.db"
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{db_path}")
+    config = _alembic_config()
+    command.upgrade(config, "e6c4a1b9d852")
+
+    insert_sql = (
+        "INSERT INTO messages (message_id, session_id, content, timestamp, sender) "
+        "VALUES (?, 'session-abc', ?, ?, ?)"
+    )
+    directory_sql = "SELECT last_sender, last_message_preview FROM session_stats WHERE session_id = 'session-abc'"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(insert_sql, ("msg-1", "Hola", "2026-01-30 10:05:00.000000", "user"))
+        conn.execute(insert_sql, ("msg-2", "Anterior", "2026-01-30 10:00:00.000000", "system"))
+
+    command.upgrade(config, "head")
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute(directory_sql).fetchone() == ("user", "Hola")
+        conn.execute(insert_sql, ("msg-3", "Todavía más antiguo", "2026-01-30 09:00:00.000000", "system"))
+        assert conn.execute(directory_sql).fetchone() == ("user", "Hola")
+        conn.execute(insert_sql, ("msg-4", "x" * 500, "2026-01-30 11:00:00.000000", "system"))
+        assert conn.execute(directory_sql).fetchone() == ("system", "x" * 120)
+        assert "ix_session_stats_last_timestamp_session_id" in {
+            name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+
+    command.downgrade(config, "e6c4a1b9d852")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(insert_sql, ("msg-5", "Tras revertir", "2026-01-30 12:00:00.000000", "user"))
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(session_stats)")}
+        assert "last_sender" not in columns
+        assert conn.execute("SELECT message_count, last_id FROM session_stats").fetchone() == (5, 5)
@@ -0,0 +1,106 @@
+# Test de los planes de consulta (EXPLAIN QUERY PLAN) de MessageRepositoryImpl contra una BD SQLite real
+import pytest
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.Application.dtos.pagination_dto import MessageCursor, SessionCursor
+from src.Domain.value_objects.search_term import SearchTerm
+from src.Infrastructure.repositories.message_repository_impl import MessageRepositoryImpl
+from src.Infrastructure.repositories.session_repository_impl import SessionRepositoryImpl
+
+pytestmark = pytest.mark.asyncio
+
+CURSOR = MessageCursor(timestamp=datetime(2026, 1, 30, 10, 0, 0), id=10)
+START, END = datetime(2026, 1, 30, 9, 0, 0), datetime(2026, 1, 30, 10, 0, 0)
+RANGE_SEEK = "ix_messages_session_timestamp_id (session_id=? AND timestamp>? AND timestamp<?)"
+
+
+#Captura las sentencias que el repositorio envía realmente a SQLite
+class StatementRecorder:
+
+    def __init__(self, engine):
+        self.statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+
+async def _drain(messages):
+    async for _ in messages:
+        pass
+
+
+async def _plan_of(engine, call):
+    SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    recorder = StatementRecorder(engine)
+    async with SessionLocal() as session:
+        await call(MessageRepositoryImpl(session))
+    statement, parameters = recorder.statements[-1]
+
+    async with engine.connect() as conn:
+        rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize(
+    "call, index",
+    [
+        (lambda r: r.get_by_session("s", limit=20, offset=0), "ix_messages_session_timestamp_id"),
+        (lambda r: r.get_by_session("s", limit=20, offset=40), "ix_messages_session_timestamp_id"),
+        (lambda r: r.get_by_session("s", limit=20, offset=0, after=CURSOR), "ix_messages_session_timestamp_id"),
+        (lambda r: r.get_by_session("s", limit=20, offset=0, before=CURSOR), "ix_messages_session_timestamp_id"),
+        (lambda r: r.get_by_session("s", limit=20, offset=0, sender="user"), "ix_messages_session_sender_timestamp_id"),
+        (lambda r: r.get_by_session("s", limit=20, offset=0, sender="user", after=CURSOR), "ix_messages_session_sender_timestamp_id"),
+        (lambda r: r.get_by_session("s", limit=20, offset=0, sender="user", before=CURSOR), "ix_messages_session_sender_timestamp_id"),
+        (lambda r: r.count_by_session("s"), "SEARCH session_stats USING INDEX sqlite_autoindex_session_stats_1"),
+        (lambda r: r.count_by_session("s", sender="user"), "SEARCH session_stats USING INDEX sqlite_autoindex_session_stats_1"),
+        (lambda r: r.get_page_by_session("s", limit=20, offset=0), "ix_messages_session_timestamp_id"),
+        (lambda r: r.get_page_by_session("s", limit=20, offset=0, sender="user", after=CURSOR), "ix_messages_session_sender_timestamp_id"),
+        (lambda r: r.get_by_session("s", limit=20, offset=0, start=START, end=END), RANGE_SEEK),
+        (lambda r: r.get_by_session("s", limit=20, offset=0, after=CURSOR, start=START, end=END), RANGE_SEEK),
+        (lambda r: r.get_by_session("s", limit=20, offset=0, sender="user", start=START), "ix_messages_session_sender_timestamp_id (session_id=? AND sender=? AND timestamp>?)"),
+        (lambda r: r.count_by_session("s", start=START, end=END), f"COVERING INDEX {RANGE_SEEK}"),
+        (lambda r: r.get_page_by_session("s", limit=20, offset=0, start=START, end=END), RANGE_SEEK),
+        (lambda r: r.get_latest_by_sessions(["a", "b"], limit=20), "COVERING INDEX ix_messages_session_timestamp_id (session_id=?)"),
+        (lambda r: r.count_by_sessions(["a", "b"]), "SEARCH session_stats USING INDEX sqlite_autoindex_session_stats_1"),
+        (lambda r: r.get_by_session_after_id("s", after_id=42, limit=100), "SEARCH messages USING INTEGER PRIMARY KEY (rowid>?)"),
+        (lambda r: r.get_last_message_id("s"), "SEARCH session_stats USING INDEX sqlite_autoindex_session_stats_1"),
+        (lambda r: SessionRepositoryImpl(r.db_session).list_recent(21), "SCAN session_stats USING INDEX ix_session_stats_last_timestamp_session_id"),
+        (
+            lambda r: SessionRepositoryImpl(r.db_session).list_recent(21, after=SessionCursor(CURSOR.timestamp, "s")),
+            "SEARCH session_stats USING INDEX ix_session_stats_last_timestamp_session_id ((last_timestamp,session_id)<(?,?))",
+        ),
+        (lambda r: r.search_recent_matches([SearchTerm("hola")], "s", limit=1000), "SCAN messages_fts VIRTUAL TABLE"),
+        (lambda r: r.search_recent_matches([SearchTerm("hola")], "s", limit=1000, max_id=42), "SCAN messages_fts VIRTUAL TABLE"),
+        (lambda r: _drain(r.iter_messages("s")), "ix_messages_session_timestamp_id (session_id=?)"),
+        (lambda r: _drain(r.iter_messages("s", start=START, end=END)), RANGE_SEEK),
+    ],
+    ids=[
+        "page", "page-offset", "page-after", "page-before",
+        "sender-page", "sender-after", "sender-before",
+        "count", "count-sender",
+        "page-with-total", "sender-after-with-total",
+        "range", "range-after", "sender-range", "count-range", "range-with-total",
+        "latest-by-sessions", "count-by-sessions",
+        "events-replay",
+        "last-message-id",
+        "sessions", "sessions-after",
+        "search", "search-max-id",
+        "export-session", "export-session-range",
+    ],
+)
+#Cada consulta por sesión, incluida la exportación en streaming, debe buscar por índice (compuesto, session_stats
+#para los conteos y el directorio de sesiones, la clave primaria para reanudar eventos o el índice de texto
+#completo en su orden de rowid),
+#sin recorrer la tabla ni ordenar en memoria
+async def test_session_queries_use_composite_indexes(test_db_engine, call, index):
+    plan = await _plan_of(test_db_engine, call)
+
+    assert any(index in detail for detail in plan), plan
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
+    assert not any(detail.startswith("SCAN messages") and "INDEX" not in detail for detail in plan), plan
+    # Los conteos ya no recorren las filas de la sesión
+    assert not any("COUNT" in detail or "messages" in detail for detail in plan if "session_stats" in index), plan
@@ -0,0 +1,326 @@
+# Benchmark de sentencias SQL por creación de mensaje contra una BD SQLite real
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.Infrastructure.repositories.message_repository_impl import MessageRepositoryImpl, _ENTITY_COLUMNS
+from src.Infrastructure.repositories.session_repository_impl import SessionRepositoryImpl
+from src.Infrastructure.database.models import MessageModel
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+from src.Domain.services.message_processor import MessageProcessor
+
+pytestmark = pytest.mark.asyncio
+
+CREATES = 200
+
+
+def _message(i):
+    return MessageProcessor().process(MessageEntity(
+        message_id=f"msg-{i:05d}",
+        session_id="session-bench",
+        content=f"Benchmark message {i}",
+        timestamp=datetime(2026, 1, 30, 10, 0, 0),
+        sender=SenderType.USER,
+    ))
+
+
+#Cuenta las sentencias que llegan al cursor de SQLite
+class StatementCounter:
+
+    def __init__(self, engine):
+        self.statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+#Ruta anterior de MessageRepositoryImpl.save: add + commit + refresh
+async def _legacy_save(session, repository, message):
+    model = MessageModel(**repository._to_row(message))
+    session.add(model)
+    await session.commit()
+    await session.refresh(model)
+    return repository._to_entity(model)
+
+
+async def test_save_issues_a_single_statement_per_create(test_db_engine):
+    SessionLocal = sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+    counter = StatementCounter(test_db_engine)
+
+    async with SessionLocal() as session:
+        repository = MessageRepositoryImpl(session)
+        for i in range(CREATES):
+            await repository.save(_message(i))
+
+    assert len(counter.statements) == CREATES
+    assert all(s.startswith("INSERT INTO messages") for s in counter.statements)
+
+
+@pytest.mark.slow
+async def test_benchmark_save_against_refresh_path(test_db_engine):
+    SessionLocal = sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+    counter = StatementCounter(test_db_engine)
+
+    async with SessionLocal() as session:
+        repository = MessageRepositoryImpl(session)
+
+        counter.statements.clear()
+        for i in range(CREATES):
+            await _legacy_save(session, repository, _message(i))
+        legacy_queries = len(counter.statements)
+
+        counter.statements.clear()
+        for i in range(CREATES, 2 * CREATES):
+            await repository.save(_message(i))
+        queries = len(counter.statements)
+
+    assert legacy_queries == 2 * CREATES
+    assert queries == CREATES
+
+
+async def test_idempotent_retry_costs_no_rollback(test_db_engine):
+    SessionLocal = sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+    counter = StatementCounter(test_db_engine)
+    rollbacks = []
+    event.listen(test_db_engine.sync_engine, "rollback", lambda conn: rollbacks.append(conn))
+
+    async with SessionLocal() as session:
+        repository = MessageRepositoryImpl(session)
+        first, created = await repository.save_or_get(_message(1))
+        assert created is True
+
+        counter.statements.clear()
+        retry, created = await repository.save_or_get(_message(1))
+
+    assert created is False
+    assert retry.message_id == first.message_id
+    assert retry.metadata.word_count == first.metadata.word_count
+    # INSERT ... ON CONFLICT DO NOTHING (sin fila) + SELECT de la fila existente
+    assert len(counter.statements) == 2
+    assert "ON CONFLICT" in counter.statements[0]
+    assert rollbacks == []
+
+
+PAGE_SIZE = 100
+PAGES = 50
+
+
+#Ruta anterior de get_by_session: instancias ORM de MessageModel copiadas a MessageEntity
+async def _legacy_get_by_session(session, repository, session_id, limit, offset):
+    stmt = (
+        select(MessageModel)
+        .where(MessageModel.session_id == session_id)
+        .order_by(MessageModel.timestamp.asc(), MessageModel.id.asc())
+        .offset(offset)
+        .limit(limit)
+    )
+    result = await session.execute(stmt)
+    return [repository._to_entity(model) for model in result.scalars().all()]
+
+
+@pytest.mark.slow
+async def test_benchmark_listing_against_orm_path(test_db_engine):
+    SessionLocal = sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with SessionLocal() as session:
+        repository = MessageRepositoryImpl(session)
+        await repository.save_many([_message(i) for i in range(PAGE_SIZE * 5)])
+
+        offsets = [(page % 5) * PAGE_SIZE for page in range(PAGES)]
+        for offset in offsets:
+            legacy_page = await _legacy_get_by_session(session, repository, "session-bench", PAGE_SIZE, offset)
+            # Cada página se carga como lo haría una petición nueva, con el identity map vacío
+            session.expunge_all()
+
+        for offset in offsets:
+            page = await repository.get_by_session("session-bench", PAGE_SIZE, offset)
+
+    assert page == legacy_page
+    assert [m.id for m in page] == [m.id for m in legacy_page]
+    assert all(m.metadata is not None for m in page)
+
+
+RANGE_SIZE = 50
+SMALL_SESSION = 200
+LARGE_SESSION = 20000
+
+
+def _timed_message(i, session_id):
+    return MessageProcessor().process(MessageEntity(
+        message_id=f"msg-{session_id}-{i:05d}",
+        session_id=session_id,
+        content=f"Benchmark message {i}",
+        timestamp=datetime(2026, 1, 30, 10, 0, 0) + timedelta(seconds=i),
+        sender=SenderType.USER,
+    ))
+
+
+#Cuenta las instrucciones de la VM de SQLite (en bloques de 100) que ejecuta cada consulta;
+#a diferencia del tiempo, no depende de la carga de la máquina
+class VmStepCounter:
+
+    def __init__(self):
+        self.steps = 0
+
+    def __call__(self):
+        self.steps += 1
+        return 0
+
+
+async def _measure(session, call):
+    connection = await session.connection()
+    raw = (await connection.get_raw_connection()).driver_connection
+    counter = VmStepCounter()
+    await raw.set_progress_handler(counter, 100)
+    try:
+        result = await call()
+    finally:
+        await raw.set_progress_handler(None, 0)
+    return result, counter.steps
+
+
+async def _range_cost(session, repository, session_id, start, end):
+    (page, total), steps = await _measure(
+        session, lambda: repository.get_page_by_session(session_id, RANGE_SIZE, 0, start=start, end=end)
+    )
+    return page, total, steps
+
+
+@pytest.mark.slow
+async def test_benchmark_range_cost_depends_on_range_not_session(test_db_engine):
+    SessionLocal = sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+    start = datetime(2026, 1, 30, 10, 0, 0) + timedelta(seconds=100)
+    end = start + timedelta(seconds=RANGE_SIZE)
+
+    async with SessionLocal() as session:
+        repository = MessageRepositoryImpl(session)
+        await repository.save_many([_timed_message(i, "session-small") for i in range(SMALL_SESSION)])
+        await repository.save_many([_timed_message(i, "session-large") for i in range(LARGE_SESSION)])
+        # Calentamiento: compila y cachea la sentencia antes de medir
+        await repository.get_page_by_session("session-small", RANGE_SIZE, 0, start=start, end=end)
+
+        small_page, small_total, small_steps = await _range_cost(session, repository, "session-small", start, end)
+        large_page, large_total, large_steps = await _range_cost(session, repository, "session-large", start, end)
+        wide_end = start + timedelta(seconds=RANGE_SIZE * 100)
+        _, wide_total, wide_steps = await _range_cost(session, repository, "session-large", start, wide_end)
+
+    assert small_total == large_total == RANGE_SIZE
+    assert len(small_page) == len(large_page) == RANGE_SIZE
+    assert large_page[0].timestamp == start
+    # La búsqueda por rango en el índice (session_id, timestamp, id) solo recorre las filas del rango:
+    # 100 veces más mensajes en la sesión apenas cambian el trabajo (un nivel más del B-tree como mucho)
+    assert large_steps <= small_steps * 1.5
+    # Lo que sí encarece la consulta es el tamaño del rango, por el conteo del total
+    assert wide_total == RANGE_SIZE * 100
+    assert wide_steps > large_steps * 5
+
+
+DASHBOARD_SESSIONS = 50
+DASHBOARD_SESSION_SIZE = 400
+DASHBOARD_LIMIT = 20
+
+
+#Alternativa con ROW_NUMBER() OVER (PARTITION BY session_id ...): una consulta, pero numera todas las filas de cada sesión
+async def _window_latest_by_sessions(session, repository, session_ids, limit):
+    messages = MessageModel.__table__
+    position = func.row_number().over(
+        partition_by=messages.c.session_id,
+        order_by=(messages.c.timestamp.desc(), messages.c.id.desc()),
+    ).label("position")
+    ranked = select(messages, position).where(messages.c.session_id.in_(session_ids)).subquery()
+    stmt = select(*[ranked.c[c.name] for c in _ENTITY_COLUMNS]).where(ranked.c.position <= limit)
+    result = await session.execute(stmt)
+    return repository._rows_to_entities(result.all())
+
+
+async def _pages(repository, session_ids):
+    pages = {}
+    for session_id in session_ids:
+        pages[session_id] = await repository.get_page_by_session(
+            session_id, DASHBOARD_LIMIT, DASHBOARD_SESSION_SIZE - DASHBOARD_LIMIT
+        )
+    return pages
+
+
+async def _latest_and_totals(repository, session_ids):
+    latest = await repository.get_latest_by_sessions(session_ids, DASHBOARD_LIMIT)
+    return latest, await repository.count_by_sessions(session_ids)
+
+
+@pytest.mark.slow
+async def test_benchmark_sessions_query_against_one_request_per_session(test_db_engine):
+    SessionLocal = sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+    counter = StatementCounter(test_db_engine)
+    session_ids = [f"session-{s:02d}" for s in range(DASHBOARD_SESSIONS)]
+
+    async with SessionLocal() as session:
+        repository = MessageRepositoryImpl(session)
+        await repository.save_many([
+            _timed_message(i, session_id) for session_id in session_ids for i in range(DASHBOARD_SESSION_SIZE)
+        ])
+
+        # Ruta anterior: un GET por sesión, cada uno con su página y su total
+        counter.statements.clear()
+        per_session, per_session_steps = await _measure(session, lambda: _pages(repository, session_ids))
+        per_session_queries = len(counter.statements)
+
+        window, window_steps = await _measure(
+            session, lambda: _window_latest_by_sessions(session, repository, session_ids, DASHBOARD_LIMIT)
+        )
+
+        counter.statements.clear()
+        (latest, totals), steps = await _measure(session, lambda: _latest_and_totals(repository, session_ids))
+        queries = len(counter.statements)
+
+    assert per_session_queries == DASHBOARD_SESSIONS
+    assert queries == 2
+    assert {session_id: [m.id for m in page] for session_id, (page, _) in per_session.items()} == {
+        session_id: [m.id for m in messages] for session_id, messages in latest.items()
+    }
+    assert sorted(m.id for m in window) == sorted(m.id for messages in latest.values() for m in messages)
+    assert set(totals.values()) == {DASHBOARD_SESSION_SIZE}
+    # Solo se leen las últimas filas de cada sesión: ROW_NUMBER() recorre las sesiones completas
+    assert steps * 5 < window_steps
+
+
+DIRECTORY_SESSIONS = 500
+DIRECTORY_SESSION_SIZE = 40
+DIRECTORY_PAGE = 20
+
+
+#Alternativa sin directorio: agrupar messages por sesión y ordenar por el último timestamp de cada una
+async def _derived_recent_sessions(session, limit):
+    last_timestamp = func.max(MessageModel.timestamp).label("last_timestamp")
+    stmt = (
+        select(MessageModel.session_id, func.count(), func.min(MessageModel.timestamp), last_timestamp)
+        .group_by(MessageModel.session_id)
+        .order_by(last_timestamp.desc(), MessageModel.session_id.desc())
+        .limit(limit)
+    )
+    result = await session.execute(stmt)
+    return [row.session_id for row in result.all()]
+
+
+@pytest.mark.slow
+async def test_benchmark_session_directory_against_derived_listing(test_db_engine):
+    SessionLocal = sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with SessionLocal() as session:
+        await MessageRepositoryImpl(session).save_many([
+            _timed_message(i * DIRECTORY_SESSIONS + s, f"session-{s:03d}")
+            for s in range(DIRECTORY_SESSIONS)
+            for i in range(DIRECTORY_SESSION_SIZE)
+        ])
+        repository = SessionRepositoryImpl(session)
+
+        derived, derived_steps = await _measure(session, lambda: _derived_recent_sessions(session, DIRECTORY_PAGE))
+        page, steps = await _measure(session, lambda: repository.list_recent(DIRECTORY_PAGE))
+
+    assert [s.session_id for s in page] == derived
+    assert page[0].session_id == f"session-{DIRECTORY_SESSIONS - 1:03d}"
+    # El directorio lee solo las filas de la página; agrupar recorre todos los mensajes
+    assert steps * 100 < derived_steps
@@ -0,0 +1,128 @@
+# Test de la paginación (cursor y página + total) de MessageRepositoryImpl contra una BD SQLite real
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from src.Application.dtos.pagination_dto import MessageCursor
+from src.Infrastructure.repositories.message_repository_impl import MessageRepositoryImpl
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+
+pytestmark = pytest.mark.asyncio
+
+MESSAGES = 57
+
+
+async def _seed(session):
+    # Varios mensajes comparten timestamp: el id debe desempatar sin saltar ni repetir filas
+    base = datetime(2026, 1, 30, 10, 0, 0)
+    await MessageRepositoryImpl(session).save_many([
+        MessageEntity(
+            message_id=f"msg-{i:03d}",
+            session_id="session-keyset",
+            content=f"Message {i}",
+            timestamp=base + timedelta(seconds=i // 4),
+            sender=SenderType.USER if i % 2 else SenderType.SYSTEM,
+        )
+        for i in range(MESSAGES)
+    ])
+
+
+def _cursor(message):
+    return MessageCursor(timestamp=message.timestamp, id=message.id)
+
+
+#Recorrer la sesión hacia adelante con after visita cada mensaje una sola vez y en orden
+async def test_after_walks_every_message_once(test_db):
+    async with test_db() as session:
+        await _seed(session)
+        repository = MessageRepositoryImpl(session)
+
+        seen = []
+        page = await repository.get_by_session("session-keyset", limit=10, offset=0)
+        while page:
+            seen.extend(m.message_id for m in page)
+            page = await repository.get_by_session("session-keyset", limit=10, offset=0, after=_cursor(page[-1]))
+
+    assert seen == [f"msg-{i:03d}" for i in range(MESSAGES)]
+
+
+#Recorrer hacia atrás con before entrega páginas en orden ascendente
+async def test_before_walks_backwards(test_db):
+    async with test_db() as session:
+        await _seed(session)
+        repository = MessageRepositoryImpl(session)
+
+        last = (await repository.get_by_session("session-keyset", limit=1, offset=MESSAGES - 1))[0]
+        pages = []
+        page = await repository.get_by_session("session-keyset", limit=10, offset=0, before=_cursor(last))
+        while page:
+            pages.append([m.message_id for m in page])
+            page = await repository.get_by_session("session-keyset", limit=10, offset=0, before=_cursor(page[0]))
+
+    seen = [message_id for page in reversed(pages) for message_id in page]
+    assert seen == [f"msg-{i:03d}" for i in range(MESSAGES - 1)]
+    assert all(page == sorted(page) for page in pages)
+
+
+#El cursor se combina con el filtro por remitente
+async def test_after_with_sender_filter(test_db):
+    async with test_db() as session:
+        await _seed(session)
+        repository = MessageRepositoryImpl(session)
+
+        first = await repository.get_by_session("session-keyset", limit=5, offset=0, sender="user")
+        second = await repository.get_by_session(
+            "session-keyset", limit=5, offset=0, sender="user", after=_cursor(first[-1])
+        )
+
+    assert [m.message_id for m in first + second] == [f"msg-{i:03d}" for i in range(1, 20, 2)]
+
+
+#Página y total deben llegar en una sola sentencia, también cuando la página está vacía
+async def test_page_with_total_uses_a_single_statement(test_db):
+    async with test_db() as session:
+        await _seed(session)
+        repository = MessageRepositoryImpl(session)
+        statements = []
+        event.listen(session.bind.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        page, total = await repository.get_page_by_session("session-keyset", limit=10, offset=25, sender="system")
+        empty_page, empty_total = await repository.get_page_by_session("session-keyset", limit=10, offset=500)
+
+    assert len(statements) == 2
+    assert [m.message_id for m in page] == [f"msg-{i:03d}" for i in range(0, MESSAGES, 2)][25:]
+    assert total == (MESSAGES + 1) // 2
+    assert (empty_page, empty_total) == ([], MESSAGES)
+
+
+#Sin total se ejecuta solo la consulta de la página
+async def test_page_without_total(test_db):
+    async with test_db() as session:
+        await _seed(session)
+        repository = MessageRepositoryImpl(session)
+
+        page, total = await repository.get_page_by_session("session-keyset", limit=5, offset=0, include_total=False)
+
+    assert total is None
+    assert [m.message_id for m in page] == [f"msg-{i:03d}" for i in range(5)]
+
+
+#El rango [start, end) se combina con el cursor, el remitente y el total
+async def test_time_range_limits_page_cursor_and_total(test_db):
+    base = datetime(2026, 1, 30, 10, 0, 0)
+    start, end = base + timedelta(seconds=3), base + timedelta(seconds=9)
+    async with test_db() as session:
+        await _seed(session)
+        repository = MessageRepositoryImpl(session)
+
+        page, total = await repository.get_page_by_session("session-keyset", limit=10, offset=0, start=start, end=end)
+        rest = await repository.get_by_session("session-keyset", limit=50, offset=0, after=_cursor(page[-1]), start=start, end=end)
+        user_total = await repository.count_by_session("session-keyset", sender="user", start=start, end=end)
+        open_ended = await repository.count_by_session("session-keyset", start=base + timedelta(seconds=13))
+
+    in_range = [f"msg-{i:03d}" for i in range(12, 36)]
+    assert total == len(in_range)
+    assert [m.message_id for m in page + rest] == in_range
+    assert user_total == len(in_range) // 2
+    assert open_ended == MESSAGES - 52
@@ -0,0 +1,134 @@
+# Test de los contadores por sesión (session_stats) que mantiene el trigger de messages y del directorio de sesiones
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select
+
+from src.Application.dtos.pagination_dto import SessionCursor
+from src.Infrastructure.database.models import SessionStatsModel
+from src.Infrastructure.repositories.message_repository_impl import MessageRepositoryImpl
+from src.Infrastructure.repositories.session_repository_impl import SessionRepositoryImpl
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+from src.Domain.services.message_processor import MessageProcessor
+
+pytestmark = pytest.mark.asyncio
+
+BASE = datetime(2026, 1, 30, 10, 0, 0)
+
+
+def _message(i, session_id="session-stats", sender=SenderType.USER):
+    return MessageProcessor().process(MessageEntity(
+        message_id=f"msg-{session_id}-{i:03d}",
+        session_id=session_id,
+        content=f"Mensaje numero {i}",
+        timestamp=BASE + timedelta(minutes=i),
+        sender=sender,
+    ))
+
+
+async def _stats(session, session_id):
+    result = await session.execute(select(SessionStatsModel).where(SessionStatsModel.session_id == session_id))
+    return result.scalar_one_or_none()
+
+
+#Todas las rutas de escritura actualizan los contadores; los duplicados no cuentan
+async def test_writes_maintain_session_stats(test_db):
+    async with test_db() as session:
+        repository = MessageRepositoryImpl(session)
+        await repository.save(_message(5))
+        await repository.save_many([
+            _message(1, sender=SenderType.SYSTEM),
+            _message(9),
+            _message(1, sender=SenderType.SYSTEM),
+            _message(0, session_id="other-session"),
+        ])
+        await repository.save_or_get(_message(3, sender=SenderType.SYSTEM))
+        await repository.save_or_get(_message(3, sender=SenderType.SYSTEM))
+
+        stats = await _stats(session, "session-stats")
+
+    assert stats.message_count == 4
+    assert (stats.user_count, stats.system_count) == (2, 2)
+    assert (stats.first_timestamp, stats.last_timestamp) == (BASE + timedelta(minutes=1), BASE + timedelta(minutes=9))
+    assert stats.word_count_sum == 4 * 3
+    assert stats.character_count_sum == 4 * len("Mensaje numero 0")
+
+
+#Un INSERT rechazado por duplicado se revierte junto con su actualización de contadores
+async def test_rejected_insert_does_not_change_stats(test_db):
+    async with test_db() as session:
+        repository = MessageRepositoryImpl(session)
+        await repository.save(_message(1))
+        with pytest.raises(ValueError):
+            await repository.save(_message(1))
+
+        stats = await _stats(session, "session-stats")
+
+    assert stats.message_count == 1
+
+
+#count_by_session lee los contadores, también para sesiones y remitentes sin mensajes
+async def test_count_by_session_reads_session_stats(test_db):
+    async with test_db() as session:
+        repository = MessageRepositoryImpl(session)
+        await repository.save_many([_message(i, sender=SenderType.USER if i % 3 else SenderType.SYSTEM) for i in range(10)])
+
+        assert await repository.count_by_session("session-stats") == 10
+        assert await repository.count_by_session("session-stats", sender="system") == 4
+        assert await repository.count_by_session("session-stats", sender="user") == 6
+        assert await repository.count_by_session("session-stats", sender="robot") == 0
+        assert await repository.count_by_session("missing-session") == 0
+        assert await repository.get_page_by_session("missing-session", limit=10, offset=0) == ([], 0)
+
+
+#La versión de la sesión cambia con cada mensaje guardado en ella, y solo en ella
+async def test_session_version_changes_on_each_insert(test_db):
+    async with test_db() as session:
+        repository = MessageRepositoryImpl(session)
+        assert await repository.get_session_version("session-stats") == "0-0"
+
+        await repository.save(_message(1))
+        first = await repository.get_session_version("session-stats")
+        await repository.save(_message(2, session_id="other-session"))
+        unchanged = await repository.get_session_version("session-stats")
+        await repository.save_many([_message(0)])
+        second = await repository.get_session_version("session-stats")
+
+    assert first == unchanged
+    assert second != first
+
+
+#El trigger guarda el remitente y la vista previa del último mensaje en orden (timestamp, id)
+async def test_writes_maintain_last_message_summary(test_db):
+    async with test_db() as session:
+        repository = MessageRepositoryImpl(session)
+        await repository.save(_message(5))
+        await repository.save_many([_message(2, sender=SenderType.SYSTEM), _message(5, session_id="other-session")])
+        unchanged = await _stats(session, "session-stats")
+        assert (unchanged.last_sender, unchanged.last_message_preview) == ("user", "Mensaje numero 5")
+
+        await repository.save(_message(9, sender=SenderType.SYSTEM))
+        # El trigger actualiza la fila por debajo del ORM: se descarta la instancia ya cargada
+        session.expire_all()
+        latest = await _stats(session, "session-stats")
+
+    assert (latest.last_sender, latest.last_message_preview) == ("system", "Mensaje numero 9")
+
+
+#El directorio de sesiones se recorre por última actividad, con session_id como desempate entre páginas
+async def test_list_recent_walks_sessions_by_last_activity(test_db):
+    async with test_db() as session:
+        await MessageRepositoryImpl(session).save_many([
+            _message(minute, session_id=f"session-{name}")
+            for name, minute in [("a", 1), ("b", 7), ("c", 3), ("d", 7), ("e", 5), ("a", 8)]
+        ])
+        repository = SessionRepositoryImpl(session)
+
+        seen = []
+        page = await repository.list_recent(limit=2)
+        while page:
+            seen.extend(s.session_id for s in page)
+            last = page[-1]
+            page = await repository.list_recent(limit=2, after=SessionCursor(last.last_timestamp, last.session_id))
+
+    assert seen == ["session-a", "session-d", "session-b", "session-e", "session-c"]
@@ -0,0 +1,94 @@
+# Test del escritor único con pool de lectores de solo lectura contra una BD SQLite real
+import asyncio
+import pytest
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.Infrastructure.database.models import Base
+from src.Infrastructure.database.sqlite_tuning import SQLITE_PROFILES, install_sqlite_pragmas
+from src.Infrastructure.database.sqlite_writer import SQLiteWriter
+from src.Infrastructure.repositories.message_repository_impl import MessageRepositoryImpl
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+
+pytestmark = pytest.mark.asyncio
+
+
+def _message(i, session_id="session-writer"):
+    return MessageEntity(
+        message_id=f"msg-{i:04d}",
+        session_id=session_id,
+        content=f"Message {i}",
+        timestamp=datetime(2026, 1, 30, 10, 0, i % 60),
+        sender=SenderType.USER,
+    )
+
+
+# Misma configuración que connection.py con SQLITE_SINGLE_WRITER activo
+@pytest.fixture
+async def single_writer_db(tmp_path):
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'single_writer.db'}"
+    pragmas = SQLITE_PROFILES["balanced"]
+
+    write_engine = create_async_engine(database_url, poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0)
+    install_sqlite_pragmas(write_engine, pragmas)
+    read_engine = create_async_engine(database_url, poolclass=AsyncAdaptedQueuePool, pool_size=4, max_overflow=0)
+    install_sqlite_pragmas(read_engine, {**pragmas, "query_only": "ON"})
+
+    async with write_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    writer = SQLiteWriter(sessionmaker(write_engine, class_=AsyncSession, expire_on_commit=False))
+    ReadSessionLocal = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        yield writer, ReadSessionLocal
+    finally:
+        await writer.close()
+        await read_engine.dispose()
+        await write_engine.dispose()
+
+
+#Escrituras concurrentes desde sesiones distintas no deben provocar "database is locked"
+async def test_concurrent_writes_go_through_the_single_writer(single_writer_db):
+    writer, ReadSessionLocal = single_writer_db
+
+    async def create(i):
+        async with ReadSessionLocal() as session:
+            return await MessageRepositoryImpl(session, writer=writer).save(_message(i))
+
+    saved = await asyncio.gather(*(create(i) for i in range(100)))
+
+    assert len(saved) == 100
+    assert writer.completed == 100
+
+    async with ReadSessionLocal() as session:
+        assert await MessageRepositoryImpl(session).count_by_session("session-writer") == 100
+
+
+#Los duplicados siguen reportándose como error aunque la escritura ocurra en el escritor
+async def test_duplicate_is_reported_through_the_writer(single_writer_db):
+    writer, ReadSessionLocal = single_writer_db
+
+    async with ReadSessionLocal() as session:
+        repository = MessageRepositoryImpl(session, writer=writer)
+        await repository.save(_message(1))
+        with pytest.raises(ValueError):
+            await repository.save(_message(1))
+
+        saved, created = await repository.save_or_get(_message(1))
+        assert created is False
+        assert saved.message_id == "msg-0001"
+
+
+#Las conexiones del pool de lectura no pueden escribir
+async def test_reader_connections_are_read_only(single_writer_db):
+    _, ReadSessionLocal = single_writer_db
+
+    async with ReadSessionLocal() as session:
+        with pytest.raises(OperationalError):
+            await session.execute(text("DELETE FROM messages"))
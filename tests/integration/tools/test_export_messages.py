@@ -0,0 +1,71 @@
+# Test de la herramienta de exportación de mensajes contra una BD SQLite real
+import io
+import json
+import pytest
+from sqlalchemy import create_engine
+
+from src.Application.dtos.pagination_dto import ExportMessagesFilterDTO
+from src.Infrastructure.database.models import Base
+from src.tools.export_messages import export_messages, main
+from src.tools.import_messages import import_messages
+
+ROWS = 2500
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    db_path = tmp_path / "export.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+
+    source = tmp_path / "seed.jsonl"
+    source.write_text("".join(
+        json.dumps({
+            "message_id": f"msg-{i:05d}",
+            "session_id": f"session-{i % 5}",
+            "content": f"Mensaje {i}",
+            "timestamp": f"2026-01-{1 + i % 28:02d}T10:00:00",
+            "sender": "user",
+        }) + "\n"
+        for i in range(ROWS)
+    ), encoding="utf-8")
+    import_messages(engine, source, "jsonl", progress_file=io.StringIO())
+    engine.dispose()
+    return f"sqlite:///{db_path}"
+
+
+#Recorre toda la tabla en bloques pequeños sin perder ni repetir filas
+@pytest.mark.asyncio
+async def test_exports_full_table_in_chunks(database_url):
+    output = io.BytesIO()
+
+    exported = await export_messages(database_url, ExportMessagesFilterDTO(), "ndjson", output, chunk_size=100)
+
+    lines = output.getvalue().decode("utf-8").splitlines()
+    assert exported == ROWS
+    assert [json.loads(line)["message_id"] for line in lines] == [f"msg-{i:05d}" for i in range(ROWS)]
+
+
+#Aplica los filtros de sesión y rango de fechas
+@pytest.mark.asyncio
+async def test_exports_filtered_csv(database_url):
+    output = io.BytesIO()
+    filters = ExportMessagesFilterDTO(session_id="session-0", start="2026-01-01T00:00:00", end="2026-01-02T00:00:00")
+
+    exported = await export_messages(database_url, filters, "csv", output)
+
+    lines = output.getvalue().decode("utf-8").splitlines()
+    assert lines[0].startswith("message_id,session_id,content,timestamp")
+    # i % 5 == 0 y i % 28 == 0  ->  i múltiplo de 140
+    assert exported == len(range(0, ROWS, 140))
+
+
+#Punto de entrada de línea de comandos escribiendo a un archivo
+def test_cli_writes_output_file(database_url, tmp_path, capsys):
+    output = tmp_path / "out.ndjson"
+
+    exit_code = main(["--database-url", database_url, "--session-id", "session-1", "--output", str(output)])
+
+    assert exit_code == 0
+    assert len(output.read_text(encoding="utf-8").splitlines()) == ROWS // 5
+    assert f"exportados={ROWS // 5}" in capsys.readouterr().err
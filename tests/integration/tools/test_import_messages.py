@@ -0,0 +1,180 @@
+# Test del importador masivo de mensajes (JSONL/CSV) contra una BD SQLite real
+import io
+import json
+import sqlite3
+import pytest
+from sqlalchemy import create_engine
+
+from src.Infrastructure.database.models import Base
+from src.tools import import_messages as import_module
+from src.tools.import_messages import import_messages, main
+
+
+def _record(i, **overrides):
+    record = {
+        "message_id": f"msg-{i:03d}",
+        "session_id": "session-import",
+        "content": f"Mensaje importado {i}",
+        "timestamp": f"2026-01-30T10:00:{i % 60:02d}Z",
+        "sender": "user" if i % 2 else "system",
+    }
+    record.update(overrides)
+    return record
+
+
+def _write_jsonl(path, records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+
+@pytest.fixture
+def database(tmp_path):
+    db_path = tmp_path / "import.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    try:
+        yield engine, db_path
+    finally:
+        engine.dispose()
+
+
+def _rows(db_path, sql):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+#Importa un JSONL aplicando las reglas del dominio y registrando los registros rechazados
+def test_imports_jsonl_with_domain_rules(tmp_path, database):
+    engine, db_path = database
+    source = tmp_path / "messages.jsonl"
+    _write_jsonl(source, [
+        _record(1, content="  Hola mundo  "),
+        _record(2, content="esto es spam"),
+        _record(3, sender="robot"),
+        _record(4),
+    ])
+    errors = io.StringIO()
+
+    stats = import_messages(engine, source, "jsonl", errors_file=errors, progress_file=io.StringIO())
+
+    assert (stats.records, stats.inserted, stats.failed) == (4, 2, 2)
+    assert _rows(db_path, "SELECT message_id, content, word_count FROM messages ORDER BY message_id") == [
+        ("msg-001", "Hola mundo", 2),
+        ("msg-004", "Mensaje importado 4", 3),
+    ]
+    assert [json.loads(line)["record"] for line in errors.getvalue().splitlines()] == [2, 3]
+
+
+#Los datos importados deben poder leerse igual que los guardados por la API
+def test_imported_timestamps_match_orm_format(tmp_path, database):
+    engine, db_path = database
+    source = tmp_path / "messages.jsonl"
+    _write_jsonl(source, [_record(5)])
+
+    import_messages(engine, source, "jsonl", progress_file=io.StringIO())
+
+    assert _rows(db_path, "SELECT timestamp FROM messages") == [("2026-01-30 10:00:05.000000",)]
+
+
+#Importa un CSV con cabecera
+def test_imports_csv(tmp_path, database):
+    engine, db_path = database
+    source = tmp_path / "messages.csv"
+    header = "message_id,session_id,content,timestamp,sender\n"
+    source.write_text(
+        header + "".join(f"msg-{i},session-csv,Texto {i},2026-01-30T10:00:00Z,user\n" for i in range(5)),
+        encoding="utf-8",
+    )
+
+    stats = import_messages(engine, source, "csv", batch_size=2, progress_file=io.StringIO())
+
+    assert stats.inserted == 5
+    assert _rows(db_path, "SELECT COUNT(*) FROM messages WHERE session_id = 'session-csv'") == [(5,)]
+
+
+#Con checkpoint se reanuda después del último registro confirmado; sin él, repetir no duplica
+def test_resumes_from_checkpoint_and_skips_duplicates(tmp_path, database):
+    engine, db_path = database
+    source = tmp_path / "messages.jsonl"
+    checkpoint = tmp_path / "messages.checkpoint.json"
+    _write_jsonl(source, [_record(i) for i in range(1, 11)])
+    checkpoint.write_text(json.dumps({"records": 6, "inserted": 6, "duplicates": 0, "failed": 0}))
+
+    stats = import_messages(engine, source, "jsonl", batch_size=3, checkpoint_path=checkpoint, progress_file=io.StringIO())
+
+    assert stats.inserted == 10
+    assert _rows(db_path, "SELECT COUNT(*) FROM messages") == [(4,)]
+    assert json.loads(checkpoint.read_text())["records"] == 10
+
+    stats = import_messages(engine, source, "jsonl", progress_file=io.StringIO())
+
+    assert (stats.inserted, stats.duplicates) == (6, 4)
+    assert _rows(db_path, "SELECT COUNT(*) FROM messages") == [(10,)]
+
+
+#Los índices secundarios y los triggers eliminados durante la carga deben existir al terminar, con session_stats y la búsqueda al día
+def test_drop_indexes_rebuilds_them(tmp_path, database):
+    engine, db_path = database
+    source = tmp_path / "messages.jsonl"
+    _write_jsonl(source, [_record(i) for i in range(20)])
+    schema_sql = "SELECT type, name FROM sqlite_master WHERE tbl_name = 'messages' ORDER BY name"
+    before = _rows(db_path, schema_sql)
+
+    import_messages(engine, source, "jsonl", drop_indexes=True, progress_file=io.StringIO())
+
+    assert _rows(db_path, schema_sql) == before
+    assert _rows(db_path, "SELECT COUNT(*) FROM messages") == [(20,)]
+    assert _rows(db_path, "SELECT session_id, message_count, user_count FROM session_stats") == [("session-import", 20, 10)]
+    assert _rows(db_path, "SELECT COUNT(*) FROM messages_fts WHERE messages_fts MATCH 'importado'") == [(20,)]
+
+
+
+TRIGGERS_SQL = "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN ('trg_messages_session_stats', 'trg_messages_fts_insert') ORDER BY name"
+
+
+#Si la carga falla a mitad, los índices y los triggers se restauran igual y lo confirmado queda contado e indexado
+def test_drop_indexes_restores_triggers_when_import_fails(tmp_path, database, monkeypatch):
+    engine, db_path = database
+    source = tmp_path / "messages.jsonl"
+    _write_jsonl(source, [_record(i) for i in range(20)])
+    original_to_params = import_module._to_params
+
+    def failing_to_params(row):
+        if row["message_id"] == "msg-012":
+            raise RuntimeError("disco lleno")
+        return original_to_params(row)
+
+    monkeypatch.setattr(import_module, "_to_params", failing_to_params)
+    with pytest.raises(RuntimeError):
+        import_messages(engine, source, "jsonl", batch_size=5, drop_indexes=True, progress_file=io.StringIO())
+
+    assert _rows(db_path, TRIGGERS_SQL) == [("trg_messages_fts_insert",), ("trg_messages_session_stats",)]
+    assert _rows(db_path, "SELECT message_count FROM session_stats") == [(10,)]
+    assert _rows(db_path, "SELECT COUNT(*) FROM messages_fts WHERE messages_fts MATCH 'importado'") == [(10,)]
+
+
+#Una importación interrumpida sin poder restaurar (proceso terminado) se repara al reanudar, aun sin --drop-indexes
+def test_resume_restores_triggers_left_dropped(tmp_path, database):
+    engine, db_path = database
+    source = tmp_path / "messages.jsonl"
+    _write_jsonl(source, [_record(i) for i in range(5)])
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP TRIGGER trg_messages_session_stats")
+        conn.execute("DROP TRIGGER trg_messages_fts_insert")
+
+    import_messages(engine, source, "jsonl", progress_file=io.StringIO())
+
+    assert _rows(db_path, TRIGGERS_SQL) == [("trg_messages_fts_insert",), ("trg_messages_session_stats",)]
+    assert _rows(db_path, "SELECT message_count FROM session_stats") == [(5,)]
+    assert _rows(db_path, "SELECT COUNT(*) FROM messages_fts WHERE messages_fts MATCH 'importado'") == [(5,)]
+
+#Punto de entrada de línea de comandos con resumen de filas por segundo
+def test_cli_entry_point(tmp_path, database, capsys):
+    _, db_path = database
+    source = tmp_path / "messages.jsonl"
+    _write_jsonl(source, [_record(i) for i in range(3)])
+
+    exit_code = main([str(source), "--database-url", f"sqlite:///{db_path}", "--no-checkpoint"])
+
+    assert exit_code == 0
+    assert "filas/s=" in capsys.readouterr().err
+    assert _rows(db_path, "SELECT COUNT(*) FROM messages") == [(3,)]
@@ -0,0 +1,76 @@
+# Test de la reconstrucción de session_stats contra una BD SQLite real
+import io
+import json
+import sqlite3
+import pytest
+from sqlalchemy import create_engine
+
+from src.Infrastructure.database.models import Base
+from src.tools.import_messages import import_messages
+from src.tools.rebuild_session_stats import main, rebuild_session_stats
+
+STATS_SQL = (
+    "SELECT session_id, message_count, user_count, system_count, first_timestamp, last_timestamp, "
+    "last_sender, last_message_preview FROM session_stats ORDER BY session_id"
+)
+
+
+@pytest.fixture
+def database(tmp_path):
+    db_path = tmp_path / "stats.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+
+    source = tmp_path / "messages.jsonl"
+    source.write_text("".join(
+        json.dumps({
+            "message_id": f"msg-{i:03d}",
+            "session_id": f"session-{i % 3}",
+            "content": f"Mensaje {i}",
+            "timestamp": f"2026-01-30T10:00:{i:02d}",
+            "sender": "user" if i % 2 else "system",
+        }) + "\n"
+        for i in range(12)
+    ), encoding="utf-8")
+    import_messages(engine, source, "jsonl", progress_file=io.StringIO())
+    try:
+        yield engine, db_path
+    finally:
+        engine.dispose()
+
+
+def _rows(db_path, sql):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+#El importador (INSERT directo) también mantiene los contadores, y reconstruirlos da el mismo resultado
+def test_rebuild_matches_counters_maintained_on_write(database):
+    engine, db_path = database
+    maintained = _rows(db_path, STATS_SQL)
+
+    with engine.begin() as conn:
+        rebuilt = rebuild_session_stats(conn)
+
+    assert rebuilt == 3
+    assert maintained[0] == (
+        "session-0", 4, 2, 2, "2026-01-30 10:00:00.000000", "2026-01-30 10:00:09.000000", "user", "Mensaje 9"
+    )
+    assert _rows(db_path, STATS_SQL) == maintained
+
+
+#Reconstruir solo algunas sesiones corrige sus contadores sin tocar las demás
+def test_rebuild_selected_sessions_from_cli(database, capsys):
+    engine, db_path = database
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE session_stats SET message_count = 99")
+        conn.execute("DELETE FROM messages WHERE session_id = 'session-2'")
+
+    exit_code = main(["--database-url", f"sqlite:///{db_path}", "--session-id", "session-1", "--session-id", "session-2"])
+
+    assert exit_code == 0
+    assert "[resumen] sesiones=1" in capsys.readouterr().err
+    assert _rows(db_path, "SELECT session_id, message_count FROM session_stats ORDER BY session_id") == [
+        ("session-0", 99),
+        ("session-1", 4),
+    ]
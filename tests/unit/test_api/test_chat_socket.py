@@ -0,0 +1,177 @@
+#Test para la conexión WebSocket de chat (colas, lotes y backpressure) sin BD ni servidor
+import asyncio
+import json
+import pytest
+from datetime import datetime
+
+from src.API.v1.chat_socket import parse_frame, serve_chat_socket
+from src.Application.dtos.message_dto import BatchItemResultDTO
+from src.Application.use_cases.stream_message_events_use_case import StreamMessageEventsUseCase
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+from src.Infrastructure.events.message_hub import MessageHub
+
+
+def _frame(i):
+    return json.dumps({
+        "message_id": f"msg-{i}", "content": "Hola", "timestamp": "2026-01-30T10:00:00", "sender": "user",
+    })
+
+
+async def _no_messages_after(session_id, after_id, limit):
+    return []
+
+
+async def _no_last_message_id(session_id):
+    return 0
+
+
+#WebSocket simulado: entrega las tramas de `frames` y luego la desconexión, contando las lecturas
+class FakeWebSocket:
+
+    def __init__(self, frames):
+        self._incoming = asyncio.Queue()
+        for frame in frames:
+            self._incoming.put_nowait({"type": "websocket.receive", "text": frame})
+        self.reads = 0
+        self.sent = []
+
+    def disconnect(self):
+        self._incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+
+    async def receive(self):
+        message = await self._incoming.get()
+        self.reads += 1
+        return message
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+#Escritura que se bloquea hasta que el test la libera
+class BlockingIngest:
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.batches = []
+
+    async def ingest_batch(self, entries):
+        await self.release.wait()
+        self.batches.append([seq for seq, _, _ in entries])
+        return [BatchItemResultDTO(index=seq, message_id=dto.message_id, status="created") for seq, dto, _ in entries]
+
+
+#Simula la BD y la escritura: guarda las tramas con ids consecutivos y las publica en el hub
+class FakeStore:
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.messages = []
+
+    def add(self, message_id):
+        message = MessageEntity(
+            message_id=message_id, session_id="session-abc", content="Hola",
+            timestamp=datetime(2026, 1, 30, 10, 0, 0), sender=SenderType.USER, id=len(self.messages) + 1,
+        )
+        self.messages.append(message)
+        return message
+
+    async def load_messages_after(self, session_id, after_id, limit):
+        return [m for m in self.messages if m.id > after_id][:limit]
+
+    async def load_last_message_id(self, session_id):
+        return self.messages[-1].id if self.messages else 0
+
+    async def ingest_batch(self, entries):
+        saved = [self.add(dto.message_id) for _, dto, _ in entries]
+        for message in saved:
+            self.hub.publish(message)
+        return [BatchItemResultDTO(index=seq, message_id=dto.message_id, status="created") for seq, dto, _ in entries]
+
+
+@pytest.mark.asyncio
+class TestServeChatSocket:
+
+    async def _serve(self, websocket, ingest, batch_size=10, max_pending_frames=2):
+        hub = MessageHub()
+        events = StreamMessageEventsUseCase(hub, _no_messages_after, _no_last_message_id, heartbeat_seconds=60)
+        return asyncio.ensure_future(serve_chat_socket(
+            websocket, "session-abc", ingest=ingest, events=events, subscription=events.subscribe("session-abc"),
+            batch_size=batch_size, max_pending_frames=max_pending_frames, max_frame_bytes=1024,
+        ))
+
+    #Con la escritura atrasada y la cola de entrada llena se deja de leer del socket
+    async def test_stops_reading_when_writer_falls_behind(self):
+        websocket = FakeWebSocket([_frame(i) for i in range(10)])
+        ingest = BlockingIngest()
+        serving = await self._serve(websocket, ingest, batch_size=10, max_pending_frames=2)
+
+        await asyncio.sleep(0.05)
+        # Como mucho: el lote que se está escribiendo (lo que había en cola) + 2 en cola + 1 esperando lugar
+        assert websocket.reads <= 5
+        assert not websocket._incoming.empty()
+
+        ingest.release.set()
+        websocket.disconnect()
+        await asyncio.wait_for(serving, 5)
+
+        assert [ack["seq"] for ack in websocket.sent] == list(range(1, 11))
+        # Lo acumulado mientras se escribía se guarda en lotes, no trama por trama
+        assert len(ingest.batches) < 10
+
+    #Las tramas recibidas antes de la desconexión se guardan igualmente
+    async def test_pending_frames_are_saved_after_disconnect(self):
+        websocket = FakeWebSocket([_frame(i) for i in range(3)])
+        websocket.disconnect()
+        ingest = BlockingIngest()
+        ingest.release.set()
+
+        await asyncio.wait_for(await self._serve(websocket, ingest, max_pending_frames=10), 5)
+
+        assert sum(len(batch) for batch in ingest.batches) == 3
+
+
+    #Los mensajes de los demás llegan en orden de id aunque el hub los publique desordenados,
+    #y los propios (leídos también de la BD) no se reenvían al que los escribió
+    async def test_delivers_in_id_order_without_own_messages(self):
+        hub = MessageHub()
+        store = FakeStore(hub)
+        events = StreamMessageEventsUseCase(hub, store.load_messages_after, store.load_last_message_id, heartbeat_seconds=60)
+        websocket = FakeWebSocket([_frame(1)])
+        serving = asyncio.ensure_future(serve_chat_socket(
+            websocket, "session-abc", ingest=store, events=events, subscription=events.subscribe("session-abc"),
+            batch_size=10, max_pending_frames=10, max_frame_bytes=1024, after_id=0,
+        ))
+
+        async with asyncio.timeout(5):
+            while not websocket.sent:
+                await asyncio.sleep(0.01)
+            second, third = store.add("msg-other-2"), store.add("msg-other-3")
+            hub.publish(third)
+            hub.publish(second)
+            while len(websocket.sent) < 3:
+                await asyncio.sleep(0.01)
+        websocket.disconnect()
+        await asyncio.wait_for(serving, 5)
+
+        assert [(frame["type"], frame.get("id")) for frame in websocket.sent] == [("ack", None), ("message", 2), ("message", 3)]
+
+class TestParseFrame:
+
+    def test_session_id_defaults_to_connection_session(self):
+        seq, dto, error = parse_frame(7, _frame(1), "session-abc", 1024)
+
+        assert (seq, dto.session_id, error) == (7, "session-abc", None)
+
+    @pytest.mark.parametrize("frame, error", [
+        ("[1, 2]", "objeto JSON"),
+        ("{", "JSON válido"),
+        (json.dumps({"message_id": "m", "session_id": "otra"}), "session_id"),
+        (json.dumps({"message_id": "m"}), "content"),
+        ("x" * 2000, "supera"),
+    ])
+    def test_invalid_frames(self, frame, error):
+        _, dto, message = parse_frame(1, frame, "session-abc", 1024)
+
+        assert dto is None
+        assert error in message
@@ -0,0 +1,45 @@
+#Test para las utilidades NDJSON de la API
+import pytest
+
+from src.API.v1.ndjson import iter_ndjson_lines, ndjson_dumps
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def _collect(chunks, max_line_bytes=1024):
+    return [item async for item in iter_ndjson_lines(chunks, max_line_bytes)]
+
+
+@pytest.mark.asyncio
+class TestIterNdjsonLines:
+
+    #Debe reconstruir líneas partidas entre fragmentos
+    async def test_lines_split_across_chunks(self):
+        result = await _collect(_chunks(b'{"a"', b':1}\n{"b":', b'2}\n'))
+
+        assert result == [(1, b'{"a":1}'), (2, b'{"b":2}')]
+
+    #Debe omitir líneas vacías sin perder la numeración
+    async def test_blank_lines_are_skipped_but_counted(self):
+        result = await _collect(_chunks(b'{"a":1}\n\n  \r\n{"b":2}\n'))
+
+        assert result == [(1, b'{"a":1}'), (4, b'{"b":2}')]
+
+    #Debe emitir la última línea aunque no termine en salto de línea
+    async def test_last_line_without_newline(self):
+        result = await _collect(_chunks(b'{"a":1}\n{"b":2}'))
+
+        assert result == [(1, b'{"a":1}'), (2, b'{"b":2}')]
+
+    #Las líneas demasiado largas se reportan como None y no se acumulan en memoria
+    async def test_oversized_line_is_reported_as_none(self):
+        result = await _collect(_chunks(b'{"a":1}\n', b"x" * 10, b"x" * 10, b'\n{"b":2}\n'), max_line_bytes=15)
+
+        assert result == [(1, b'{"a":1}'), (2, None), (3, b'{"b":2}')]
+
+
+def test_ndjson_dumps_writes_one_compact_line():
+    assert ndjson_dumps({"line": 1, "status": "created"}) == b'{"line":1,"status":"created"}\n'
@@ -0,0 +1,74 @@
+#Test para la ruta rápida de respuestas JSON de la API
+from datetime import datetime, timedelta, timezone
+
+from src.API.v1.responses import batch_result_payload, message_payload, pagination_payload, success_response
+from src.API.v1.schemas.message_schema import BatchCreateResultSchema, MessageResponseSchema, PaginatedMessagesSchema
+from src.API.v1.schemas.response_schema import SuccessResponse
+from src.Application.dtos.message_dto import BatchCreateResultDTO, BatchItemResultDTO, MessageDTO
+from src.Application.dtos.pagination_dto import PaginationDTO
+
+
+def _message(message_id, timestamp):
+    return MessageDTO(
+        message_id=message_id,
+        session_id="session-1",
+        content="Hola, ¿qué tal?",
+        timestamp=timestamp,
+        sender="user",
+        metadata={"word_count": 3, "character_count": 15, "processed_at": "2026-01-01T00:00:00"},
+    )
+
+
+_TIMESTAMPS = [
+    datetime(2026, 1, 1, 12, 0, 0),
+    datetime(2026, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc),
+    datetime(2026, 1, 1, 14, 0, 0, tzinfo=timezone(timedelta(hours=2))),
+]
+
+
+class TestFastJSONResponses:
+
+    #El JSON de la página debe ser idéntico, byte a byte, al que genera pydantic con los schemas
+    def test_pagination_payload_matches_schema_serialization(self):
+        page = PaginationDTO(
+            items=[_message(f"msg-{i}", timestamp) for i, timestamp in enumerate(_TIMESTAMPS)],
+            limit=3,
+            offset=0,
+            total=None,
+            next_cursor="cursor-next",
+            prev_cursor=None,
+        )
+
+        expected = SuccessResponse[PaginatedMessagesSchema](
+            data=PaginatedMessagesSchema.model_validate(page, from_attributes=True)
+        ).model_dump_json().encode()
+
+        assert success_response(pagination_payload(page)).body == expected
+
+    #El resultado de un lote conserva la forma de BatchCreateResultSchema, incluidos los errores sin data
+    def test_batch_result_payload_matches_schema_serialization(self):
+        result = BatchCreateResultDTO(
+            items=[
+                BatchItemResultDTO(index=0, message_id="msg-0", status="created", data=_message("msg-0", _TIMESTAMPS[1])),
+                BatchItemResultDTO(index=1, message_id="msg-1", status="error", error="duplicado"),
+            ],
+            created=1,
+            failed=1,
+        )
+
+        expected = SuccessResponse[BatchCreateResultSchema](
+            data=BatchCreateResultSchema.model_validate(result, from_attributes=True)
+        ).model_dump_json().encode()
+
+        assert success_response(batch_result_payload(result)).body == expected
+
+    def test_success_response_sets_status_and_headers(self):
+        message = _message("msg-0", _TIMESTAMPS[0])
+
+        response = success_response(message_payload(message), status_code=201, headers={"ETag": '"1-1"'})
+
+        assert response.status_code == 201
+        assert response.headers["ETag"] == '"1-1"'
+        assert response.media_type == "application/json"
+        body = SuccessResponse[MessageResponseSchema].model_validate_json(response.body)
+        assert body.data.message_id == "msg-0"
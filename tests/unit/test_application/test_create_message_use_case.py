@@ -453,3 +453,220 @@ class TestCreateMessageUseCaseEdgeCases:
         # Act & Assert
         with pytest.raises(ValueError, match="content no puede estar vacío"):
             await use_case.execute(dto)
+
+
+#Test para la creación idempotente de mensajes
+@pytest.mark.asyncio
+class TestCreateMessageUseCaseIdempotent:
+
+    @pytest.fixture
+    def dto(self):
+        return CreateMessageDTO(
+            message_id="msg-123",
+            session_id="session-abc",
+            content="Hello world",
+            timestamp=datetime(2026, 1, 30, 10, 0, 0),
+            sender="user"
+        )
+
+    @pytest.fixture
+    def use_case_and_repository(self):
+        from src.Domain.services.content_filter import ContentFilterService
+        from src.Domain.services.message_processor import MessageProcessor
+
+        repository = AsyncMock()
+        use_case = CreateMessageUseCase(
+            repository=repository,
+            content_filter=ContentFilterService(),
+            message_processor=MessageProcessor()
+        )
+        return use_case, repository
+
+    #Debe indicar que el mensaje se creó cuando el message_id es nuevo
+    async def test_new_message_is_reported_as_created(self, dto, use_case_and_repository):
+        use_case, repository = use_case_and_repository
+        repository.save_or_get.side_effect = lambda message: (message, True)
+
+        result, created = await use_case.execute_idempotent(dto)
+
+        assert created is True
+        assert result.message_id == "msg-123"
+        repository.save.assert_not_called()
+
+    #Un reintento con los mismos datos debe retornar el mensaje almacenado sin error
+    async def test_retry_returns_stored_message(self, dto, use_case_and_repository):
+        use_case, repository = use_case_and_repository
+        stored = MessageEntity(
+            message_id="msg-123",
+            session_id="session-abc",
+            content="Hello world",
+            timestamp=datetime(2026, 1, 30, 10, 0, 0),
+            sender=SenderType.USER,
+            metadata=MessageMetadata(word_count=2, character_count=11, processed_at=datetime(2026, 1, 30, 10, 0, 1))
+        )
+        repository.save_or_get.return_value = (stored, False)
+
+        result, created = await use_case.execute_idempotent(dto)
+
+        assert created is False
+        assert result.metadata["processed_at"] == "2026-01-30T10:00:01"
+
+    #Reutilizar un message_id con otro contenido sigue siendo un error
+    async def test_same_id_with_different_content_raises_error(self, dto, use_case_and_repository):
+        use_case, repository = use_case_and_repository
+        stored = MessageEntity(
+            message_id="msg-123",
+            session_id="session-abc",
+            content="Another content",
+            timestamp=datetime(2026, 1, 30, 10, 0, 0),
+            sender=SenderType.USER,
+        )
+        repository.save_or_get.return_value = (stored, False)
+
+        with pytest.raises(ValueError, match="contenido diferente"):
+            await use_case.execute_idempotent(dto)
+
+
+#Test para el pre-chequeo de duplicados con el filtro de message_id
+@pytest.mark.asyncio
+class TestCreateMessageUseCaseMessageIdFilter:
+
+    @pytest.fixture
+    def dto(self):
+        return CreateMessageDTO(
+            message_id="msg-123",
+            session_id="session-abc",
+            content="Hello world",
+            timestamp=datetime(2026, 1, 30, 10, 0, 0),
+            sender="user"
+        )
+
+    def _use_case(self, repository, message_id_filter):
+        from src.Domain.services.content_filter import ContentFilterService
+        from src.Domain.services.message_processor import MessageProcessor
+
+        return CreateMessageUseCase(
+            repository=repository,
+            content_filter=ContentFilterService(),
+            message_processor=MessageProcessor(),
+            message_id_filter=message_id_filter,
+        )
+
+    #Un "no visto" seguro debe ir directo al INSERT y registrarse en el filtro
+    async def test_definite_miss_skips_duplicate_check(self, dto):
+        repository = AsyncMock()
+        repository.save.side_effect = lambda message: message
+        message_id_filter = Mock()
+        message_id_filter.might_contain.return_value = False
+
+        await self._use_case(repository, message_id_filter).execute(dto)
+
+        repository.get_by_message_id.assert_not_called()
+        repository.save.assert_called_once()
+        message_id_filter.add.assert_called_once_with("msg-123")
+
+    #Un "quizá" debe confirmarse contra la BD sin intentar el INSERT si ya existe
+    async def test_maybe_seen_duplicate_is_rejected_without_insert(self, dto):
+        from src.Application.interfaces.message_repository_interface import DuplicateMessageError
+
+        repository = AsyncMock()
+        repository.get_by_message_id.return_value = Mock()
+        message_id_filter = Mock()
+        message_id_filter.might_contain.return_value = True
+
+        with pytest.raises(DuplicateMessageError, match="ya existe"):
+            await self._use_case(repository, message_id_filter).execute(dto)
+
+        repository.save.assert_not_called()
+
+    #Un falso positivo del filtro debe terminar guardando el mensaje
+    async def test_false_positive_falls_back_to_insert(self, dto):
+        repository = AsyncMock()
+        repository.get_by_message_id.return_value = None
+        repository.save.side_effect = lambda message: message
+        message_id_filter = Mock()
+        message_id_filter.might_contain.return_value = True
+
+        result = await self._use_case(repository, message_id_filter).execute(dto)
+
+        assert result.message_id == "msg-123"
+        repository.save.assert_called_once()
+
+    #En modo idempotente un reintento "quizá visto" se resuelve con una sola lectura
+    async def test_idempotent_retry_is_resolved_with_a_single_read(self, dto):
+        repository = AsyncMock()
+        repository.get_by_message_id.return_value = MessageEntity(
+            message_id="msg-123",
+            session_id="session-abc",
+            content="Hello world",
+            timestamp=datetime(2026, 1, 30, 10, 0, 0),
+            sender=SenderType.USER,
+        )
+        message_id_filter = Mock()
+        message_id_filter.might_contain.return_value = True
+
+        result, created = await self._use_case(repository, message_id_filter).execute_idempotent(dto)
+
+        assert created is False
+        repository.save_or_get.assert_not_called()
+        repository.save.assert_not_called()
+
+    #En modo idempotente un duplicado que el filtro no conocía recurre al upsert
+    async def test_idempotent_definite_miss_falls_back_to_upsert_on_duplicate(self, dto):
+        from src.Application.interfaces.message_repository_interface import DuplicateMessageError
+
+        repository = AsyncMock()
+        repository.save.side_effect = DuplicateMessageError("ya existe")
+        repository.save_or_get.side_effect = lambda message: (message, False)
+        message_id_filter = Mock()
+        message_id_filter.might_contain.return_value = False
+
+        result, created = await self._use_case(repository, message_id_filter).execute_idempotent(dto)
+
+        assert created is False
+        repository.save_or_get.assert_called_once()
+
+    #Guardar un mensaje invalida las páginas en caché de su sesión; un reintento no
+    async def test_saved_message_invalidates_session_pages(self, dto):
+        from src.Domain.services.content_filter import ContentFilterService
+        from src.Domain.services.message_processor import MessageProcessor
+
+        repository = AsyncMock()
+        repository.save.side_effect = lambda message: message
+        repository.save_or_get.side_effect = lambda message: (message, False)
+        page_cache = Mock()
+        use_case = CreateMessageUseCase(
+            repository=repository,
+            content_filter=ContentFilterService(),
+            message_processor=MessageProcessor(),
+            page_cache=page_cache,
+        )
+
+        await use_case.execute(dto)
+        await use_case.execute_idempotent(dto)
+
+        page_cache.invalidate_session.assert_called_once_with("session-abc")
+
+    #El mensaje guardado se publica en el hub de eventos con el id asignado por la BD; un reintento no
+    async def test_saved_message_is_published_to_event_hub(self, dto):
+        from dataclasses import replace
+        from src.Domain.services.content_filter import ContentFilterService
+        from src.Domain.services.message_processor import MessageProcessor
+
+        repository = AsyncMock()
+        repository.save.side_effect = lambda message: replace(message, id=7)
+        repository.save_or_get.side_effect = lambda message: (message, False)
+        event_hub = Mock()
+        use_case = CreateMessageUseCase(
+            repository=repository,
+            content_filter=ContentFilterService(),
+            message_processor=MessageProcessor(),
+            event_hub=event_hub,
+        )
+
+        await use_case.execute(dto)
+        await use_case.execute_idempotent(dto)
+
+        event_hub.publish.assert_called_once()
+        published = event_hub.publish.call_args.args[0]
+        assert (published.message_id, published.id) == ("msg-123", 7)
@@ -0,0 +1,86 @@
+#Test para la creación de mensajes por lotes en la aplicación
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from src.Application.use_cases.create_messages_batch_use_case import CreateMessagesBatchUseCase
+from src.Application.dtos.message_dto import CreateMessageDTO, BatchCreateResultDTO
+from src.Domain.services.content_filter import ContentFilterService
+from src.Domain.services.message_processor import MessageProcessor
+
+
+def _dto(message_id, content="Hello world", sender="user", session_id="session-abc"):
+    return CreateMessageDTO(
+        message_id=message_id,
+        session_id=session_id,
+        content=content,
+        timestamp=datetime(2026, 1, 30, 10, 0, 0),
+        sender=sender,
+    )
+
+#Test para la creación de mensajes por lotes
+@pytest.mark.asyncio
+class TestCreateMessagesBatchUseCase:
+
+    @pytest.fixture
+    def repository(self):
+        repository = AsyncMock()
+        # Por defecto el repositorio guarda todos los mensajes recibidos
+        repository.save_many.side_effect = lambda messages: list(messages)
+        return repository
+
+    @pytest.fixture
+    def use_case(self, repository):
+        return CreateMessagesBatchUseCase(
+            repository=repository,
+            content_filter=ContentFilterService(),
+            message_processor=MessageProcessor(),
+        )
+
+    #Debe guardar todos los mensajes válidos en una sola llamada al repositorio
+    async def test_batch_with_valid_messages_saves_all_in_one_call(self, use_case, repository):
+        result = await use_case.execute([_dto("msg-1"), _dto("msg-2"), _dto("msg-3")])
+
+        assert isinstance(result, BatchCreateResultDTO)
+        assert result.created == 3
+        assert result.failed == 0
+        assert [item.status for item in result.items] == ["created"] * 3
+        assert result.items[0].data.metadata["word_count"] == 2
+        repository.save_many.assert_called_once()
+        assert len(repository.save_many.call_args.args[0]) == 3
+
+    #Un mensaje inválido no debe impedir guardar el resto
+    async def test_batch_reports_invalid_items_without_aborting(self, use_case, repository):
+        result = await use_case.execute([
+            _dto("msg-1"),
+            _dto("msg-2", content="This is spam"),
+            _dto("msg-3", sender="invalid"),
+            _dto("msg-4"),
+        ])
+
+        assert result.created == 2
+        assert result.failed == 2
+        assert [item.status for item in result.items] == ["created", "error", "error", "created"]
+        assert "inapropiadas" in result.items[1].error
+        saved = repository.save_many.call_args.args[0]
+        assert [m.message_id for m in saved] == ["msg-1", "msg-4"]
+
+    #Los duplicados reportados por el repositorio deben marcarse como error
+    async def test_batch_reports_duplicates_per_item(self, use_case, repository):
+        repository.save_many.side_effect = lambda messages: [messages[0], None]
+
+        result = await use_case.execute([_dto("msg-1"), _dto("msg-1")])
+
+        assert result.created == 1
+        assert result.failed == 1
+        assert result.items[0].index == 0
+        assert result.items[1].status == "error"
+        assert "ya existe" in result.items[1].error
+
+    #Si ningún mensaje es válido no debe llamarse al repositorio
+    async def test_batch_without_valid_items_does_not_hit_repository(self, use_case, repository):
+        result = await use_case.execute([_dto("msg-1", content="   ")])
+
+        assert result.created == 0
+        assert result.failed == 1
+        repository.save_many.assert_not_called()
@@ -0,0 +1,60 @@
+#Test para la exportación de mensajes en streaming
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from src.Application.use_cases.export_messages_use_case import ExportMessagesUseCase
+from src.Application.dtos.pagination_dto import ExportMessagesFilterDTO
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+from src.Domain.services.message_processor import MessageProcessor
+
+
+def _message(i):
+    return MessageProcessor().process(MessageEntity(
+        message_id=f"msg-{i}",
+        session_id="session-abc",
+        content=f"Message {i}",
+        timestamp=datetime(2026, 1, 30, 10, 0, i),
+        sender=SenderType.USER,
+    ))
+
+
+@pytest.mark.asyncio
+class TestExportMessagesUseCase:
+
+    @pytest.fixture
+    def repository(self):
+        async def iter_messages(**kwargs):
+            for i in range(3):
+                yield _message(i)
+
+        repository = MagicMock()
+        repository.iter_messages.side_effect = iter_messages
+        return repository
+
+    #Debe convertir cada entidad a DTO y pasar los filtros al repositorio
+    async def test_streams_messages_as_dtos(self, repository):
+        use_case = ExportMessagesUseCase(repository=repository, chunk_size=50)
+        filters = ExportMessagesFilterDTO(session_id="session-abc", start=datetime(2026, 1, 30))
+
+        result = [dto async for dto in use_case.execute(filters)]
+
+        assert [dto.message_id for dto in result] == ["msg-0", "msg-1", "msg-2"]
+        assert result[0].sender == "user"
+        assert result[0].metadata["word_count"] == 2
+        repository.iter_messages.assert_called_once_with(
+            session_id="session-abc", start=datetime(2026, 1, 30), end=None, chunk_size=50
+        )
+
+    #Un rango invertido o vacío debe rechazarse
+    async def test_rejects_inverted_range(self, repository):
+        filters = ExportMessagesFilterDTO(start=datetime(2026, 1, 31), end=datetime(2026, 1, 30))
+
+        with pytest.raises(ValueError):
+            [dto async for dto in ExportMessagesUseCase(repository=repository).execute(filters)]
+
+    #Un session_id en blanco debe rechazarse
+    async def test_rejects_blank_session_id(self, repository):
+        with pytest.raises(ValueError):
+            ExportMessagesUseCase.validate(ExportMessagesFilterDTO(session_id="  "))
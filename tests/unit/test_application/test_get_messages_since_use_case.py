@@ -0,0 +1,166 @@
+#Test para el caso de uso del long-poll de mensajes nuevos
+import asyncio
+import pytest
+from datetime import datetime
+
+from src.Application.use_cases.get_messages_since_use_case import GetMessagesSinceUseCase
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+from src.Infrastructure.events.message_hub import MessageHub
+
+
+def _message(message_pk):
+    return MessageEntity(
+        message_id=f"msg-{message_pk}",
+        session_id="session-abc",
+        content="Hola",
+        timestamp=datetime(2026, 1, 30, 10, 0, 0),
+        sender=SenderType.USER,
+        id=message_pk,
+    )
+
+
+#Simula la BD: mensajes de la sesión con id 1..stored, y cuenta las consultas
+class FakeStore:
+
+    def __init__(self, stored):
+        self.messages = [_message(message_pk) for message_pk in range(1, stored + 1)]
+        self.queries = 0
+
+    async def load_messages_after(self, session_id, after_id, limit):
+        self.queries += 1
+        return [m for m in self.messages if m.id > after_id][:limit]
+
+    async def load_last_message_id(self, session_id):
+        self.queries += 1
+        return self.messages[-1].id if self.messages else 0
+
+
+def _use_case(hub, store):
+    return GetMessagesSinceUseCase(hub, store.load_messages_after, store.load_last_message_id)
+
+
+def _ids(result):
+    return [int(item.message_id.split("-")[1]) for item in result.items]
+
+
+@pytest.mark.asyncio
+class TestGetMessagesSinceUseCase:
+
+    #Si ya hay mensajes después del cursor se retornan sin esperar
+    async def test_returns_existing_messages_immediately(self):
+        hub = MessageHub()
+        store = FakeStore(stored=5)
+
+        result = await _use_case(hub, store).execute("session-abc", cursor=2, wait_seconds=30, limit=2)
+
+        assert (_ids(result), result.next_cursor) == ([3, 4], 4)
+        assert hub.stats()["subscribers"] == 0
+
+    #Sin mensajes nuevos espera en el hub, sin consultar la BD; al publicarse uno lee lo nuevo de la BD
+    async def test_waits_for_published_message(self):
+        hub = MessageHub()
+        store = FakeStore(stored=3)
+        use_case = _use_case(hub, store)
+
+        poll = asyncio.create_task(use_case.execute("session-abc", cursor=3, wait_seconds=5))
+        await asyncio.sleep(0.01)
+        assert store.queries == 2
+        store.messages.append(_message(4))
+        hub.publish(_message(4))
+        result = await poll
+
+        assert (_ids(result), result.next_cursor) == ([4], 4)
+        assert store.queries == 3
+        assert hub.stats()["subscribers"] == 0
+
+    #Si el hub publica desordenado (6 antes que 5) no se pierde el 5: lo nuevo se lee de la BD en orden de id
+    async def test_out_of_order_publish_does_not_skip_messages(self):
+        hub = MessageHub()
+        store = FakeStore(stored=4)
+        use_case = _use_case(hub, store)
+
+        poll = asyncio.create_task(use_case.execute("session-abc", cursor=4, wait_seconds=5))
+        await asyncio.sleep(0.01)
+        store.messages.extend([_message(5), _message(6)])
+        hub.publish(_message(6))
+        first = await poll
+        hub.publish(_message(5))
+        second = await use_case.execute("session-abc", cursor=first.next_cursor, wait_seconds=0.01)
+
+        assert (_ids(first), first.next_cursor) == ([5, 6], 6)
+        assert (second.items, second.next_cursor) == ([], 6)
+
+    #Con la posición de la sesión recordada, un cliente al día espera sin consultar la BD
+    async def test_idle_poll_with_known_position_makes_no_queries(self):
+        hub = MessageHub()
+        store = FakeStore(stored=3)
+        use_case = _use_case(hub, store)
+
+        first = await use_case.execute("session-abc", cursor=3, wait_seconds=0.01)
+        second = await use_case.execute("session-abc", cursor=3, wait_seconds=0.01)
+
+        assert (first.items, first.next_cursor) == ([], 3)
+        assert (second.items, second.next_cursor) == ([], 3)
+        assert store.queries == 2
+
+    #Si la posición recordada es posterior al cursor se consulta la BD aunque sea reciente
+    async def test_known_newer_position_reads_database(self):
+        hub = MessageHub()
+        store = FakeStore(stored=3)
+        hub.remember_last_id("session-abc", 3)
+
+        result = await _use_case(hub, store).execute("session-abc", cursor=1, wait_seconds=5)
+
+        assert _ids(result) == [2, 3]
+        assert store.queries == 1
+
+    #Un cursor inventado o de otra sesión no reemplaza la posición real: un cliente nuevo sigue recibiendo mensajes
+    async def test_bogus_cursor_does_not_corrupt_session_position(self):
+        hub = MessageHub()
+        store = FakeStore(stored=2)
+        use_case = _use_case(hub, store)
+
+        bogus = await use_case.execute("session-abc", cursor=999999, wait_seconds=0.01)
+        fresh = await use_case.execute("session-abc", cursor=None)
+        store.messages.append(_message(3))
+        hub.publish(_message(3))
+        result = await use_case.execute("session-abc", cursor=fresh.next_cursor, wait_seconds=0.01)
+
+        assert (bogus.items, bogus.next_cursor) == ([], 999999)
+        assert fresh.next_cursor == 2
+        assert (_ids(result), result.next_cursor) == ([3], 3)
+
+    #Sin cursor retorna solo la posición actual, para empezar a sondear desde ahí
+    async def test_without_cursor_returns_current_position(self):
+        hub = MessageHub()
+        store = FakeStore(stored=3)
+        use_case = _use_case(hub, store)
+
+        first = await use_case.execute("session-abc", cursor=None, wait_seconds=30)
+        second = await use_case.execute("session-abc", cursor=None, wait_seconds=30)
+
+        assert (first.items, first.next_cursor) == ([], 3)
+        assert second.next_cursor == 3
+        assert store.queries == 1
+
+
+#Test de la validación del cursor y la espera
+class TestGetMessagesSinceUseCaseParsing:
+
+    def test_parse_cursor_and_wait(self):
+        use_case = GetMessagesSinceUseCase(MessageHub(), None, None, max_wait_seconds=60)
+
+        assert use_case.parse_cursor(None) is None
+        assert use_case.parse_cursor("42") == 42
+        assert use_case.parse_wait("30s") == 30
+        assert use_case.parse_wait("500ms") == 0.5
+        assert use_case.parse_wait("15") == 15
+        assert use_case.parse_wait("600s") == 60
+        assert use_case.parse_wait(None) == 0
+        for cursor in ("abc", "-1"):
+            with pytest.raises(ValueError):
+                use_case.parse_cursor(cursor)
+        for wait in ("30m", "-1", "soon"):
+            with pytest.raises(ValueError):
+                use_case.parse_wait(wait)
@@ -3,14 +3,15 @@ Unit tests for GetMessagesUseCase.
 Tests cover: successful retrieval, pagination, filtering, error handling, and edge cases.
 """
 import pytest
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest.mock import Mock, AsyncMock
 
 from src.Application.use_cases.get_messages_use_case import GetMessagesUseCase
-from src.Application.dtos.pagination_dto import PaginationDTO, GetMessagesFilterDTO
+from src.Application.dtos.pagination_dto import PaginationDTO, GetMessagesFilterDTO, MessageCursor
 from src.Domain.entities.message_entity import MessageEntity
 from src.Domain.value_objects.sender_type import SenderType
 from src.Domain.value_objects.message_metadata import MessageMetadata
+from src.Infrastructure.cache.message_page_cache import MessagePageCache
 
 #Test para obtener mensajes exitosamente
 @pytest.mark.asyncio
@@ -40,8 +41,7 @@ class TestGetMessagesUseCaseSuccess:
             )
         ]
 
-        repository.get_by_session.return_value = messages
-        repository.count_by_session.return_value = 2
+        repository.get_page_by_session.return_value = (messages, 2)
 
         use_case = GetMessagesUseCase(repository)
         filters = GetMessagesFilterDTO(
@@ -66,8 +66,7 @@ class TestGetMessagesUseCaseSuccess:
     async def test_get_messages_with_no_messages_returns_empty_list(self):
         # Prepara los mocks y datos de prueba
         repository = AsyncMock()
-        repository.get_by_session.return_value = []
-        repository.count_by_session.return_value = 0
+        repository.get_page_by_session.return_value = ([], 0)
 
         use_case = GetMessagesUseCase(repository)
         filters = GetMessagesFilterDTO(
@@ -87,7 +86,7 @@ class TestGetMessagesUseCaseSuccess:
     async def test_get_messages_calls_repository_with_correct_params(self):
         # pREpara los mocks y datos de prueba
         repository = AsyncMock()
-        repository.get_by_session.return_value = []
+        repository.get_page_by_session.return_value = ([], 0)
         repository.count_by_session.return_value = 0
 
         use_case = GetMessagesUseCase(repository)
@@ -100,11 +99,16 @@ class TestGetMessagesUseCaseSuccess:
 
         await use_case.execute(filters)
 
-        repository.get_by_session.assert_awaited_once_with(
+        repository.get_page_by_session.assert_awaited_once_with(
             session_id="session-123",
             limit=20,
             offset=10,
             sender="user",
+            after=None,
+            before=None,
+            include_total=True,
+            start=None,
+            end=None,
         )
 
 #Tests para paginación
@@ -126,8 +130,7 @@ class TestGetMessagesUseCasePagination:
             for i in range(5)
         ]
 
-        repository.get_by_session.return_value = messages[:3]  # Simula retornar solo 3 mensajes
-        repository.count_by_session.return_value = 5
+        repository.get_page_by_session.return_value = (messages[:3], 5)  # Simula retornar solo 3 mensajes
 
         use_case = GetMessagesUseCase(repository)
         filters = GetMessagesFilterDTO(
@@ -157,8 +160,7 @@ class TestGetMessagesUseCasePagination:
             for i in range(3, 5)
         ]
         # Simula retornar mensajes a partir del offset 3    
-        repository.get_by_session.return_value = messages
-        repository.count_by_session.return_value = 5
+        repository.get_page_by_session.return_value = (messages, 5)
 
         #Esto hace que se use offset 3 y limit 10
         use_case = GetMessagesUseCase(repository)
@@ -177,8 +179,7 @@ class TestGetMessagesUseCasePagination:
     async def test_get_messages_with_max_limit_100(self):
         # Prepara los mocks y datos de prueba
         repository = AsyncMock()
-        repository.get_by_session.return_value = []
-        repository.count_by_session.return_value = 0
+        repository.get_page_by_session.return_value = ([], 0)
 
         use_case = GetMessagesUseCase(repository)
         filters = GetMessagesFilterDTO(
@@ -189,7 +190,7 @@ class TestGetMessagesUseCasePagination:
 
         result = await use_case.execute(filters)
 
-        call_args = repository.get_by_session.call_args
+        call_args = repository.get_page_by_session.call_args
         assert call_args[1]["limit"] == 100
 
 #Tests para filtrado de mensajes
@@ -210,8 +211,7 @@ class TestGetMessagesUseCaseFiltering:
             )
         ]
 
-        repository.get_by_session.return_value = user_messages
-        repository.count_by_session.return_value = 1
+        repository.get_page_by_session.return_value = (user_messages, 1)
 
         use_case = GetMessagesUseCase(repository)
         filters = GetMessagesFilterDTO(
@@ -223,8 +223,8 @@ class TestGetMessagesUseCaseFiltering:
 
         result = await use_case.execute(filters)
 
-        repository.get_by_session.assert_awaited_once()
-        call_args = repository.get_by_session.call_args
+        repository.get_page_by_session.assert_awaited_once()
+        call_args = repository.get_page_by_session.call_args
         assert call_args[1]["sender"] == "user"
         assert all(msg.sender == SenderType.USER for msg in result.items)
 
@@ -242,8 +242,7 @@ class TestGetMessagesUseCaseFiltering:
             )
         ]
 
-        repository.get_by_session.return_value = system_messages
-        repository.count_by_session.return_value = 1
+        repository.get_page_by_session.return_value = (system_messages, 1)
 
         use_case = GetMessagesUseCase(repository)
         filters = GetMessagesFilterDTO(
@@ -255,7 +254,7 @@ class TestGetMessagesUseCaseFiltering:
 
         result = await use_case.execute(filters)
 
-        call_args = repository.get_by_session.call_args
+        call_args = repository.get_page_by_session.call_args
         assert call_args[1]["sender"] == "system"
         assert all(msg.sender == SenderType.SYSTEM for msg in result.items)
 
@@ -280,8 +279,7 @@ class TestGetMessagesUseCaseFiltering:
             )
         ]
 
-        repository.get_by_session.return_value = all_messages
-        repository.count_by_session.return_value = 2
+        repository.get_page_by_session.return_value = (all_messages, 2)
 
         use_case = GetMessagesUseCase(repository)
         filters = GetMessagesFilterDTO(
@@ -293,7 +291,7 @@ class TestGetMessagesUseCaseFiltering:
 
         result = await use_case.execute(filters)
 
-        call_args = repository.get_by_session.call_args
+        call_args = repository.get_page_by_session.call_args
         assert call_args[1]["sender"] is None
         assert len(result.items) == 2
 
@@ -324,8 +322,7 @@ class TestGetMessagesUseCaseEdgeCases:
     async def test_get_messages_with_limit_1_is_valid(self):
         # Prepara los mocks y datos de prueba
         repository = AsyncMock()
-        repository.get_by_session.return_value = []
-        repository.count_by_session.return_value = 0
+        repository.get_page_by_session.return_value = ([], 0)
 
         use_case = GetMessagesUseCase(repository)
         filters = GetMessagesFilterDTO(
@@ -336,7 +333,7 @@ class TestGetMessagesUseCaseEdgeCases:
 
         result = await use_case.execute(filters)
 
-        call_args = repository.get_by_session.call_args
+        call_args = repository.get_page_by_session.call_args
         assert call_args[1]["limit"] == 1
 
     #Debe retornar mensajes ordenados por timestamp ascendente
@@ -362,8 +359,7 @@ class TestGetMessagesUseCaseEdgeCases:
             )
         ]
 
-        repository.get_by_session.return_value = messages
-        repository.count_by_session.return_value = 2
+        repository.get_page_by_session.return_value = (messages, 2)
 
         use_case = GetMessagesUseCase(repository)
 
@@ -393,8 +389,7 @@ class TestGetMessagesUseCaseEdgeCases:
             )
         ]
 
-        repository.get_by_session.return_value = messages
-        repository.count_by_session.return_value = 1
+        repository.get_page_by_session.return_value = (messages, 1)
 
         use_case = GetMessagesUseCase(repository)
 
@@ -406,9 +401,258 @@ class TestGetMessagesUseCaseEdgeCases:
 
         result = await use_case.execute(filters)
 
-        repository.get_by_session.assert_awaited_once()
-        call_args = repository.get_by_session.call_args
+        repository.get_page_by_session.assert_awaited_once()
+        call_args = repository.get_page_by_session.call_args
         assert call_args[1]["session_id"] == "session-abc"
         assert all(msg.session_id == "session-abc" for msg in result.items)
 
 
+def _stored(i):
+    return MessageEntity(
+        message_id=f"msg-{i}",
+        session_id="session-abc",
+        content=f"Message {i}",
+        timestamp=datetime(2026, 1, 30, 10, 0, 0),
+        sender=SenderType.USER,
+        id=i,
+    )
+
+
+#Test para la paginación por cursor (keyset)
+@pytest.mark.asyncio
+class TestGetMessagesUseCaseCursor:
+
+    #El cursor debe codificarse como token opaco y decodificarse sin pérdida
+    async def test_cursor_round_trip(self):
+        cursor = MessageCursor(timestamp=datetime(2026, 1, 30, 10, 0, 0, 123), id=42)
+
+        assert MessageCursor.decode(cursor.encode()) == cursor
+
+    #Con after se pide un mensaje extra para saber si hay página siguiente
+    async def test_after_requests_one_extra_row_and_returns_next_cursor(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(i) for i in range(4, 8)], 20)
+        after = MessageCursor(timestamp=datetime(2026, 1, 30, 10, 0, 0), id=3)
+
+        result = await GetMessagesUseCase(repository).execute(
+            GetMessagesFilterDTO(session_id="session-abc", limit=3, after=after.encode())
+        )
+
+        call_args = repository.get_page_by_session.call_args
+        assert call_args[1]["after"] == after
+        assert call_args[1]["limit"] == 4
+        assert [m.message_id for m in result.items] == ["msg-4", "msg-5", "msg-6"]
+        assert MessageCursor.decode(result.next_cursor).id == 6
+        assert MessageCursor.decode(result.prev_cursor).id == 4
+
+    #En la última página no hay next_cursor
+    async def test_after_on_last_page_has_no_next_cursor(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(18), _stored(19)], 20)
+        after = MessageCursor(timestamp=datetime(2026, 1, 30, 10, 0, 0), id=17)
+
+        result = await GetMessagesUseCase(repository).execute(
+            GetMessagesFilterDTO(session_id="session-abc", limit=3, after=after.encode())
+        )
+
+        assert result.next_cursor is None
+        assert len(result.items) == 2
+
+    #Con before se descarta el mensaje extra más antiguo
+    async def test_before_drops_the_extra_oldest_row(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(i) for i in range(1, 5)], 20)
+        before = MessageCursor(timestamp=datetime(2026, 1, 30, 10, 0, 0), id=5)
+
+        result = await GetMessagesUseCase(repository).execute(
+            GetMessagesFilterDTO(session_id="session-abc", limit=3, before=before.encode())
+        )
+
+        assert [m.message_id for m in result.items] == ["msg-2", "msg-3", "msg-4"]
+        assert MessageCursor.decode(result.prev_cursor).id == 2
+        assert MessageCursor.decode(result.next_cursor).id == 4
+
+    #La primera página en modo offset ya entrega el cursor siguiente
+    async def test_offset_mode_returns_next_cursor_when_more_remain(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(i) for i in range(3)], 10)
+
+        result = await GetMessagesUseCase(repository).execute(
+            GetMessagesFilterDTO(session_id="session-abc", limit=3)
+        )
+
+        assert MessageCursor.decode(result.next_cursor).id == 2
+        assert result.prev_cursor is None
+
+    #Un cursor mal formado es un error de validación
+    async def test_invalid_cursor_raises_value_error(self):
+        repository = AsyncMock()
+
+        with pytest.raises(ValueError):
+            await GetMessagesUseCase(repository).execute(
+                GetMessagesFilterDTO(session_id="session-abc", after="no-es-un-cursor")
+            )
+
+    #after y before son excluyentes
+    async def test_after_and_before_together_raise_value_error(self):
+        repository = AsyncMock()
+        cursor = MessageCursor(timestamp=datetime(2026, 1, 30), id=1).encode()
+
+        with pytest.raises(ValueError):
+            await GetMessagesUseCase(repository).execute(
+                GetMessagesFilterDTO(session_id="session-abc", after=cursor, before=cursor)
+            )
+
+
+#Test del filtro por rango de tiempo
+@pytest.mark.asyncio
+class TestGetMessagesUseCaseTimeRange:
+
+    #El rango llega al repositorio sin zona horaria, como se guardan los timestamps
+    async def test_range_is_passed_to_repository(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(1)], 1)
+        start = datetime(2026, 1, 30, 9, 0, 0, tzinfo=timezone.utc)
+
+        await GetMessagesUseCase(repository).execute(
+            GetMessagesFilterDTO(session_id="session-abc", start=start, end=datetime(2026, 1, 30, 10, 0, 0))
+        )
+
+        call_args = repository.get_page_by_session.call_args
+        assert call_args[1]["start"] == datetime(2026, 1, 30, 9, 0, 0)
+        assert call_args[1]["end"] == datetime(2026, 1, 30, 10, 0, 0)
+
+    async def test_inverted_range_raises_value_error(self):
+        repository = AsyncMock()
+
+        with pytest.raises(ValueError, match="anterior"):
+            await GetMessagesUseCase(repository).execute(
+                GetMessagesFilterDTO(
+                    session_id="session-abc", start=datetime(2026, 1, 31), end=datetime(2026, 1, 30)
+                )
+            )
+        repository.get_page_by_session.assert_not_awaited()
+
+    #Un rango vacío no invalida el sender: se comprueba contra toda la sesión
+    async def test_empty_range_with_sender_checks_whole_session(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([], 0)
+        repository.count_by_session.return_value = 3
+
+        result = await GetMessagesUseCase(repository).execute(
+            GetMessagesFilterDTO(session_id="session-abc", sender="user", start=datetime(2026, 2, 1))
+        )
+
+        assert result.items == []
+        repository.count_by_session.assert_awaited_once_with(session_id="session-abc", sender="user")
+
+
+#Test para la consulta combinada de página + total
+@pytest.mark.asyncio
+class TestGetMessagesUseCaseSingleQuery:
+
+    #Con include_total=False no se cuenta y se pide un mensaje extra para detectar la página siguiente
+    async def test_without_total_probes_one_extra_row(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(i) for i in range(4)], None)
+
+        result = await GetMessagesUseCase(repository).execute(
+            GetMessagesFilterDTO(session_id="session-abc", limit=3, include_total=False)
+        )
+
+        call_args = repository.get_page_by_session.call_args
+        assert call_args[1]["include_total"] is False
+        assert call_args[1]["limit"] == 4
+        assert result.total is None
+        assert len(result.items) == 3
+        assert MessageCursor.decode(result.next_cursor).id == 2
+        repository.count_by_session.assert_not_awaited()
+
+    #Con página no vacía, el filtro por sender no necesita consultas de validación
+    async def test_sender_with_results_does_not_validate_separately(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(1)], 1)
+
+        await GetMessagesUseCase(repository).execute(
+            GetMessagesFilterDTO(session_id="session-abc", sender="user")
+        )
+
+        repository.get_page_by_session.assert_awaited_once()
+        repository.count_by_session.assert_not_awaited()
+
+    #Con página vacía se valida que el sender pertenezca a una sesión existente
+    async def test_sender_not_in_existing_session_raises_value_error(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([], 0)
+        repository.count_by_session.return_value = 5
+
+        with pytest.raises(ValueError, match="no pertenece"):
+            await GetMessagesUseCase(repository).execute(
+                GetMessagesFilterDTO(session_id="session-abc", sender="system")
+            )
+
+
+#Test del uso de la caché de páginas
+@pytest.mark.asyncio
+class TestGetMessagesUseCasePageCache:
+
+    #La segunda petición de la misma página no consulta el repositorio
+    async def test_repeated_page_is_served_from_cache(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(1)], 1)
+        repository.get_session_version.return_value = "1-1"
+        use_case = GetMessagesUseCase(repository, page_cache=MessagePageCache())
+        filters = GetMessagesFilterDTO(session_id="session-abc", limit=10)
+
+        first = await use_case.execute(filters)
+        second = await use_case.execute(filters)
+
+        assert second is first
+        repository.get_page_by_session.assert_awaited_once()
+
+    #Otra página (u otro filtro) de la misma sesión es una entrada distinta
+    async def test_different_parameters_are_cached_separately(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(1)], 1)
+        repository.get_session_version.return_value = "1-1"
+        use_case = GetMessagesUseCase(repository, page_cache=MessagePageCache())
+
+        await use_case.execute(GetMessagesFilterDTO(session_id="session-abc", limit=10))
+        await use_case.execute(GetMessagesFilterDTO(session_id="session-abc", limit=10, sender="user"))
+        await use_case.execute(GetMessagesFilterDTO(session_id="session-abc", limit=10, offset=10))
+
+        assert repository.get_page_by_session.await_count == 3
+
+    #Si otro proceso escribe en la sesión (cambia su versión) la página en caché se vuelve a leer
+    async def test_page_from_older_session_version_is_reloaded(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(1)], 1)
+        repository.get_session_version.return_value = "1-1"
+        use_case = GetMessagesUseCase(repository, page_cache=MessagePageCache())
+        filters = GetMessagesFilterDTO(session_id="session-abc", limit=10)
+
+        first = await use_case.execute(filters)
+        repository.get_page_by_session.return_value = ([_stored(1), _stored(2)], 2)
+        repository.get_session_version.return_value = "2-2"
+        second = await use_case.execute(filters)
+        third = await use_case.execute(filters)
+
+        assert (first.total, second.total) == (1, 2)
+        assert third is second
+        assert repository.get_page_by_session.await_count == 2
+
+    #La versión que ya leyó el llamador (la del ETag) es la que decide si la página en caché sirve
+    async def test_version_from_caller_selects_cached_page(self):
+        repository = AsyncMock()
+        repository.get_page_by_session.return_value = ([_stored(1)], 1)
+        use_case = GetMessagesUseCase(repository, page_cache=MessagePageCache())
+        filters = GetMessagesFilterDTO(session_id="session-abc", limit=10)
+
+        first = await use_case.execute(filters, version="1-1")
+        cached = await use_case.execute(filters, version="1-1")
+        reloaded = await use_case.execute(filters, version="2-2")
+
+        assert cached is first
+        assert reloaded is not first
+        assert repository.get_page_by_session.await_count == 2
+        repository.get_session_version.assert_not_awaited()
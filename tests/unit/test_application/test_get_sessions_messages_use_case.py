@@ -0,0 +1,63 @@
+#Test para el caso de uso que obtiene los últimos mensajes de varias sesiones
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from src.Application.dtos.pagination_dto import GetSessionsMessagesFilterDTO
+from src.Application.use_cases.get_sessions_messages_use_case import GetSessionsMessagesUseCase
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+
+
+def _stored(i, session_id):
+    return MessageEntity(
+        message_id=f"msg-{session_id}-{i}",
+        session_id=session_id,
+        content=f"Message {i}",
+        timestamp=datetime(2026, 1, 30, 10, 0, i),
+        sender=SenderType.USER,
+        id=i,
+    )
+
+
+@pytest.mark.asyncio
+class TestGetSessionsMessagesUseCase:
+
+    #Cada sesión pedida aparece una vez, en el orden pedido, con sus mensajes y su total
+    async def test_returns_sessions_in_requested_order(self):
+        repository = AsyncMock()
+        repository.get_latest_by_sessions.return_value = {
+            "session-a": [_stored(1, "session-a"), _stored(2, "session-a")],
+            "session-b": [_stored(3, "session-b")],
+        }
+        repository.count_by_sessions.return_value = {"session-a": 7, "session-b": 1, "session-c": 0}
+
+        result = await GetSessionsMessagesUseCase(repository).execute(
+            GetSessionsMessagesFilterDTO(session_ids=["session-b", "session-c", "session-a", "session-b"], limit=2)
+        )
+
+        repository.get_latest_by_sessions.assert_awaited_once_with(["session-b", "session-c", "session-a"], 2)
+        repository.count_by_sessions.assert_awaited_once_with(["session-b", "session-c", "session-a"])
+        assert [(s.session_id, s.total) for s in result.sessions] == [("session-b", 1), ("session-c", 0), ("session-a", 7)]
+        assert [m.message_id for m in result.sessions[2].items] == ["msg-session-a-1", "msg-session-a-2"]
+        assert result.sessions[1].items == []
+
+    async def test_empty_session_id_raises_value_error(self):
+        repository = AsyncMock()
+
+        with pytest.raises(ValueError, match="vacío"):
+            await GetSessionsMessagesUseCase(repository).execute(
+                GetSessionsMessagesFilterDTO(session_ids=["session-a", " "])
+            )
+        repository.get_latest_by_sessions.assert_not_awaited()
+
+    #El máximo se aplica a las sesiones distintas, no a las repeticiones
+    async def test_too_many_sessions_raises_value_error(self):
+        repository = AsyncMock()
+        repository.get_latest_by_sessions.return_value = {}
+        repository.count_by_sessions.return_value = {}
+        use_case = GetSessionsMessagesUseCase(repository, max_sessions=2)
+
+        await use_case.execute(GetSessionsMessagesFilterDTO(session_ids=["a", "b", "a"]))
+        with pytest.raises(ValueError, match="más de 2"):
+            await use_case.execute(GetSessionsMessagesFilterDTO(session_ids=["a", "b", "c"]))
@@ -0,0 +1,88 @@
+#Test para la ingesta de mensajes en streaming
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from src.Application.use_cases.ingest_messages_stream_use_case import IngestMessagesStreamUseCase
+from src.Application.use_cases.create_messages_batch_use_case import CreateMessagesBatchUseCase
+from src.Application.dtos.message_dto import CreateMessageDTO
+from src.Domain.services.content_filter import ContentFilterService
+from src.Domain.services.message_processor import MessageProcessor
+
+
+def _dto(message_id, content="Hello world"):
+    return CreateMessageDTO(
+        message_id=message_id,
+        session_id="session-abc",
+        content=content,
+        timestamp=datetime(2026, 1, 30, 10, 0, 0),
+        sender="user",
+    )
+
+
+async def _entries(entries):
+    for entry in entries:
+        yield entry
+
+
+@pytest.mark.asyncio
+class TestIngestMessagesStreamUseCase:
+
+    @pytest.fixture
+    def repository(self):
+        repository = AsyncMock()
+        repository.save_many.side_effect = lambda messages: list(messages)
+        return repository
+
+    def _use_case(self, repository, batch_size):
+        return IngestMessagesStreamUseCase(
+            batch_use_case=CreateMessagesBatchUseCase(
+                repository=repository,
+                content_filter=ContentFilterService(),
+                message_processor=MessageProcessor(),
+            ),
+            batch_size=batch_size,
+        )
+
+    #Debe persistir en lotes acotados por batch_size
+    async def test_entries_are_saved_in_bounded_batches(self, repository):
+        use_case = self._use_case(repository, batch_size=3)
+        entries = [(i + 1, _dto(f"msg-{i}"), None) for i in range(7)]
+
+        results = [r async for r in use_case.execute(_entries(entries))]
+
+        assert [r.index for r in results] == list(range(1, 8))
+        assert all(r.status == "created" for r in results)
+        assert [len(call.args[0]) for call in repository.save_many.call_args_list] == [3, 3, 1]
+
+    #Debe mantener el orden de las líneas mezclando errores de parseo y de validación
+    async def test_results_keep_line_order_with_errors(self, repository):
+        use_case = self._use_case(repository, batch_size=10)
+        entries = [
+            (1, _dto("msg-1"), None),
+            (2, None, "timestamp: Field required"),
+            (3, _dto("msg-3", content="This is spam"), None),
+            (4, _dto("msg-4"), None),
+        ]
+
+        results = [r async for r in use_case.execute(_entries(entries))]
+
+        assert [(r.index, r.status) for r in results] == [
+            (1, "created"), (2, "error"), (3, "error"), (4, "created")
+        ]
+        assert results[1].error == "timestamp: Field required"
+        assert results[0].data is None
+
+
+#Test de la configuración de la ingesta
+class TestIngestMessagesStreamUseCaseConfiguration:
+
+    def test_invalid_batch_size_raises_value_error(self):
+        batch_use_case = CreateMessagesBatchUseCase(
+            repository=AsyncMock(),
+            content_filter=ContentFilterService(),
+            message_processor=MessageProcessor(),
+        )
+
+        with pytest.raises(ValueError):
+            IngestMessagesStreamUseCase(batch_use_case=batch_use_case, batch_size=0)
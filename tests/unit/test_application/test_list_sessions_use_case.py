@@ -0,0 +1,55 @@
+#Test para el caso de uso que lista el directorio de sesiones
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+from src.Application.dtos.pagination_dto import ListSessionsFilterDTO, SessionCursor
+from src.Application.use_cases.list_sessions_use_case import ListSessionsUseCase
+from src.Domain.entities.session_summary_entity import SessionSummaryEntity
+from src.Domain.value_objects.sender_type import SenderType
+
+BASE = datetime(2026, 1, 30, 10, 0, 0)
+
+
+def _summary(i):
+    return SessionSummaryEntity(
+        session_id=f"session-{i}",
+        message_count=i + 1,
+        first_timestamp=BASE,
+        last_timestamp=BASE + timedelta(minutes=i),
+        last_sender=SenderType.USER,
+        last_message_preview=f"Hola {i}",
+    )
+
+
+@pytest.mark.asyncio
+class TestListSessionsUseCase:
+
+    #Se pide una sesión extra para saber si hay página siguiente; el cursor es la última sesión retornada
+    async def test_returns_page_and_next_cursor(self):
+        repository = AsyncMock()
+        repository.list_recent.return_value = [_summary(i) for i in (9, 8, 7)]
+
+        result = await ListSessionsUseCase(repository).execute(ListSessionsFilterDTO(limit=2))
+
+        repository.list_recent.assert_awaited_once_with(limit=3, after=None)
+        assert [s.session_id for s in result.items] == ["session-9", "session-8"]
+        assert (result.items[0].last_sender, result.items[0].last_message_preview) == ("user", "Hola 9")
+        assert SessionCursor.decode(result.next_cursor) == SessionCursor(BASE + timedelta(minutes=8), "session-8")
+
+    async def test_last_page_has_no_next_cursor(self):
+        repository = AsyncMock()
+        repository.list_recent.return_value = [_summary(1)]
+        after = SessionCursor(BASE + timedelta(minutes=2), "session-2")
+
+        result = await ListSessionsUseCase(repository).execute(ListSessionsFilterDTO(limit=2, after=after.encode()))
+
+        assert repository.list_recent.call_args[1]["after"] == after
+        assert result.next_cursor is None
+
+    async def test_invalid_cursor_raises_value_error(self):
+        repository = AsyncMock()
+
+        with pytest.raises(ValueError, match="cursor"):
+            await ListSessionsUseCase(repository).execute(ListSessionsFilterDTO(after="no-es-un-cursor"))
+        repository.list_recent.assert_not_awaited()
@@ -0,0 +1,85 @@
+#Test para el caso de uso de búsqueda de texto completo
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from src.Application.dtos.pagination_dto import SearchCursor, SearchMessagesFilterDTO
+from src.Application.use_cases.search_messages_use_case import SearchMessagesUseCase
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.services.message_search_ranker import MessageSearchRanker
+from src.Domain.value_objects.search_term import SearchTerm
+from src.Domain.value_objects.sender_type import SenderType
+
+
+def _message(message_pk, content):
+    return MessageEntity(
+        message_id=f"msg-{message_pk}",
+        session_id="session-abc",
+        content=content,
+        timestamp=datetime(2026, 1, 30, 10, 0, 0),
+        sender=SenderType.USER,
+        id=message_pk,
+    )
+
+
+@pytest.mark.asyncio
+class TestSearchMessagesUseCase:
+
+    @pytest.fixture
+    def repository(self):
+        repository = MagicMock()
+        # Como el índice: coincidencias más recientes primero
+        repository.search_recent_matches = AsyncMock(return_value=[
+            _message(5, "factura"),
+            _message(4, "factura pendiente de pago con el banco"),
+            _message(3, "factura factura"),
+            _message(2, "factura"),
+        ])
+        return repository
+
+    #Ordena por puntuación (a igual puntuación, el más reciente primero) y pagina con el cursor
+    async def test_ranks_candidates_and_paginates(self, repository):
+        use_case = SearchMessagesUseCase(repository, MessageSearchRanker(), max_candidates=50)
+
+        first = await use_case.execute(SearchMessagesFilterDTO(query="Factura", session_id="session-abc", limit=2))
+        second = await use_case.execute(SearchMessagesFilterDTO(query="Factura", session_id="session-abc", limit=2, after=first.next_cursor))
+
+        assert [hit.message.message_id for hit in first.items] == ["msg-3", "msg-5"]
+        assert [hit.message.message_id for hit in second.items] == ["msg-2", "msg-4"]
+        assert second.next_cursor is None
+        assert (first.truncated, second.truncated) == (False, False)
+        assert first.items[0].snippet == "<mark>factura</mark> <mark>factura</mark>"
+        # La segunda página se limita a las coincidencias que vio la primera
+        assert repository.search_recent_matches.call_args_list[0].args == ([SearchTerm("factura")], "session-abc", 51)
+        assert repository.search_recent_matches.call_args_list[0].kwargs == {"max_id": None}
+        assert repository.search_recent_matches.call_args_list[1].kwargs == {"max_id": 5}
+
+    #Con más coincidencias que max_candidates se puntúan las más recientes y se avisa con truncated
+    async def test_more_matches_than_candidates_sets_truncated(self, repository):
+        use_case = SearchMessagesUseCase(repository, MessageSearchRanker(), max_candidates=3)
+
+        result = await use_case.execute(SearchMessagesFilterDTO(query="factura", limit=10))
+
+        assert [hit.message.message_id for hit in result.items] == ["msg-3", "msg-5", "msg-4"]
+        assert result.truncated is True
+        assert result.next_cursor is None
+
+    async def test_invalid_query_or_cursor_raises_value_error(self, repository):
+        use_case = SearchMessagesUseCase(repository, MessageSearchRanker())
+
+        with pytest.raises(ValueError):
+            await use_case.execute(SearchMessagesFilterDTO(query="***"))
+        with pytest.raises(ValueError):
+            await use_case.execute(SearchMessagesFilterDTO(query="factura", after="no-es-un-cursor"))
+        with pytest.raises(ValueError):
+            await use_case.execute(SearchMessagesFilterDTO(query="factura", session_id=" "))
+        repository.search_recent_matches.assert_not_called()
+
+
+#Test del cursor de búsqueda
+class TestSearchCursor:
+
+    def test_cursor_round_trip(self):
+        cursor = SearchCursor(score=1.2345678901234567, id=42, max_id=99)
+
+        assert SearchCursor.decode(cursor.encode()) == cursor
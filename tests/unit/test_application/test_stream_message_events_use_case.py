@@ -0,0 +1,141 @@
+#Test para el caso de uso del flujo de eventos de una sesión
+import pytest
+from datetime import datetime
+
+from src.Application.interfaces.message_event_hub_interface import SubscriberEvictedError
+from src.Application.use_cases.stream_message_events_use_case import StreamMessageEventsUseCase
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+from src.Infrastructure.events.message_hub import MessageHub
+
+
+def _message(message_pk):
+    return MessageEntity(
+        message_id=f"msg-{message_pk}",
+        session_id="session-abc",
+        content="Hola",
+        timestamp=datetime(2026, 1, 30, 10, 0, 0),
+        sender=SenderType.USER,
+        id=message_pk,
+    )
+
+
+#Simula la BD: mensajes de la sesión con id 1..stored
+class FakeStore:
+
+    def __init__(self, stored):
+        self.messages = [_message(message_pk) for message_pk in range(1, stored + 1)]
+        self.calls = []
+
+    async def load_messages_after(self, session_id, after_id, limit):
+        self.calls.append((session_id, after_id, limit))
+        return [m for m in self.messages if m.id > after_id][:limit]
+
+    async def load_last_message_id(self, session_id):
+        return self.messages[-1].id if self.messages else 0
+
+
+def _use_case(hub, store, **kwargs):
+    return StreamMessageEventsUseCase(hub, store.load_messages_after, store.load_last_message_id, **kwargs)
+
+
+def _event_ids(batch):
+    return [event.event_id for event in batch]
+
+
+@pytest.mark.asyncio
+class TestStreamMessageEventsUseCase:
+
+    #Con Last-Event-ID reenvía lo perdido desde la BD por bloques y luego sigue en vivo sin repetir
+    async def test_replays_missed_messages_then_follows_hub(self):
+        hub = MessageHub()
+        store = FakeStore(stored=5)
+        use_case = _use_case(hub, store, heartbeat_seconds=0.05, replay_batch_size=2)
+
+        subscription = use_case.subscribe("session-abc")
+        # Guardado durante la reanudación: llega por el hub y también desde la BD
+        hub.publish(_message(5))
+        events = use_case.events(subscription, await use_case.start_position("session-abc", 1))
+
+        assert _event_ids(await events.__anext__()) == [2, 3]
+        assert _event_ids(await events.__anext__()) == [4, 5]
+        store.messages.append(_message(6))
+        hub.publish(_message(6))
+        assert _event_ids(await events.__anext__()) == [6]
+        # Los avisos del 5 y el 6 no vuelven a consultar la BD: ya se entregaron
+        assert await events.__anext__() == []
+        assert store.calls == [("session-abc", 1, 2), ("session-abc", 3, 2), ("session-abc", 5, 2)]
+
+        await events.aclose()
+        assert hub.stats()["subscribers"] == 0
+
+    #Un lote del hub desordenado se entrega en orden de id, y reanudar desde el último id no pierde nada
+    async def test_out_of_order_publish_is_delivered_in_id_order(self):
+        hub = MessageHub()
+        store = FakeStore(stored=4)
+        use_case = _use_case(hub, store, heartbeat_seconds=1)
+
+        events = use_case.events(use_case.subscribe("session-abc"), 4)
+        store.messages.extend([_message(5), _message(6)])
+        hub.publish(_message(6))
+        hub.publish(_message(5))
+        delivered = _event_ids(await events.__anext__())
+        await events.aclose()
+
+        resumed = use_case.events(use_case.subscribe("session-abc"), delivered[-1])
+        hub.publish(_message(5))
+        store.messages.append(_message(7))
+        hub.publish(_message(7))
+
+        assert delivered == [5, 6]
+        assert _event_ids(await resumed.__anext__()) == [7]
+        await resumed.aclose()
+
+    #Sin Last-Event-ID empieza en el último mensaje guardado; un lote vacío es un heartbeat
+    async def test_without_last_event_id_starts_at_current_position(self):
+        hub = MessageHub()
+        store = FakeStore(stored=3)
+        use_case = _use_case(hub, store, heartbeat_seconds=0.01)
+
+        subscription = use_case.subscribe("session-abc")
+        events = use_case.events(subscription, await use_case.start_position("session-abc", None))
+
+        assert await events.__anext__() == []
+        store.messages.append(_message(4))
+        hub.publish(_message(4))
+        batch = await events.__anext__()
+        assert _event_ids(batch) == [4]
+        assert batch[0].message.sender == "user"
+        await events.aclose()
+
+    #La desconexión por consumidor lento se propaga y libera la suscripción
+    async def test_eviction_is_propagated(self):
+        hub = MessageHub(max_queue_size=1)
+        use_case = _use_case(hub, FakeStore(stored=0))
+        events = use_case.events(use_case.subscribe("session-abc"), 0)
+
+        hub.publish(_message(1))
+        hub.publish(_message(2))
+
+        with pytest.raises(SubscriberEvictedError):
+            await events.__anext__()
+        assert hub.stats()["subscribers"] == 0
+
+
+#Test de la validación de Last-Event-ID y de la sesión
+class TestStreamMessageEventsUseCaseValidation:
+
+    @pytest.mark.parametrize("value, expected", [(None, None), ("", None), ("42", 42)])
+    def test_parse_last_event_id(self, value, expected):
+        assert StreamMessageEventsUseCase.parse_last_event_id(value) == expected
+
+    @pytest.mark.parametrize("value", ["abc", "-1", "1.5"])
+    def test_parse_invalid_last_event_id_raises_value_error(self, value):
+        with pytest.raises(ValueError, match="Last-Event-ID"):
+            StreamMessageEventsUseCase.parse_last_event_id(value)
+
+    def test_empty_session_id_raises_value_error(self):
+        use_case = _use_case(MessageHub(), FakeStore(stored=0))
+
+        with pytest.raises(ValueError, match="session_id"):
+            use_case.subscribe("  ")
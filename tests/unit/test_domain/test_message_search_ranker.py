@@ -0,0 +1,78 @@
+#Test para message_search_ranker.py en domain services
+import pytest
+from datetime import datetime
+
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.services.message_search_ranker import MessageSearchRanker
+from src.Domain.value_objects.search_term import SearchTerm
+from src.Domain.value_objects.sender_type import SenderType
+
+
+def _message(message_pk, content):
+    return MessageEntity(
+        message_id=f"msg-{message_pk}",
+        session_id="session-abc",
+        content=content,
+        timestamp=datetime(2026, 1, 30, 10, 0, 0),
+        sender=SenderType.USER,
+        id=message_pk,
+    )
+
+
+#test cases para MessageSearchRanker: términos, puntuación y fragmentos
+class TestMessageSearchRanker:
+
+    #La consulta se normaliza como el índice (sin tildes ni mayúsculas) y los operadores se tratan como palabras
+    def test_parse_query_normalizes_terms(self):
+        terms = MessageSearchRanker().parse_query('Canción "factura" pend* OR canción')
+
+        assert terms == [
+            SearchTerm("cancion"),
+            SearchTerm("factura"),
+            SearchTerm("pend", prefix=True),
+            SearchTerm("or"),
+        ]
+
+    def test_parse_query_rejects_empty_or_long_queries(self):
+        ranker = MessageSearchRanker()
+        with pytest.raises(ValueError):
+            ranker.parse_query("¿?! *")
+        with pytest.raises(ValueError):
+            ranker.parse_query(" ".join(f"w{i}" for i in range(MessageSearchRanker.MAX_TERMS + 1)))
+        with pytest.raises(ValueError):
+            ranker.parse_query("factura p*")
+
+    #Más apariciones del término y mensajes más cortos puntúan más
+    def test_score_prefers_frequent_terms_in_short_messages(self):
+        messages = [
+            _message(1, "la factura llegó ayer junto con otros papeles del banco y del seguro"),
+            _message(2, "factura factura pendiente"),
+            _message(3, "la factura llegó"),
+        ]
+
+        scores = MessageSearchRanker().score(messages, [SearchTerm("factura")])
+
+        assert scores[1] > scores[2] > scores[0] > 0
+
+    def test_score_counts_prefix_matches(self):
+        scores = MessageSearchRanker().score(
+            [_message(1, "pendiente pendientes"), _message(2, "pendiente otra cosa")],
+            [SearchTerm("pend", prefix=True)],
+        )
+
+        assert scores[0] > scores[1] > 0
+
+    #El fragmento escapa el HTML del mensaje y marca las coincidencias alrededor de la primera
+    def test_snippet_marks_matches_and_escapes_html(self):
+        content = "uno dos tres cuatro cinco seis <b>Canción</b> de siete ocho nueve diez once doce trece catorce quince"
+
+        snippet = MessageSearchRanker().snippet(content, [SearchTerm("cancion")])
+
+        assert snippet == (
+            "…cuatro cinco seis &lt;b&gt;<mark>Canción</mark>&lt;/b&gt; de siete ocho nueve diez once doce trece catorce quince"
+        )
+
+    def test_snippet_of_short_message_is_complete(self):
+        snippet = MessageSearchRanker().snippet("¿Llegó la factura?", [SearchTerm("factura")])
+
+        assert snippet == "¿Llegó la <mark>factura</mark>?"
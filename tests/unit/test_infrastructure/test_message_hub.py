@@ -0,0 +1,152 @@
+#Test para el hub de eventos de mensajes (pub/sub en memoria)
+import asyncio
+import pytest
+from datetime import datetime
+
+from src.Application.interfaces.message_event_hub_interface import SubscriberEvictedError, SubscriberLimitError
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+from src.Infrastructure.events.message_hub import MessageHub
+
+
+def _message(message_pk, session_id="session-abc"):
+    return MessageEntity(
+        message_id=f"msg-{message_pk}",
+        session_id=session_id,
+        content="Hola",
+        timestamp=datetime(2026, 1, 30, 10, 0, 0),
+        sender=SenderType.USER,
+        id=message_pk,
+    )
+
+
+@pytest.mark.asyncio
+class TestMessageHub:
+
+    #Cada suscriptor de la sesión recibe los mensajes publicados, en orden y en un solo lote
+    async def test_publish_fans_out_to_session_subscribers(self):
+        hub = MessageHub()
+        first = hub.subscribe("session-abc")
+        second = hub.subscribe("session-abc")
+        other = hub.subscribe("session-xyz")
+
+        hub.publish(_message(1))
+        hub.publish(_message(2))
+
+        assert [m.id for m in await first.next_batch(1)] == [1, 2]
+        assert [m.id for m in await second.next_batch(1)] == [1, 2]
+        assert await other.next_batch(0.01) == []
+        assert hub.stats()["delivered"] == 4
+
+    #Un suscriptor en espera se despierta al publicar
+    async def test_waiting_subscriber_is_woken_by_publish(self):
+        hub = MessageHub()
+        subscription = hub.subscribe("session-abc")
+
+        waiter = asyncio.ensure_future(subscription.next_batch(5))
+        await asyncio.sleep(0)
+        hub.publish(_message(1))
+
+        assert [m.id for m in await waiter] == [1]
+
+    #Sin mensajes, next_batch retorna una lista vacía al vencer el timeout (heartbeat)
+    async def test_next_batch_returns_empty_list_on_timeout(self):
+        subscription = MessageHub().subscribe("session-abc")
+
+        assert await subscription.next_batch(0.01) == []
+
+    #Un consumidor lento se desconecta al llenar su cola, sin afectar a los demás
+    async def test_slow_consumer_is_evicted(self):
+        hub = MessageHub(max_queue_size=2)
+        slow = hub.subscribe("session-abc")
+        fast = hub.subscribe("session-abc")
+
+        for message_pk in (1, 2):
+            hub.publish(_message(message_pk))
+        await fast.next_batch(1)
+        hub.publish(_message(3))
+
+        with pytest.raises(SubscriberEvictedError):
+            await slow.next_batch(1)
+        assert [m.id for m in await fast.next_batch(1)] == [3]
+        stats = hub.stats()
+        assert (stats["subscribers"], stats["evictions"]) == (1, 1)
+
+    #Los mensajes ignorados (los que guarda el propio suscriptor) no ocupan su cola ni lo desconectan:
+    #solo lo despiertan con el último de ellos
+    async def test_ignored_messages_are_not_queued(self):
+        hub = MessageHub(max_queue_size=2)
+        writer = hub.subscribe("session-abc")
+        writer.ignore(f"msg-{message_pk}" for message_pk in (1, 2, 3, 4))
+        writer.unignore(["msg-4"])
+
+        for message_pk in (1, 2, 3, 4):
+            hub.publish(_message(message_pk))
+
+        assert [m.id for m in await writer.next_batch(1)] == [4, 3]
+        hub.publish(_message(1))
+        assert [m.id for m in await writer.next_batch(1)] == [1]
+        assert await writer.next_batch(0.01) == []
+        assert hub.stats()["evictions"] == 0
+
+    #Cerrar una suscripción la quita del hub; cerrarla dos veces no descuenta dos veces
+    async def test_close_unsubscribes_once(self):
+        hub = MessageHub()
+        with hub.subscribe("session-abc") as subscription:
+            assert hub.stats()["subscribers"] == 1
+        subscription.close()
+
+        hub.publish(_message(1))
+
+        stats = hub.stats()
+        assert (stats["subscribers"], stats["sessions"], stats["delivered"]) == (0, 0, 0)
+
+    #Al llegar al máximo de suscriptores se rechazan los nuevos
+    async def test_subscriber_limit(self):
+        hub = MessageHub(max_subscribers=1)
+        hub.subscribe("session-abc")
+
+        with pytest.raises(SubscriberLimitError):
+            hub.subscribe("session-xyz")
+        assert hub.stats()["rejected_subscriptions"] == 1
+
+    #Publicar recuerda el último id de la sesión; la posición caduca tras max_age y nunca retrocede
+    async def test_last_known_id_tracks_published_ids(self):
+        now = [0.0]
+        hub = MessageHub(clock=lambda: now[0])
+
+        assert hub.last_known_id("session-abc", 60) is None
+        hub.publish(_message(7))
+        hub.remember_last_id("session-abc", 3)
+        assert hub.last_known_id("session-abc", 60) == 7
+
+        now[0] = 61.0
+        assert hub.last_known_id("session-abc", 60) is None
+        hub.remember_last_id("session-abc", 7)
+        assert hub.last_known_id("session-abc", 60) == 7
+
+        stats = hub.stats()
+        assert (stats["tracked_sessions"], stats["position_hits"], stats["position_misses"]) == (1, 2, 2)
+
+    #Las posiciones recordadas están acotadas: al superar el máximo se olvidan todas
+    async def test_tracked_sessions_are_bounded(self):
+        hub = MessageHub(max_tracked_sessions=2)
+        hub.remember_last_id("session-1", 1)
+        hub.remember_last_id("session-2", 2)
+        hub.remember_last_id("session-3", 3)
+
+        assert hub.stats()["tracked_sessions"] == 1
+        assert hub.last_known_id("session-1", 60) is None
+        assert hub.last_known_id("session-3", 60) == 3
+
+
+#Test de la configuración del hub
+class TestMessageHubConfiguration:
+
+    def test_invalid_configuration_raises_value_error(self):
+        with pytest.raises(ValueError):
+            MessageHub(max_queue_size=0)
+        with pytest.raises(ValueError):
+            MessageHub(max_subscribers=0)
+        with pytest.raises(ValueError):
+            MessageHub(max_tracked_sessions=0)
@@ -0,0 +1,51 @@
+#Test para el filtro de Bloom de message_id
+import pytest
+
+from src.Infrastructure.cache.message_id_bloom_filter import MessageIdBloomFilter
+
+
+class TestMessageIdBloomFilter:
+
+    #Antes de cargarse desde la BD debe responder siempre "quizá"
+    def test_not_ready_filter_always_answers_maybe(self):
+        bloom = MessageIdBloomFilter(false_positive_rate=0.01, max_memory_bytes=1024)
+
+        assert bloom.might_contain("msg-never-added") is True
+
+    #Nunca debe dar falsos negativos
+    def test_added_ids_are_always_reported(self):
+        bloom = MessageIdBloomFilter(false_positive_rate=0.01, max_memory_bytes=4096)
+        bloom.load(f"msg-{i}" for i in range(1000))
+        bloom.mark_ready()
+
+        assert all(bloom.might_contain(f"msg-{i}") for i in range(1000))
+
+    #La tasa de falsos positivos debe mantenerse cerca de la objetivo dentro de la capacidad
+    def test_false_positive_rate_within_capacity(self):
+        bloom = MessageIdBloomFilter(false_positive_rate=0.01, max_memory_bytes=4096)
+        bloom.load(f"msg-{i}" for i in range(bloom.capacity))
+        bloom.mark_ready()
+
+        false_positives = sum(bloom.might_contain(f"other-{i}") for i in range(10000))
+
+        assert false_positives / 10000 < 0.03
+        assert bloom.stats()["definite_misses"] == 10000 - false_positives
+
+    #Las estadísticas deben reflejar la ocupación del filtro
+    def test_stats_report_fill_ratio(self):
+        bloom = MessageIdBloomFilter(false_positive_rate=0.01, max_memory_bytes=1024)
+        empty = bloom.stats()
+        bloom.add("msg-1")
+        stats = bloom.stats()
+
+        assert empty["fill_ratio"] == 0
+        assert stats["items"] == 1
+        assert stats["bits"] == 8192
+        assert stats["hash_functions"] == 7
+        assert 0 < stats["fill_ratio"] <= 7 / 8192
+        assert stats["ready"] is False
+
+    @pytest.mark.parametrize("rate, memory", [(0, 1024), (1, 1024), (0.01, 0)])
+    def test_invalid_configuration_raises_value_error(self, rate, memory):
+        with pytest.raises(ValueError):
+            MessageIdBloomFilter(false_positive_rate=rate, max_memory_bytes=memory)
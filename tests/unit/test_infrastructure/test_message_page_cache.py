@@ -0,0 +1,120 @@
+#Test para la caché LRU de páginas de mensajes
+import pytest
+from datetime import datetime
+
+from src.Application.dtos.message_dto import MessageDTO
+from src.Application.dtos.pagination_dto import MessagePageKey, PaginationDTO
+from src.Infrastructure.cache.message_page_cache import MessagePageCache
+
+
+def _key(session_id="session-abc", offset=0):
+    return MessagePageKey(
+        session_id=session_id, sender=None, limit=10, offset=offset,
+        after=None, before=None, include_total=True,
+    )
+
+
+def _page(items=1, content="Hola"):
+    return PaginationDTO(
+        items=[
+            MessageDTO(
+                message_id=f"msg-{i}", session_id="session-abc", content=content,
+                timestamp=datetime(2026, 1, 30, 10, 0, 0), sender="user", metadata=None,
+            )
+            for i in range(items)
+        ],
+        limit=10, offset=0, total=items,
+    )
+
+
+#Reloj manual para probar el TTL sin esperar
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMessagePageCache:
+
+    #Una página guardada se devuelve hasta que vence su TTL
+    def test_get_returns_page_until_ttl_expires(self):
+        clock = FakeClock()
+        cache = MessagePageCache(ttl_seconds=5, clock=clock)
+        page = _page()
+
+        assert cache.get(_key(), "1-1") is None
+        cache.put(_key(), page, cache.token("session-abc"), "1-1")
+        assert cache.get(_key(), "1-1") is page
+
+        clock.now = 5.0
+        assert cache.get(_key(), "1-1") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"], stats["entries"]) == (1, 2, 1, 0)
+
+    #Una página leída en otra versión de la sesión (escritura de otro proceso) no se sirve
+    def test_get_with_different_version_drops_entry(self):
+        cache = MessagePageCache()
+        cache.put(_key(), _page(), cache.token("session-abc"), "1-1")
+
+        assert cache.get(_key(), "2-2") is None
+        assert cache.get(_key(), "1-1") is None
+        stats = cache.stats()
+        assert (stats["stale"], stats["misses"], stats["entries"]) == (1, 2, 0)
+
+    #Invalidar una sesión descarta solo sus páginas
+    def test_invalidate_session_drops_only_that_session(self):
+        cache = MessagePageCache()
+        for session_id in ("session-abc", "session-xyz"):
+            for offset in (0, 10):
+                cache.put(_key(session_id, offset), _page(), cache.token(session_id), "1-1")
+
+        cache.invalidate_session("session-abc")
+
+        assert cache.get(_key("session-abc"), "1-1") is None
+        assert cache.get(_key("session-abc", 10), "1-1") is None
+        assert cache.get(_key("session-xyz"), "1-1") is not None
+        assert cache.stats()["entries"] == 2
+
+    #Una lectura que empezó antes de una escritura no puede guardar su página
+    def test_put_with_token_from_before_invalidation_is_rejected(self):
+        cache = MessagePageCache()
+        token = cache.token("session-abc")
+
+        cache.invalidate_session("session-abc")
+        cache.put(_key(), _page(), token, "1-1")
+
+        assert cache.get(_key(), "1-1") is None
+        assert cache.stats()["rejected_puts"] == 1
+
+    #Al superar el máximo de entradas se desaloja la menos usada recientemente
+    def test_evicts_least_recently_used_entry(self):
+        cache = MessagePageCache(max_entries=2)
+        cache.put(_key(offset=0), _page(), cache.token("session-abc"), "1-1")
+        cache.put(_key(offset=10), _page(), cache.token("session-abc"), "1-1")
+        cache.get(_key(offset=0), "1-1")
+
+        cache.put(_key(offset=20), _page(), cache.token("session-abc"), "1-1")
+
+        assert cache.get(_key(offset=10), "1-1") is None
+        assert cache.get(_key(offset=0), "1-1") is not None
+        assert cache.stats()["evictions"] == 1
+
+    #La memoria estimada nunca supera el límite configurado
+    def test_memory_bound_is_respected(self):
+        cache = MessagePageCache(max_memory_bytes=20000)
+        for offset in range(50):
+            cache.put(_key(offset=offset), _page(items=5, content="x" * 500), cache.token("session-abc"), "1-1")
+
+        stats = cache.stats()
+        assert 0 < stats["memory_bytes"] <= 20000
+        assert stats["evictions"] == 50 - stats["entries"]
+
+    #Los parámetros inválidos se rechazan
+    def test_invalid_parameters_raise_value_error(self):
+        with pytest.raises(ValueError):
+            MessagePageCache(max_entries=0)
+        with pytest.raises(ValueError):
+            MessagePageCache(ttl_seconds=0)
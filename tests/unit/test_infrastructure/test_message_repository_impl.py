@@ -9,6 +9,15 @@ from src.Domain.entities.message_entity import MessageEntity
 from src.Domain.value_objects.sender_type import SenderType
 from src.Domain.value_objects.message_metadata import MessageMetadata
 from src.Infrastructure.database.models import MessageModel
+
+
+#Fila de la consulta de listados: las columnas de un mensaje en el orden de _ENTITY_COLUMNS
+def _as_row(model):
+    return (
+        model.id, model.message_id, model.session_id, model.content, model.timestamp,
+        model.sender, model.word_count, model.character_count, model.processed_at,
+    )
+
 #test para MessageRepositoryImpl
 class TestMessageRepositoryImpl:
 
@@ -42,16 +51,22 @@ class TestMessageRepositoryImpl:
             metadata=metadata
         )
 
+        # Mock: el INSERT ... RETURNING devuelve el id generado
+        mock_result = MagicMock()
+        mock_result.scalar_one.return_value = 7
         mock_db_session.refresh = AsyncMock()
-        mock_db_session.add = MagicMock()
+        mock_db_session.execute = AsyncMock(return_value=mock_result)
         mock_db_session.commit = AsyncMock()
 
         result = await repository.save(message)
 
         assert result is not None
         assert result.message_id == "msg-123"
-        mock_db_session.add.assert_called_once()
+        assert result.id == 7
+        # Un solo INSERT y ningún SELECT posterior para recargar la fila
+        mock_db_session.execute.assert_called_once()
         mock_db_session.commit.assert_called_once()
+        mock_db_session.refresh.assert_not_called()
 
     #Debe obtener mensajes por session_id con paginación
     @pytest.mark.asyncio
@@ -81,13 +96,9 @@ class TestMessageRepositoryImpl:
         model2.character_count = 10
         model2.processed_at = datetime.utcnow()
 
-        # Mock: .all() retorna los modelos
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = [model1, model2]
-        
-        # Mock: result.scalars() retorna el objeto con .all()
+        # Mock: result.all() retorna las filas con las columnas proyectadas
         mock_result = MagicMock()
-        mock_result.scalars.return_value = mock_scalars
+        mock_result.all.return_value = [_as_row(model1), _as_row(model2)]
         
         # execute() es AsyncMock
         mock_db_session.execute = AsyncMock(return_value=mock_result)
@@ -141,8 +152,7 @@ class TestMessageRepositoryImpl:
             metadata=metadata
         )
 
-        mock_db_session.add = MagicMock()
-        mock_db_session.commit = AsyncMock(side_effect=IntegrityError("Duplicate", None, None))
+        mock_db_session.execute = AsyncMock(side_effect=IntegrityError("Duplicate", None, None))
         mock_db_session.rollback = AsyncMock()
 
         with pytest.raises(ValueError, match="ya existe"):
@@ -150,16 +160,35 @@ class TestMessageRepositoryImpl:
         
         mock_db_session.rollback.assert_called_once()
 
+    #Debe retornar las fechas tal como las devolvería SQLite (sin zona horaria)
+    @pytest.mark.asyncio
+    async def test_save_returns_entity_as_stored(self, repository, mock_db_session):
+        from datetime import timezone
+
+        message = MessageEntity(
+            message_id="msg-123",
+            session_id="session-abc",
+            content="Test",
+            timestamp=datetime(2026, 1, 30, 10, 0, 0, tzinfo=timezone.utc),
+            sender=SenderType.USER,
+        )
+        mock_result = MagicMock()
+        mock_result.scalar_one.return_value = 1
+        mock_db_session.execute = AsyncMock(return_value=mock_result)
+        mock_db_session.commit = AsyncMock()
+
+        result = await repository.save(message)
+
+        assert result.timestamp == datetime(2026, 1, 30, 10, 0, 0)
+        assert result.timestamp.tzinfo is None
+
     #Debe retornar lista vacía cuando no hay mensajes
     @pytest.mark.asyncio
     async def test_get_by_session_empty_result(self, repository, mock_db_session):
         session_id = "session-nonexistent"
 
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = []
-        
         mock_result = MagicMock()
-        mock_result.scalars.return_value = mock_scalars
+        mock_result.all.return_value = []
         
         mock_db_session.execute = AsyncMock(return_value=mock_result)
 
@@ -189,11 +218,8 @@ class TestMessageRepositoryImpl:
         model.character_count = 11
         model.processed_at = datetime.utcnow()
 
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = [model]
-        
         mock_result = MagicMock()
-        mock_result.scalars.return_value = mock_scalars
+        mock_result.all.return_value = [_as_row(model)]
         
         mock_db_session.execute = AsyncMock(return_value=mock_result)
 
@@ -205,4 +231,43 @@ class TestMessageRepositoryImpl:
         )
 
         assert len(result) == 1
-        assert result[0].sender == SenderType.USER
\ No newline at end of file
+        assert result[0].sender == SenderType.USER
+
+    #Debe guardar un lote en una sola sentencia y marcar los duplicados con None
+    @pytest.mark.asyncio
+    async def test_save_many_marks_duplicates_as_none(self, repository, mock_db_session):
+        messages = [
+            MessageEntity(
+                message_id=message_id,
+                session_id="session-abc",
+                content="Test",
+                timestamp=datetime.utcnow(),
+                sender=SenderType.USER,
+            )
+            for message_id in ["msg-1", "msg-2", "msg-1"]
+        ]
+
+        # Solo msg-1 se inserta: msg-2 ya existía en la BD (RETURNING message_id, id)
+        mock_result = MagicMock()
+        mock_result.all.return_value = [("msg-1", 1)]
+        mock_db_session.execute = AsyncMock(return_value=mock_result)
+        mock_db_session.commit = AsyncMock()
+
+        result = await repository.save_many(messages)
+
+        assert result[0].message_id == "msg-1"
+        assert result[0].id == 1
+        assert result[1] is None
+        assert result[2] is None
+        mock_db_session.execute.assert_called_once()
+        # Los message_id repetidos dentro del lote se envían una sola vez
+        assert len(mock_db_session.execute.call_args.args[1]) == 2
+        mock_db_session.commit.assert_called_once()
+
+    #Un lote vacío no debe tocar la BD
+    @pytest.mark.asyncio
+    async def test_save_many_with_empty_list(self, repository, mock_db_session):
+        result = await repository.save_many([])
+
+        assert result == []
+        mock_db_session.execute.assert_not_called()
@@ -0,0 +1,65 @@
+#Test para los perfiles de ajuste de SQLite
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.Infrastructure.database.sqlite_tuning import (
+    SQLITE_PROFILES,
+    install_sqlite_pragmas,
+    resolve_sqlite_pragmas,
+)
+
+
+class TestResolveSqlitePragmas:
+
+    #Debe retornar los PRAGMAs del perfil
+    @pytest.mark.parametrize("profile", list(SQLITE_PROFILES))
+    def test_every_profile_enables_wal(self, profile):
+        pragmas = resolve_sqlite_pragmas(profile)
+
+        assert pragmas["journal_mode"] == "WAL"
+        assert set(pragmas) == {
+            "journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store", "busy_timeout", "foreign_keys"
+        }
+
+    #Las sobrescrituras deben aplicarse sobre el perfil, ignorando las vacías
+    def test_overrides_replace_profile_values(self):
+        pragmas = resolve_sqlite_pragmas("balanced", {"synchronous": "full", "mmap_size": "0", "cache_size": None})
+
+        assert pragmas["synchronous"] == "FULL"
+        assert pragmas["mmap_size"] == 0
+        assert pragmas["cache_size"] == SQLITE_PROFILES["balanced"]["cache_size"]
+
+    def test_unknown_profile_raises_value_error(self):
+        with pytest.raises(ValueError, match="Perfil de SQLite desconocido"):
+            resolve_sqlite_pragmas("fastest")
+
+    #Los valores se validan porque los PRAGMA no admiten parámetros enlazados
+    def test_invalid_value_raises_value_error(self):
+        with pytest.raises(ValueError, match="journal_mode"):
+            resolve_sqlite_pragmas("balanced", {"journal_mode": "WAL; DROP TABLE messages"})
+
+
+@pytest.mark.asyncio
+class TestInstallSqlitePragmas:
+
+    #Cada conexión del pool debe quedar configurada con el perfil
+    async def test_pragmas_are_applied_on_connect(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'tuning.db'}")
+        install_sqlite_pragmas(engine, resolve_sqlite_pragmas("throughput"))
+
+        try:
+            async with engine.connect() as conn:
+                journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar_one()
+                synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar_one()
+                temp_store = (await conn.execute(text("PRAGMA temp_store"))).scalar_one()
+                busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar_one()
+                foreign_keys = (await conn.execute(text("PRAGMA foreign_keys"))).scalar_one()
+        finally:
+            await engine.dispose()
+
+        assert journal_mode == "wal"
+        assert synchronous == 0
+        assert temp_store == 2
+        assert busy_timeout == 10000
+        assert foreign_keys == 1
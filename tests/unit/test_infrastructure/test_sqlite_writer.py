@@ -0,0 +1,107 @@
+#Test para SQLiteWriter (escritor único con cola de operaciones)
+import asyncio
+import pytest
+
+from src.Infrastructure.database.sqlite_writer import SQLiteWriter
+
+
+#Factory de sesiones falsa: registra cuántas sesiones están abiertas a la vez
+class FakeSessionFactory:
+
+    def __init__(self):
+        self.open_sessions = 0
+        self.max_open_sessions = 0
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        self.open_sessions += 1
+        self.max_open_sessions = max(self.max_open_sessions, self.open_sessions)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.open_sessions -= 1
+
+
+@pytest.mark.asyncio
+class TestSQLiteWriter:
+
+    #Las operaciones concurrentes deben ejecutarse una a una y en orden de llegada
+    async def test_operations_run_one_at_a_time_in_order(self):
+        factory = FakeSessionFactory()
+        writer = SQLiteWriter(factory)
+        executed = []
+
+        def operation(i):
+            async def run(session):
+                await asyncio.sleep(0)
+                executed.append(i)
+                return i * 2
+            return run
+
+        results = await asyncio.gather(*(writer.run(operation(i)) for i in range(20)))
+        await writer.close()
+
+        assert results == [i * 2 for i in range(20)]
+        assert executed == list(range(20))
+        assert factory.max_open_sessions == 1
+        assert writer.completed == 20
+
+    #Una operación fallida propaga su excepción solo a su llamador
+    async def test_failure_is_isolated_to_its_caller(self):
+        writer = SQLiteWriter(FakeSessionFactory())
+
+        async def fail(session):
+            raise ValueError("boom")
+
+        async def ok(session):
+            return "ok"
+
+        results = await asyncio.gather(writer.run(fail), writer.run(ok), return_exceptions=True)
+        await writer.close()
+
+        assert isinstance(results[0], ValueError)
+        assert results[1] == "ok"
+        assert writer.snapshot()["failed"] == 1
+
+    #close() debe ejecutar las operaciones que ya estaban en cola
+    async def test_close_drains_pending_operations(self):
+        writer = SQLiteWriter(FakeSessionFactory())
+        executed = []
+
+        async def record(session):
+            executed.append(True)
+
+        tasks = [asyncio.create_task(writer.run(record)) for _ in range(5)]
+        await asyncio.sleep(0)
+        await writer.close()
+        await asyncio.gather(*tasks)
+
+        assert len(executed) == 5
+
+    #La cola acotada hace esperar a los llamadores en lugar de crecer sin límite
+    async def test_bounded_queue_applies_backpressure(self):
+        writer = SQLiteWriter(FakeSessionFactory(), max_queue_size=2)
+        release = asyncio.Event()
+
+        async def blocked(session):
+            await release.wait()
+
+        tasks = [asyncio.create_task(writer.run(blocked)) for _ in range(6)]
+        await asyncio.sleep(0.01)
+
+        assert writer.pending <= 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+        await writer.close()
+
+
+#Test de la configuración del escritor
+class TestSQLiteWriterConfiguration:
+
+    #El tamaño de la cola debe ser positivo
+    def test_rejects_invalid_queue_size(self):
+        with pytest.raises(ValueError):
+            SQLiteWriter(FakeSessionFactory(), max_queue_size=0)
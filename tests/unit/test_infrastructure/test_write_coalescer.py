@@ -0,0 +1,125 @@
+#Test para WriteCoalescer (group commit de mensajes)
+import asyncio
+import pytest
+from datetime import datetime
+
+from src.Infrastructure.repositories.write_coalescer import WriteCoalescer
+from src.Domain.entities.message_entity import MessageEntity
+from src.Domain.value_objects.sender_type import SenderType
+
+
+def _message(message_id):
+    return MessageEntity(
+        message_id=message_id,
+        session_id="session-abc",
+        content="Test message",
+        timestamp=datetime.utcnow(),
+        sender=SenderType.USER,
+    )
+
+
+#Repositorio falso que registra los lotes recibidos y simula la restricción única de message_id
+class FakeBatchStore:
+
+    def __init__(self):
+        self.batches = []
+        self.stored = set()
+
+    async def save_many(self, messages):
+        self.batches.append([m.message_id for m in messages])
+        saved = []
+        for message in messages:
+            if message.message_id in self.stored:
+                saved.append(None)
+            else:
+                self.stored.add(message.message_id)
+                saved.append(message)
+        return saved
+
+
+@pytest.mark.asyncio
+class TestWriteCoalescer:
+
+    #Las escrituras concurrentes deben confirmarse en un solo lote
+    async def test_concurrent_submits_are_committed_together(self):
+        store = FakeBatchStore()
+        coalescer = WriteCoalescer(store.save_many, max_batch_size=100, max_latency_ms=20)
+
+        results = await asyncio.gather(*(coalescer.submit(_message(f"msg-{i}")) for i in range(10)))
+        await coalescer.close()
+
+        assert [r.message_id for r in results] == [f"msg-{i}" for i in range(10)]
+        assert len(store.batches) == 1
+        assert coalescer.metrics.batches == 1
+        assert coalescer.metrics.messages == 10
+
+    #Un lote no debe superar max_batch_size
+    async def test_batches_respect_max_batch_size(self):
+        store = FakeBatchStore()
+        coalescer = WriteCoalescer(store.save_many, max_batch_size=4, max_latency_ms=50)
+
+        await asyncio.gather(*(coalescer.submit(_message(f"msg-{i}")) for i in range(10)))
+        await coalescer.close()
+
+        assert all(len(batch) <= 4 for batch in store.batches)
+        assert sum(len(batch) for batch in store.batches) == 10
+        assert coalescer.metrics.max_batch_size == 4
+
+    #Solo el llamador duplicado debe recibir el error
+    async def test_duplicate_fails_only_its_own_caller(self):
+        store = FakeBatchStore()
+        store.stored.add("msg-dup")
+        coalescer = WriteCoalescer(store.save_many, max_batch_size=100, max_latency_ms=20)
+
+        results = await asyncio.gather(
+            coalescer.submit(_message("msg-1")),
+            coalescer.submit(_message("msg-dup")),
+            coalescer.submit(_message("msg-2")),
+            return_exceptions=True,
+        )
+        await coalescer.close()
+
+        assert results[0].message_id == "msg-1"
+        assert isinstance(results[1], ValueError)
+        assert "ya existe" in str(results[1])
+        assert results[2].message_id == "msg-2"
+
+    #Un fallo de la transacción se propaga a todos los llamadores del lote
+    async def test_failed_transaction_propagates_to_all_callers(self):
+        async def failing_save_many(messages):
+            raise RuntimeError("database is locked")
+
+        coalescer = WriteCoalescer(failing_save_many, max_batch_size=100, max_latency_ms=10)
+
+        results = await asyncio.gather(
+            coalescer.submit(_message("msg-1")),
+            coalescer.submit(_message("msg-2")),
+            return_exceptions=True,
+        )
+        await coalescer.close()
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert coalescer.metrics.failed_batches == 1
+
+    #Las métricas deben agrupar los tamaños de lote en potencias de 2
+    async def test_snapshot_reports_batch_size_histogram(self):
+        store = FakeBatchStore()
+        coalescer = WriteCoalescer(store.save_many, max_batch_size=100, max_latency_ms=20)
+
+        await asyncio.gather(*(coalescer.submit(_message(f"msg-{i}")) for i in range(3)))
+        await coalescer.submit(_message("msg-solo"))
+        await coalescer.close()
+
+        snapshot = coalescer.snapshot()
+        assert snapshot["batches"] == 2
+        assert snapshot["batch_size_histogram"] == {"<=1": 1, "<=4": 1}
+        assert snapshot["average_batch_size"] == 2.0
+        assert snapshot["pending"] == 0
+
+
+#Test de la configuración del coalescedor
+class TestWriteCoalescerConfiguration:
+
+    def test_invalid_configuration_raises_value_error(self):
+        with pytest.raises(ValueError):
+            WriteCoalescer(FakeBatchStore().save_many, max_batch_size=0)